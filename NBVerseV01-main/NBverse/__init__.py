@@ -10,9 +10,12 @@ JavaScript bitCalculation.v.0.2.js 기반 구현
 """
 
 from .calculator import NBValueCalculator
+from .sliding import SlidingNBCalculator
 from .converter import TextToNBConverter, calculate_sentence_bits
+from .cache import NBResultCache
 from .utils import word_nb_unicode_format
 from .storage import NBverseStorage, nested_path_from_number
+from .indexed_storage import NBverseIndexedStorage
 from .config import NBverseConfig
 from .similarity import (
     calculate_nb_similarity,
@@ -23,6 +26,8 @@ from .similarity import (
 from .history import QueryHistory
 from .compact_storage import NBverseCompactStorage
 from .hybrid_storage import NBverseHybridStorage
+from .compaction import NBverseCompactor, NBverseCompactionScheduler
+from .columns import ColumnArray
 
 __version__ = '0.2.1'
 __author__ = 'yoohyunseog'
@@ -35,10 +40,13 @@ __all__ = [
     
     # 핵심 클래스
     'NBValueCalculator',
+    'SlidingNBCalculator',
     'TextToNBConverter',
     'NBverseStorage',
+    'NBverseIndexedStorage',
     'NBverseConfig',
     'QueryHistory',
+    'NBResultCache',
     
     # 주요 함수
     'calculate_sentence_bits',
@@ -56,6 +64,13 @@ __all__ = [
     
     # 하이브리드 저장소
     'NBverseHybridStorage',
+    
+    # 저장소 압축
+    'NBverseCompactor',
+    'NBverseCompactionScheduler',
+    
+    # 열(.col) 저장 배열
+    'ColumnArray',
 ]
 
 # 편의 함수 (간단한 사용을 위해)
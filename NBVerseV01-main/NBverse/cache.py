@@ -0,0 +1,190 @@
+"""
+N/B 변환 결과 캐시 모듈
+같은 문자열(유니코드 배열)에 대한 calculate_bit_pair 결과를 재사용합니다.
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+
+class NBResultCache:
+    """N/B 계산 결과 LRU 캐시 (선택적으로 디스크에 보관)
+
+    - 키: 유니코드 배열 해시 + bit + decimal_places
+    - 값: calculate_bit_pair()의 (순방향, 역방향) 원시 결과
+      (SUPER_BIT 보정은 캐시하지 않고 변환기에서 매번 적용)
+    - 메모리: 최대 max_items개 유지, 초과 시 가장 오래 사용하지 않은 항목 제거
+    - 디스크: disk_path를 지정하면 SQLite 파일에 최대 max_disk_items개 보관 (재시작 후 재사용)
+    """
+
+    def __init__(self, max_items: int = 256, disk_path: Optional[str] = None,
+                 max_disk_items: int = 5000):
+        """
+        초기화
+
+        Args:
+            max_items: 메모리에 유지할 최대 항목 수 (기본값: 256)
+            disk_path: 디스크 캐시 파일 경로 (선택사항, 없으면 메모리만 사용)
+            max_disk_items: 디스크에 유지할 최대 항목 수 (기본값: 5000)
+        """
+        self.max_items = max_items
+        self.disk_path = disk_path
+        self.max_disk_items = max_disk_items
+
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if disk_path:
+            self._init_disk()
+
+    @staticmethod
+    def make_key(text: str, bit: float, decimal_places: int) -> str:
+        """캐시 키 생성 (유니코드 배열 해시 + bit + decimal_places)"""
+        # UTF-32 인코딩은 유니코드 코드 포인트 배열과 1:1 대응
+        digest = hashlib.blake2b(text.encode('utf-32-le', 'surrogatepass'), digest_size=20).hexdigest()
+        return f"{digest}:{bit!r}:{decimal_places}"
+
+    def _init_disk(self):
+        """디스크 캐시 초기화 (실패하면 메모리 캐시만 사용)"""
+        try:
+            cache_dir = os.path.dirname(self.disk_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with self._disk_lock, self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS nb_cache ("
+                    "key TEXT PRIMARY KEY, forward REAL NOT NULL, reverse REAL NOT NULL, "
+                    "used_at INTEGER NOT NULL)"
+                )
+        except Exception as e:
+            print(f"⚠️ N/B 디스크 캐시 초기화 오류: {e}")
+            self.disk_path = None
+
+    @contextmanager
+    def _connect(self):
+        """디스크 캐시 연결 (정상 종료 시 커밋 후 닫음)"""
+        conn = sqlite3.connect(self.disk_path, timeout=5.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, float]]:
+        try:
+            with self._disk_lock, self._connect() as conn:
+                row = conn.execute("SELECT forward, reverse FROM nb_cache WHERE key = ?", (key,)).fetchone()
+                if row:
+                    # 읽은 항목을 가장 최근 사용으로 표시 (개수 초과 시 사용한 지 오래된 항목부터 제거)
+                    conn.execute(
+                        "UPDATE nb_cache SET used_at = (SELECT MAX(used_at) + 1 FROM nb_cache) WHERE key = ?",
+                        (key,)
+                    )
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            print(f"⚠️ N/B 디스크 캐시 조회 오류: {e}")
+            return None
+
+    def _disk_put(self, key: str, value: Tuple[float, float]):
+        try:
+            with self._disk_lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO nb_cache (key, forward, reverse, used_at) "
+                    "VALUES (?, ?, ?, (SELECT COALESCE(MAX(used_at), 0) + 1 FROM nb_cache))",
+                    (key, value[0], value[1])
+                )
+                # 최대 개수 초과 시 오래된 항목 제거
+                conn.execute(
+                    "DELETE FROM nb_cache WHERE key NOT IN "
+                    "(SELECT key FROM nb_cache ORDER BY used_at DESC LIMIT ?)",
+                    (self.max_disk_items,)
+                )
+        except Exception as e:
+            print(f"⚠️ N/B 디스크 캐시 저장 오류: {e}")
+
+    def _remember(self, key: str, value: Tuple[float, float]):
+        """메모리 캐시에 저장 (락 안에서 호출)"""
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """캐시 조회 (메모리 → 디스크 순서)"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.disk_path:
+            value = self._disk_get(key)
+            if value is not None:
+                with self._lock:
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Tuple[float, float]):
+        """캐시 저장 (메모리 + 디스크)"""
+        value = (float(value[0]), float(value[1]))
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_path:
+            self._disk_put(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Tuple[float, float]]) -> Tuple[float, float]:
+        """캐시에 있으면 반환, 없으면 계산 후 저장"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, include_disk: bool = False):
+        """캐시 초기화
+
+        Args:
+            include_disk: True이면 디스크 캐시도 삭제
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.disk_hits = 0
+        if include_disk and self.disk_path:
+            try:
+                with self._disk_lock, self._connect() as conn:
+                    conn.execute("DELETE FROM nb_cache")
+            except Exception as e:
+                print(f"⚠️ N/B 디스크 캐시 삭제 오류: {e}")
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'items': len(self._items),
+                'max_items': self.max_items,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'disk_path': self.disk_path
+            }
@@ -3,25 +3,81 @@ N/B 값 계산 모듈
 JavaScript bitCalculation.v.0.2.js의 calculateBit, BIT_MAX_NB, BIT_MIN_NB 로직 구현
 """
 
-from decimal import Decimal, getcontext
+from decimal import getcontext
 import math
 
+# NumPy 백엔드 (선택사항, 없으면 순수 Python 계산만 사용)
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    _NUMPY_AVAILABLE = False
+
+BACKEND_PYTHON = 'python'
+BACKEND_NUMPY = 'numpy'
+
+# 마스크 방식 구간 검색 시 한 번에 비교할 최대 원소 수 (메모리 제한)
+_MASK_CHUNK_ELEMENTS = 4_000_000
+
+
+def _round_array(values, decimal_places: int):
+    """배열 전체를 Python round()와 비트 단위로 동일하게 반올림
+
+    np.round()는 곱셈 후 rint를 사용하므로 반올림 경계(x.5)에 아주 가까운 값에서
+    Python round()(정확한 10진 반올림)와 결과가 달라질 수 있습니다.
+    경계 근처 값과 정수 표현 범위를 벗어나는 값만 Python round()로 다시 계산합니다.
+
+    Args:
+        values: float64 배열
+        decimal_places: 소수점 자리수
+
+    Returns:
+        반올림된 float64 배열 (무한대/NaN은 0.0)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    safe = np.where(finite, values, 0.0)
+    
+    scale = 10.0 ** decimal_places
+    scaled = safe * scale
+    result = np.rint(scaled) / scale
+    
+    # 반올림 경계 근처 또는 2^52 이상(정수 정밀도 손실)인 값은 Python round() 사용
+    frac = scaled - np.floor(scaled)
+    risky = (np.abs(frac - 0.5) <= 4.0 * np.spacing(np.abs(scaled))) | (np.abs(scaled) >= 2.0 ** 52)
+    risky &= finite
+    if risky.any():
+        idx = np.nonzero(risky)[0]
+        result[idx] = [round(v, decimal_places) for v in safe[idx].tolist()]
+    
+    result[~finite] = 0.0
+    return result
+
 
 class NBValueCalculator:
     """N/B 값 계산 클래스 (JavaScript bitCalculation.v.0.2.js 로직 변환)"""
     
-    def __init__(self, decimal_places: int = 10):
+    def __init__(self, decimal_places: int = 10, backend: str = BACKEND_PYTHON):
         """
         초기화
         
         Args:
             decimal_places: 소수점 자리수 (기본값: 10)
+            backend: 계산 백엔드 ('python' 또는 'numpy', 기본값: 'python')
+                     'numpy'는 NumPy가 설치된 경우에만 사용되며 결과는 'python'과 동일
         """
         self.SUPER_BIT = 0.0
         self.BIT_DEFAULT = 5.5
         self.COUNT = 150
         self.CONT = 20
         self.NB_DECIMAL_PLACES = decimal_places
+        if backend not in (BACKEND_PYTHON, BACKEND_NUMPY):
+            raise ValueError(f"지원하지 않는 계산 백엔드입니다: {backend}")
+        if backend == BACKEND_NUMPY and not _NUMPY_AVAILABLE:
+            print("ℹ️ NumPy가 설치되지 않았습니다. python 백엔드를 사용합니다. (설치: pip install numpy)")
+            backend = BACKEND_PYTHON
+        self.backend = backend
         # Decimal 정밀도 설정
         getcontext().prec = 28
     
@@ -39,22 +95,12 @@ class NBValueCalculator:
         """N/B 값을 소수점 10자리로 포맷팅"""
         if not math.isfinite(value) or math.isnan(value):
             return 0.0
-        return round(float(Decimal(str(value))), self.NB_DECIMAL_PLACES)
+        # float(Decimal(str(value)))는 항상 value와 같은 float이므로 (repr 왕복 보장)
+        # Decimal 객체를 만들지 않고 바로 반올림 (결과는 이전 구현과 비트 단위로 동일)
+        return round(value, self.NB_DECIMAL_PLACES)
     
-    def calculate_bit(self, nb: list, bit: float = 5.5, reverse: bool = False) -> float:
-        """N/B 값을 계산하는 함수 (가중치 상한치 및 하한치 기반)
-        
-        Args:
-            nb: N/B 값 배열
-            bit: 기본 비트 값 (기본값: 5.5)
-            reverse: 시간 역방향 흐름 분석 여부 (기본값: False)
-        
-        Returns:
-            계산된 N/B 값
-        """
-        if len(nb) < 2:
-            return self.format_nb_value(bit / 100.0)
-        
+    def _build_band_arrays(self, nb: list, bit: float) -> dict:
+        """A50/A100/B50/B100/NBA100 구간 배열 생성 (calculate_bit의 배열 구성 단계)"""
         BIT_NB = bit
         max_val = max(nb)
         min_val = min(nb)
@@ -69,6 +115,12 @@ class NBValueCalculator:
         positive_increment = positive_range / (total_count - 1) if total_count > 1 else 0.0
         
         arrays = self.initialize_arrays(total_count)
+        BIT_START_A50 = arrays['BIT_START_A50']
+        BIT_START_A100 = arrays['BIT_START_A100']
+        BIT_START_B50 = arrays['BIT_START_B50']
+        BIT_START_B100 = arrays['BIT_START_B100']
+        BIT_START_NBA100 = arrays['BIT_START_NBA100']
+        format_nb_value = self.format_nb_value
         count = 0
         total_sum = 0.0
         
@@ -93,40 +145,203 @@ class NBValueCalculator:
                 
                 NBA100 = A100 / (len(nb) - BIT_END) if len(nb) > BIT_END else A100
                 
-                arrays['BIT_START_A50'][count] = self.format_nb_value(A50)
-                arrays['BIT_START_A100'][count] = self.format_nb_value(A100)
-                arrays['BIT_START_B50'][count] = self.format_nb_value(B50)
-                arrays['BIT_START_B100'][count] = self.format_nb_value(B100)
-                arrays['BIT_START_NBA100'][count] = self.format_nb_value(NBA100)
+                BIT_START_A50[count] = format_nb_value(A50)
+                BIT_START_A100[count] = format_nb_value(A100)
+                BIT_START_B50[count] = format_nb_value(B50)
+                BIT_START_B100[count] = format_nb_value(B100)
+                BIT_START_NBA100[count] = format_nb_value(NBA100)
                 
                 count += 1
             total_sum += value
         
+        return arrays
+    
+    def _find_first_bands(self, nb: list, arrays: dict) -> list:
+        """각 값이 처음으로 포함되는 구간(B50 <= value <= B100)의 인덱스 (없으면 -1)"""
+        B50 = arrays['BIT_START_B50']
+        B100 = arrays['BIT_START_B100']
+        first = []
+        for value in nb:
+            index = -1
+            for a in range(len(B50)):
+                if B50[a] <= value <= B100[a]:
+                    index = a
+                    break
+            first.append(index)
+        return first
+    
+    def _finalize_nb50(self, nb: list, bit: float, NB50: float) -> float:
+        """시간 흐름의 상한치(MAX)와 하한치(MIN) 보정"""
+        if len(nb) == 2:
+            return self.format_nb_value(bit - NB50)  # NB 분석 점수가 작을수록 시간 흐름 안정성이 높음
+        else:
+            return self.format_nb_value(NB50)
+    
+    def calculate_bit(self, nb: list, bit: float = 5.5, reverse: bool = False) -> float:
+        """N/B 값을 계산하는 함수 (가중치 상한치 및 하한치 기반)
+        
+        Args:
+            nb: N/B 값 배열
+            bit: 기본 비트 값 (기본값: 5.5)
+            reverse: 시간 역방향 흐름 분석 여부 (기본값: False)
+        
+        Returns:
+            계산된 N/B 값
+        """
+        if len(nb) < 2:
+            return self.format_nb_value(bit / 100.0)
+        
+        if self.backend == BACKEND_NUMPY:
+            return self._calculate_bit_numpy(nb, bit, reverse)
+        
+        arrays = self._build_band_arrays(nb, bit)
+        
         # Reverse 옵션 처리 (시간 역방향 흐름 분석)
         if reverse:
             arrays['BIT_START_NBA100'].reverse()
         
         # NB50 계산 (시간 흐름 기반 가중치 분석)
         NB50 = 0.0
-        for value in nb:
-            for a in range(len(arrays['BIT_START_NBA100'])):
-                B50_val = arrays['BIT_START_B50'][a]
-                B100_val = arrays['BIT_START_B100'][a]
-                if B50_val <= value <= B100_val:
-                    NBA100_val = arrays['BIT_START_NBA100'][min(a, len(arrays['BIT_START_NBA100']) - 1)]
-                    NB50 += NBA100_val
-                    break
+        NBA100 = arrays['BIT_START_NBA100']
+        for a in self._find_first_bands(nb, arrays):
+            if a >= 0:
+                NB50 += NBA100[min(a, len(NBA100) - 1)]
         
-        # 시간 흐름의 상한치(MAX)와 하한치(MIN) 보정
-        if len(nb) == 2:
-            return self.format_nb_value(bit - NB50)  # NB 분석 점수가 작을수록 시간 흐름 안정성이 높음
-        else:
-            return self.format_nb_value(NB50)
+        return self._finalize_nb50(nb, bit, NB50)
+    
+    def calculate_bit_pair(self, nb: list, bit: float = 5.5) -> tuple:
+        """순방향/역방향 N/B 값을 한 번에 계산 (구간 배열과 구간 검색을 공유)
+        
+        calculate_bit(nb, bit, False), calculate_bit(nb, bit, True)와 동일한 결과를
+        구간 배열 생성 1회, 구간 검색 1회로 계산합니다.
+        
+        Args:
+            nb: N/B 값 배열
+            bit: 기본 비트 값 (기본값: 5.5)
+        
+        Returns:
+            (순방향 결과, 역방향 결과)
+        """
+        if len(nb) < 2:
+            value = self.format_nb_value(bit / 100.0)
+            return value, value
+        
+        if self.backend == BACKEND_NUMPY:
+            return self._calculate_bit_pair_numpy(nb, bit)
+        
+        arrays = self._build_band_arrays(nb, bit)
+        NBA100 = arrays['BIT_START_NBA100']
+        last = len(NBA100) - 1
+        
+        # 같은 구간 인덱스 a에 대해 순방향은 NBA100[a], 역방향은 NBA100[last - a]
+        NB50_forward = 0.0
+        NB50_reverse = 0.0
+        for a in self._find_first_bands(nb, arrays):
+            if a >= 0:
+                NB50_forward += NBA100[a]
+                NB50_reverse += NBA100[last - a]
+        
+        return (self._finalize_nb50(nb, bit, NB50_forward),
+                self._finalize_nb50(nb, bit, NB50_reverse))
+    
+    def _build_band_arrays_numpy(self, nb: list, bit: float):
+        """NumPy로 B50/B100/NBA100 배열 생성 (calculate_bit 루프와 동일한 연산 순서)
+        
+        Returns:
+            (nb_arr, B50, B100, NBA100) - B50/B100/NBA100은 소수점 자리수로 반올림된 값
+        """
+        n = len(nb)
+        max_val = max(nb)
+        min_val = min(nb)
+        COUNT = self.COUNT
+        total_count = COUNT * n
+        
+        negative_range = abs(min_val) if min_val < 0 else 0.0
+        positive_range = max_val if max_val > 0 else 0.0
+        
+        negative_increment = negative_range / (total_count - 1) if total_count > 1 else 0.0
+        positive_increment = positive_range / (total_count - 1) if total_count > 1 else 0.0
+        
+        nb_arr = np.asarray(nb, dtype=np.float64)
+        # 각 행(value)의 부호에 따른 증분을 COUNT번 반복
+        increment = np.repeat(np.where(nb_arr < 0, negative_increment, positive_increment), COUNT)
+        steps = np.arange(1, total_count + 1, dtype=np.float64)  # count + 1
+        
+        A50 = float(min_val) + increment * steps
+        A100 = steps * bit / total_count
+        B50 = A50 - increment * 2
+        B100 = A50 + increment
+        NBA100 = A100 / (n - 1) if n > 1 else A100
+        
+        decimal_places = self.NB_DECIMAL_PLACES
+        return (nb_arr,
+                _round_array(B50, decimal_places),
+                _round_array(B100, decimal_places),
+                _round_array(NBA100, decimal_places))
+    
+    def _find_first_bands_numpy(self, nb_arr, B50, B100):
+        """각 값이 처음으로 포함되는 구간(B50 <= value <= B100)의 인덱스 계산
+        
+        Returns:
+            인덱스 배열 (포함되는 구간이 없으면 -1)
+        """
+        total_count = len(B50)
+        
+        # 구간 경계가 단조 증가하면 이진 탐색으로 첫 구간을 찾음
+        if np.all(B50[1:] >= B50[:-1]) and np.all(B100[1:] >= B100[:-1]):
+            first = np.searchsorted(B100, nb_arr, side='left')
+            clipped = np.minimum(first, total_count - 1)
+            valid = (first < total_count) & (B50[clipped] <= nb_arr)
+            return np.where(valid, clipped, -1)
+        
+        # 음수/양수가 섞여 단조성이 깨지면 마스크 + argmax로 검색 (메모리 제한을 위해 분할)
+        result = np.full(len(nb_arr), -1, dtype=np.int64)
+        chunk = max(1, _MASK_CHUNK_ELEMENTS // total_count)
+        for start in range(0, len(nb_arr), chunk):
+            values = nb_arr[start:start + chunk, None]
+            mask = (B50[None, :] <= values) & (values <= B100[None, :])
+            hit = mask.any(axis=1)
+            result[start:start + chunk] = np.where(hit, mask.argmax(axis=1), -1)
+        return result
+    
+    def _sum_nb50(self, first, NBA100) -> float:
+        """첫 구간의 NBA100 값을 입력 순서대로 누적 (Python 루프와 동일한 합산 순서)"""
+        matched = first[first >= 0]
+        NB50 = 0.0
+        for value in NBA100[matched].tolist():
+            NB50 += value
+        return NB50
+    
+    def _calculate_bit_numpy(self, nb: list, bit: float, reverse: bool) -> float:
+        """calculate_bit의 NumPy 백엔드 (python 백엔드와 비트 단위로 동일한 결과)"""
+        nb_arr, B50, B100, NBA100 = self._build_band_arrays_numpy(nb, bit)
+        
+        if reverse:
+            NBA100 = NBA100[::-1]
+        
+        first = self._find_first_bands_numpy(nb_arr, B50, B100)
+        return self._finalize_nb50(nb, bit, self._sum_nb50(first, NBA100))
+    
+    def _calculate_bit_pair_numpy(self, nb: list, bit: float) -> tuple:
+        """calculate_bit_pair의 NumPy 백엔드 (python 백엔드와 비트 단위로 동일한 결과)"""
+        nb_arr, B50, B100, NBA100 = self._build_band_arrays_numpy(nb, bit)
+        first = self._find_first_bands_numpy(nb_arr, B50, B100)
+        
+        return (self._finalize_nb50(nb, bit, self._sum_nb50(first, NBA100)),
+                self._finalize_nb50(nb, bit, self._sum_nb50(first, NBA100[::-1])))
     
     def update_super_bit(self, new_value: float):
         """SUPER_BIT는 현재 N/B 분석 상태를 반영한 전역 가중치"""
         self.SUPER_BIT = self.format_nb_value(new_value)
     
+    def _apply_super_bit(self, result: float) -> float:
+        """결과 값이 유효 범위를 벗어나면 SUPER_BIT 반환, 유효하면 SUPER_BIT 갱신"""
+        if not math.isfinite(result) or math.isnan(result) or result > 100 or result < -100:
+            return self.format_nb_value(self.SUPER_BIT)
+        else:
+            self.update_super_bit(result)
+            return self.format_nb_value(result)
+    
     def bit_max_nb(self, nb: list, bit: float = 5.5) -> float:
         """BIT_MAX_NB 함수 (시간 흐름 상한치 분석)
         
@@ -137,14 +352,7 @@ class NBValueCalculator:
         Returns:
             시간 순방향 분석 결과 (Forward Time Flow)
         """
-        result = self.calculate_bit(nb, bit, False)
-        
-        # 결과 값이 유효 범위를 벗어나면 SUPER_BIT 반환
-        if not math.isfinite(result) or math.isnan(result) or result > 100 or result < -100:
-            return self.format_nb_value(self.SUPER_BIT)
-        else:
-            self.update_super_bit(result)
-            return self.format_nb_value(result)
+        return self._apply_super_bit(self.calculate_bit(nb, bit, False))
     
     def bit_min_nb(self, nb: list, bit: float = 5.5) -> float:
         """BIT_MIN_NB 함수 (시간 흐름 하한치 분석)
@@ -156,12 +364,34 @@ class NBValueCalculator:
         Returns:
             시간 역방향 분석 결과 (Reverse Time Flow)
         """
-        result = self.calculate_bit(nb, bit, True)
+        return self._apply_super_bit(self.calculate_bit(nb, bit, True))
+    
+    def bit_max_min_nb(self, nb: list, bit: float = 5.5) -> tuple:
+        """BIT_MAX_NB, BIT_MIN_NB를 한 번의 계산으로 처리
         
-        # 결과 값이 유효 범위를 벗어나면 SUPER_BIT 반환
-        if not math.isfinite(result) or math.isnan(result) or result > 100 or result < -100:
-            return self.format_nb_value(self.SUPER_BIT)
-        else:
-            self.update_super_bit(result)
-            return self.format_nb_value(result)
-
+        bit_max_nb() 후 bit_min_nb()를 호출한 것과 동일한 결과와 SUPER_BIT 상태를 만듭니다.
+        (MAX 결과가 유효하면 SUPER_BIT가 먼저 갱신되고, MIN이 범위를 벗어나면 그 값을 사용)
+        
+        Args:
+            nb: N/B 값 배열
+            bit: 기본 비트 값 (기본값: 5.5)
+        
+        Returns:
+            (bitMax, bitMin)
+        """
+        forward, backward = self.calculate_bit_pair(nb, bit)
+        return self.resolve_bit_pair(forward, backward)
+    
+    def resolve_bit_pair(self, forward: float, backward: float) -> tuple:
+        """calculate_bit_pair 결과에 SUPER_BIT 보정을 적용 (MAX → MIN 순서)
+        
+        Args:
+            forward: 순방향 calculate_bit 결과
+            backward: 역방향 calculate_bit 결과
+        
+        Returns:
+            (bitMax, bitMin)
+        """
+        bit_max = self._apply_super_bit(forward)
+        bit_min = self._apply_super_bit(backward)
+        return bit_max, bit_min
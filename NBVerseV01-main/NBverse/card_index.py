@@ -0,0 +1,212 @@
+"""
+카드 ID 인덱스 모듈
+metadata.card_id → 저장 파일 경로 목록을 유지하여
+카드 갱신/삭제 시 전체 폴더를 스캔하지 않고 해당 파일만 읽고 씁니다.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class NBCardIndex:
+    """카드 ID → 파일 경로 인덱스
+    
+    - 인덱스 파일: 추가만 하는 로그
+      '+\\t<card_id>\\t<상대 경로>' (경로 추가), '-\\t<card_id>\\t' (카드 삭제)
+    - 인덱스 파일이 없으면 처음 조회할 때 폴더를 한 번 스캔하여 다시 만듦
+    - 다른 프로세스가 추가한 줄은 조회할 때 파일 끝부분만 읽어서 반영
+    - 다른 프로세스가 인덱스 파일을 다시 만들면 (파일 교체: inode 변경 또는 크기 감소) 처음부터 다시 읽음
+    """
+    
+    # 카드 메타데이터가 있는 파일만 파싱 (바이트 사전 필터)
+    _CARD_ID_MARKER = b'"card_id"'
+    
+    def __init__(self, index_path: str, data_dir: str, search_dirs: List[str]):
+        """
+        초기화
+        
+        Args:
+            index_path: 인덱스 파일 경로
+            data_dir: 상대 경로 기준 디렉토리
+            search_dirs: 인덱스를 다시 만들 때 스캔할 폴더 목록 (max, min 폴더)
+        """
+        self.index_path = index_path
+        self.data_dir = data_dir
+        self.search_dirs = search_dirs
+        
+        self._paths = {}  # card_id -> [상대 경로]
+        self._offset = 0
+        self._file_id = None  # 읽고 있는 인덱스 파일의 (장치, inode)
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def add(self, card_id: str, file_paths: List[str]):
+        """카드 파일 경로 추가 (인덱스 파일이 아직 없으면 처음 조회할 때 스캔에 포함됨)"""
+        if not card_id:
+            return
+        lines = "".join(f"+\t{card_id}\t{os.path.relpath(path, self.data_dir)}\n" for path in file_paths)
+        self._append(lines)
+    
+    def remove(self, card_id: str):
+        """카드 경로 삭제 기록"""
+        if card_id:
+            self._append(f"-\t{card_id}\t\n")
+    
+    def get_paths(self, card_id: str) -> List[str]:
+        """카드 ID의 파일 경로 목록 (저장 순서)"""
+        with self._lock:
+            self._ensure_loaded()
+            return [os.path.join(self.data_dir, path) for path in self._paths.get(card_id, [])]
+    
+    def rebuild(self):
+        """폴더를 스캔하여 인덱스 파일을 다시 만듦"""
+        with self._lock:
+            self._rebuild()
+    
+    def items(self) -> Dict[str, List[str]]:
+        """카드 ID -> 파일 경로 목록 전체 (저장소 압축용)"""
+        with self._lock:
+            self._ensure_loaded()
+            return {card_id: [os.path.join(self.data_dir, path) for path in paths]
+                    for card_id, paths in self._paths.items()}
+    
+    def compact(self):
+        """삭제 기록과 없어진 파일 경로를 뺀 내용으로 인덱스 파일을 다시 씀"""
+        with self._lock:
+            self._ensure_loaded()
+            paths = {}
+            for card_id, card_paths in self._paths.items():
+                existing = [path for path in card_paths if os.path.exists(os.path.join(self.data_dir, path))]
+                if existing:
+                    paths[card_id] = existing
+            self._write(paths)
+    
+    def _append(self, lines: str):
+        with self._lock:
+            if not os.path.exists(self.index_path):
+                return
+            try:
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+            except Exception as e:
+                print(f"⚠️ 카드 인덱스 추가 오류: {e}")
+    
+    def _ensure_loaded(self):
+        """인덱스 로드 (처음이면 파일 전체를 읽거나 다시 만들고, 이후에는 새로 추가된 줄만 읽음) - 락 안에서 호출"""
+        if self._loaded and self._replaced():
+            # 다른 프로세스가 다시 만든 파일에서 이전 위치부터 읽으면 경로가 빠지거나 중복되므로 처음부터 다시 읽음
+            self._loaded = False
+        if not self._loaded:
+            if not os.path.exists(self.index_path):
+                self._rebuild()
+                return
+            self._file_id = self._index_file_id()
+            self._paths = {}
+            self._offset = 0
+            self._loaded = True
+        if os.path.exists(self.index_path):
+            self._read_tail()
+    
+    def _index_file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+    
+    def _replaced(self) -> bool:
+        """마지막으로 읽은 뒤 인덱스 파일이 교체되었거나 (os.replace) 읽은 위치보다 작아졌는지"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._file_id or stat.st_size < self._offset
+    
+    def _read_tail(self):
+        """인덱스 파일에서 마지막으로 읽은 위치 이후의 완성된 줄 반영"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except Exception as e:
+            print(f"⚠️ 카드 인덱스 읽기 오류: {e}")
+            return
+        
+        # 쓰는 중인 마지막 줄은 다음 번에 읽음
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return
+        self._offset += end
+        
+        for line in chunk[:end].decode('utf-8').splitlines():
+            parts = line.split('\t')
+            if len(parts) != 3:
+                continue
+            operation, card_id, path = parts
+            if operation == '+':
+                paths = self._paths.setdefault(card_id, [])
+                if path not in paths:
+                    paths.append(path)
+            elif operation == '-':
+                self._paths.pop(card_id, None)
+    
+    def _rebuild(self):
+        """폴더 스캔으로 인덱스 재생성 - 락 안에서 호출"""
+        paths = {}
+        for base_dir in self.search_dirs:
+            if not os.path.exists(base_dir):
+                continue
+            for root, _, files in os.walk(base_dir):
+                for filename in sorted(files):
+                    if not filename.endswith('.json'):
+                        continue
+                    file_path = os.path.join(root, filename)
+                    card_id = self._read_card_id(file_path)
+                    if card_id:
+                        paths.setdefault(card_id, []).append(os.path.relpath(file_path, self.data_dir))
+        self._write(paths)
+    
+    def _write(self, paths: Dict[str, List[str]]):
+        """인덱스 파일을 경로 목록으로 교체 - 락 안에서 호출"""
+        content = "".join(
+            f"+\t{card_id}\t{path}\n" for card_id, card_paths in paths.items() for path in card_paths
+        ).encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+                stat = os.fstat(f.fileno())
+            os.replace(temp_path, self.index_path)
+            self._file_id = (stat.st_dev, stat.st_ino)
+        except Exception as e:
+            print(f"⚠️ 카드 인덱스 저장 오류: {e}")
+            self._file_id = None
+        
+        self._paths = paths
+        self._offset = len(content)
+        self._loaded = True
+    
+    def _read_card_id(self, file_path: str):
+        """파일의 metadata.card_id (card_id가 없는 파일은 파싱하지 않음)"""
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            if self._CARD_ID_MARKER not in content:
+                return None
+            data = json.loads(content)
+        except (OSError, ValueError):
+            return None
+        metadata = data.get('metadata') if isinstance(data, dict) else None
+        return metadata.get('card_id') if isinstance(metadata, dict) else None
+    
+    def stats(self) -> Dict:
+        """인덱스 통계"""
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                'cards': len(self._paths),
+                'paths': sum(len(paths) for paths in self._paths.values())
+            }
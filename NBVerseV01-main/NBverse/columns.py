@@ -0,0 +1,335 @@
+"""
+NBverse 숫자 배열 열(column) 저장 모듈
+레코드의 큰 숫자 배열(nb.unicodeArray, metadata.chart_data.prices)을 JSON 숫자 목록 대신
+JSON 파일 옆의 바이너리 파일('<파일명>.<내용 해시>.col')에 리틀 엔디언 원시 바이트로 저장합니다.
+
+JSON에는 참조만 남습니다:
+    {"$column": "<.col 파일명>", "offset": 0, "dtype": "<i4", "count": 2000}
+
+- 실수 필드(prices)는 실수만 있으면 float64, 정수만 있으면 int64로 저장하고
+  정수/실수가 섞인 목록은 JSON에 그대로 둠 (100 -> 100.0으로 바뀌면 N/B 텍스트와 값이 달라짐)
+
+- 읽을 때 파일 바이트를 그대로 읽어 array.frombytes / np.frombuffer로 바로 변환 (숫자 문자열 파싱 없음)
+- lazy=True이면 ColumnArray로 돌려주고 실제로 값을 볼 때 변환 (갱신만 하고 배열은 보지 않는 경로)
+- .col 파일명에 내용 해시가 들어가므로 배열이 바뀌지 않은 갱신은 .col 파일을 다시 쓰지 않음
+- 참조가 없는 기존 JSON(숫자 목록)도 그대로 읽음
+"""
+
+import os
+import sys
+import hashlib
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Set, Tuple
+
+# numpy가 있으면 np.frombuffer로 복사 없이 변환 (없으면 array 사용)
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+COLUMN_SUFFIX = '.col'
+COLUMN_REF_KEY = '$column'
+
+# 열로 저장할 필드 (레코드 안의 경로, array 타입 코드)
+COLUMN_FIELDS = (
+    (('nb', 'unicodeArray'), 'i'),
+    (('metadata', 'chart_data', 'prices'), 'd'),
+)
+
+# 이보다 짧은 배열은 JSON에 그대로 둠 (파일 하나 더 만드는 비용이 더 큼)
+MIN_COLUMN_LENGTH = 16
+
+# array 타입 코드 <-> dtype 문자열 (항상 리틀 엔디언)
+_DTYPES = {'i': '<i4', 'd': '<f8', 'q': '<i8'}
+_TYPECODES = {dtype: typecode for typecode, dtype in _DTYPES.items()}
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+# 실수 필드에 정수만 있을 때 쓰는 타입 코드
+_INT_TYPECODES = {'d': 'q'}
+_ALIGNMENT = 8
+
+
+def is_column_ref(value) -> bool:
+    """JSON 값이 .col 파일 참조인지 확인"""
+    return isinstance(value, dict) and COLUMN_REF_KEY in value
+
+
+def sidecar_prefix(json_path: str) -> str:
+    """JSON 파일의 .col 파일명 앞부분 ('<JSON 파일명에서 .json 제외>.')"""
+    name = os.path.basename(json_path)
+    if name.endswith('.json'):
+        name = name[:-len('.json')]
+    return name + '.'
+
+
+def sidecar_paths(json_path: str) -> List[str]:
+    """JSON 파일에 딸린 .col 파일 경로 목록 (이전 버전 포함)"""
+    folder = os.path.dirname(json_path) or '.'
+    prefix = sidecar_prefix(json_path)
+    try:
+        with os.scandir(folder) as it:
+            return [entry.path for entry in it
+                    if entry.name.startswith(prefix) and entry.name.endswith(COLUMN_SUFFIX)]
+    except OSError:
+        return []
+
+
+def owner_json_name(sidecar_name: str) -> Optional[str]:
+    """.col 파일명에서 주인 JSON 파일명 ('<이름>.<해시>.col' -> '<이름>.json')"""
+    if not sidecar_name.endswith(COLUMN_SUFFIX):
+        return None
+    stem, sep, _ = sidecar_name[:-len(COLUMN_SUFFIX)].rpartition('.')
+    return stem + '.json' if sep else None
+
+
+class ColumnArray(Sequence):
+    """.col 파일 바이트 위의 읽기 전용 숫자 배열 (처음 값을 볼 때 변환)
+    
+    len()은 변환 없이 바로 알 수 있고, 다시 저장할 때는 원시 바이트를 그대로 씁니다.
+    """
+    
+    __slots__ = ('_buffer', 'typecode', '_values')
+    
+    def __init__(self, buffer, typecode: str):
+        self._buffer = memoryview(buffer).cast('B')
+        self.typecode = typecode
+        self._values = None
+    
+    @property
+    def dtype(self) -> str:
+        return _DTYPES[self.typecode]
+    
+    def __len__(self) -> int:
+        return self._buffer.nbytes // array(self.typecode).itemsize
+    
+    def to_array(self) -> array:
+        """array.array로 변환 (한 번만 변환하여 재사용)"""
+        if self._values is None:
+            values = array(self.typecode)
+            values.frombytes(self._buffer)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            self._values = values
+        return self._values
+    
+    def to_numpy(self):
+        """numpy 배열 (원시 바이트를 복사 없이 참조, 읽기 전용)"""
+        if not _NUMPY_AVAILABLE:
+            raise ImportError("numpy가 설치되어 있지 않습니다")
+        return np.frombuffer(self._buffer, dtype=self.dtype)
+    
+    def tobytes(self) -> bytes:
+        """리틀 엔디언 원시 바이트"""
+        return self._buffer.tobytes()
+    
+    def tolist(self) -> list:
+        return self.to_array().tolist()
+    
+    def __getitem__(self, index):
+        values = self.to_array()
+        if isinstance(index, slice):
+            return values[index].tolist()
+        return values[index]
+    
+    def __iter__(self):
+        return iter(self.to_array())
+    
+    def __array__(self, dtype=None, copy=None):
+        values = self.to_numpy()
+        return values.astype(dtype) if dtype is not None else values
+    
+    def __eq__(self, other):
+        if isinstance(other, ColumnArray):
+            return self.typecode == other.typecode and self._buffer == other._buffer
+        if isinstance(other, (list, tuple, array)):
+            return len(self) == len(other) and self.tolist() == list(other)
+        return NotImplemented
+    
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"ColumnArray({self.dtype}, {len(self)})"
+
+
+def _encode_values(values, typecode: str) -> Optional[Tuple[str, bytes]]:
+    """숫자 목록을 리틀 엔디언 바이트로 변환 (열로 저장할 수 없는 값이면 None)
+    
+    array/ColumnArray는 JSON으로 쓸 수 없으므로 길이와 무관하게 항상 변환합니다.
+    
+    Returns:
+        (실제로 쓴 타입 코드, 바이트) - 실수 필드에 정수만 있으면 'q'
+    """
+    allowed = (typecode, _INT_TYPECODES.get(typecode))
+    if isinstance(values, ColumnArray):
+        return (values.typecode, values.tobytes()) if values.typecode in allowed else None
+    if isinstance(values, array):
+        if values.typecode not in allowed:
+            return None
+        typecode = values.typecode
+        packed = values
+    elif isinstance(values, (list, tuple)):
+        if len(values) < MIN_COLUMN_LENGTH:
+            return None
+        if typecode == 'i':
+            # 정수만 (bool 제외), int32 범위 밖이면 JSON에 그대로 둠
+            if not all(type(v) is int for v in values) or min(values) < _INT32_MIN or max(values) > _INT32_MAX:
+                return None
+        elif all(type(v) is float for v in values):
+            pass
+        elif (typecode in _INT_TYPECODES and all(type(v) is int for v in values)
+              and min(values) >= _INT64_MIN and max(values) <= _INT64_MAX):
+            typecode = _INT_TYPECODES[typecode]
+        else:
+            return None  # 정수/실수가 섞였으면 float64로 바꾸지 않고 JSON에 그대로 둠
+        packed = array(typecode, values)
+    else:
+        return None
+    if sys.byteorder == 'big':
+        packed = array(typecode, packed)
+        packed.byteswap()
+    return typecode, packed.tobytes()
+
+
+def _get_path(data: Dict, keys: Tuple[str, ...]):
+    value = data
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _set_path(data: Dict, keys: Tuple[str, ...], value) -> Dict:
+    """경로의 dict를 얕게 복사하며 값 교체 (호출자의 원본 dict는 바꾸지 않음)"""
+    copied = dict(data)
+    node = copied
+    for key in keys[:-1]:
+        node[key] = dict(node[key])
+        node = node[key]
+    node[keys[-1]] = value
+    return copied
+
+
+def encode_columns(data: Dict, json_path: str) -> Tuple[Dict, Optional[str], bytes]:
+    """
+    레코드의 열 필드를 참조로 바꾼 JSON용 데이터와 .col 파일 내용 생성
+    
+    Returns:
+        (JSON으로 쓸 데이터, .col 파일명 또는 None, .col 파일 바이트)
+    """
+    segments = []
+    for keys, typecode in COLUMN_FIELDS:
+        encoded = _encode_values(_get_path(data, keys), typecode)
+        if encoded is not None:
+            segments.append((keys, *encoded))
+    if not segments:
+        return data, None, b''
+    
+    chunks = []
+    offset = 0
+    refs = []
+    for keys, typecode, encoded in segments:
+        refs.append((keys, {'offset': offset, 'dtype': _DTYPES[typecode],
+                            'count': len(encoded) // array(typecode).itemsize}))
+        padding = -len(encoded) % _ALIGNMENT
+        chunks.append(encoded + b'\0' * padding)
+        offset += len(encoded) + padding
+    payload = b''.join(chunks)
+    digest = hashlib.blake2b(payload, digest_size=8)
+    for keys, _ in refs:
+        digest.update('.'.join(keys).encode('ascii'))
+    name = f"{sidecar_prefix(json_path)}{digest.hexdigest()}{COLUMN_SUFFIX}"
+    
+    for keys, ref in refs:
+        data = _set_path(data, keys, {COLUMN_REF_KEY: name, **ref})
+    return data, name, payload
+
+
+def write_columns(json_path: str, data: Dict) -> Tuple[Dict, Optional[str]]:
+    """
+    .col 파일을 먼저 쓰고 JSON에 쓸 데이터 반환 (JSON보다 .col 파일이 먼저 존재하도록)
+    
+    같은 내용의 .col 파일이 이미 있으면 다시 쓰지 않습니다.
+    
+    Returns:
+        (JSON으로 쓸 데이터, .col 파일명 또는 None)
+    """
+    data, name, payload = encode_columns(data, json_path)
+    if name is None:
+        return data, None
+    column_path = os.path.join(os.path.dirname(json_path), name)
+    if not os.path.exists(column_path):
+        temp_path = f"{column_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, column_path)
+    return data, name
+
+
+def remove_stale_columns(json_path: str, keep: Optional[str] = None) -> int:
+    """JSON 파일의 이전 .col 파일 삭제 (keep 파일명은 유지), 삭제한 파일 수 반환"""
+    removed = 0
+    for path in sidecar_paths(json_path):
+        if os.path.basename(path) == keep:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def column_refs(data) -> Set[str]:
+    """레코드가 참조하는 .col 파일명"""
+    names = set()
+    for keys, _ in COLUMN_FIELDS:
+        ref = _get_path(data, keys) if isinstance(data, dict) else None
+        if is_column_ref(ref):
+            names.add(os.path.basename(ref[COLUMN_REF_KEY]))
+    return names
+
+
+def resolve_columns(data, json_path: str, lazy: bool = False) -> bool:
+    """
+    레코드의 .col 참조를 숫자 배열로 바꿈 (제자리 변경)
+    
+    Args:
+        data: JSON에서 읽은 레코드
+        json_path: 레코드 JSON 파일 경로 (.col 파일은 같은 폴더)
+        lazy: True이면 ColumnArray, False이면 list로 변환
+    
+    Returns:
+        .col 파일을 모두 읽었으면 True (다른 쪽에서 파일을 교체하는 중이라 없으면 False)
+    """
+    if not isinstance(data, dict):
+        return True
+    folder = os.path.dirname(json_path)
+    files = {}
+    for keys, _ in COLUMN_FIELDS:
+        parent = _get_path(data, keys[:-1])
+        ref = parent.get(keys[-1]) if isinstance(parent, dict) else None
+        if not is_column_ref(ref):
+            continue
+        name = ref[COLUMN_REF_KEY]
+        if name not in files:
+            try:
+                with open(os.path.join(folder, os.path.basename(name)), 'rb') as f:
+                    files[name] = memoryview(f.read())
+            except OSError:
+                return False
+        typecode = _TYPECODES.get(ref.get('dtype'))
+        if typecode is None:
+            return False
+        start = ref.get('offset', 0)
+        end = start + ref.get('count', 0) * array(typecode).itemsize
+        column = ColumnArray(files[name][start:end], typecode)
+        parent[keys[-1]] = column if lazy else column.tolist()
+    return True
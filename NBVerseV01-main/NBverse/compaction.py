@@ -0,0 +1,334 @@
+"""
+NBverse 저장소 압축(정리) 모듈
+저장할 때마다 새 파일이 생기는 max/min 폴더 구조에서
+같은 텍스트의 중복 파일, 카드 ID별 이전 버전, 보존 기간이 지난 파일, 빈 폴더를 정리합니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set, Tuple
+from .columns import COLUMN_SUFFIX, column_refs, owner_json_name
+
+# 카드 파일 표시 (중복 텍스트 정리 / 보존 기간 대상 아님)
+_CARD = object()
+
+
+def text_key(text: str, metadata: Optional[Dict] = None) -> Tuple[bytes, Optional[str]]:
+    """같은 레코드로 볼 키 (텍스트 해시, metadata.card_type)"""
+    card_type = metadata.get('card_type') if isinstance(metadata, dict) else None
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), card_type
+
+
+class NBverseCompactor:
+    """NBverseStorage 압축 작업 (한 번 실행)
+    
+    - 카드 파일 (metadata.card_id): 카드 ID 인덱스로 폴더(max/min)별 가장 최근에 쓴 파일 하나만 남김
+    - 일반 파일: 같은 숫자 폴더 안에서 text와 metadata.card_type이 같은 파일은 가장 최근 것만 남김
+      (같은 텍스트는 N/B 값이 같아 항상 같은 숫자 폴더에 저장되므로 폴더 하나씩 처리 → 메모리 사용량 일정)
+    - retention_days: 이 기간이 지난 일반 파일 삭제 (카드 파일은 기간과 무관하게 유지, 0이면 사용 안 함)
+    - 최근 min_age_seconds 안에 쓴 파일은 건드리지 않음 (저장/갱신 중인 파일 보호)
+    - 남은 .tmp 파일, 빈 파일, 빈 숫자 폴더 삭제 후 N/B 값 / 카드 ID 인덱스를 다시 씀
+    - 주인 JSON이 없어진 .col 파일과 JSON이 더 이상 참조하지 않는 이전 .col 파일 삭제
+    """
+    
+    def __init__(self, storage, retention_days: float = 0, min_age_seconds: float = 300.0,
+                 dry_run: bool = False):
+        """
+        초기화
+        
+        Args:
+            storage: 정리할 NBverseStorage
+            retention_days: 일반 파일 보존 기간 (일, 0이면 기간으로 삭제하지 않음)
+            min_age_seconds: 이 시간 안에 쓴 파일은 정리하지 않음 (초)
+            dry_run: True이면 삭제하지 않고 결과만 계산
+        """
+        self.storage = storage
+        self.retention_days = retention_days
+        self.min_age_seconds = min_age_seconds
+        self.dry_run = dry_run
+        self.report = {
+            'files_scanned': 0,
+            'duplicate_texts': 0,  # 같은 텍스트의 이전 파일
+            'card_versions': 0,  # 같은 카드 ID의 이전 파일
+            'expired': 0,  # 보존 기간이 지난 파일
+            'temp_files': 0,  # 저장 도중 남은 .tmp 파일
+            'empty_files': 0,
+            'column_files': 0,  # 주인 JSON이 삭제되었거나 참조하지 않는 .col 파일
+            'files_removed': 0,
+            'dirs_removed': 0,
+            'bytes_freed': 0,
+            'inodes_freed': 0,
+            'errors': 0,
+            'elapsed': 0.0,
+            'dry_run': dry_run
+        }
+        self._removed = set()  # 삭제한(dry_run이면 삭제할) 파일 절대 경로
+    
+    def run(self) -> Dict:
+        """압축 실행 후 결과 반환 (삭제한 파일/폴더 수, 확보한 바이트/inode 수)"""
+        start = time.perf_counter()
+        now = time.time()
+        cutoff = now - self.retention_days * 86400 if self.retention_days > 0 else None
+        
+        self._compact_cards(now)
+        for base_dir in (self.storage.max_dir, self.storage.min_dir):
+            if os.path.isdir(base_dir):
+                self._compact_folder(base_dir, now, cutoff)
+        
+        if not self.dry_run and self.report['files_removed']:
+            self._rewrite_indexes()
+        
+        self.report['inodes_freed'] = self.report['files_removed'] + self.report['dirs_removed']
+        self.report['elapsed'] = time.perf_counter() - start
+        return self.report
+    
+    def _compact_cards(self, now: float):
+        """카드 ID별로 폴더마다 가장 최근에 쓴 파일만 남김 (최근에 갱신된 카드는 다음 실행으로 미룸)"""
+        card_index = getattr(self.storage, 'card_index', None)
+        if card_index is None:
+            return
+        folders = [os.path.abspath(d) + os.sep for d in (self.storage.max_dir, self.storage.min_dir)]
+        
+        for card_paths in card_index.items().values():
+            if len(card_paths) <= len(folders):
+                continue
+            by_folder = {}
+            for path in card_paths:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                absolute_path = os.path.abspath(path)
+                folder = next((f for f in folders if absolute_path.startswith(f)), None)
+                by_folder.setdefault(folder, []).append((stat.st_mtime, os.path.basename(path), path, stat.st_size))
+            
+            versions = [v for folder_versions in by_folder.values() for v in folder_versions]
+            if not versions or now - max(v[0] for v in versions) < self.min_age_seconds:
+                continue
+            for folder_versions in by_folder.values():
+                folder_versions.sort(reverse=True)
+                for _, _, path, size in folder_versions[1:]:
+                    self._remove(path, size, 'card_versions')
+    
+    def _compact_folder(self, base_dir: str, now: float, cutoff: Optional[float]):
+        """숫자 폴더를 아래에서부터 순회하며 폴더 하나씩 정리 (비게 된 폴더는 삭제)"""
+        empty_dirs = set()
+        for root, dirs, files in os.walk(base_dir, topdown=False):
+            groups = {}  # (텍스트 해시, card_type) -> [(생성 시각, 파일명, 경로, 크기)]
+            columns = {}  # 주인 JSON 파일명 -> [(.col 파일명, 크기)]
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    self._removed.add(os.path.abspath(path))  # 그 사이에 삭제됨
+                    continue
+                recent = now - stat.st_mtime < self.min_age_seconds
+                
+                if name.endswith('.tmp'):
+                    if not recent:
+                        self._remove(path, stat.st_size, 'temp_files')
+                    continue
+                if name.endswith(COLUMN_SUFFIX):
+                    # .col 파일은 JSON보다 먼저 쓰므로 최근 파일은 주인 JSON이 아직 없을 수 있음
+                    if not recent:
+                        columns.setdefault(owner_json_name(name), []).append((name, stat.st_size))
+                    continue
+                if not name.endswith('.json'):
+                    continue
+                self.report['files_scanned'] += 1
+                if recent:
+                    continue
+                if stat.st_size == 0:
+                    self._remove(path, 0, 'empty_files')
+                    continue
+                
+                key = self._text_key(path)
+                if key is _CARD:
+                    continue
+                created = self._created_at(name, stat.st_mtime)
+                if cutoff is not None and created < cutoff:
+                    self._remove(path, stat.st_size, 'expired')
+                    continue
+                if key is not None:
+                    groups.setdefault(key, []).append((created, name, path, stat.st_size))
+            
+            for versions in groups.values():
+                if len(versions) < 2:
+                    continue
+                versions.sort(reverse=True)
+                for _, _, path, size in versions[1:]:
+                    self._remove(path, size, 'duplicate_texts')
+            
+            self._compact_columns(root, set(files), columns)
+            
+            # 하위 폴더와 파일이 모두 없어진 숫자 폴더 삭제 (max/min 폴더 자체는 유지)
+            remaining = sum(1 for name in files if os.path.abspath(os.path.join(root, name)) not in self._removed)
+            if root == base_dir or remaining or any(os.path.join(root, d) not in empty_dirs for d in dirs):
+                continue
+            if not self.dry_run:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    continue  # 그 사이에 새 파일이 저장됨
+            empty_dirs.add(root)
+            empty_dirs.difference_update(os.path.join(root, d) for d in dirs)
+            self.report['dirs_removed'] += 1
+    
+    def _compact_columns(self, root: str, names: Set[str], columns: Dict):
+        """주인 JSON이 없거나 삭제된 .col 파일, JSON이 참조하지 않는 이전 .col 파일 삭제"""
+        for owner, column_files in columns.items():
+            owner_path = os.path.abspath(os.path.join(root, owner)) if owner else None
+            if owner_path is None or owner not in names or owner_path in self._removed:
+                keep = set()
+            elif len(column_files) > 1:
+                # 갱신 도중 중단되어 이전 .col 파일이 남은 경우 (보통은 JSON 하나에 .col 파일 하나)
+                keep = self._column_refs(owner_path)
+                if keep is None:
+                    continue
+            else:
+                continue
+            for name, size in column_files:
+                if name not in keep:
+                    self._remove(os.path.join(root, name), size, 'column_files')
+    
+    def _column_refs(self, path: str) -> Optional[Set[str]]:
+        """JSON이 참조하는 .col 파일명 (읽지 못하면 None)"""
+        try:
+            with open(path, 'rb') as f:
+                return column_refs(json.loads(f.read()))
+        except (OSError, ValueError):
+            self.report['errors'] += 1
+            return None
+    
+    def _text_key(self, path: str):
+        """중복 판단 키 (카드 파일이면 _CARD, 텍스트가 없거나 읽지 못하면 None)"""
+        try:
+            with open(path, 'rb') as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            self.report['errors'] += 1
+            return None
+        if not isinstance(data, dict):
+            return None
+        metadata = data.get('metadata') if isinstance(data.get('metadata'), dict) else {}
+        if metadata.get('card_id'):
+            return _CARD
+        text = data.get('text')
+        if not isinstance(text, str) or not text:
+            return None
+        return text_key(text, metadata)
+    
+    @staticmethod
+    def _created_at(filename: str, mtime: float) -> float:
+        """파일명('<값>_<YYYYmmdd_HHMMSS_ffffff>.json')의 저장 시각 (형식이 다르면 수정 시각)"""
+        stem = filename[:-len('.json')]
+        parts = stem.split('_')
+        if len(parts) >= 4:
+            try:
+                return datetime.strptime('_'.join(parts[-3:]), "%Y%m%d_%H%M%S_%f").timestamp()
+            except ValueError:
+                pass
+        return mtime
+    
+    def _remove(self, path: str, size: int, reason: str) -> bool:
+        """파일 삭제 (dry_run이면 집계만)"""
+        if not self.dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                self._removed.add(os.path.abspath(path))
+                return True
+            except OSError as e:
+                print(f"⚠️ NBverse 압축 중 파일 삭제 오류 ({path}): {e}")
+                self.report['errors'] += 1
+                return False
+        self._removed.add(os.path.abspath(path))
+        self.report[reason] += 1
+        self.report['files_removed'] += 1
+        self.report['bytes_freed'] += size
+        return True
+    
+    def _rewrite_indexes(self):
+        """삭제한 파일을 인덱스에서 제거 (N/B 값 인덱스는 파일명, metadata 인덱스는 파일 내용으로 다시 만들고 카드 ID 인덱스는 남은 경로로 다시 씀)"""
+        indexes = [getattr(self.storage, 'max_index', None), getattr(self.storage, 'min_index', None)]
+        indexes.extend(getattr(self.storage, 'metadata_indexes', {}).values())
+        for index in indexes:
+            if index is not None and os.path.exists(index.index_path):
+                index.rebuild()
+        card_index = getattr(self.storage, 'card_index', None)
+        if card_index is not None:
+            card_index.compact()
+
+
+def format_compaction_report(report: Dict) -> str:
+    """압축 결과 한 줄 요약"""
+    prefix = "NBverse 압축 (시험 실행)" if report.get('dry_run') else "NBverse 압축"
+    return (f"{prefix}: 파일 {report['files_removed']:,}개 / 폴더 {report['dirs_removed']:,}개 삭제, "
+            f"{report['bytes_freed'] / (1024 * 1024):.1f}MB, inode {report['inodes_freed']:,}개 확보 "
+            f"(중복 텍스트 {report['duplicate_texts']:,}, 카드 이전 버전 {report['card_versions']:,}, "
+            f"보존 기간 경과 {report['expired']:,}, 열 파일 {report.get('column_files', 0):,}, 확인한 파일 {report['files_scanned']:,}개, "
+            f"{report['elapsed']:.1f}초)")
+
+
+class NBverseCompactionScheduler:
+    """주기적으로 storage.compact()를 실행하는 백그라운드 스레드"""
+    
+    def __init__(self, storage, interval_seconds: float, initial_delay_seconds: float = 300.0,
+                 on_report: Optional[Callable[[Dict], None]] = None, **options):
+        """
+        초기화
+        
+        Args:
+            storage: 정리할 저장소 (compact() 메서드 필요)
+            interval_seconds: 실행 주기 (초)
+            initial_delay_seconds: 시작 후 첫 실행까지 대기 시간 (초, 시작 직후 부하 방지)
+            on_report: 실행 결과 콜백 (결과 딕셔너리)
+            **options: storage.compact()에 전달할 옵션 (retention_days, min_age_seconds, dry_run)
+        """
+        self.storage = storage
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self.on_report = on_report
+        self.options = options
+        self.last_report = None
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """백그라운드 실행 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="NBverseCompaction", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """백그라운드 실행 중지 (진행 중인 압축은 끝날 때까지 대기)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def run_now(self) -> Optional[Dict]:
+        """지금 한 번 실행"""
+        try:
+            report = self.storage.compact(**self.options)
+        except Exception as e:
+            print(f"⚠️ NBverse 압축 오류: {e}")
+            return None
+        self.last_report = report
+        print(f"🗑️ {format_compaction_report(report)}")
+        if self.on_report:
+            self.on_report(report)
+        return report
+    
+    def _run_loop(self):
+        delay = self.initial_delay_seconds
+        while not self._stop_event.wait(delay):
+            self.run_now()
+            delay = self.interval_seconds
@@ -2,23 +2,86 @@
 문자열을 N/B 값으로 변환하는 모듈
 """
 
-from .calculator import NBValueCalculator
+import os
+import atexit
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from .calculator import NBValueCalculator, BACKEND_PYTHON
+from .cache import NBResultCache
 from .utils import word_nb_unicode_format
 
 
+# 배치 계산 시 청크당 최소 문자열 수 (프로세스 간 전송 오버헤드 완화)
+_MIN_BATCH_CHUNK_SIZE = 4
+
+# 배치 계산용 프로세스 풀 (처음 쓸 때 CPU 수만큼 만들고 요청 간에 재사용, 종료 시 정리)
+# 배치마다 동시에 넘기는 청크 수를 workers개로 제한하므로 workers가 실제 병렬 수의 상한
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """공유 프로세스 풀 반환 (없으면 생성)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """고장 난 풀 폐기 (다음 배치에서 새로 생성)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_process_pool():
+    """공유 프로세스 풀 종료 (프로세스 종료 시 자동 호출)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+atexit.register(shutdown_process_pool)
+
+
+def _calculate_pair_chunk(texts: List[str], bit: float, decimal_places: int, backend: str) -> list:
+    """문자열 묶음의 calculate_bit_pair 결과 계산 (프로세스 풀 작업 함수)
+    
+    Returns:
+        문자열별 (순방향, 역방향) 결과 목록
+    """
+    calculator = NBValueCalculator(decimal_places=decimal_places, backend=backend)
+    return [calculator.calculate_bit_pair(word_nb_unicode_format(text), bit) for text in texts]
+
+
 class TextToNBConverter:
     """문자열을 N/B 값으로 변환하는 클래스"""
     
-    def __init__(self, bit: float = 5.5, decimal_places: int = 10):
+    def __init__(self, bit: float = 5.5, decimal_places: int = 10, backend: str = BACKEND_PYTHON,
+                 cache: Optional[NBResultCache] = None):
         """초기화
         
         Args:
             bit: 기본 비트 값 (기본값: 5.5)
             decimal_places: 소수점 자리수 (기본값: 10)
+            backend: 계산 백엔드 ('python' 또는 'numpy', 기본값: 'python')
+            cache: N/B 결과 캐시 (선택사항, 같은 문자열 재계산 방지)
         """
-        self.calculator = NBValueCalculator(decimal_places=decimal_places)
+        self.calculator = NBValueCalculator(decimal_places=decimal_places, backend=backend)
         self.bit = bit
         self.decimal_places = decimal_places
+        self.cache = cache
     
     def text_to_nb(self, text: str) -> dict:
         """문자열을 N/B 값으로 변환
@@ -50,9 +113,15 @@ class TextToNBConverter:
                 'unicodeArray': unicode_array
             }
         
-        # N/B 값 계산
-        bit_max = self.calculator.bit_max_nb(unicode_array, self.bit)
-        bit_min = self.calculator.bit_min_nb(unicode_array, self.bit)
+        # N/B 값 계산 (순방향/역방향을 한 번의 구간 계산으로 처리)
+        if self.cache is not None:
+            key = NBResultCache.make_key(text, self.bit, self.decimal_places)
+            forward, backward = self.cache.get_or_compute(
+                key, lambda: self.calculator.calculate_bit_pair(unicode_array, self.bit)
+            )
+            bit_max, bit_min = self.calculator.resolve_bit_pair(forward, backward)
+        else:
+            bit_max, bit_min = self.calculator.bit_max_min_nb(unicode_array, self.bit)
         
         return {
             'bitMax': bit_max,
@@ -60,6 +129,108 @@ class TextToNBConverter:
             'unicodeArray': unicode_array
         }
     
+    def text_to_nb_batch(self, texts: List[str], workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None) -> List[dict]:
+        """여러 문자열을 N/B 값으로 변환 (프로세스 풀 병렬 계산)
+        
+        calculate_bit_pair 계산만 워커 프로세스에서 수행하고,
+        SUPER_BIT 보정은 입력 순서대로 적용하므로 text_to_nb()를 순서대로 호출한 것과 같은 결과를 반환합니다.
+        
+        Args:
+            texts: 변환할 문자열 목록
+            workers: 병렬 계산 수 (기본값: CPU 수, CPU 수를 넘지 않음, 1 이하이면 현재 프로세스에서 계산)
+                     병렬 계산은 모듈 공유 프로세스 풀을 재사용합니다.
+            chunk_size: 워커에 한 번에 보낼 문자열 수 (기본값: 워커당 약 4개 청크가 되도록 자동 계산)
+        
+        Returns:
+            문자열별 text_to_nb() 결과 목록 (입력 순서 유지)
+        """
+        texts = list(texts)
+        unicode_arrays = [word_nb_unicode_format(text) if text else [] for text in texts]
+        pairs = [None] * len(texts)
+        
+        # 캐시 조회 후 계산이 필요한 문자열만 모으기 (같은 문자열은 한 번만 계산)
+        keys = {}
+        pending = {}
+        for index, text in enumerate(texts):
+            if len(unicode_arrays[index]) < 2:
+                continue
+            if self.cache is not None:
+                key = NBResultCache.make_key(text, self.bit, self.decimal_places)
+                keys[index] = key
+                cached = self.cache.get(key)
+                if cached is not None:
+                    pairs[index] = cached
+                    continue
+            pending.setdefault(text, []).append(index)
+        
+        if pending:
+            pending_texts = list(pending)
+            results = self._calculate_pairs(pending_texts, workers, chunk_size)
+            for text, pair in zip(pending_texts, results):
+                for index in pending[text]:
+                    pairs[index] = pair
+                if self.cache is not None:
+                    self.cache.put(keys[pending[text][0]], pair)
+        
+        # SUPER_BIT 보정은 입력 순서대로 적용
+        batch_results = []
+        for index, unicode_array in enumerate(unicode_arrays):
+            if pairs[index] is None:
+                bit_max, bit_min = 0.0, 0.0
+            else:
+                bit_max, bit_min = self.calculator.resolve_bit_pair(*pairs[index])
+            batch_results.append({
+                'bitMax': bit_max,
+                'bitMin': bit_min,
+                'unicodeArray': unicode_array
+            })
+        return batch_results
+    
+    def _calculate_pairs(self, texts: List[str], workers: Optional[int], chunk_size: Optional[int]) -> list:
+        """문자열 목록의 calculate_bit_pair 결과 계산 (가능하면 프로세스 풀 사용)"""
+        cpu_count = os.cpu_count() or 1
+        if workers is None:
+            workers = cpu_count
+        workers = min(workers, cpu_count, len(texts))
+        
+        if workers > 1:
+            if not chunk_size:
+                chunk_size = max(_MIN_BATCH_CHUNK_SIZE, -(-len(texts) // (workers * 4)))
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            workers = min(workers, len(chunks))
+        
+        if workers <= 1:
+            return [self.calculator.calculate_bit_pair(word_nb_unicode_format(text), self.bit) for text in texts]
+        
+        pool = None
+        pending = deque()
+        try:
+            pool = _get_process_pool()
+            # 청크를 workers개씩만 넘기고, 앞 청크가 끝날 때마다 다음 청크를 넘김 (입력 순서대로 결과 수집)
+            next_chunks = iter(chunks)
+            for chunk in islice(next_chunks, workers):
+                pending.append(pool.submit(_calculate_pair_chunk, chunk, self.bit, self.decimal_places,
+                                           self.calculator.backend))
+            results = []
+            while pending:
+                results.extend(pending.popleft().result())
+                for chunk in islice(next_chunks, 1):
+                    pending.append(pool.submit(_calculate_pair_chunk, chunk, self.bit, self.decimal_places,
+                                               self.calculator.backend))
+            return results
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            if pool is not None and isinstance(e, (BrokenProcessPool, RuntimeError)):
+                _discard_process_pool(pool)
+            print(f"⚠️ N/B 배치 병렬 계산 실패, 현재 프로세스에서 계산합니다: {e}")
+            return [self.calculator.calculate_bit_pair(word_nb_unicode_format(text), self.bit) for text in texts]
+    
+    def cache_stats(self) -> Optional[dict]:
+        """N/B 결과 캐시 통계 (캐시를 사용하지 않으면 None)"""
+        return self.cache.stats() if self.cache is not None else None
+    
     def calculate_sentence_bits(self, sentence: str) -> dict:
         """문장의 N/B 값 계산 (별칭 함수)
         
@@ -0,0 +1,566 @@
+"""
+NBverse 인덱스 저장소 모듈
+max/min 숫자 폴더 구조 대신 단일 SQLite 파일에 레코드를 추가 기록하고
+bitMax/bitMin 정렬 인덱스로 검색합니다.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .compaction import text_key
+from .columns import resolve_columns
+from .converter import TextToNBConverter
+from .value_index import NBMetadataIndex
+
+
+class NBverseIndexedStorage:
+    """NBverse 인덱스 저장소 클래스 (NBverseStorage와 같은 공개 API)
+    
+    - 레코드 로그: 저장할 때마다 레코드를 한 행 추가 (파일/디렉토리 생성 없음)
+    - 정렬 인덱스: nb_max, nb_min 컬럼 B-tree 인덱스로 값/범위 검색
+    - 경로: '<db 파일>#max/<레코드 id>' 형식의 가상 경로 (load_from_path로 로드)
+      기존 NBverseStorage JSON 파일 경로도 load_from_path로 그대로 읽을 수 있습니다.
+    """
+    
+    DB_FILE_NAME = "nbverse.sqlite3"
+    PATH_SEPARATOR = "#"
+    
+    # 정렬 인덱스를 유지할 metadata 숫자 필드 (iter_metadata_range)
+    METADATA_INDEX_FIELDS = ('nb_max', 'nb_min')
+    
+    def __init__(self, data_dir: str = "novel_ai/v1.0.7/data", decimal_places: int = 10,
+                 converter: Optional[TextToNBConverter] = None):
+        """
+        초기화
+        
+        Args:
+            data_dir: 데이터 디렉토리 경로
+            decimal_places: 소수점 자리수 (기본값: 10)
+            converter: 텍스트 변환기 (선택사항, 결과 캐시를 공유할 때 지정)
+        """
+        self.data_dir = data_dir
+        self.decimal_places = decimal_places
+        self.db_path = os.path.join(data_dir, self.DB_FILE_NAME)
+        
+        # 기존 폴더 구조 경로 (이전 데이터 가져오기용, 이 저장소는 폴더에 저장하지 않으므로 max_dir/min_dir이 없음)
+        self.legacy_max_dir = os.path.join(data_dir, "max")
+        self.legacy_min_dir = os.path.join(data_dir, "min")
+        
+        os.makedirs(data_dir, exist_ok=True)
+        
+        self.converter = converter or TextToNBConverter(decimal_places=decimal_places)
+        self._write_lock = threading.Lock()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self):
+        """저장소 연결 (정상 종료 시 커밋 후 닫음)"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        """테이블과 정렬 인덱스 생성"""
+        with self._write_lock, self._connect() as conn:
+            # WAL: 쓰기 중에도 읽기 가능
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "nb_max REAL NOT NULL, nb_min REAL NOT NULL, "
+                "calculated_at TEXT NOT NULL, card_id TEXT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_nb_max ON records (nb_max)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_nb_min ON records (nb_min)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_card_id ON records (card_id)")
+            
+            # metadata N/B 값 식 인덱스 (JSON1 확장이 없으면 iter_metadata_range가 전체 레코드를 읽음)
+            try:
+                for field in self.METADATA_INDEX_FIELDS:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_records_metadata_{field} "
+                                 f"ON records ({self._metadata_expr(field)})")
+                self._json_available = True
+            except sqlite3.OperationalError:
+                self._json_available = False
+    
+    @staticmethod
+    def _metadata_expr(field: str) -> str:
+        return f"json_extract(data, '$.metadata.{field}')"
+    
+    def _make_path(self, record_id: int, folder_type: str) -> str:
+        return f"{self.db_path}{self.PATH_SEPARATOR}{folder_type}/{record_id}"
+    
+    def _parse_path(self, file_path: str) -> Optional[int]:
+        """가상 경로에서 레코드 id 추출 (이 저장소 경로가 아니면 None)"""
+        db_path, separator, record_ref = file_path.rpartition(self.PATH_SEPARATOR)
+        if not separator or os.path.normpath(db_path) != os.path.normpath(self.db_path):
+            return None
+        try:
+            return int(record_ref.rsplit('/', 1)[-1])
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _card_id_of(data: Dict) -> Optional[str]:
+        metadata = data.get('metadata')
+        return metadata.get('card_id') if isinstance(metadata, dict) else None
+    
+    def _append(self, data: Dict) -> Dict[str, str]:
+        """레코드 추가 후 max/min 가상 경로 반환"""
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with self._write_lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO records (nb_max, nb_min, calculated_at, card_id, data) VALUES (?, ?, ?, ?, ?)",
+                (data['nb']['max'], data['nb']['min'], data['calculated_at'], self._card_id_of(data), payload)
+            )
+            record_id = cursor.lastrowid
+        
+        return {
+            'max_path': self._make_path(record_id, "max"),
+            'min_path': self._make_path(record_id, "min"),
+            'bitMax': data['nb']['max'],
+            'bitMin': data['nb']['min']
+        }
+    
+    def save_text(self, text: str, metadata: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        텍스트를 N/B 값으로 변환하여 저장
+        
+        Args:
+            text: 저장할 텍스트
+            metadata: 추가 메타데이터 (선택사항)
+        
+        Returns:
+            저장된 경로 정보
+            {
+                'max_path': str,
+                'min_path': str,
+                'bitMax': float,
+                'bitMin': float
+            }
+        """
+        result = self.converter.text_to_nb(text)
+        saved = self.save_precomputed(text, result['bitMax'], result['bitMin'],
+                                      unicode_array=result['unicodeArray'], metadata=metadata)
+        saved.pop('duplicate')
+        return saved
+    
+    def save_precomputed(self, text: str, bit_max: float, bit_min: float,
+                         unicode_array: Optional[List] = None,
+                         metadata: Optional[Dict] = None,
+                         skip_duplicate: bool = False) -> Dict:
+        """
+        이미 계산한 N/B 값으로 텍스트 저장 (text_to_nb를 다시 계산하지 않음)
+        
+        Args:
+            text: 저장할 텍스트
+            bit_max: text_to_nb 결과 bitMax
+            bit_min: text_to_nb 결과 bitMin
+            unicode_array: text_to_nb 결과 unicodeArray (선택사항, 없으면 저장하지 않음)
+            metadata: 추가 메타데이터 (선택사항)
+            skip_duplicate: True이면 같은 텍스트(+ metadata.card_type)가 이미 저장되어 있을 때 새로 저장하지 않음
+        
+        Returns:
+            저장된 경로 정보 (duplicate가 True이면 이미 저장된 레코드 경로)
+        """
+        # 설정된 소수점 자릿수로 반올림
+        bit_max = round(bit_max, self.decimal_places)
+        bit_min = round(bit_min, self.decimal_places)
+        
+        if skip_duplicate:
+            record_id = self._find_text(text, bit_max, bit_min, metadata)
+            if record_id is not None:
+                return {
+                    'max_path': self._make_path(record_id, "max"),
+                    'min_path': self._make_path(record_id, "min"),
+                    'bitMax': bit_max,
+                    'bitMin': bit_min,
+                    'duplicate': True
+                }
+        
+        nb = {'max': bit_max, 'min': bit_min}
+        if unicode_array is not None:
+            nb['unicodeArray'] = unicode_array
+        data = {
+            'text': text,
+            'nb': nb,
+            'calculated_at': datetime.now().isoformat(),
+            'version': 'bitCalculation.v.0.2',
+            'decimal_places': self.decimal_places
+        }
+        
+        if metadata:
+            data['metadata'] = metadata
+        
+        saved = self._append(data)
+        saved['duplicate'] = False
+        return saved
+    
+    def _find_text(self, text: str, bit_max: float, bit_min: float, metadata: Optional[Dict]) -> Optional[int]:
+        """같은 텍스트(+ metadata.card_type)가 저장된 가장 최근 레코드 id (N/B 값 인덱스로 후보만 확인)"""
+        key = text_key(text, metadata)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM records WHERE nb_max = ? AND nb_min = ? ORDER BY id DESC",
+                (bit_max, bit_min)
+            ).fetchall()
+        for record_id, payload in rows:
+            try:
+                data = json.loads(payload)
+            except ValueError:
+                continue
+            if data.get('text') == text and text_key(text, data.get('metadata')) == key:
+                return record_id
+        return None
+    
+    def save_nb_values(self, bit_max: float, bit_min: float,
+                      text: Optional[str] = None,
+                      metadata: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        N/B 값(max/min)을 직접 저장
+        
+        Args:
+            bit_max: bitMax 값
+            bit_min: bitMin 값
+            text: 원본 텍스트 (선택사항)
+            metadata: 추가 메타데이터 (선택사항)
+        
+        Returns:
+            저장된 경로 정보
+        """
+        data = {
+            'nb': {
+                'max': round(bit_max, self.decimal_places),
+                'min': round(bit_min, self.decimal_places)
+            },
+            'calculated_at': datetime.now().isoformat(),
+            'version': 'bitCalculation.v.0.2',
+            'decimal_places': self.decimal_places
+        }
+        
+        if text:
+            data['text'] = text
+        
+        if metadata:
+            data['metadata'] = metadata
+        
+        return self._append(data)
+    
+    def load_from_path(self, file_path: str) -> Optional[Dict]:
+        """
+        경로에서 데이터 로드 (가상 경로 또는 기존 JSON 파일 경로)
+        
+        Args:
+            file_path: save_text/save_nb_values가 반환한 경로 또는 기존 파일 경로
+        
+        Returns:
+            로드된 데이터 또는 None
+        """
+        record_id = self._parse_path(file_path)
+        if record_id is None:
+            return self._load_legacy_file(file_path)
+        
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT data FROM records WHERE id = ?", (record_id,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"⚠️ 레코드 로드 오류 ({file_path}): {e}")
+            return None
+    
+    def save_to_path(self, file_path: str, data: Dict):
+        """
+        기존 레코드 내용을 갱신 (N/B 값 인덱스는 유지)
+        
+        Args:
+            file_path: 갱신할 레코드 경로
+            data: 저장할 데이터
+        """
+        record_id = self._parse_path(file_path)
+        if record_id is None:
+            raise ValueError(f"이 저장소의 레코드 경로가 아닙니다: {file_path}")
+        
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with self._write_lock, self._connect() as conn:
+            conn.execute("UPDATE records SET card_id = ?, data = ? WHERE id = ?",
+                         (self._card_id_of(data), payload, record_id))
+    
+    def find_card_paths(self, card_id: str) -> List[str]:
+        """
+        metadata.card_id로 저장된 레코드 경로 검색
+        
+        Args:
+            card_id: 카드 ID
+        
+        Returns:
+            레코드 경로 리스트 (레코드당 하나)
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id FROM records WHERE card_id = ? ORDER BY id", (card_id,)).fetchall()
+        return [self._make_path(record_id, "max") for record_id, in rows]
+    
+    def remove_card(self, card_id: str) -> int:
+        """
+        metadata.card_id로 저장된 레코드 삭제
+        
+        Args:
+            card_id: 카드 ID
+        
+        Returns:
+            삭제된 레코드 수
+        """
+        with self._write_lock, self._connect() as conn:
+            return conn.execute("DELETE FROM records WHERE card_id = ?", (card_id,)).rowcount
+    
+    def _load_legacy_file(self, file_path: str) -> Optional[Dict]:
+        """기존 폴더 구조 JSON 파일 로드"""
+        try:
+            if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+                return None
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # NBverseStorage가 .col 파일에 저장한 배열은 list로 변환
+            return data if resolve_columns(data, file_path) else None
+        except Exception as e:
+            print(f"⚠️ 파일 로드 오류 ({file_path}): {e}")
+            return None
+    
+    def _query(self, folder_type: str, low: float, high: float, limit: int,
+               include_low: bool = True, include_high: bool = True,
+               newest_first: bool = False) -> List[Dict]:
+        """정렬 인덱스로 low <= 값 <= high 레코드 검색 (include_low/include_high=False이면 경계 제외)"""
+        column = "nb_max" if folder_type == "max" else "nb_min"
+        low_operator = ">=" if include_low else ">"
+        high_operator = "<=" if include_high else "<"
+        order = "calculated_at DESC" if newest_first else column
+        sql = (f"SELECT id, data FROM records WHERE {column} {low_operator} ? AND {column} {high_operator} ? "
+               f"ORDER BY {order} LIMIT ?")
+        
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(sql, (low, high, limit)).fetchall()
+        except Exception as e:
+            print(f"⚠️ 레코드 검색 오류: {e}")
+            return []
+        
+        return [{'path': self._make_path(record_id, folder_type), 'data': json.loads(data)}
+                for record_id, data in rows]
+    
+    def find_by_nb_value(self, nb_value: float, folder_type: str = "max",
+                        limit: int = 10) -> List[Dict]:
+        """
+        N/B 값으로 검색 (소수점 6자리까지 같은 값)
+        
+        Args:
+            nb_value: 검색할 N/B 값
+            folder_type: "max" 또는 "min"
+            limit: 최대 반환 개수
+        
+        Returns:
+            검색된 데이터 리스트 (최신순)
+        """
+        nb_int = int(abs(nb_value) * 1000000)
+        low = nb_int / 1000000.0
+        high = (nb_int + 1) / 1000000.0
+        if nb_value < 0:
+            # 음수는 절댓값 기준 같은 구간 (-high, -low]
+            return self._query(folder_type, -high, -low, limit, include_low=False, newest_first=True)
+        return self._query(folder_type, low, high, limit, include_high=False, newest_first=True)
+    
+    def find_similar_by_nb_range(self, nb_max: float, nb_min: float,
+                                 range_threshold: float = 0.5, limit: int = 50) -> List[Dict]:
+        """
+        N/B 값 범위로 검색 (유사도 검색용)
+        
+        Args:
+            nb_max: bitMax 값
+            nb_min: bitMin 값
+            range_threshold: 범위 임계값 (기본값: 0.5)
+            limit: 최대 반환 개수
+        
+        Returns:
+            검색된 데이터 리스트 (bitMax 범위 결과 → bitMin 범위 결과 순서)
+        """
+        max_results = self._query("max", nb_max - range_threshold, nb_max + range_threshold, limit)
+        min_results = self._query("min", nb_min - range_threshold, nb_min + range_threshold, limit)
+        
+        # 중복 제거 (같은 레코드가 max/min 범위에 모두 포함될 수 있음)
+        results = []
+        seen_ids = set()
+        for result in max_results + min_results:
+            record_id = self._parse_path(result['path'])
+            if record_id not in seen_ids:
+                seen_ids.add(record_id)
+                results.append(result)
+        
+        return results[:limit]
+    
+    def iter_nb_range(self, low: float, high: float, folder_type: str = "max", batch_size: int = 200):
+        """
+        정렬 인덱스로 low <= N/B 값 <= high 인 데이터를 값 오름차순으로 순회
+        (조건을 추가로 확인하면서 필요한 만큼만 읽을 때 사용)
+        
+        Args:
+            low: 최솟값
+            high: 최댓값
+            folder_type: "max" 또는 "min"
+            batch_size: 한 번에 읽을 레코드 수
+        
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        column = "nb_max" if folder_type == "max" else "nb_min"
+        first_sql = (f"SELECT id, {column}, data FROM records WHERE {column} >= ? AND {column} <= ? "
+                     f"ORDER BY {column}, id LIMIT ?")
+        next_sql = (f"SELECT id, {column}, data FROM records "
+                    f"WHERE {column} <= ? AND ({column} > ? OR ({column} = ? AND id > ?)) "
+                    f"ORDER BY {column}, id LIMIT ?")
+        
+        # (값, id) 기준으로 다음 묶음을 읽음 (순회 중에는 연결을 유지하지 않음)
+        last = None
+        while True:
+            with self._connect() as conn:
+                if last is None:
+                    rows = conn.execute(first_sql, (low, high, batch_size)).fetchall()
+                else:
+                    rows = conn.execute(next_sql, (high, last[1], last[1], last[0], batch_size)).fetchall()
+            
+            for record_id, _, data in rows:
+                yield {'path': self._make_path(record_id, folder_type), 'data': json.loads(data)}
+            
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][:2]
+    
+    def iter_metadata_range(self, field: str, low: float, high: float, batch_size: int = 200):
+        """
+        metadata 숫자 필드 인덱스로 low <= metadata[field] <= high 인 데이터를 값 오름차순으로 순회
+        (save_text로 저장한 카드처럼 저장 N/B 값과 metadata N/B 값이 다른 레코드도 찾음)
+        
+        Args:
+            field: METADATA_INDEX_FIELDS 중 하나 ('nb_max', 'nb_min')
+            low: 최솟값
+            high: 최댓값
+            batch_size: 한 번에 읽을 레코드 수
+        
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        if field not in self.METADATA_INDEX_FIELDS:
+            raise KeyError(field)
+        
+        if not self._json_available:
+            # JSON1 확장 없음: 전체 레코드에서 골라서 정렬
+            matches = []
+            with self._connect() as conn:
+                for record_id, data in conn.execute("SELECT id, data FROM records"):
+                    data = json.loads(data)
+                    value = NBMetadataIndex.metadata_value(data.get('metadata'), field)
+                    if value is not None and low <= value <= high:
+                        matches.append((value, record_id, data))
+            matches.sort(key=lambda match: match[:2])
+            for _, record_id, data in matches:
+                yield {'path': self._make_path(record_id, "max"), 'data': data}
+            return
+        
+        expr = self._metadata_expr(field)
+        first_sql = (f"SELECT id, {expr}, data FROM records WHERE {expr} >= ? AND {expr} <= ? "
+                     f"ORDER BY {expr}, id LIMIT ?")
+        next_sql = (f"SELECT id, {expr}, data FROM records "
+                    f"WHERE {expr} <= ? AND ({expr} > ? OR ({expr} = ? AND id > ?)) "
+                    f"ORDER BY {expr}, id LIMIT ?")
+        
+        # (값, id) 기준으로 다음 묶음을 읽음 (순회 중에는 연결을 유지하지 않음)
+        last = None
+        while True:
+            with self._connect() as conn:
+                if last is None:
+                    rows = conn.execute(first_sql, (low, high, batch_size)).fetchall()
+                else:
+                    rows = conn.execute(next_sql, (high, last[1], last[1], last[0], batch_size)).fetchall()
+            
+            for record_id, value, data in rows:
+                # 문자열로 저장된 값은 건너뜀 (SQLite에서 문자열은 모든 숫자보다 큼)
+                if isinstance(value, (int, float)):
+                    yield {'path': self._make_path(record_id, "max"), 'data': json.loads(data)}
+            
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][:2]
+    
+    def iter_records(self, folder_type: str = "max", batch_size: int = 200):
+        """
+        저장된 모든 레코드를 저장 순서대로 순회 (폴더 구조 저장소의 max/min 폴더 순회 대신 사용)
+        
+        Args:
+            folder_type: 반환할 경로 종류 ("max" 또는 "min")
+            batch_size: 한 번에 읽을 레코드 수
+        
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT id, data FROM records WHERE id > ? ORDER BY id LIMIT ?",
+                                    (last_id, batch_size)).fetchall()
+            
+            for record_id, data in rows:
+                yield {'path': self._make_path(record_id, folder_type), 'data': json.loads(data)}
+            
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+    
+    def count(self) -> int:
+        """저장된 레코드 수"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    
+    def import_from_directory(self, source_dir: Optional[str] = None) -> int:
+        """
+        기존 NBverseStorage 폴더 구조의 데이터를 가져오기
+        (같은 데이터가 max/min 폴더에 모두 있으므로 max 폴더만 읽음)
+        
+        Args:
+            source_dir: 기존 데이터 디렉토리 (기본값: 현재 data_dir)
+        
+        Returns:
+            가져온 레코드 수
+        """
+        max_dir = os.path.join(source_dir, "max") if source_dir else self.legacy_max_dir
+        if not os.path.isdir(max_dir):
+            return 0
+        
+        rows = []
+        for root, _, files in os.walk(max_dir):
+            for filename in files:
+                if not filename.endswith('.json'):
+                    continue
+                data = self._load_legacy_file(os.path.join(root, filename))
+                nb = data.get('nb') if isinstance(data, dict) else None
+                if not isinstance(nb, dict) or nb.get('max') is None or nb.get('min') is None:
+                    continue
+                rows.append((
+                    float(nb['max']), float(nb['min']),
+                    data.get('calculated_at', ''),
+                    self._card_id_of(data),
+                    json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                ))
+        
+        # 저장 시간 순서대로 추가
+        rows.sort(key=lambda row: row[2])
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO records (nb_max, nb_min, calculated_at, card_id, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        
+        return len(rows)
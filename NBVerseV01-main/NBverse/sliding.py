@@ -0,0 +1,243 @@
+"""
+슬라이딩 윈도우 N/B 계산 모듈
+가격 스트림처럼 앞쪽 문자가 빠지고 뒤쪽 문자가 추가되는 입력에서
+구간(band) 구조와 값별 NB50 기여도를 유지하여 N/B 값을 빠르게 다시 계산합니다.
+"""
+
+from collections import Counter, deque
+from typing import Iterable, Optional
+
+from .calculator import NBValueCalculator
+from .cache import NBResultCache
+from .utils import word_nb_unicode_format
+
+
+class SlidingNBCalculator:
+    """슬라이딩 윈도우 N/B 계산 클래스 (NBValueCalculator.calculate_bit_pair와 동일한 결과)
+
+    - 모든 값이 0 이상이면 구간 구조는 (최솟값, 최댓값, 길이)로만 결정됩니다.
+      구간 배열을 만들지 않고 값별 첫 포함 구간을 이진 탐색으로 구해 기여도를 캐시합니다.
+    - 윈도우에 값이 추가/제거되어도 최솟값/최댓값/길이가 그대로면 캐시된 기여도를 재사용하고,
+      바뀌면 기여도 캐시만 다시 계산합니다 (값 종류 수 × log(구간 수)).
+    - NB50 합산은 원본과 같은 순서로 더해 비트 단위로 동일한 결과를 유지합니다.
+    - 음수 값이 있으면 행마다 증분이 달라지므로 calculate_bit_pair로 전체 재계산합니다.
+    - text_to_nb()는 새 문자열이 현재 윈도우 뒷부분에서 이어지면 앞쪽 제거 + 뒤쪽 추가만 합니다.
+    """
+
+    def __init__(self, bit: float = 5.5, decimal_places: int = 10, max_length: Optional[int] = None,
+                 calculator: Optional[NBValueCalculator] = None, cache: Optional[NBResultCache] = None):
+        """
+        초기화
+
+        Args:
+            bit: 기본 비트 값 (기본값: 5.5)
+            decimal_places: 소수점 자리수 (기본값: 10)
+            max_length: 윈도우 최대 길이 (선택사항, 초과하면 앞쪽부터 제거)
+            calculator: 사용할 계산기 (선택사항, 변환기의 계산기를 주면 SUPER_BIT 상태를 공유)
+            cache: text_to_nb() 결과 캐시 (선택사항, 변환기와 같은 키/값 형식)
+        """
+        self.calculator = calculator or NBValueCalculator(decimal_places=decimal_places)
+        self.bit = bit
+        self.decimal_places = decimal_places
+        self.max_length = max_length
+        self.cache = cache
+
+        self._values = deque()
+        self._counts = Counter()
+
+        # 구간 구조 (최솟값, 최댓값, 길이)와 값별 (순방향, 역방향) 기여도 캐시
+        self._band_key = None
+        self._increment = 0.0
+        self._total_count = 0
+        self._contributions = {}
+
+        # 통계
+        self.full_recomputes = 0
+        self.incremental_updates = 0
+        self.window_slides = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def values(self) -> list:
+        """현재 윈도우 값 목록"""
+        return list(self._values)
+
+    def reset(self, values: Iterable = ()):
+        """윈도우를 주어진 값으로 초기화 (기여도 캐시는 구간 구조가 같으면 재사용)"""
+        self._values.clear()
+        self._counts.clear()
+        self.append(values)
+
+    def append(self, values: Iterable):
+        """윈도우 뒤쪽에 값 추가 (max_length 초과 시 앞쪽 제거)"""
+        for value in values:
+            self._values.append(value)
+            self._counts[value] += 1
+        if self.max_length is not None and len(self._values) > self.max_length:
+            self.drop_left(len(self._values) - self.max_length)
+
+    def drop_left(self, count: int = 1):
+        """윈도우 앞쪽에서 값 제거"""
+        for _ in range(min(count, len(self._values))):
+            value = self._values.popleft()
+            self._counts[value] -= 1
+            if self._counts[value] == 0:
+                del self._counts[value]
+
+    def append_text(self, text: str):
+        """문자열을 유니코드 값으로 변환하여 윈도우 뒤쪽에 추가"""
+        self.append(word_nb_unicode_format(text))
+
+    def slide_to(self, values: list) -> bool:
+        """윈도우를 values로 교체 - 현재 윈도우 뒷부분이 values 앞부분과 겹치면 앞쪽 제거 + 뒤쪽 추가만 함
+
+        Returns:
+            겹치는 부분을 찾아 이어 붙였으면 True (찾지 못해 reset했으면 False)
+        """
+        current = list(self._values)
+        if current and values:
+            # 가장 긴 겹침부터 (앞쪽을 가장 적게 제거하는 위치부터) 확인
+            first = values[0]
+            for start in range(max(0, len(current) - len(values)), len(current)):
+                if current[start] == first and current[start:] == values[:len(current) - start]:
+                    self.drop_left(start)
+                    self.append(values[len(current) - start:])
+                    self.window_slides += 1
+                    return True
+        self.reset(values)
+        return False
+
+    def _band_bounds(self, index: int) -> tuple:
+        """index번째 구간의 (B50, B100) - calculate_bit와 동일한 연산 순서"""
+        A50 = self._band_key[0] + self._increment * (index + 1)
+        B50 = self.calculator.format_nb_value(A50 - self._increment * 2)
+        B100 = self.calculator.format_nb_value(A50 + self._increment)
+        return B50, B100
+
+    def _nba100(self, index: int) -> float:
+        """index번째 NBA100 값 - calculate_bit와 동일한 연산 순서"""
+        A100 = (index + 1) * self.bit / self._total_count
+        return self.calculator.format_nb_value(A100 / (len(self._values) - 1))
+
+    def _first_band(self, value) -> int:
+        """값이 처음으로 포함되는 구간 인덱스 (B100이 단조 증가하므로 이진 탐색, 없으면 -1)"""
+        low, high = 0, self._total_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._band_bounds(mid)[1] >= value:
+                high = mid
+            else:
+                low = mid + 1
+        if low >= self._total_count or self._band_bounds(low)[0] > value:
+            return -1
+        return low
+
+    def _contribution(self, value) -> tuple:
+        """값의 (순방향, 역방향) NB50 기여도 (없으면 None)"""
+        if value not in self._contributions:
+            index = self._first_band(value)
+            if index < 0:
+                self._contributions[value] = None
+            else:
+                last = self._total_count - 1
+                self._contributions[value] = (self._nba100(index), self._nba100(last - index))
+        return self._contributions[value]
+
+    def calculate_pair(self) -> tuple:
+        """현재 윈도우의 (순방향, 역방향) calculate_bit 결과
+
+        Returns:
+            NBValueCalculator.calculate_bit_pair(현재 윈도우 값)와 동일한 결과
+        """
+        n = len(self._values)
+        if n < 2:
+            value = self.calculator.format_nb_value(self.bit / 100.0)
+            return value, value
+
+        min_val = min(self._counts)
+        max_val = max(self._counts)
+
+        # 음수가 있으면 행마다 증분이 달라지므로 전체 재계산
+        if min_val < 0:
+            self.full_recomputes += 1
+            self._band_key = None
+            self._contributions.clear()
+            return self.calculator.calculate_bit_pair(list(self._values), self.bit)
+
+        band_key = (min_val, max_val, n)
+        if band_key != self._band_key:
+            # 구간 구조가 바뀌면 기여도 캐시를 다시 계산
+            self.full_recomputes += 1
+            self._band_key = band_key
+            self._total_count = self.calculator.COUNT * n
+            positive_range = max_val if max_val > 0 else 0.0
+            self._increment = positive_range / (self._total_count - 1) if self._total_count > 1 else 0.0
+            self._contributions.clear()
+        else:
+            self.incremental_updates += 1
+
+        NB50_forward = 0.0
+        NB50_reverse = 0.0
+        for value in self._values:
+            contribution = self._contribution(value)
+            if contribution is not None:
+                NB50_forward += contribution[0]
+                NB50_reverse += contribution[1]
+
+        return (self.calculator._finalize_nb50(self._values, self.bit, NB50_forward),
+                self.calculator._finalize_nb50(self._values, self.bit, NB50_reverse))
+
+    def bit_max_min(self) -> tuple:
+        """현재 윈도우의 (bitMax, bitMin) - SUPER_BIT 보정 포함"""
+        forward, backward = self.calculate_pair()
+        return self.calculator.resolve_bit_pair(forward, backward)
+
+    def text_to_nb(self, text: str) -> dict:
+        """문자열로 윈도우를 교체하고 N/B 값 계산 (TextToNBConverter.text_to_nb와 같은 형식)
+
+        가격 문자열처럼 이전 문자열의 앞쪽이 빠지고 뒤쪽이 추가된 입력이면 바뀐 부분만 윈도우에 반영합니다.
+
+        Args:
+            text: 변환할 문자열
+
+        Returns:
+            {
+                'bitMax': float,
+                'bitMin': float,
+                'unicodeArray': list
+            }
+        """
+        unicode_array = word_nb_unicode_format(text) if text else []
+        self.slide_to(unicode_array)
+
+        if len(unicode_array) < 2:
+            return {
+                'bitMax': 0.0,
+                'bitMin': 0.0,
+                'unicodeArray': unicode_array
+            }
+
+        if self.cache is not None:
+            key = NBResultCache.make_key(text, self.bit, self.decimal_places)
+            forward, backward = self.cache.get_or_compute(key, self.calculate_pair)
+            bit_max, bit_min = self.calculator.resolve_bit_pair(forward, backward)
+        else:
+            bit_max, bit_min = self.bit_max_min()
+        return {
+            'bitMax': bit_max,
+            'bitMin': bit_min,
+            'unicodeArray': unicode_array
+        }
+
+    def stats(self) -> dict:
+        """계산 통계"""
+        return {
+            'length': len(self._values),
+            'distinct_values': len(self._counts),
+            'cached_contributions': len(self._contributions),
+            'full_recomputes': self.full_recomputes,
+            'incremental_updates': self.incremental_updates,
+            'window_slides': self.window_slides
+        }
@@ -5,10 +5,16 @@ max/min 폴더 구조로 데이터를 저장합니다.
 
 import os
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from .calculator import NBValueCalculator
 from .converter import TextToNBConverter
+from .value_index import NBValueIndex, NBMetadataIndex
+from .card_index import NBCardIndex
+from .compaction import NBverseCompactor, text_key
+from .columns import remove_stale_columns, resolve_columns, write_columns
 
 
 def nested_path_from_number(number: int, base_path: str = "data") -> str:
@@ -31,25 +37,69 @@ def nested_path_from_number(number: int, base_path: str = "data") -> str:
 class NBverseStorage:
     """NBverse 데이터 저장 클래스 (max/min 폴더 구조)"""
     
-    def __init__(self, data_dir: str = "novel_ai/v1.0.7/data", decimal_places: int = 10):
+    # 중복 저장 확인용으로 기억할 최근 텍스트 수
+    RECENT_TEXTS_MAX = 1024
+    
+    # 정렬 인덱스를 유지할 metadata 숫자 필드 (iter_metadata_range)
+    METADATA_INDEX_FIELDS = ('nb_max', 'nb_min')
+    
+    def __init__(self, data_dir: str = "novel_ai/v1.0.7/data", decimal_places: int = 10,
+                 columnar: bool = True):
         """
         초기화
         
         Args:
             data_dir: 데이터 디렉토리 경로
             decimal_places: 소수점 자리수 (기본값: 10)
+            columnar: True이면 unicodeArray / chart_data.prices를 JSON 옆 .col 바이너리 파일에 저장
+                      (False이면 기존처럼 JSON 숫자 목록, 읽기는 두 형식 모두 지원)
         """
         self.data_dir = data_dir
         self.max_dir = os.path.join(data_dir, "max")
         self.min_dir = os.path.join(data_dir, "min")
         self.decimal_places = decimal_places
+        self.columnar = columnar
         
         # 디렉토리 생성
         os.makedirs(self.max_dir, exist_ok=True)
         os.makedirs(self.min_dir, exist_ok=True)
         
+        # N/B 값 정렬 인덱스 (범위 검색용, 처음 검색할 때 로드)
+        self.index_dir = os.path.join(data_dir, "index")
+        self.max_index = NBValueIndex(os.path.join(self.index_dir, "max.idx"), self.max_dir)
+        self.min_index = NBValueIndex(os.path.join(self.index_dir, "min.idx"), self.min_dir)
+        
+        # metadata N/B 값 정렬 인덱스 (save_text로 저장한 카드는 파일명이 metadata 값과 다르므로 따로 유지)
+        # 같은 레코드가 max/min 폴더에 모두 있으므로 max 폴더 파일만 인덱싱
+        self.metadata_indexes = {
+            field: NBMetadataIndex(os.path.join(self.index_dir, f"metadata_{field}.idx"), self.max_dir, field)
+            for field in self.METADATA_INDEX_FIELDS
+        }
+        
+        # 카드 ID → 파일 경로 인덱스 (카드 갱신/삭제용, 처음 조회할 때 로드)
+        self.card_index = NBCardIndex(os.path.join(self.index_dir, "card_paths.idx"), data_dir,
+                                      [self.max_dir, self.min_dir])
+        
         self.converter = TextToNBConverter(decimal_places=decimal_places)
         self.calculator = NBValueCalculator(decimal_places=decimal_places)
+        self._compact_lock = threading.Lock()
+        
+        # 최근 저장한 텍스트 (중복 저장 확인용, (텍스트 해시, card_type) -> 경로)
+        self._recent_texts = OrderedDict()
+        self._recent_lock = threading.Lock()
+    
+    def _get_folder_path(self, nb_value: float, folder_type: str = "max") -> str:
+        """N/B 값의 숫자 폴더 경로 (폴더는 만들지 않음)"""
+        # N/B 값을 문자열로 변환 (정수 부분 + 소수점 이후)
+        # 0.2604972083의 경우: "0" + "2604972083" = "02604972083"
+        nb_str = f"{abs(nb_value):.10f}".replace('.', '')  # 소수점 제거하여 문자열로
+        
+        # 폴더 선택
+        base_dir = self.max_dir if folder_type == "max" else self.min_dir
+        
+        # 중첩된 경로 생성 (문자열 각 자릿수를 폴더로 사용)
+        path_parts = [base_dir] + list(nb_str)
+        return os.path.join(*path_parts)
     
     def _get_file_path(self, nb_value: float, folder_type: str = "max") -> str:
         """
@@ -63,16 +113,7 @@ class NBverseStorage:
         Returns:
             파일 경로
         """
-        # N/B 값을 문자열로 변환 (정수 부분 + 소수점 이후)
-        # 0.2604972083의 경우: "0" + "2604972083" = "02604972083"
-        nb_str = f"{abs(nb_value):.10f}".replace('.', '')  # 소수점 제거하여 문자열로
-        
-        # 폴더 선택
-        base_dir = self.max_dir if folder_type == "max" else self.min_dir
-        
-        # 중첩된 경로 생성 (문자열 각 자릿수를 폴더로 사용)
-        path_parts = [base_dir] + list(nb_str)
-        nested_path = os.path.join(*path_parts)
+        nested_path = self._get_folder_path(nb_value, folder_type)
         os.makedirs(nested_path, exist_ok=True)
         
         # 파일명 생성 (타임스탬프 포함)
@@ -101,21 +142,59 @@ class NBverseStorage:
         """
         # 텍스트를 N/B 값으로 변환
         result = self.converter.text_to_nb(text)
-        bit_max = result['bitMax']
-        bit_min = result['bitMin']
+        saved = self.save_precomputed(text, result['bitMax'], result['bitMin'],
+                                      unicode_array=result['unicodeArray'], metadata=metadata)
+        saved.pop('duplicate')
+        return saved
+    
+    def save_precomputed(self, text: str, bit_max: float, bit_min: float,
+                         unicode_array: Optional[List] = None,
+                         metadata: Optional[Dict] = None,
+                         skip_duplicate: bool = False) -> Dict:
+        """
+        이미 계산한 N/B 값으로 텍스트 저장 (text_to_nb를 다시 계산하지 않음)
+        
+        Args:
+            text: 저장할 텍스트
+            bit_max: text_to_nb 결과 bitMax
+            bit_min: text_to_nb 결과 bitMin
+            unicode_array: text_to_nb 결과 unicodeArray (선택사항, 없으면 저장하지 않음)
+            metadata: 추가 메타데이터 (선택사항)
+            skip_duplicate: True이면 같은 텍스트(+ metadata.card_type)가 이미 저장되어 있을 때 새로 저장하지 않음
         
+        Returns:
+            저장된 파일 경로 정보 (duplicate가 True이면 이미 저장된 파일 경로)
+            {
+                'max_path': str,
+                'min_path': str,
+                'bitMax': float,
+                'bitMin': float,
+                'duplicate': bool
+            }
+        """
         # 설정된 소수점 자릿수로 반올림
         bit_max = round(bit_max, self.decimal_places)
         bit_min = round(bit_min, self.decimal_places)
+        key = text_key(text, metadata)
+        
+        if skip_duplicate:
+            saved = self._find_saved_text(key, text, bit_max, bit_min)
+            if saved:
+                return {
+                    'max_path': saved[0],
+                    'min_path': saved[1],
+                    'bitMax': bit_max,
+                    'bitMin': bit_min,
+                    'duplicate': True
+                }
         
         # 데이터 구조 생성
+        nb = {'max': bit_max, 'min': bit_min}
+        if unicode_array is not None:
+            nb['unicodeArray'] = unicode_array
         data = {
             'text': text,
-            'nb': {
-                'max': bit_max,
-                'min': bit_min,
-                'unicodeArray': result['unicodeArray']
-            },
+            'nb': nb,
             'calculated_at': datetime.now().isoformat(),
             'version': 'bitCalculation.v.0.2',
             'decimal_places': self.decimal_places
@@ -125,22 +204,10 @@ class NBverseStorage:
         if metadata:
             data['metadata'] = metadata
         
-        # max 폴더에 저장
-        max_path = self._get_file_path(bit_max, "max")
-        with open(max_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        # min 폴더에 저장
-        min_path = self._get_file_path(bit_min, "min")
-        with open(min_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        return {
-            'max_path': max_path,
-            'min_path': min_path,
-            'bitMax': bit_max,
-            'bitMin': bit_min
-        }
+        saved = self._write_record(data, bit_max, bit_min, metadata)
+        self._remember_text(key, saved['max_path'], saved['min_path'])
+        saved['duplicate'] = False
+        return saved
     
     def save_nb_values(self, bit_max: float, bit_min: float, 
                       text: Optional[str] = None,
@@ -178,15 +245,28 @@ class NBverseStorage:
         if metadata:
             data['metadata'] = metadata
         
+        return self._write_record(data, bit_max, bit_min, metadata)
+    
+    def _write_record(self, data: Dict, bit_max: float, bit_min: float,
+                      metadata: Optional[Dict]) -> Dict:
+        """max/min 폴더에 레코드를 쓰고 인덱스에 추가"""
         # max 폴더에 저장
         max_path = self._get_file_path(bit_max, "max")
-        with open(max_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._dump(max_path, data)
         
         # min 폴더에 저장
         min_path = self._get_file_path(bit_min, "min")
-        with open(min_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._dump(min_path, data)
+        
+        # 정렬 인덱스에 추가
+        self.max_index.add(max_path)
+        self.min_index.add(min_path)
+        for field, index in self.metadata_indexes.items():
+            value = NBMetadataIndex.metadata_value(metadata, field)
+            if value is not None:
+                index.add(max_path, value)
+        if metadata and metadata.get('card_id'):
+            self.card_index.add(metadata['card_id'], [max_path, min_path])
         
         return {
             'max_path': max_path,
@@ -195,16 +275,80 @@ class NBverseStorage:
             'bitMin': bit_min
         }
     
-    def load_from_path(self, file_path: str) -> Optional[Dict]:
+    def _dump(self, file_path: str, data: Dict) -> Optional[str]:
+        """JSON 파일 쓰기 (columnar이면 숫자 배열은 .col 파일에 먼저 쓰고 참조만 기록), .col 파일명 반환"""
+        column_name = None
+        if self.columnar:
+            data, column_name = write_columns(file_path, data)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return column_name
+    
+    def _remember_text(self, key, max_path: str, min_path: str):
+        """최근 저장한 텍스트 기록 (최대 RECENT_TEXTS_MAX개)"""
+        with self._recent_lock:
+            self._recent_texts[key] = (max_path, min_path)
+            self._recent_texts.move_to_end(key)
+            while len(self._recent_texts) > self.RECENT_TEXTS_MAX:
+                self._recent_texts.popitem(last=False)
+    
+    def _find_saved_text(self, key, text: str, bit_max: float, bit_min: float) -> Optional[Tuple[str, str]]:
+        """
+        같은 텍스트(+ metadata.card_type)가 저장된 max/min 파일 경로 검색
+        (최근 저장 기록을 먼저 보고, 없으면 같은 텍스트가 저장되는 숫자 폴더 두 개만 확인)
+        """
+        with self._recent_lock:
+            saved = self._recent_texts.get(key)
+        if saved and os.path.exists(saved[0]) and os.path.exists(saved[1]):
+            return saved
+        
+        max_path = self._find_text_in_folder(self._get_folder_path(bit_max, "max"), key, text)
+        min_path = max_path and self._find_text_in_folder(self._get_folder_path(bit_min, "min"), key, text)
+        if not max_path or not min_path:
+            return None
+        self._remember_text(key, max_path, min_path)
+        return max_path, min_path
+    
+    def _find_text_in_folder(self, folder: str, key, text: str) -> Optional[str]:
+        """숫자 폴더에서 같은 텍스트가 저장된 가장 최근 파일"""
+        try:
+            with os.scandir(folder) as it:
+                names = sorted((entry.name for entry in it if entry.name.endswith('.json')), reverse=True)
+        except OSError:
+            return None
+        for name in names:
+            file_path = os.path.join(folder, name)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and data.get('text') == text and text_key(text, data.get('metadata')) == key:
+                return file_path
+        return None
+    
+    def load_from_path(self, file_path: str, lazy_columns: bool = False) -> Optional[Dict]:
         """
         파일 경로에서 데이터 로드 (빈 파일 및 손상된 파일 처리)
         
         Args:
             file_path: 파일 경로
+            lazy_columns: True이면 .col 파일에 저장된 배열을 list 대신 ColumnArray로 반환
+                          (값을 볼 때 변환, 다시 저장할 때는 바이트를 그대로 씀)
         
         Returns:
             로드된 데이터 또는 None
         """
+        for _ in range(2):
+            data = self._load_json(file_path)
+            if data is None or resolve_columns(data, file_path, lazy=lazy_columns):
+                return data
+            # 읽는 사이에 다른 쪽에서 파일을 갱신하며 이전 .col 파일을 지움 → 새 JSON으로 다시 읽음
+        print(f"⚠️ 열 파일을 찾을 수 없습니다: {file_path}")
+        return None
+    
+    def _load_json(self, file_path: str) -> Optional[Dict]:
+        """JSON 파일 파싱 (.col 참조는 그대로 둠)"""
         try:
             if not os.path.exists(file_path):
                 return None
@@ -241,6 +385,78 @@ class NBverseStorage:
                 print(f"⚠️ 파일 로드 오류 ({file_path}): {error_msg}")
         return None
     
+    def save_to_path(self, file_path: str, data: Dict):
+        """
+        기존 파일 내용을 갱신 (임시 파일에 쓴 후 교체하여 읽는 쪽이 빈 파일을 보지 않도록 함)
+        
+        Args:
+            file_path: 갱신할 파일 경로
+            data: 저장할 데이터
+        """
+        column_name = None
+        if self.columnar:
+            data, column_name = write_columns(file_path, data)
+        temp_path = f"{file_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+        # 새 JSON이 참조하지 않는 이전 .col 파일 삭제
+        remove_stale_columns(file_path, keep=column_name)
+    
+    def find_card_paths(self, card_id: str) -> List[str]:
+        """
+        metadata.card_id로 저장된 파일 경로 검색 (카드 ID 인덱스 사용)
+        
+        Args:
+            card_id: 카드 ID
+        
+        Returns:
+            파일 경로 리스트 (max/min 폴더 파일)
+        """
+        return [path for path in self.card_index.get_paths(card_id) if os.path.exists(path)]
+    
+    def remove_card(self, card_id: str) -> int:
+        """
+        metadata.card_id로 저장된 파일 삭제
+        
+        Args:
+            card_id: 카드 ID
+        
+        Returns:
+            삭제된 파일 수
+        """
+        removed = 0
+        for file_path in self.find_card_paths(card_id):
+            try:
+                os.remove(file_path)
+                removed += 1
+            except OSError as e:
+                print(f"⚠️ 카드 파일 삭제 오류 ({file_path}): {e}")
+                continue
+            remove_stale_columns(file_path)
+        self.card_index.remove(card_id)
+        return removed
+    
+    def compact(self, retention_days: float = 0, min_age_seconds: float = 300.0,
+                dry_run: bool = False) -> Dict:
+        """
+        저장소 압축 - 같은 텍스트의 중복 파일, 카드 ID별 이전 버전, 보존 기간이 지난 파일,
+        빈 숫자 폴더를 삭제하고 인덱스를 다시 씀 (동시에 한 번만 실행)
+        
+        Args:
+            retention_days: 카드가 아닌 파일의 보존 기간 (일, 0이면 기간으로 삭제하지 않음)
+            min_age_seconds: 이 시간 안에 쓴 파일은 정리하지 않음 (초)
+            dry_run: True이면 삭제하지 않고 결과만 계산
+        
+        Returns:
+            결과 딕셔너리 (files_removed, dirs_removed, bytes_freed, inodes_freed, 사유별 파일 수 등)
+        """
+        with self._compact_lock:
+            return NBverseCompactor(self, retention_days=retention_days,
+                                    min_age_seconds=min_age_seconds, dry_run=dry_run).run()
+    
     def find_by_nb_value(self, nb_value: float, folder_type: str = "max", 
                         limit: int = 10) -> List[Dict]:
         """
@@ -317,36 +533,83 @@ class NBverseStorage:
         
         return results[:limit]
     
-    def _search_in_range(self, base_dir: str, min_val: float, max_val: float, limit: int) -> List[Dict]:
-        """범위 내에서 검색"""
-        results = []
+    def iter_nb_range(self, low: float, high: float, folder_type: str = "max"):
+        """
+        정렬 인덱스로 low <= N/B 값 <= high 인 데이터를 값 오름차순으로 순회
+        (조건을 추가로 확인하면서 필요한 만큼만 읽을 때 사용)
         
-        if not os.path.exists(base_dir):
-            return results
+        Args:
+            low: 최솟값
+            high: 최댓값
+            folder_type: "max" 또는 "min"
         
-        # 범위 내의 모든 가능한 경로 검색
-        min_int = int(abs(min_val) * 1000000)
-        max_int = int(abs(max_val) * 1000000)
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        index = self.max_index if folder_type == "max" else self.min_index
+        for _, file_path in index.iter_range(low, high):
+            data = self.load_from_path(file_path)
+            if data:
+                yield {
+                    'path': file_path,
+                    'data': data
+                }
+    
+    def iter_records(self, folder_type: str = "max"):
+        """
+        폴더의 모든 데이터를 순회 (같은 데이터가 max/min 폴더에 모두 있으므로 한 폴더만 읽으면 됨)
         
-        # 검색 범위를 좁히기 위해 상위 디렉토리부터 검색
-        for root, dirs, files in os.walk(base_dir):
+        Args:
+            folder_type: "max" 또는 "min"
+        
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        base_dir = self.max_dir if folder_type == "max" else self.min_dir
+        if not os.path.exists(base_dir):
+            return
+        for root, _, files in os.walk(base_dir):
             for filename in files:
-                if filename.endswith('.json') and filename.startswith(str(min_int)[:3]):
-                    try:
-                        # 파일명에서 N/B 값 추출
-                        nb_int = int(filename.split('_')[0])
-                        nb_val = nb_int / 1000000.0
-                        
-                        if min_val <= nb_val <= max_val:
-                            file_path = os.path.join(root, filename)
-                            data = self.load_from_path(file_path)
-                            if data:
-                                results.append({
-                                    'path': file_path,
-                                    'data': data
-                                })
-                    except:
-                        pass
+                if not filename.endswith('.json'):
+                    continue
+                file_path = os.path.join(root, filename)
+                data = self.load_from_path(file_path)
+                if data:
+                    yield {
+                        'path': file_path,
+                        'data': data
+                    }
+    
+    def iter_metadata_range(self, field: str, low: float, high: float):
+        """
+        metadata 숫자 필드 정렬 인덱스로 low <= metadata[field] <= high 인 데이터를 값 오름차순으로 순회
+        (save_text로 저장한 카드처럼 파일명 N/B 값과 metadata N/B 값이 다른 레코드도 찾음)
+        
+        Args:
+            field: METADATA_INDEX_FIELDS 중 하나 ('nb_max', 'nb_min')
+            low: 최솟값
+            high: 최댓값
+        
+        Yields:
+            {'path': str, 'data': dict}
+        """
+        index = self.metadata_indexes[field]
+        for _, file_path in index.iter_range(low, high):
+            data = self.load_from_path(file_path)
+            if data:
+                yield {
+                    'path': file_path,
+                    'data': data
+                }
+    
+    def _search_in_range(self, base_dir: str, min_val: float, max_val: float, limit: int) -> List[Dict]:
+        """범위 내에서 검색 (정렬 인덱스 이진 탐색 + 연속 구간 읽기)"""
+        folder_type = "max" if base_dir == self.max_dir else "min"
+        
+        results = []
+        for result in self.iter_nb_range(min_val, max_val, folder_type):
+            results.append(result)
+            if len(results) >= limit:
+                break
         
         return results
-
@@ -0,0 +1,398 @@
+"""
+N/B 값 정렬 인덱스 모듈
+max/min 폴더의 파일을 N/B 값 순서로 정렬한 (값, 경로) 배열로 유지하여
+범위 검색을 이진 탐색 + 연속 구간 읽기로 처리합니다.
+
+정렬된 항목은 바이너리 세그먼트 파일(<인덱스 이름>.seg)에 모아 두고 mmap으로 엽니다.
+- 값 배열(float64)을 memoryview로 바로 이진 탐색 (파싱/복사 없음, 검색 구간의 페이지만 읽음)
+- 경로 문자열은 검색 결과로 돌려줄 때만 디코드
+- 여러 API 작업 프로세스가 같은 페이지 캐시를 공유 (프로세스마다 파싱한 목록을 들고 있지 않음)
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import heapq
+import struct
+import bisect
+import zlib
+import threading
+from array import array
+from itertools import islice
+from typing import List, Optional, Tuple
+
+# 세그먼트 파일 헤더: 매직, 항목 수, 세그먼트에 포함된 인덱스 로그 길이, 경로 바이트 길이, 로그 확인값
+SEGMENT_MAGIC = b'NBVSEG01'
+_SEGMENT_HEADER = struct.Struct('<8sQQQI4x')
+# 로그 확인값 계산에 쓰는 로그 끝부분 길이 (다른 로그에 대한 세그먼트를 쓰지 않도록)
+_LOG_CHECK_BYTES = 256
+
+
+def _log_check(index_path: str, log_offset: int) -> int:
+    """인덱스 로그의 log_offset 바로 앞부분 CRC32"""
+    start = max(0, log_offset - _LOG_CHECK_BYTES)
+    with open(index_path, 'rb') as f:
+        f.seek(start)
+        return zlib.crc32(f.read(log_offset - start))
+
+
+class _Segment:
+    """mmap으로 연 정렬 세그먼트 (값 배열 / 경로 끝 위치 배열 / 경로 바이트)"""
+    
+    __slots__ = ('_mmap', 'values', '_ends', '_paths_start', 'log_offset')
+    
+    def __init__(self, mapped: mmap.mmap, count: int, log_offset: int):
+        self._mmap = mapped
+        view = memoryview(mapped)
+        values_start = _SEGMENT_HEADER.size
+        ends_start = values_start + count * 8
+        self._paths_start = ends_start + count * 8
+        self.values = view[values_start:ends_start].cast('d')
+        self._ends = view[ends_start:self._paths_start].cast('Q')
+        self.log_offset = log_offset
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def path(self, position: int) -> str:
+        start = self._ends[position - 1] if position else 0
+        return self._mmap[self._paths_start + start:self._paths_start + self._ends[position]].decode('utf-8')
+    
+    def entries(self, start: int = 0, end: Optional[int] = None):
+        for position in range(start, len(self) if end is None else end):
+            yield self.values[position], self.path(position)
+    
+    @classmethod
+    def open(cls, segment_path: str, index_path: str) -> Optional['_Segment']:
+        """세그먼트 파일 열기 (없거나 현재 인덱스 로그와 맞지 않으면 None)"""
+        try:
+            with open(segment_path, 'rb') as f:
+                header = f.read(_SEGMENT_HEADER.size)
+                if len(header) < _SEGMENT_HEADER.size:
+                    return None
+                magic, count, log_offset, paths_size, check = _SEGMENT_HEADER.unpack(header)
+                if magic != SEGMENT_MAGIC or os.fstat(f.fileno()).st_size != _SEGMENT_HEADER.size + count * 16 + paths_size:
+                    return None
+                if log_offset > os.path.getsize(index_path) or _log_check(index_path, log_offset) != check:
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        return cls(mapped, count, log_offset)
+    
+    @staticmethod
+    def write(segment_path: str, index_path: str, entries: List[Tuple[float, str]], log_offset: int):
+        """정렬된 (값, 상대 경로) 목록을 세그먼트 파일로 씀 (임시 파일에 쓴 후 교체)"""
+        ends = []
+        paths = bytearray()
+        for _, path in entries:
+            paths += path.encode('utf-8')
+            ends.append(len(paths))
+        header = _SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(entries), log_offset, len(paths),
+                                      _log_check(index_path, log_offset))
+        temp_path = f"{segment_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(array('d', (value for value, _ in entries)).tobytes())
+            f.write(array('Q', ends).tobytes())
+            f.write(paths)
+        os.replace(temp_path, segment_path)
+
+
+class NBValueIndex:
+    """N/B 값 정렬 인덱스 (폴더 하나당 하나)
+    
+    - 인덱스 파일: '<값>\\t<상대 경로>' 줄을 추가만 하는 로그 (저장할 때마다 한 줄 추가)
+    - 세그먼트 파일: 로그 앞부분(log_offset까지)을 값 순서로 정렬한 바이너리 파일 (mmap으로 읽음)
+    - 메모리: 세그먼트 이후에 추가된 줄만 값 기준으로 정렬된 values/paths 배열로 보관
+      (SEGMENT_TAIL_MAX개를 넘으면 세그먼트를 다시 써서 합침)
+    - 인덱스 파일이 없으면 처음 검색할 때 폴더를 한 번 스캔하여 다시 만듦
+    - 다른 프로세스가 추가한 줄은 검색할 때 파일 끝부분만 읽어서 반영
+    - 다른 프로세스가 인덱스 파일을 다시 만들면 (파일 교체: inode 변경 또는 크기 감소) 처음부터 다시 읽음
+    """
+    
+    # 메모리 배열에 이보다 많이 쌓이면 세그먼트로 합침
+    SEGMENT_TAIL_MAX = 4096
+    
+    def __init__(self, index_path: str, base_dir: str, use_segment: bool = True):
+        """
+        초기화
+        
+        Args:
+            index_path: 인덱스 파일 경로
+            base_dir: 인덱싱할 폴더 (max 또는 min 폴더)
+            use_segment: True이면 정렬 세그먼트 파일을 mmap으로 읽음 (False이면 로그 전체를 메모리 배열로 읽음)
+        """
+        self.index_path = index_path
+        self.base_dir = base_dir
+        # 세그먼트는 리틀 엔디언으로 기록하므로 같은 바이트 순서에서만 사용
+        self.use_segment = use_segment and sys.byteorder == 'little'
+        self.segment_path = os.path.splitext(index_path)[0] + '.seg'
+        
+        self._segment = None
+        self._segment_retry_at = 0  # 세그먼트 저장에 실패하면 메모리 배열이 이 크기를 넘을 때 다시 시도
+        self._values = []
+        self._paths = []
+        self._offset = 0  # 인덱스 파일에서 읽은 위치
+        self._file_id = None  # 읽고 있는 인덱스 파일의 (장치, inode)
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._values) + (len(self._segment) if self._segment else 0)
+    
+    @staticmethod
+    def parse_filename(filename: str) -> Optional[float]:
+        """파일명('<값>_<타임스탬프>.json')에서 N/B 값 추출"""
+        if not filename.endswith('.json'):
+            return None
+        try:
+            return float(filename.split('_', 1)[0])
+        except ValueError:
+            return None
+    
+    def add(self, file_path: str, nb_value: Optional[float] = None):
+        """저장된 파일을 인덱스 파일에 추가 (메모리 배열은 다음 검색 때 반영)
+        
+        인덱스 파일이 아직 없으면 추가하지 않습니다. (처음 검색할 때 폴더 스캔에 포함됨)
+        
+        Args:
+            file_path: 저장된 파일 경로
+            nb_value: 인덱스 값 (없으면 파일명에서 추출)
+        """
+        if nb_value is None:
+            nb_value = self.parse_filename(os.path.basename(file_path))
+        if nb_value is None:
+            return
+        relative_path = os.path.relpath(file_path, self.base_dir)
+        with self._lock:
+            if not os.path.exists(self.index_path):
+                return
+            try:
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(f"{nb_value!r}\t{relative_path}\n")
+            except Exception as e:
+                print(f"⚠️ N/B 인덱스 추가 오류: {e}")
+    
+    def find_range(self, low: float, high: float, limit: Optional[int] = None) -> List[Tuple[float, str]]:
+        """low <= 값 <= high 인 (값, 파일 경로) 목록 (값 오름차순)"""
+        return list(islice(self.iter_range(low, high), limit))
+    
+    def iter_range(self, low: float, high: float):
+        """low <= 값 <= high 인 (값, 파일 경로)를 값 오름차순으로 순회 (조건부 검색용)"""
+        with self._lock:
+            self._ensure_loaded()
+            start = bisect.bisect_left(self._values, low)
+            end = bisect.bisect_right(self._values, high)
+            entries = list(zip(self._values[start:end], self._paths[start:end]))
+            segment = self._segment
+            if segment is not None:
+                # mmap 값 배열에서 바로 이진 탐색 (경로는 순회하면서 필요한 만큼만 디코드)
+                entries = heapq.merge(segment.entries(bisect.bisect_left(segment.values, low),
+                                                      bisect.bisect_right(segment.values, high)),
+                                      entries, key=lambda entry: entry[0])
+        for value, relative_path in entries:
+            yield value, os.path.join(self.base_dir, relative_path)
+    
+    def rebuild(self):
+        """폴더를 스캔하여 인덱스 파일을 다시 만듦"""
+        with self._lock:
+            self._rebuild()
+    
+    def _ensure_loaded(self):
+        """인덱스 로드 (처음이면 파일 전체를 읽거나 다시 만들고, 이후에는 새로 추가된 줄만 읽음) - 락 안에서 호출"""
+        if self._loaded and self._replaced():
+            # 다른 프로세스가 다시 만든 파일에서 이전 위치부터 읽으면 항목이 빠지거나 중복되므로 처음부터 다시 읽음
+            self._loaded = False
+        if not self._loaded:
+            if not os.path.exists(self.index_path):
+                self._rebuild()
+                return
+            self._file_id = self._index_file_id()
+            self._values = []
+            self._paths = []
+            self._segment = _Segment.open(self.segment_path, self.index_path) if self.use_segment else None
+            self._offset = self._segment.log_offset if self._segment else 0
+            self._loaded = True
+        if os.path.exists(self.index_path):
+            self._read_tail()
+            if self.use_segment and len(self._values) > max(self.SEGMENT_TAIL_MAX, self._segment_retry_at):
+                self._write_segment()
+    
+    def _index_file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+    
+    def _replaced(self) -> bool:
+        """마지막으로 읽은 뒤 인덱스 파일이 교체되었거나 (os.replace) 읽은 위치보다 작아졌는지"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._file_id or stat.st_size < self._offset
+    
+    def _read_tail(self):
+        """인덱스 파일에서 마지막으로 읽은 위치 이후의 완성된 줄을 읽어 배열에 삽입"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except Exception as e:
+            print(f"⚠️ N/B 인덱스 읽기 오류: {e}")
+            return
+        
+        # 쓰는 중인 마지막 줄은 다음 번에 읽음
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return
+        self._offset += end
+        
+        entries = self._parse_lines(chunk[:end].decode('utf-8').splitlines())
+        if len(entries) > len(self._values) // 8:
+            # 많이 추가되었으면 한 번에 다시 정렬
+            merged = sorted(list(zip(self._values, self._paths)) + entries, key=lambda entry: entry[0])
+            self._values = [value for value, _ in merged]
+            self._paths = [path for _, path in merged]
+        else:
+            for value, path in entries:
+                index = bisect.bisect_right(self._values, value)
+                self._values.insert(index, value)
+                self._paths.insert(index, path)
+    
+    @staticmethod
+    def _parse_lines(lines: List[str]) -> List[Tuple[float, str]]:
+        entries = []
+        for line in lines:
+            value, separator, path = line.partition('\t')
+            if not separator:
+                continue
+            try:
+                entries.append((float(value), path))
+            except ValueError:
+                continue
+        return entries
+    
+    def _scan(self) -> List[Tuple[float, str]]:
+        """폴더의 (값, 상대 경로) 목록 (파일명 기준)"""
+        entries = []
+        if os.path.exists(self.base_dir):
+            for root, _, files in os.walk(self.base_dir):
+                for filename in files:
+                    nb_value = self.parse_filename(filename)
+                    if nb_value is not None:
+                        entries.append((nb_value, os.path.relpath(os.path.join(root, filename), self.base_dir)))
+        return entries
+    
+    def _rebuild(self):
+        """폴더 스캔으로 인덱스 재생성 - 락 안에서 호출"""
+        entries = self._scan()
+        entries.sort(key=lambda entry: entry[0])
+        
+        content = "".join(f"{value!r}\t{path}\n" for value, path in entries).encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}_{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+                stat = os.fstat(f.fileno())
+            os.replace(temp_path, self.index_path)
+            self._file_id = (stat.st_dev, stat.st_ino)
+        except Exception as e:
+            print(f"⚠️ N/B 인덱스 저장 오류: {e}")
+            self._file_id = None
+        
+        self._segment = None
+        self._values = [value for value, _ in entries]
+        self._paths = [path for _, path in entries]
+        self._offset = len(content)
+        self._loaded = True
+        if self.use_segment:
+            self._write_segment()
+    
+    def _write_segment(self):
+        """세그먼트 + 메모리 배열을 합쳐 세그먼트 파일을 다시 쓰고 mmap으로 엶 - 락 안에서 호출
+        
+        세그먼트를 쓰지 못하면 (예: Windows에서 다른 프로세스가 열고 있는 경우) 메모리 배열을 그대로 사용합니다.
+        """
+        tail = list(zip(self._values, self._paths))
+        entries = list(heapq.merge(self._segment.entries(), tail, key=lambda entry: entry[0])) if self._segment else tail
+        try:
+            os.makedirs(os.path.dirname(self.segment_path) or ".", exist_ok=True)
+            _Segment.write(self.segment_path, self.index_path, entries, self._offset)
+        except OSError as e:
+            print(f"⚠️ N/B 인덱스 세그먼트 저장 오류: {e}")
+            self._segment_retry_at = len(self._values) * 2  # 매 검색마다 다시 시도하지 않음
+            return
+        segment = _Segment.open(self.segment_path, self.index_path)
+        if segment is None or len(segment) != len(entries):
+            return
+        self._segment = segment
+        self._values = []
+        self._paths = []
+        self._segment_retry_at = 0
+
+
+class NBMetadataIndex(NBValueIndex):
+    """metadata의 숫자 필드(nb_max, nb_min 등) 정렬 인덱스
+    
+    save_text로 저장한 카드는 JSON 텍스트의 N/B 값으로 파일명이 정해지므로
+    metadata에 기록한 N/B 값으로 찾으려면 파일명이 아닌 metadata 값으로 인덱싱해야 합니다.
+    - 저장할 때 metadata 값을 함께 추가 (add(file_path, value))
+    - 인덱스 파일이 없으면 폴더의 JSON 파일을 한 번 읽어서 다시 만듦 (필드가 없는 파일은 파싱하지 않음)
+    """
+    
+    def __init__(self, index_path: str, base_dir: str, field: str, use_segment: bool = True):
+        """
+        초기화
+        
+        Args:
+            index_path: 인덱스 파일 경로
+            base_dir: 인덱싱할 폴더
+            field: metadata 필드 이름
+            use_segment: True이면 정렬 세그먼트 파일을 mmap으로 읽음
+        """
+        super().__init__(index_path, base_dir, use_segment=use_segment)
+        self.field = field
+        self._marker = json.dumps(field).encode('utf-8')
+    
+    @staticmethod
+    def metadata_value(metadata, field: str) -> Optional[float]:
+        """metadata 필드의 숫자 값 (없거나 숫자가 아니면 None)"""
+        if not isinstance(metadata, dict):
+            return None
+        value = metadata.get(field)
+        if isinstance(value, bool) or value is None:
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value if math.isfinite(value) else None
+    
+    def _scan(self) -> List[Tuple[float, str]]:
+        entries = []
+        if os.path.exists(self.base_dir):
+            for root, _, files in os.walk(self.base_dir):
+                for filename in files:
+                    if not filename.endswith('.json'):
+                        continue
+                    file_path = os.path.join(root, filename)
+                    try:
+                        with open(file_path, 'rb') as f:
+                            content = f.read()
+                        if self._marker not in content:
+                            continue
+                        data = json.loads(content)
+                    except (OSError, ValueError):
+                        continue
+                    value = self.metadata_value(data.get('metadata') if isinstance(data, dict) else None, self.field)
+                    if value is not None:
+                        entries.append((value, os.path.relpath(file_path, self.base_dir)))
+        return entries
@@ -0,0 +1,77 @@
+"""
+N/B 배치 변환 테스트
+"""
+
+import os
+import sys
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import TextToNBConverter, NBResultCache
+
+
+def test_text_to_nb_batch():
+    """배치 결과가 text_to_nb() 순차 호출과 같은지 확인"""
+    texts = [
+        "101234000.0,101250000.0,101190000.0",
+        "안녕하세요",
+        "",
+        "a",
+        "Hello World",
+        "101234000.0,101250000.0,101190000.0",
+        "-12.5,3.0,-7.25",
+        "NBVerse 배치 테스트",
+    ]
+    
+    sequential = TextToNBConverter(bit=5.5)
+    expected = [sequential.text_to_nb(text) for text in texts]
+    
+    # 프로세스 풀 사용
+    parallel = TextToNBConverter(bit=5.5)
+    assert parallel.text_to_nb_batch(texts, workers=2, chunk_size=2) == expected
+    
+    # 요청마다 풀을 새로 만들지 않고 공유 풀 재사용 (워커 수는 CPU 수로 제한)
+    from NBverse import converter
+    pool = converter._process_pool
+    assert parallel.text_to_nb_batch(texts, workers=1000, chunk_size=2) == expected
+    assert converter._process_pool is pool
+    
+    # 공유 풀은 CPU 수만큼이어도 한 배치가 동시에 넘기는 청크는 workers개 이하 (CPU가 1개인 환경에서도 확인)
+    submitted = []
+    max_in_flight = [0]
+    
+    class CountingPool:
+        def submit(self, *args):
+            max_in_flight[0] = max(max_in_flight[0], sum(1 for f in submitted if not f.done()) + 1)
+            submitted.append(get_pool().submit(*args))
+            return submitted[-1]
+    
+    get_pool = converter._get_process_pool
+    cpu_count = os.cpu_count
+    converter._get_process_pool = CountingPool
+    os.cpu_count = lambda: 4
+    try:
+        assert parallel.text_to_nb_batch(texts, workers=2, chunk_size=1) == expected
+    finally:
+        converter._get_process_pool = get_pool
+        os.cpu_count = cpu_count
+    assert len(submitted) == 5 and max_in_flight[0] <= 2, (len(submitted), max_in_flight)
+    
+    # 현재 프로세스에서 계산
+    single = TextToNBConverter(bit=5.5)
+    assert single.text_to_nb_batch(texts, workers=1) == expected
+    
+    # 캐시 사용 시 중복 문자열은 한 번만 계산
+    cached = TextToNBConverter(bit=5.5, cache=NBResultCache())
+    assert cached.text_to_nb_batch(texts, workers=2) == expected
+    stats = cached.cache_stats()
+    assert stats['items'] == 5, stats
+    assert cached.text_to_nb_batch(texts, workers=2) == TextToNBConverter(bit=5.5).text_to_nb_batch(
+        texts + texts, workers=1)[len(texts):]
+    
+    print(f"배치 변환 테스트 통과: {len(texts)}개 문자열, 캐시 통계 {cached.cache_stats()}")
+
+
+if __name__ == "__main__":
+    test_text_to_nb_batch()
@@ -0,0 +1,60 @@
+"""
+N/B 결과 캐시 테스트
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import TextToNBConverter, NBResultCache
+
+
+def test_nb_result_cache():
+    """캐시 적중/미스, LRU 제한, 디스크 재사용 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_cache_test_")
+    disk_path = os.path.join(test_dir, "nb_cache.sqlite3")
+    texts = ["101234000.0,101250000.0", "안녕하세요", "Hello World"]
+    
+    try:
+        plain = TextToNBConverter(bit=5.5)
+        cached = TextToNBConverter(bit=5.5, cache=NBResultCache(max_items=2, disk_path=disk_path))
+        
+        for text in texts + texts:
+            assert cached.text_to_nb(text) == plain.text_to_nb(text), text
+        
+        stats = cached.cache_stats()
+        print(f"캐시 통계: {stats}")
+        assert stats['items'] == 2
+        assert stats['misses'] == 3
+        assert stats['hits'] == 3
+        assert stats['disk_hits'] >= 1
+        
+        # 새 인스턴스 (재시작)는 디스크 캐시에서 결과를 가져옴
+        restarted = TextToNBConverter(bit=5.5, cache=NBResultCache(disk_path=disk_path))
+        assert restarted.text_to_nb(texts[0]) == plain.text_to_nb(texts[0])
+        assert restarted.cache_stats()['disk_hits'] == 1
+        
+        # 디스크에서 읽은 항목은 최근 사용으로 표시되어 개수 초과 시 남음 (LRU)
+        lru = NBResultCache(max_items=1, disk_path=os.path.join(test_dir, "lru.sqlite3"), max_disk_items=2)
+        lru.put("a", (1.0, 2.0))
+        lru.put("b", (3.0, 4.0))
+        lru.clear()
+        assert lru.get("a") == (1.0, 2.0)
+        lru.put("c", (5.0, 6.0))
+        lru.clear()
+        assert lru.get("a") == (1.0, 2.0) and lru.get("c") == (5.0, 6.0) and lru.get("b") is None
+        
+        # bit가 다르면 다른 키
+        assert NBResultCache.make_key(texts[0], 5.5, 10) != NBResultCache.make_key(texts[0], 6.0, 10)
+        
+        print("N/B 결과 캐시 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_nb_result_cache()
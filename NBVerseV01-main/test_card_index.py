@@ -0,0 +1,74 @@
+"""
+카드 ID 인덱스 테스트
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseIndexedStorage
+
+
+def test_card_index():
+    """카드 ID로 파일 경로 조회/갱신/삭제 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_card_index_test_")
+    
+    try:
+        # 인덱스가 생기기 전에 저장된 카드 (처음 조회할 때 폴더 스캔으로 인덱스 생성)
+        storage = NBverseStorage(data_dir=test_dir)
+        first = storage.save_text("101234000.0,101250000.0", metadata={'card_id': 'card-1', 'history_list': []})
+        storage.save_text("카드 아님")
+        assert sorted(storage.find_card_paths('card-1')) == sorted([first['max_path'], first['min_path']])
+        assert os.path.exists(storage.card_index.index_path)
+        
+        # 인덱스가 있으면 저장할 때 추가 (다른 인스턴스가 저장한 것도 반영)
+        other = NBverseStorage(data_dir=test_dir)
+        second = other.save_nb_values(0.31, 5.2, metadata={'card_id': 'card-2'})
+        assert storage.find_card_paths('card-2') == [second['max_path'], second['min_path']]
+        assert storage.card_index.stats() == {'cards': 2, 'paths': 4}
+        
+        # 경로로 읽고 갱신
+        for path in storage.find_card_paths('card-1'):
+            data = storage.load_from_path(path)
+            data['metadata']['history_list'].append({'type': 'BUY'})
+            storage.save_to_path(path, data)
+        assert all(storage.load_from_path(path)['metadata']['history_list'] == [{'type': 'BUY'}]
+                   for path in storage.find_card_paths('card-1'))
+        
+        # 삭제
+        assert storage.remove_card('card-1') == 2
+        assert storage.find_card_paths('card-1') == []
+        assert NBverseStorage(data_dir=test_dir).find_card_paths('card-1') == []
+        assert not os.path.exists(first['max_path'])
+        
+        # 다른 인스턴스(프로세스)가 인덱스를 다시 쓰면 (압축) 이전 읽기 위치를 쓰지 않고 처음부터 다시 읽음
+        third = other.save_nb_values(0.5, 5.5, metadata={'card_id': 'card-4'})
+        assert storage.find_card_paths('card-4') == [third['max_path'], third['min_path']]
+        NBverseStorage(data_dir=test_dir).card_index.compact()
+        fourth = other.save_nb_values(0.6, 5.6, metadata={'card_id': 'card-5'})
+        assert storage.find_card_paths('card-5') == [fourth['max_path'], fourth['min_path']]
+        assert storage.card_index.stats() == {'cards': 3, 'paths': 6}
+        
+        # 인덱스 저장소도 같은 API 제공
+        indexed = NBverseIndexedStorage(data_dir=os.path.join(test_dir, "indexed"))
+        saved = indexed.save_text("안녕하세요", metadata={'card_id': 'card-3'})
+        paths = indexed.find_card_paths('card-3')
+        assert paths == [saved['max_path']]
+        data = indexed.load_from_path(paths[0])
+        data['metadata']['score'] = 120.0
+        indexed.save_to_path(paths[0], data)
+        assert indexed.load_from_path(saved['min_path'])['metadata']['score'] == 120.0
+        assert indexed.remove_card('card-3') == 1
+        assert indexed.find_card_paths('card-3') == []
+        
+        print("카드 ID 인덱스 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_card_index()
@@ -0,0 +1,181 @@
+"""
+숫자 배열 열(.col) 저장 테스트
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseIndexedStorage, ColumnArray
+from NBverse.columns import sidecar_paths, MIN_COLUMN_LENGTH
+
+TEXT = ",".join(str(100 + i % 13) for i in range(300))
+PRICES = [50000000.0 + i * 0.25 for i in range(200)]
+
+
+def _raw(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _age(paths, seconds):
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def test_round_trip():
+    """unicodeArray / chart_data.prices는 .col 파일에 저장되고 읽을 때 원래 값으로 복원"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_columns_test_")
+    
+    try:
+        storage = NBverseStorage(data_dir=test_dir)
+        metadata = {'card_id': 'card-1', 'chart_data': {'prices': PRICES, 'timeframe': '1m'}}
+        saved = storage.save_text(TEXT, metadata=metadata)
+        expected = storage.converter.text_to_nb(TEXT)['unicodeArray']
+        
+        for path in (saved['max_path'], saved['min_path']):
+            raw = _raw(path)
+            assert raw['nb']['unicodeArray']['dtype'] == '<i4'
+            assert raw['nb']['unicodeArray']['count'] == len(expected)
+            assert raw['metadata']['chart_data']['prices']['dtype'] == '<f8'
+            assert len(sidecar_paths(path)) == 1
+            
+            data = storage.load_from_path(path)
+            assert data['nb']['unicodeArray'] == expected
+            assert data['metadata']['chart_data'] == {'prices': PRICES, 'timeframe': '1m'}
+            assert isinstance(data['nb']['unicodeArray'], list)
+        assert metadata['chart_data']['prices'] is PRICES  # 호출자 데이터는 바꾸지 않음
+        
+        # 지연 변환
+        lazy = storage.load_from_path(saved['max_path'], lazy_columns=True)
+        prices = lazy['metadata']['chart_data']['prices']
+        assert isinstance(prices, ColumnArray) and len(prices) == len(PRICES)
+        assert prices[0] == PRICES[0] and prices[-1] == PRICES[-1] and prices[:3] == PRICES[:3]
+        assert prices == PRICES and list(prices) == PRICES
+        try:
+            import numpy as np
+            assert np.array_equal(prices.to_numpy(), np.array(PRICES))
+        except ImportError:
+            pass
+        
+        # 기존 형식(숫자 목록) 파일도 그대로 읽음
+        inline = NBverseStorage(data_dir=os.path.join(test_dir, "inline"), columnar=False)
+        old = inline.save_text(TEXT, metadata={'chart_data': {'prices': PRICES}})
+        assert _raw(old['max_path'])['nb']['unicodeArray'] == expected
+        assert not sidecar_paths(old['max_path'])
+        assert storage.load_from_path(old['max_path'])['metadata']['chart_data']['prices'] == PRICES
+        
+        # 짧은 배열 / int32 범위 밖 값은 JSON에 그대로 둠
+        short = storage.save_text("abc", metadata={'chart_data': {'prices': [1.0, 2.0]}})
+        assert not sidecar_paths(short['max_path'])
+        big = storage.save_precomputed("big", 1.5, 1.5, unicode_array=[2 ** 40] * 20)
+        assert _raw(big['max_path'])['nb']['unicodeArray'] == [2 ** 40] * 20
+        assert not sidecar_paths(big['max_path'])
+        
+        # 정수만 있는 가격 목록은 int64로 저장 (100 -> 100.0으로 바뀌지 않음), 정수/실수가 섞였으면 JSON에 그대로 둠
+        int_prices = list(range(100, 100 + MIN_COLUMN_LENGTH))
+        ints = storage.save_text(TEXT, metadata={'chart_data': {'prices': int_prices}})
+        assert _raw(ints['max_path'])['metadata']['chart_data']['prices']['dtype'] == '<i8'
+        loaded = storage.load_from_path(ints['max_path'])['metadata']['chart_data']['prices']
+        assert loaded == int_prices and all(type(v) is int for v in loaded)
+        lazy_ints = storage.load_from_path(ints['max_path'], lazy_columns=True)['metadata']['chart_data']['prices']
+        assert lazy_ints == int_prices and type(lazy_ints[0]) is int
+        mixed_prices = int_prices[:-1] + [100.5]
+        mixed = storage.save_text(TEXT, metadata={'chart_data': {'prices': mixed_prices}})
+        assert _raw(mixed['max_path'])['metadata']['chart_data']['prices'] == mixed_prices
+        loaded = storage.load_from_path(mixed['max_path'])['metadata']['chart_data']['prices']
+        assert [type(v) for v in loaded] == [type(v) for v in mixed_prices]
+        
+        # 인덱스 저장소의 기존 파일 경로 읽기도 변환
+        indexed = NBverseIndexedStorage(data_dir=os.path.join(test_dir, "indexed"))
+        assert indexed.load_from_path(saved['max_path'])['nb']['unicodeArray'] == expected
+        print("열 저장 읽기/쓰기 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_update_and_remove():
+    """갱신 시 바뀐 배열만 새 .col 파일로 쓰고, 카드 삭제 시 .col 파일도 삭제"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_columns_update_test_")
+    
+    try:
+        storage = NBverseStorage(data_dir=test_dir)
+        saved = storage.save_text(TEXT, metadata={'card_id': 'card-1', 'chart_data': {'prices': PRICES}})
+        path = saved['max_path']
+        before = sidecar_paths(path)
+        _age(before, 3600)
+        mtime = os.path.getmtime(before[0])
+        
+        # 배열이 그대로면 .col 파일을 다시 쓰지 않음 (ColumnArray는 바이트 그대로 저장)
+        data = storage.load_from_path(path, lazy_columns=True)
+        data['metadata']['score'] = 90
+        storage.save_to_path(path, data)
+        assert sidecar_paths(path) == before and os.path.getmtime(before[0]) == mtime
+        assert storage.load_from_path(path)['metadata']['score'] == 90
+        
+        # 배열이 바뀌면 새 .col 파일, 이전 파일은 삭제
+        data = storage.load_from_path(path)
+        data['metadata']['chart_data']['prices'] = PRICES[1:] + [1.0]
+        storage.save_to_path(path, data)
+        after = sidecar_paths(path)
+        assert len(after) == 1 and after != before
+        assert storage.load_from_path(path)['metadata']['chart_data']['prices'] == PRICES[1:] + [1.0]
+        
+        # .col 파일이 없으면 None (손상 파일과 같게 처리)
+        os.remove(after[0])
+        assert storage.load_from_path(path) is None
+        
+        assert storage.remove_card('card-1') == 2
+        assert not sidecar_paths(saved['min_path'])
+        print("열 저장 갱신/삭제 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_compaction():
+    """압축 시 삭제한 JSON의 .col 파일과 주인이 없는 .col 파일도 삭제"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_columns_compaction_test_")
+    
+    try:
+        storage = NBverseStorage(data_dir=test_dir)
+        first = storage.save_text(TEXT, metadata={'timestamp': 1})
+        latest = storage.save_text(TEXT, metadata={'timestamp': 2})
+        folder = os.path.dirname(latest['max_path'])
+        orphan = os.path.join(folder, "0.1000000000_20200101_000000_000000.0123456789abcdef.col")
+        with open(orphan, 'wb') as f:
+            f.write(b'\0' * 16)
+        recent_orphan = os.path.join(folder, "0.1000000000_20200101_000000_000001.0123456789abcdef.col")
+        with open(recent_orphan, 'wb') as f:
+            f.write(b'\0' * 16)
+        
+        files = [os.path.join(root, name)
+                 for base_dir in (storage.max_dir, storage.min_dir)
+                 for root, _, names in os.walk(base_dir) for name in names]
+        _age([path for path in files if path != recent_orphan], 3600)
+        
+        dry = storage.compact(dry_run=True)
+        assert dry['duplicate_texts'] == 2 and dry['column_files'] == 3, dry
+        report = storage.compact()
+        # max/min 폴더의 이전 JSON 2개 + 그 .col 파일 2개 + 주인 없는 .col 파일 1개
+        assert report['duplicate_texts'] == 2 and report['column_files'] == 3, report
+        assert report['files_removed'] == 5, report
+        assert not os.path.exists(orphan) and os.path.exists(recent_orphan)
+        assert not sidecar_paths(first['max_path']) and not sidecar_paths(first['min_path'])
+        assert len(sidecar_paths(latest['max_path'])) == 1
+        assert storage.load_from_path(latest['max_path'])['nb']['unicodeArray']
+        print("열 저장 압축 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_update_and_remove()
+    test_compaction()
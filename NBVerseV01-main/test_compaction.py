@@ -0,0 +1,144 @@
+"""
+저장소 압축 테스트
+"""
+
+import os
+import sys
+import time
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseCompactionScheduler
+
+
+def _json_files(storage):
+    return sorted(
+        os.path.join(root, name)
+        for base_dir in (storage.max_dir, storage.min_dir)
+        for root, _, files in os.walk(base_dir)
+        for name in files
+    )
+
+
+def _age(paths, seconds):
+    """파일 수정 시각을 과거로 옮김 (최근 파일 보호 시간 밖으로)"""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def test_compaction():
+    """중복 텍스트 / 카드 이전 버전 / 보존 기간 / 빈 폴더 정리 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_compaction_test_")
+    
+    try:
+        storage = NBverseStorage(data_dir=test_dir)
+        storage.save_text("1,2,3")  # 인덱스 파일 생성 후 저장하도록 먼저 한 번 검색
+        storage.find_similar_by_nb_range(5.0, 5.0)
+        storage.find_card_paths('none')
+        
+        # 같은 텍스트를 여러 번 저장 (차트 분석 저장처럼)
+        for i in range(3):
+            storage.save_text("100,101,102", metadata={'timestamp': i})
+        latest_text = storage.save_text("100,101,102", metadata={'timestamp': 3})
+        # card_type이 다르면 같은 텍스트라도 유지
+        other_type = storage.save_text("100,101,102", metadata={'card_type': 'chart_analysis'})
+        
+        # 같은 카드 ID로 두 번 저장 (판매 시 전체 카드 정보를 다시 저장하는 경우)
+        first_card = storage.save_text("card-text-1", metadata={'card_id': 'card-1'})
+        second_card = storage.save_text("card-text-2", metadata={'card_id': 'card-1', 'has_sold': True})
+        
+        # 오래된 파일 (보존 기간 경과 대상)
+        old = storage.save_nb_values(0.77, 3.3, text="old-text")
+        # 저장 도중 남은 임시 파일 / 빈 파일
+        leftover = os.path.join(os.path.dirname(latest_text['max_path']), "x.json.123_456.tmp")
+        with open(leftover, 'w') as f:
+            f.write("{")
+        empty = os.path.join(os.path.dirname(latest_text['min_path']), "0.0000000000_20200101_000000_000000.json")
+        open(empty, 'w').close()
+        
+        before = _json_files(storage)
+        _age(before, 3600)
+        _age([first_card['max_path'], first_card['min_path']], 7200)  # 첫 번째 카드 파일이 더 오래됨
+        
+        # 시험 실행: 아무것도 지우지 않음
+        dry = storage.compact(dry_run=True)
+        assert _json_files(storage) == before
+        assert dry['duplicate_texts'] == 6 and dry['card_versions'] == 2, dry
+        
+        # 최근 파일 보호 시간 안이면 지우지 않음
+        assert storage.compact(min_age_seconds=86400)['files_removed'] == 0
+        
+        report = storage.compact()
+        assert report['duplicate_texts'] == 6, report  # max/min 폴더 각각 3개
+        assert report['card_versions'] == 2, report
+        assert report['temp_files'] == 1 and report['empty_files'] == 1, report
+        assert report['files_removed'] == 10 and report['bytes_freed'] > 0
+        assert report['dirs_removed'] > 0 and report['inodes_freed'] == report['files_removed'] + report['dirs_removed']
+        
+        remaining = set(_json_files(storage))
+        for path in (latest_text['max_path'], latest_text['min_path'],
+                     other_type['max_path'], other_type['min_path'],
+                     second_card['max_path'], second_card['min_path'],
+                     old['max_path'], old['min_path']):
+            assert path in remaining, path
+        assert first_card['max_path'] not in remaining
+        assert not os.path.exists(leftover) and not os.path.exists(empty)
+        
+        # 인덱스도 정리됨
+        assert storage.find_card_paths('card-1') == [second_card['max_path'], second_card['min_path']]
+        assert storage.card_index.stats() == {'cards': 1, 'paths': 2}
+        indexed = {path for _, path in storage.max_index.iter_range(-1e9, 1e9)}
+        assert indexed == {path for path in remaining if path.startswith(storage.max_dir)}
+        assert NBverseStorage(data_dir=test_dir).find_card_paths('card-1') == [second_card['max_path'], second_card['min_path']]
+        
+        # 빈 숫자 폴더가 남지 않음 (max/min 폴더는 유지)
+        for base_dir in (storage.max_dir, storage.min_dir):
+            assert os.path.isdir(base_dir)
+            for root, dirs, files in os.walk(base_dir):
+                assert root == base_dir or dirs or files, root
+        
+        # 보존 기간: 카드가 아닌 파일 중 기간이 지난 것 삭제 (카드 파일은 유지)
+        expired = storage.compact(retention_days=1e-9)
+        assert expired['expired'] == len(remaining) - 2, expired
+        assert set(_json_files(storage)) == {second_card['max_path'], second_card['min_path']}
+        
+        # 두 번째 실행은 지울 것이 없음
+        assert storage.compact()['files_removed'] == 0
+        print("저장소 압축 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_scheduler():
+    """주기 실행 스레드 시작/중지와 결과 콜백 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_compaction_scheduler_test_")
+    
+    try:
+        storage = NBverseStorage(data_dir=test_dir)
+        for _ in range(2):
+            storage.save_text("5,6,7")
+        _age(_json_files(storage), 3600)
+        
+        reports = []
+        scheduler = NBverseCompactionScheduler(storage, interval_seconds=0.05, initial_delay_seconds=0,
+                                               on_report=reports.append)
+        scheduler.start()
+        deadline = time.time() + 10
+        while len(reports) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        scheduler.stop(timeout=10)
+        assert len(reports) >= 2 and reports[0]['duplicate_texts'] == 2, reports[:1]
+        assert scheduler.last_report is reports[-1]
+        assert len(_json_files(storage)) == 2
+        print("저장소 압축 주기 실행 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_compaction()
+    test_scheduler()
@@ -0,0 +1,116 @@
+"""
+N/B 값 골든 회귀 테스트
+계산 경로(반올림, 백엔드 등)를 바꿔도 bitMax/bitMin이 비트 단위로 동일한지 확인합니다.
+
+- GOLDEN_ENTRIES: 기존 Decimal 반올림 구현으로 계산해 둔 기준 값
+- data/nbverse: 실제로 저장된 항목이 있으면 함께 검증 (경로는 인자로 지정 가능)
+"""
+
+import os
+import sys
+import json
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import TextToNBConverter
+from NBverse.calculator import NBValueCalculator
+from NBverse.utils import word_nb_unicode_format
+
+DEFAULT_STORAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "nbverse")
+MAX_STORED_ENTRIES = 200  # 저장 항목 검증 최대 개수 (긴 가격 문자열은 계산이 느림)
+
+# 기존 Decimal 반올림 구현으로 계산한 기준 값 (bit=5.5, decimal_places=10)
+GOLDEN_ENTRIES = [
+    ('75632000.0,75596000.0', 0.6307539683, 5.1460793653),
+    ('122318000.0,122651000.0', 0.5259420292, 5.2257246376),
+    ('91341000.0,91232000.0', 0.5342857143, 5.2425476193),
+    ('86636000.0,86737000.0,86579000.0', 0.6497983866, 5.0288037639),
+    ('70123000.0,70184000.0,70057000.0', 0.5251612899, 5.1534408605),
+    ('134834000.0,134656000.0,134363000.0', 0.5597058827, 5.1031372549),
+    ('76757000.0,76630000.0,77028000.0,76817000.0,77068000.0', 0.6018996036, 5.0025658039),
+    ('69987000.0,69875000.0,69656000.0,70032000.0,70203000.0', 0.5822851152, 5.0221802942),
+    ('133762000.0,134021000.0,133599000.0,134146000.0,134035000.0', 0.5119725301, 5.0834872405),
+    ('94479000.0,94375000.0,94255000.0,94438000.0,94306000.0,94396000.0,94516000.0,94581000.0', 0.5865784566, 4.9778013913),
+    ('67266000.0,67138000.0,66990000.0,67130000.0,66949000.0,67098000.0,67162000.0,67283000.0', 0.5776004653, 4.986779383),
+    ('62110000.0,62256000.0,62276000.0,62431000.0,62468000.0,62524000.0,62592000.0,62245000.0', 0.5181212713, 5.0462585778),
+    ('101546000.0,101887000.0,101684000.0,102002000.0,101703000.0,101734000.0,101846000.0,101882000.0,101951000.0,101846000.0,101631000.0,101605000.0', 0.4762477429, 5.062742867),
+    ('68612000.0,68838000.0,68665000.0,68698000.0,68535000.0,68627000.0,68492000.0,68465000.0,68672000.0,68809000.0,68535000.0,68460000.0', 0.5973394006, 4.9452503443),
+    ('148817000.0,148979000.0,149147000.0,148730000.0,149058000.0,148914000.0,149085000.0,148674000.0,148954000.0,148996000.0,149155000.0,148786000.0', 0.5829180215, 4.9560725888),
+    ('67325000.0,67195000.0,67263000.0,67370000.0,67226000.0,67394000.0,67031000.0,66931000.0,66951000.0,67202000.0,67419000.0,67054000.0,66964000.0,67011000.0,67005000.0,67435000.0,67383000.0,67488000.0,67001000.0,67131000.0', 0.5425863275, 4.9828112253),
+    ('142935000.0,142835000.0,143006000.0,142818000.0,142836000.0,143007000.0,142600000.0,142609000.0,142859000.0,142480000.0,143052000.0,142968000.0,142579000.0,143024000.0,142945000.0,142673000.0,142823000.0,143020000.0,142476000.0,142785000.0', 0.5119654706, 5.0112978331),
+    ('102220000.0,102206000.0,101873000.0,102155000.0,101758000.0,101794000.0,101909000.0,101828000.0,102081000.0,101977000.0,102227000.0,102010000.0,101777000.0,102263000.0,102227000.0,102057000.0,101996000.0,101730000.0,101824000.0,102127000.0', 0.4718250054, 5.0514382983),
+    ('82595000.0,82332000.0,82267000.0,82805000.0,82456000.0,82328000.0,82398000.0,82347000.0,82420000.0,82630000.0,82805000.0,82523000.0,82829000.0,82773000.0,82537000.0,82457000.0,82609000.0,82699000.0,82395000.0,82562000.0,82260000.0,82402000.0,82483000.0,82809000.0,82806000.0,82666000.0,82411000.0,82633000.0,82448000.0,82501000.0', 0.5439066643, 4.9729734057),
+    ('140013000.0,140097000.0,139774000.0,140272000.0,139988000.0,140065000.0,140152000.0,140064000.0,140215000.0,140121000.0,140010000.0,140284000.0,139920000.0,140207000.0,140154000.0,139981000.0,140168000.0,140021000.0,140024000.0,139769000.0,139854000.0,140012000.0,139893000.0,139863000.0,139928000.0,140251000.0,139783000.0,140040000.0,139898000.0,140143000.0', 0.5015283986, 5.0139371465),
+    ('90392000.0,90825000.0,90779000.0,90601000.0,90859000.0,90910000.0,90556000.0,90770000.0,90396000.0,90428000.0,90856000.0,90640000.0,90690000.0,90687000.0,90570000.0,90688000.0,90463000.0,90875000.0,90710000.0,90896000.0,90559000.0,90429000.0,90675000.0,90834000.0,90704000.0,90944000.0,90477000.0,90535000.0,90396000.0,90507000.0', 0.5536224175, 4.9632576485),
+    ('544.03,435.158,652.5,698.6673,499.4805,746.5837', 0.7127274128, 4.9076349062),
+    ('102.8,527.0734,573.02,570.596,17.38,167.6083,451.242,461.35,764.018,321.332', 0.5982876861, 4.9765321314),
+    ('716.296,795.027,655.51,16.8,293.6099,785.968,382.9578,520.8497,571.81,243.69', 0.7072292393, 4.866592982),
+    ('274.0,470.1,191.85,491.304,166.0817,813.647,353.907,98.6,819.5893,107.454,446.1,46.4689,228.14', 0.6358197965, 4.9237142517),
+    ('안녕하세요', 0.5976666666, 6.2865),
+    ('Hello World', 3.374, 2.6796666668),
+    ('NBVerse 테스트 문장입니다.', 2.3929193898, 3.4327668846),
+    ('ab', 5.4266666667, -5.4633333333),
+    ('😀🚀 N/B', 2.1987777777, 4.4085555556),
+    ('-12.5,3.0,-7.25', 0.4632222223, 5.4322539684),
+]
+
+
+def test_golden_values():
+    """기준 값의 bitMax/bitMin과 비트 단위로 동일한지 확인"""
+    for text, bit_max, bit_min in GOLDEN_ENTRIES:
+        # SUPER_BIT 상태가 결과에 영향을 주지 않도록 항목마다 새 변환기 사용
+        converter = TextToNBConverter(bit=5.5, decimal_places=10)
+        result = converter.text_to_nb(text)
+        assert repr(result['bitMax']) == repr(bit_max), (text, result['bitMax'], bit_max)
+        assert repr(result['bitMin']) == repr(bit_min), (text, result['bitMin'], bit_min)
+    
+    print(f"골든 값 테스트 통과: {len(GOLDEN_ENTRIES)}개 항목")
+
+
+def _iter_stored_entries(storage_dir: str):
+    """저장소의 max 폴더에서 텍스트가 있는 항목 읽기"""
+    max_dir = os.path.join(storage_dir, "max")
+    for root, _, files in os.walk(max_dir):
+        for file_name in sorted(files):
+            if not file_name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(root, file_name), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get('text') and isinstance(data.get('nb'), dict):
+                yield data
+
+
+def test_stored_entries(storage_dir: str = DEFAULT_STORAGE_DIR):
+    """저장된 항목의 bitMax/bitMin을 다시 계산하여 비트 단위로 동일한지 확인"""
+    if not os.path.isdir(storage_dir):
+        print(f"저장소 항목 테스트 건너뜀: {storage_dir} 없음")
+        return
+    
+    checked = 0
+    skipped = 0
+    for data in _iter_stored_entries(storage_dir):
+        if checked >= MAX_STORED_ENTRIES:
+            break
+        decimal_places = data.get('decimal_places', 10)
+        calculator = NBValueCalculator(decimal_places=decimal_places)
+        forward, backward = calculator.calculate_bit_pair(word_nb_unicode_format(data['text']), 5.5)
+        
+        # 범위를 벗어난 결과는 저장 당시의 SUPER_BIT 상태에 따라 달라지므로 제외
+        if not all(-100 <= value <= 100 for value in (forward, backward)):
+            skipped += 1
+            continue
+        
+        assert repr(round(forward, decimal_places)) == repr(data['nb']['max']), (data['text'], forward)
+        assert repr(round(backward, decimal_places)) == repr(data['nb']['min']), (data['text'], backward)
+        checked += 1
+    
+    print(f"저장소 항목 테스트 통과: {checked}개 항목 (SUPER_BIT 보정 항목 {skipped}개 제외)")
+
+
+if __name__ == "__main__":
+    test_golden_values()
+    test_stored_entries(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STORAGE_DIR)
@@ -0,0 +1,72 @@
+"""
+NBverse 인덱스 저장소 테스트
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseIndexedStorage
+
+
+def test_indexed_storage():
+    """저장/로드/값 검색/범위 검색 및 기존 데이터 가져오기 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_indexed_test_")
+    
+    try:
+        storage = NBverseIndexedStorage(data_dir=test_dir)
+        
+        # 텍스트 저장 후 경로로 로드
+        saved = storage.save_text("안녕하세요", metadata={'card_id': 'card-1'})
+        data = storage.load_from_path(saved['max_path'])
+        assert data['text'] == "안녕하세요"
+        assert data['metadata']['card_id'] == 'card-1'
+        assert storage.load_from_path(saved['min_path']) == data
+        assert data['nb']['max'] == saved['bitMax']
+        
+        # N/B 값 직접 저장
+        storage.save_nb_values(1.2345678912, 4.5, text="direct")
+        storage.save_nb_values(1.2345671, 4.4)
+        storage.save_nb_values(1.2345689, 9.0)
+        
+        # 값 검색 (소수점 6자리까지 같은 값, 최신순)
+        found = storage.find_by_nb_value(1.234567, folder_type="max")
+        assert [r['data']['nb']['max'] for r in found] == [1.2345671, 1.2345678912]
+        assert storage.find_by_nb_value(4.5, folder_type="min")[0]['data']['text'] == "direct"
+        
+        # 범위 검색 (max 범위 또는 min 범위, 같은 레코드는 한 번만)
+        similar = storage.find_similar_by_nb_range(1.2345, 4.45, range_threshold=0.1)
+        assert len(similar) == 3
+        assert len({r['path'] for r in similar}) == 3
+        assert all(storage.load_from_path(r['path']) == r['data'] for r in similar)
+        
+        # 다시 열어도 데이터 유지
+        reopened = NBverseIndexedStorage(data_dir=test_dir)
+        assert reopened.count() == 4
+        
+        # 전체 레코드 순회 (저장 순서, 작은 묶음으로 나눠 읽어도 같은 결과)
+        records = list(reopened.iter_records(batch_size=3))
+        assert [r['data']['nb']['max'] for r in records] == [saved['bitMax'], 1.2345678912, 1.2345671, 1.2345689]
+        assert records[0]['path'] == saved['max_path'] and records[0]['data'] == data
+        assert not hasattr(reopened, 'max_dir')
+        
+        # 기존 폴더 구조 데이터 가져오기
+        legacy_dir = os.path.join(test_dir, "legacy")
+        legacy = NBverseStorage(data_dir=legacy_dir)
+        legacy_saved = legacy.save_text("Hello World")
+        imported = NBverseIndexedStorage(data_dir=os.path.join(test_dir, "imported"))
+        assert imported.import_from_directory(legacy_dir) == 1
+        assert imported.find_by_nb_value(legacy_saved['bitMax'])[0]['data']['text'] == "Hello World"
+        assert imported.load_from_path(legacy_saved['max_path'])['text'] == "Hello World"
+        
+        print(f"인덱스 저장소 테스트 통과: {reopened.count()}개 레코드")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_indexed_storage()
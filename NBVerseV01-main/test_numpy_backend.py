@@ -0,0 +1,64 @@
+"""
+NumPy 백엔드 테스트
+python 백엔드와 비트 단위로 동일한 결과를 내는지 확인
+"""
+
+import os
+import sys
+import random
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse.calculator import NBValueCalculator, _NUMPY_AVAILABLE
+
+
+def _sample_inputs():
+    """테스트 입력 (유니코드 배열, 음수/양수 혼합, 실수)"""
+    rng = random.Random(42)
+    inputs = [
+        [ord(c) for c in "안녕하세요"],
+        [ord(c) for c in "Hello World"],
+        [ord(c) for c in "101234000.0,101250000.0,101190000.0"],
+        [3, 7],
+        [-5, 12, -3, 8, 0],
+    ]
+    for _ in range(20):
+        inputs.append([rng.uniform(-5.0, 5.0) for _ in range(rng.randint(2, 12))])
+    return inputs
+
+
+def test_numpy_backend():
+    """python/numpy 백엔드 결과 비교"""
+    if not _NUMPY_AVAILABLE:
+        print("NumPy가 설치되지 않아 테스트를 건너뜁니다.")
+        return
+    
+    python_calc = NBValueCalculator(decimal_places=10)
+    numpy_calc = NBValueCalculator(decimal_places=10, backend='numpy')
+    
+    for nb in _sample_inputs():
+        for reverse in (False, True):
+            expected = python_calc.calculate_bit(nb, 5.5, reverse)
+            actual = numpy_calc.calculate_bit(nb, 5.5, reverse)
+            assert actual == expected, f"{nb} (reverse={reverse}): {actual} != {expected}"
+    
+    print("NumPy 백엔드 결과가 python 백엔드와 동일합니다.")
+
+
+def test_calculate_bit_pair():
+    """calculate_bit_pair가 순방향/역방향 calculate_bit와 동일한지 확인"""
+    backends = ['python', 'numpy'] if _NUMPY_AVAILABLE else ['python']
+    
+    for backend in backends:
+        calculator = NBValueCalculator(decimal_places=10, backend=backend)
+        for nb in _sample_inputs():
+            expected = (calculator.calculate_bit(nb, 5.5, False), calculator.calculate_bit(nb, 5.5, True))
+            assert calculator.calculate_bit_pair(nb, 5.5) == expected, f"{backend}: {nb}"
+    
+    print("calculate_bit_pair 결과가 calculate_bit와 동일합니다.")
+
+
+if __name__ == "__main__":
+    test_numpy_backend()
+    test_calculate_bit_pair()
@@ -0,0 +1,88 @@
+"""
+계산된 N/B 값 저장(save_precomputed) / 중복 저장 건너뛰기 테스트
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseIndexedStorage, TextToNBConverter
+
+
+class CountingConverter(TextToNBConverter):
+    """text_to_nb 호출 횟수 기록"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+    
+    def text_to_nb(self, text):
+        self.calls += 1
+        return super().text_to_nb(text)
+
+
+def test_save_precomputed():
+    """save_text와 같은 위치/값으로 저장하고, text_to_nb를 다시 계산하지 않음"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_precomputed_test_")
+    
+    try:
+        text = ",".join(str(100 + i % 7) for i in range(200))
+        result = TextToNBConverter(decimal_places=10).text_to_nb(text)
+        
+        storage = NBverseStorage(data_dir=test_dir)
+        storage.converter = CountingConverter(decimal_places=10)
+        expected = storage.save_text(text)
+        assert storage.converter.calls == 1 and 'duplicate' not in expected
+        
+        saved = storage.save_precomputed(text, result['bitMax'], result['bitMin'], metadata={'timeframe': '1m'})
+        assert storage.converter.calls == 1  # 다시 계산하지 않음
+        assert not saved['duplicate']
+        assert os.path.dirname(saved['max_path']) == os.path.dirname(expected['max_path'])
+        assert os.path.dirname(saved['min_path']) == os.path.dirname(expected['min_path'])
+        data = storage.load_from_path(saved['max_path'])
+        assert data['text'] == text and data['metadata'] == {'timeframe': '1m'}
+        assert data['nb'] == {'max': expected['bitMax'], 'min': expected['bitMin']}  # unicodeArray 생략
+        assert 'unicodeArray' in storage.load_from_path(expected['max_path'])['nb']
+        
+        # 같은 텍스트는 다시 저장하지 않음 (최근 저장 기록)
+        again = storage.save_precomputed(text, result['bitMax'], result['bitMin'],
+                                         metadata={'timeframe': '1m', 'timestamp': 'later'}, skip_duplicate=True)
+        assert again['duplicate'] and again['max_path'] == saved['max_path']
+        
+        # 다른 인스턴스(재시작 후)도 숫자 폴더를 확인하여 건너뜀
+        other = NBverseStorage(data_dir=test_dir)
+        found = other.save_precomputed(text, result['bitMax'], result['bitMin'], skip_duplicate=True)
+        assert found['duplicate'] and found['max_path'] in (saved['max_path'], expected['max_path'])
+        
+        # card_type이 다르거나 텍스트가 다르면 저장
+        typed = other.save_precomputed(text, result['bitMax'], result['bitMin'],
+                                       metadata={'card_type': 'chart_analysis'}, skip_duplicate=True)
+        assert not typed['duplicate']
+        changed = text + ",101"
+        changed_result = other.converter.text_to_nb(changed)
+        assert not other.save_precomputed(changed, changed_result['bitMax'], changed_result['bitMin'],
+                                          skip_duplicate=True)['duplicate']
+        
+        # 파일이 지워졌으면 다시 저장
+        for path in (saved['max_path'], expected['max_path'], typed['max_path']):
+            os.remove(path)
+        assert not storage.save_precomputed(text, result['bitMax'], result['bitMin'], skip_duplicate=True)['duplicate']
+        
+        # 인덱스 저장소도 같은 API 제공
+        indexed = NBverseIndexedStorage(data_dir=os.path.join(test_dir, "indexed"))
+        first = indexed.save_precomputed(text, result['bitMax'], result['bitMin'], skip_duplicate=True)
+        second = indexed.save_precomputed(text, result['bitMax'], result['bitMin'], skip_duplicate=True)
+        assert not first['duplicate'] and second['duplicate'] and second['max_path'] == first['max_path']
+        assert indexed.count() == 1
+        
+        print("계산된 N/B 값 저장 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_save_precomputed()
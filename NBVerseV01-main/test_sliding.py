@@ -0,0 +1,56 @@
+"""
+슬라이딩 윈도우 N/B 계산 테스트
+"""
+
+import os
+import sys
+import random
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import SlidingNBCalculator, TextToNBConverter, NBResultCache
+from NBverse.calculator import NBValueCalculator
+
+
+def test_sliding_window():
+    """슬라이딩 윈도우 결과가 전체 재계산과 같은지 확인"""
+    rng = random.Random(7)
+    calculator = NBValueCalculator(decimal_places=10)
+    sliding = SlidingNBCalculator(bit=5.5, decimal_places=10, max_length=30)
+    
+    # 값 추가/제거 스트림
+    for _ in range(120):
+        sliding.append([rng.randint(44, 57)])
+        if len(sliding) >= 2:
+            assert sliding.calculate_pair() == calculator.calculate_bit_pair(sliding.values, 5.5)
+    
+    # 음수가 섞이면 전체 재계산
+    sliding.reset([3, -2, 7, -5, 1])
+    assert sliding.calculate_pair() == calculator.calculate_bit_pair([3, -2, 7, -5, 1], 5.5)
+    
+    # text_to_nb 형식 호환 (SUPER_BIT 상태가 같도록 새 인스턴스 사용)
+    sliding = SlidingNBCalculator(bit=5.5, decimal_places=10)
+    converter = TextToNBConverter(bit=5.5)
+    prices = [rng.randint(900, 1500) * 100.0 for _ in range(40)]
+    for end in range(10, 40):
+        text = ",".join(str(p) for p in prices[end - 10:end])
+        assert sliding.text_to_nb(text) == converter.text_to_nb(text)
+    # 한 칸씩 밀린 가격 문자열은 윈도우 앞쪽 제거 + 뒤쪽 추가로 반영
+    assert sliding.stats()['window_slides'] == 29, sliding.stats()
+    
+    # 변환기의 계산기(SUPER_BIT)와 결과 캐시 공유
+    shared = TextToNBConverter(bit=5.5, cache=NBResultCache())
+    shared_sliding = SlidingNBCalculator(bit=5.5, decimal_places=10, calculator=shared.calculator, cache=shared.cache)
+    expected = TextToNBConverter(bit=5.5)
+    texts = [",".join(str(p) for p in prices[end - 10:end]) for end in (12, 13, 12, 20)]
+    for text in texts:
+        assert shared_sliding.text_to_nb(text) == expected.text_to_nb(text)
+        assert shared.calculator.SUPER_BIT == expected.calculator.SUPER_BIT
+    assert shared.cache_stats()['hits'] == 1 and shared.text_to_nb(texts[0]) == expected.text_to_nb(texts[0])
+    
+    print(f"슬라이딩 윈도우 테스트 통과: {sliding.stats()}")
+
+
+if __name__ == "__main__":
+    test_sliding_window()
@@ -0,0 +1,153 @@
+"""
+N/B 값 정렬 인덱스 테스트
+"""
+
+import os
+import sys
+import json
+import random
+import tempfile
+import shutil
+
+# 상위 디렉토리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NBverse import NBverseStorage, NBverseIndexedStorage
+from NBverse.value_index import NBValueIndex
+
+
+def _saved_values(results, folder_type="max"):
+    return sorted(r['data']['nb'][folder_type] for r in results)
+
+
+def test_value_index():
+    """범위 검색이 정렬 인덱스로 정확한 결과를 반환하는지 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_index_test_")
+    
+    try:
+        # 인덱스가 생기기 전에 저장된 데이터 (처음 검색할 때 폴더 스캔으로 인덱스 생성)
+        storage = NBverseStorage(data_dir=test_dir)
+        for bit_max, bit_min in [(0.26, 5.1), (0.31, 5.2), (1.5, 4.9)]:
+            storage.save_nb_values(bit_max, bit_min)
+        assert not os.path.exists(storage.max_index.index_path)
+        assert _saved_values(storage.find_similar_by_nb_range(0.3, 100.0, range_threshold=0.05)) == [0.26, 0.31]
+        assert os.path.exists(storage.max_index.index_path)
+        
+        # 인덱스가 있으면 저장할 때 추가 (다른 인스턴스가 저장한 것도 반영)
+        other = NBverseStorage(data_dir=test_dir)
+        other.save_nb_values(0.2999999999, 7.0)
+        storage.save_nb_values(-0.28, 5.0)
+        assert _saved_values(storage._search_in_range(storage.max_dir, 0.25, 0.35, 10)) == [0.26, 0.2999999999, 0.31]
+        assert _saved_values(storage._search_in_range(storage.max_dir, -0.3, 0.0, 10)) == [-0.28]
+        assert _saved_values(storage._search_in_range(storage.min_dir, 4.95, 5.15, 10), "min") == [5.0, 5.1]
+        assert len(storage._search_in_range(storage.max_dir, 0.0, 2.0, 2)) == 2
+        
+        # 조건부 순회 (nb_min >= 5.0 인 데이터를 값 순서대로)
+        assert [r['data']['nb']['min'] for r in storage.iter_nb_range(5.0, float('inf'), "min")] == [5.0, 5.1, 5.2, 7.0]
+        
+        # 인덱스 파일이 없어지면 다시 만듦
+        os.remove(storage.min_index.index_path)
+        rebuilt = NBverseStorage(data_dir=test_dir)
+        assert len(rebuilt.min_index) == 5
+        
+        # 인덱스 저장소도 같은 순회 API 제공
+        indexed = NBverseIndexedStorage(data_dir=os.path.join(test_dir, "indexed"))
+        for bit_max, bit_min in [(0.26, 5.1), (0.31, 5.2), (1.5, 4.9), (0.3, 5.2)]:
+            indexed.save_nb_values(bit_max, bit_min)
+        values = [r['data']['nb']['min'] for r in indexed.iter_nb_range(5.0, float('inf'), "min", batch_size=1)]
+        assert values == [5.1, 5.2, 5.2], values
+        
+        print(f"정렬 인덱스 테스트 통과: max {len(rebuilt.max_index)}개, min {len(rebuilt.min_index)}개")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_segment():
+    """mmap 세그먼트 + 메모리 배열 검색 결과가 로그 전체를 읽은 결과와 같은지 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_segment_test_")
+    
+    try:
+        base_dir = os.path.join(test_dir, "max")
+        index_path = os.path.join(test_dir, "index", "max.idx")
+        rng = random.Random(7)
+        for i in range(300):
+            value = round(rng.uniform(0, 10), 4)
+            folder = os.path.join(base_dir, str(i % 7))
+            os.makedirs(folder, exist_ok=True)
+            open(os.path.join(folder, f"{value:.10f}_20260101_000000_{i:06d}.json"), 'w').close()
+        
+        index = NBValueIndex(index_path, base_dir)
+        assert len(index) == 300 and os.path.exists(index.segment_path)
+        assert index._segment is not None and not index._values
+        
+        # 다른 인스턴스가 추가한 항목은 메모리 배열로, 많이 쌓이면 세그먼트로 합침
+        writer = NBValueIndex(index_path, base_dir)
+        reader = NBValueIndex(index_path, base_dir)
+        reader.SEGMENT_TAIL_MAX = 50
+        for i in range(40):
+            writer.add(os.path.join(base_dir, "new", f"{5 + i / 100:.10f}_20260102_000000_{i:06d}.json"))
+        assert len(reader) == 340 and len(reader._values) == 40
+        for i in range(40, 100):
+            writer.add(os.path.join(base_dir, "new", f"{5 + i / 100:.10f}_20260102_000000_{i:06d}.json"))
+        assert len(reader) == 400 and not reader._values
+        
+        plain = NBValueIndex(index_path, base_dir, use_segment=False)
+        for low, high in [(0, 10), (2.5, 2.5001), (4.9, 5.3), (9.99, 20), (-1, 0)]:
+            expected = plain.find_range(low, high)
+            assert [v for v, _ in reader.find_range(low, high)] == [v for v, _ in expected]
+            assert sorted(reader.find_range(low, high)) == sorted(expected)
+            assert sorted(NBValueIndex(index_path, base_dir).find_range(low, high)) == sorted(expected)
+        
+        # 다른 인스턴스(프로세스)가 인덱스를 다시 만들면 (파일 교체) 이전 읽기 위치를 쓰지 않고 처음부터 다시 읽음
+        shutil.rmtree(os.path.join(base_dir, "0"))
+        NBValueIndex(index_path, base_dir).rebuild()
+        writer.add(os.path.join(base_dir, "new", f"{5.5:.10f}_20260103_000000_000000.json"))
+        expected = NBValueIndex(index_path, base_dir, use_segment=False).find_range(0, 10)
+        assert sorted(reader.find_range(0, 10)) == sorted(expected)
+        assert len(reader) == len(expected) and not os.path.exists(os.path.join(base_dir, "0"))
+        assert not [name for name in os.listdir(os.path.dirname(index_path)) if name.endswith('.tmp')]
+        
+        # 로그가 다시 만들어지면 (다른 로그 기준의) 세그먼트는 쓰지 않음
+        with open(index_path, 'w') as f:
+            f.write(f"{1.0!r}\tonly.json\n")
+        stale = NBValueIndex(index_path, base_dir)
+        assert stale.find_range(0, 10) == [(1.0, os.path.join(base_dir, "only.json"))]
+        print(f"정렬 인덱스 세그먼트 테스트 통과: {len(reader)}개")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_metadata_index():
+    """save_text로 저장한 카드(저장 N/B 값 ≠ metadata N/B 값)를 metadata 값 범위로 찾는지 확인"""
+    test_dir = tempfile.mkdtemp(prefix="nbverse_metadata_index_test_")
+    
+    try:
+        card_json = json.dumps({'card_id': 'card1-a', 'nb_max': 0.61, 'nb_min': 0.42})
+        for storage in (NBverseStorage(data_dir=os.path.join(test_dir, "files")),
+                        NBverseIndexedStorage(data_dir=os.path.join(test_dir, "indexed"))):
+            # 인덱스 파일이 생기기 전에 저장한 카드 (처음 검색할 때 파일 내용으로 인덱스 생성)
+            saved = storage.save_text(card_json, metadata={
+                'card_id': 'card1-a', 'card_type': 'chart_analysis_card', 'nb_max': 0.61, 'nb_min': 0.42
+            })
+            assert not 0.4 <= saved['bitMin'] <= 0.5
+            storage.save_nb_values(0.55, 0.35, metadata={'card_id': 'card2-a', 'nb_max': 0.55, 'nb_min': 0.35})
+            storage.save_text("metadata 없는 텍스트")
+            
+            found = list(storage.iter_metadata_range('nb_min', 0.4, float('inf')))
+            assert [r['data']['metadata']['card_id'] for r in found] == ['card1-a']
+            assert [r['data']['metadata']['card_id'] for r in storage.iter_nb_range(0.4, 0.5, folder_type="min")] == []
+            
+            # 인덱스가 있으면 저장할 때 추가
+            storage.save_text(card_json, metadata={'card_id': 'card1-b', 'nb_max': 0.58, 'nb_min': 0.45})
+            found = list(storage.iter_metadata_range('nb_max', float('-inf'), 0.6))
+            assert [r['data']['metadata']['card_id'] for r in found] == ['card2-a', 'card1-b']
+            assert storage.load_from_path(found[1]['path'])['metadata']['nb_min'] == 0.45
+        print("metadata 인덱스 테스트 통과")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_value_index()
+    test_segment()
+    test_metadata_index()
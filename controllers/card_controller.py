@@ -101,8 +101,9 @@ class CardController(QObject):
             return [card for card in cards 
                    if card.get('card_state') in [CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value]]
         elif filter_type == "판매 완료":
+            # SOLD 여부는 관리자 인덱스에서 조회 (카드 히스토리를 훑지 않음)
             return [card for card in cards 
-                   if any(h.get('type') == 'SOLD' for h in card.get('history_list', []))]
+                   if self.production_card_manager.has_sold_history(card.get('card_id', ''))]
         elif filter_type == "폐기":
             if self.discarded_card_manager:
                 return self.discarded_card_manager.get_all_discarded_cards()
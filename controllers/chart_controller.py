@@ -22,6 +22,9 @@ class ChartController(QObject):
         self._chart_worker = None
         self._nb_max_min_worker = None
         
+        # 타임프레임별 슬라이딩 N/B 계산기 (구간 구조/기여도 재사용)
+        self._sliding_nb_calculators = {}
+        
         # 상태 변수
         self._chart_updating = False
         self.chart_timeframes = ['1m', '3m', '5m', '15m', '30m', '60m', '1d']
@@ -80,12 +83,36 @@ class ChartController(QObject):
         from workers.chart_workers import NBMaxMinWorker
         self._nb_max_min_worker = NBMaxMinWorker(
             chart_data,
-            self.nbverse_converter,
+            self._get_nb_calculator(chart_data.get('timeframe')),
             self.settings_manager
         )
         self._nb_max_min_worker.max_min_ready.connect(self._on_max_min_ready)
         self._nb_max_min_worker.start()
     
+    def _get_nb_calculator(self, timeframe):
+        """타임프레임별 슬라이딩 N/B 계산기 반환 (사용할 수 없으면 공용 변환기)
+        
+        새 봉이 추가되어 가격 문자열의 앞쪽이 빠지고 뒤쪽이 추가되면 계산기가 바뀐 부분만 윈도우에 반영합니다.
+        공용 변환기의 계산기(SUPER_BIT 상태)와 결과 캐시를 함께 사용합니다.
+        """
+        if not self.nbverse_converter:
+            return None
+        
+        calculator = self._sliding_nb_calculators.get(timeframe)
+        if calculator is None:
+            try:
+                from NBverse import SlidingNBCalculator
+            except ImportError:
+                return self.nbverse_converter
+            calculator = SlidingNBCalculator(
+                bit=getattr(self.nbverse_converter, 'bit', 5.5),
+                decimal_places=getattr(self.nbverse_converter, 'decimal_places', 10),
+                calculator=getattr(self.nbverse_converter, 'calculator', None),
+                cache=getattr(self.nbverse_converter, 'cache', None)
+            )
+            self._sliding_nb_calculators[timeframe] = calculator
+        return calculator
+    
     def _on_max_min_ready(self, bit_max, bit_min):
         """MAX/MIN 계산 완료"""
         try:
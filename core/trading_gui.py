@@ -107,7 +107,8 @@ class TradingBotGUI(QMainWindow):
             
             self.nbverse_storage, self.nbverse_converter = init_nbverse_storage(
                 data_dir=data_dir,
-                decimal_places=nb_decimal_places
+                decimal_places=nb_decimal_places,
+                storage_backend=self.settings_manager.get("nbverse_storage_backend", "directory")
             )
             
             if not self.nbverse_storage or not self.nbverse_converter:
@@ -520,6 +521,12 @@ class TradingBotGUI(QMainWindow):
                     except Exception as e:
                         print(f"⚠️ 카드 저장 오류 ({card.get('card_id', 'unknown')}): {e}")
                 
+                # 저장 워커에 대기 중인 카드/임시 저장 파일을 종료 전에 모두 기록
+                try:
+                    self.production_card_manager.flush()
+                except Exception as e:
+                    print(f"⚠️ 카드 저장 완료 대기 오류: {e}")
+                
                 print(f"✓ {saved_count}개 카드 상태 저장 완료")
             
             # 워커 종료
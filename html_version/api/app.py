@@ -6,8 +6,11 @@ import os
 import sys
 import json
 import time
+import atexit
+import threading
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import pyupbit
 from dotenv import load_dotenv
@@ -34,9 +37,13 @@ print(f"📁 작업 디렉토리: {os.getcwd()}")
 print(f"📁 Python 경로에 추가: {parent_dir_normalized}")
 print(f"📁 nbverse_helper 경로 확인: {os.path.join(parent_dir_normalized, 'nbverse_helper.py')}")
 
-from nbverse_helper import init_nbverse_storage, calculate_nb_value_from_chart
+from nbverse_helper import init_nbverse_storage, calculate_nb_value_from_chart, start_nbverse_compaction
 from managers import SettingsManager, ProductionCardManager, DiscardedCardManager
-from utils import load_config
+from managers.card_records import json_default, to_plain
+from utils import load_config, TTLCache, RateLimiter
+from services.market_data_service import get_market_data_service
+from services.candle_store import get_candle_store
+from services.price_feed import PriceFeed
 
 # ML 모델 관리자 제거됨
 
@@ -65,7 +72,18 @@ def load_env_local():
 # env.local 파일 로드
 load_env_local()
 
+class CardJSONProvider(DefaultJSONProvider):
+    """카드 레코드(ProductionCard/HistoryEntry)와 array('d') 가격/점수 시리즈도 JSON으로 변환"""
+    
+    @staticmethod
+    def default(o):
+        try:
+            return json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
 app = Flask(__name__)
+app.json = CardJSONProvider(app)
 CORS(app)  # CORS 활성화
 
 # 응답 압축 활성화 (성능 향상)
@@ -97,13 +115,16 @@ discarded_card_manager = None
 upbit = None
 cfg = None
 # rl_system 제거됨
-_price_cache_value = 0.0
-_price_cache_time = 0.0
-_price_call_times = []  # 최근 호출 시각(초) 목록
+# 가격 캐시 (Flask 전용, 요청 스레드 공유) - key: 마켓 코드, 유효 시간은 설정값(price_cache_ttl_seconds)
+_price_cache = TTLCache(max_size=16, ttl=60)
+_price_rate_limiter = RateLimiter(period=60)  # 최근 60초 가격 API 호출 수
 
-# OHLCV 캐시 시스템 (메모리 기반)
-_ohlcv_cache = {}  # key: f"{market}_{interval}_{count}", value: {"data": [...], "timestamp": time.time()}
+# OHLCV 캐시 시스템 (메모리 기반) - key: f"{market}_{interval}_{count}", value: 변환된 봉 목록
 _ohlcv_cache_ttl = 180  # 캐시 유효 시간 (초) - 180초(3분)간 캐시 유지 (성능 최적화)
+_ohlcv_cache = TTLCache(max_size=300, ttl=_ohlcv_cache_ttl)
+
+# N/B 배치 계산 제한
+_NB_BATCH_MAX_ITEMS = 64  # 한 번에 계산할 최대 입력 수
 
 
 class TimeoutError(Exception):
@@ -117,10 +138,10 @@ def time_limit(seconds):
     def signal_handler(signum, frame):
         raise TimeoutError(f"Timed out after {seconds} seconds")
     
-    # Windows에서는 SIGALRM이 지원되지 않으므로 다른 방법 사용
-    if sys.platform == 'win32':
-        # Windows: threading을 사용한 타임아웃
-        import threading
+    # Windows에서는 SIGALRM이 지원되지 않고, signal은 메인 스레드에서만 설정 가능
+    # (waitress/ASGI 레인 스레드에서 호출되면 signal.signal이 ValueError) -> 다른 방법 사용
+    if sys.platform == 'win32' or threading.current_thread() is not threading.main_thread():
+        # Windows/작업 스레드: threading을 사용한 타임아웃
         timer = threading.Timer(seconds, lambda: None)
         try:
             timer.start()
@@ -519,28 +540,48 @@ def _verify_prediction(previous_card: dict, current_card: dict, chart_data: dict
         }
 
 
-def _get_btc_price_cached():
-    """설정 기반 캐시/레이트리밋을 적용해 BTC 현재가를 반환"""
-    global _price_cache_value, _price_cache_time, _price_call_times
-
+def _price_settings():
+    """(캐시 유효 시간, 분당 호출 한도)"""
     ttl = settings_manager.get('price_cache_ttl_seconds', 60) if settings_manager else 60
     rate_limit = settings_manager.get('price_rate_limit_per_min', 10) if settings_manager else 10
+    return ttl, rate_limit
 
-    now = time.time()
+
+def _get_btc_price_cached():
+    """설정 기반 캐시/레이트리밋을 적용해 BTC 현재가를 반환 (가격 피드가 돌고 있으면 항상 캐시 적중)"""
+    ttl, rate_limit = _price_settings()
 
     # 1) 캐시 유효하면 반환
-    if _price_cache_time > 0 and (now - _price_cache_time) < ttl and _price_cache_value > 0:
-        return _price_cache_value
+    price = _price_cache.get("KRW-BTC")
+    if price is not None:
+        return price
 
+    # 동시에 들어온 요청은 한 스레드만 조회하고 나머지는 그 결과 사용
+    with _price_cache.lock_for("KRW-BTC"):
+        price = _price_cache.get("KRW-BTC")
+        if price is not None:
+            return price
+        return _fetch_btc_price(ttl, rate_limit)
+
+
+def _fetch_btc_price(ttl: float, rate_limit: int) -> float:
+    """레이트 리밋 안에서 BTC 현재가 조회 후 캐시에 저장 (_get_btc_price_cached의 키 잠금 안에서 호출)"""
     # 2) 레이트 리밋 확인 (최근 60초)
-    _price_call_times = [t for t in _price_call_times if now - t < 60]
-    if len(_price_call_times) >= rate_limit:
-        if _price_cache_value > 0:
+    if not _price_rate_limiter.try_acquire(rate_limit):
+        stale_price = _price_cache.peek("KRW-BTC")
+        if stale_price is not None:
             print("⚠️ 가격 API 레이트 리밋 초과, 캐시된 가격 반환")
-            return _price_cache_value
+            return stale_price
         raise Exception("가격 API 호출 한도 초과 (캐시 없음)")
 
-    # 3) 실시간 조회 (다중 fallback)
+    # 3) 실시간 조회
+    price = _request_btc_price(ttl)
+    _price_cache.set("KRW-BTC", price, ttl=ttl)
+    return price
+
+
+def _request_btc_price(ttl: float) -> float:
+    """거래소에서 BTC 현재가 조회 (다중 fallback, 캐시/레이트리밋 없음)"""
     price = None
     try:
         price = pyupbit.get_current_price("KRW-BTC")
@@ -557,7 +598,7 @@ def _get_btc_price_cached():
 
     if not price or price <= 0:
         try:
-            df_last = pyupbit.get_ohlcv("KRW-BTC", interval='minute1', count=1)
+            df_last = get_market_data_service().get_ohlcv("KRW-BTC", 'minute1', 1, max_age=ttl)
             if df_last is not None and not df_last.empty:
                 price = float(df_last['close'].iloc[-1])
         except Exception as e:
@@ -565,11 +606,36 @@ def _get_btc_price_cached():
 
     if not price or price <= 0:
         raise Exception("현재 가격을 가져올 수 없습니다.")
+    return float(price)
+
+
+def _feed_fetch_btc_price(market: str):
+    """가격 피드 fetcher - 레이트 리밋 안에서 조회하고 가격 캐시도 갱신 (한도 초과면 이번 틱 건너뜀)"""
+    ttl, rate_limit = _price_settings()
+    if not _price_rate_limiter.try_acquire(rate_limit):
+        return None
+    price = _request_btc_price(ttl)
+    _price_cache.set(market, price, ttl=ttl)
+    return price
+
 
-    _price_call_times.append(now)
-    _price_cache_value = float(price)
-    _price_cache_time = now
-    return _price_cache_value
+def _price_push_interval() -> float:
+    """가격 피드 조회 주기 (초) - 설정값(price_push_interval_seconds)과 분당 호출 한도 중 느린 쪽"""
+    _, rate_limit = _price_settings()
+    push_interval = settings_manager.get('price_push_interval_seconds', 2.0) if settings_manager else 2.0
+    return max(float(push_interval), 60.0 / max(int(rate_limit), 1))
+
+
+# 가격 피드 (SSE 구독자 전체가 공유하는 가격 생산자 하나, 구독자가 없으면 멈춤)
+_price_feed = PriceFeed(fetcher=_feed_fetch_btc_price, market="KRW-BTC")
+_PRICE_STREAM_KEEPALIVE_SECONDS = 15
+_PRICE_STREAM_MAX_SECONDS = 300  # 연결을 주기적으로 끊어 서버 스레드 반환 (EventSource가 자동 재연결)
+
+# Waitress 모드에서는 스트림 연결 하나가 작업 스레드 하나를 계속 차지하므로 동시 연결 수를 제한
+# (가득 차면 503 -> 브라우저는 폴링으로 대체, ASGI 모드(asgi.py)는 스레드를 쓰지 않으므로 제한 없음)
+_SERVER_THREADS = 8
+_PRICE_STREAM_MAX_CLIENTS = 2
+_price_stream_slots = threading.BoundedSemaphore(_PRICE_STREAM_MAX_CLIENTS)
 
 
 def _map_timeframe_to_interval(timeframe: str) -> str:
@@ -595,18 +661,8 @@ def _map_timeframe_to_interval(timeframe: str) -> str:
 
 
 def _fetch_ohlcv_cached(market: str, interval: str, count: int = 20):
-    """pyupbit OHLCV를 캐시와 함께 조회"""
-    cache_key = f"{market}_{interval}_{count}"
-    now = time.time()
-
-    cached = _ohlcv_cache.get(cache_key)
-    if cached and (now - cached['timestamp']) < _ohlcv_cache_ttl:
-        return cached['data']
-
-    df = pyupbit.get_ohlcv(market, interval=interval, count=count)
-    if df is not None:
-        _ohlcv_cache[cache_key] = {'data': df, 'timestamp': now}
-    return df
+    """pyupbit OHLCV를 캐시와 함께 조회 (시장 데이터 서비스 공유 캐시)"""
+    return get_market_data_service().get_ohlcv(market, interval, count)
 
 
 def _calculate_market_volume_metrics(timeframe: str, market: str = "KRW-BTC", count: int = 20) -> dict:
@@ -676,16 +732,10 @@ def _resolve_entry_and_qty(card: dict, current_price: float) -> tuple[float, flo
 
     return float(entry_price or 0.0), float(qty or 0.0)
 
-# 가격 캐시 (Flask 전용)
-_price_cache_value = 0.0
-_price_cache_time = 0.0
-_price_call_times = []  # 최근 호출 시각(초) 목록
-
 def init_app():
     """애플리케이션 초기화"""
     global nbverse_storage, nbverse_converter, settings_manager
     global production_card_manager, discarded_card_manager, upbit, cfg
-    global _price_cache_value, _price_cache_time, _price_call_times
     try:
         # 설정 관리자
         settings_manager = SettingsManager()
@@ -714,18 +764,30 @@ def init_app():
         
         nbverse_storage, nbverse_converter = init_nbverse_storage(
             data_dir=data_dir,
-            decimal_places=nb_decimal_places
+            decimal_places=nb_decimal_places,
+            storage_backend=settings_manager.get("nbverse_storage_backend", "directory")
         )
         
         if not nbverse_storage or not nbverse_converter:
             raise RuntimeError("NBVerse 초기화에 실패했습니다.")
         
+        # NBVerse 저장소 주기 압축 (저장할 때마다 쌓이는 중복/이전 버전 파일 정리)
+        nbverse_compaction = start_nbverse_compaction(
+            nbverse_storage,
+            interval_hours=float(settings_manager.get("nbverse_compaction_interval_hours", 24)),
+            retention_days=float(settings_manager.get("nbverse_retention_days", 0))
+        )
+        if nbverse_compaction:
+            atexit.register(nbverse_compaction.stop)
+        
         # 카드 관리자 초기화
         discarded_card_manager = DiscardedCardManager()
         production_card_manager = ProductionCardManager(
             nbverse_storage=nbverse_storage,
             discarded_card_manager=discarded_card_manager
         )
+        # 프로세스 종료 시 저장 워커에 대기 중인 카드 저장 완료
+        atexit.register(production_card_manager.flush)
         
         # Upbit API 초기화
         try:
@@ -810,6 +872,50 @@ def get_price():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@app.route('/api/price/stream', methods=['GET'])
+def stream_price():
+    """BTC 현재가 푸시 (Server-Sent Events)
+    
+    모든 연결이 가격 피드 하나를 구독하므로 연결 수와 관계없이 틱마다 거래소 요청은 한 번입니다.
+    이벤트 data: {"market", "price", "timestamp", "sequence"}
+    동시 연결이 _PRICE_STREAM_MAX_CLIENTS개를 넘으면 503 (다른 요청이 쓸 작업 스레드 확보)
+    """
+    if not _price_stream_slots.acquire(blocking=False):
+        return jsonify({'error': '가격 스트림 연결이 가득 찼습니다. /api/price를 사용하세요.'}), 503
+    
+    _price_feed.interval_seconds = _price_push_interval()
+    subscription = _price_feed.subscribe()
+    released = []
+    
+    def release():
+        # 응답 close 때 호출 (생성기가 한 번도 실행되지 않고 끊겨도 호출됨), 한 번만 반환
+        if not released:
+            released.append(True)
+            subscription.close()
+            _price_stream_slots.release()
+    
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            started = time.monotonic()
+            last_sequence = None
+            while time.monotonic() - started < _PRICE_STREAM_MAX_SECONDS:
+                tick = subscription.get(timeout=_PRICE_STREAM_KEEPALIVE_SECONDS)
+                if tick is None:
+                    yield ": keepalive\n\n"
+                elif tick['sequence'] != last_sequence:
+                    last_sequence = tick['sequence']
+                    yield f"id: {tick['sequence']}\ndata: {json.dumps(tick)}\n\n"
+        finally:
+            # 클라이언트가 끊으면 GeneratorExit로 여기 도달 -> 구독 해제
+            release()
+    
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(release)
+    return response
+
 # 잔고 정보 API
 @app.route('/api/balance', methods=['GET'])
 def get_balance():
@@ -913,12 +1019,12 @@ def get_chart():
         
         print(f"📊 차트 데이터 요청: timeframe={timeframe}, mapped_interval={pyupbit_interval}, count={count}")
         
-        df = pyupbit.get_ohlcv("KRW-BTC", interval=pyupbit_interval, count=count)
-        if df is None or df.empty:
+        candles = get_candle_store().get_candles("KRW-BTC", pyupbit_interval, count)
+        if not len(candles):
             print(f"❌ [{timeframe}] 차트 데이터를 가져올 수 없습니다.")
             return jsonify({'error': '차트 데이터를 가져올 수 없습니다.'}), 500
         
-        prices = df['close'].tolist()
+        prices = candles.close.tolist()
         current_price = prices[-1] if prices else 0
         
         print(f"✅ [{timeframe}] 차트 데이터 반환: {len(prices)}개 가격, 현재가={current_price:,.0f} KRW")
@@ -938,6 +1044,36 @@ def get_chart():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+def _load_ohlcv_rows(market: str, interval: str, count: int) -> list:
+    """OHLCV 조회 후 차트 분석용 봉 목록으로 변환 (실패하면 예외)"""
+    # pyupbit API 호출 (빠른 실행)
+    df = get_market_data_service().get_ohlcv(market, interval, count)
+    if df is None or df.empty:
+        # 한 번만 재시도
+        time.sleep(0.05)
+        df = get_market_data_service().get_ohlcv(market, interval, count)
+    
+    if df is None or df.empty:
+        raise RuntimeError('No data')
+    
+    # DataFrame을 리스트로 변환 (최적화)
+    data = [
+        {
+            'time': idx.isoformat() if hasattr(idx, 'isoformat') else str(idx),
+            'open': float(row.get('open', 0) or 0),
+            'high': float(row.get('high', 0) or 0),
+            'low': float(row.get('low', 0) or 0),
+            'close': float(row.get('close', 0) or 0),
+            'volume': float(row.get('volume', 0) or 0)
+        }
+        for idx, row in df.iterrows()
+    ]
+    
+    if not data:
+        raise RuntimeError('No data converted')
+    return data
+
+
 # OHLCV 차트 데이터 API (차트 분석용) - 캐싱 최적화
 @app.route('/api/ohlcv', methods=['GET'])
 def get_ohlcv():
@@ -980,64 +1116,25 @@ def get_ohlcv():
         
         # 캐시 키 생성
         cache_key = f"{market}_{interval}_{count}"
-        current_time = time.time()
         
         # 캐시 확인
-        if cache_key in _ohlcv_cache:
-            cached_data = _ohlcv_cache[cache_key]
-            cache_age = current_time - cached_data['timestamp']
-            if cache_age < _ohlcv_cache_ttl:
-                return jsonify({
-                    'ok': True,
-                    'data': cached_data['data'],
-                    'market': market,
-                    'interval': interval,
-                    'count': len(cached_data['data']),
-                    'cached': True
-                })
-        
-        # pyupbit API 호출 (빠른 실행)
-        df = None
-        try:
-            df = pyupbit.get_ohlcv(market, interval=interval, count=count)
-            if df is None or df.empty:
-                # 한 번만 재시도
-                time.sleep(0.05)
-                df = pyupbit.get_ohlcv(market, interval=interval, count=count)
-        except Exception as e:
-            return jsonify({'error': str(e), 'ok': False}), 500
-        
-        if df is None or df.empty:
-            return jsonify({'error': 'No data', 'ok': False}), 500
+        cached_data = _ohlcv_cache.get(cache_key)
+        if cached_data is not None:
+            return jsonify({
+                'ok': True,
+                'data': cached_data,
+                'market': market,
+                'interval': interval,
+                'count': len(cached_data),
+                'cached': True
+            })
         
-        # DataFrame을 리스트로 변환 (최적화)
+        # 같은 키를 동시에 요청하면 한 스레드만 조회/변환 (캐시 크기 제한 + LRU 제거)
         try:
-            data = [
-                {
-                    'time': idx.isoformat() if hasattr(idx, 'isoformat') else str(idx),
-                    'open': float(row.get('open', 0) or 0),
-                    'high': float(row.get('high', 0) or 0),
-                    'low': float(row.get('low', 0) or 0),
-                    'close': float(row.get('close', 0) or 0),
-                    'volume': float(row.get('volume', 0) or 0)
-                }
-                for idx, row in df.iterrows()
-            ]
+            data = _ohlcv_cache.get_or_set(cache_key, lambda: _load_ohlcv_rows(market, interval, count))
         except Exception as e:
             return jsonify({'error': str(e), 'ok': False}), 500
         
-        if not data:
-            return jsonify({'error': 'No data converted', 'ok': False}), 500
-        
-        # 캐시에 저장
-        _ohlcv_cache[cache_key] = {'data': data, 'timestamp': current_time}
-        
-        # 캐시 정리 (비동기적으로)
-        if len(_ohlcv_cache) > 300:
-            expired_keys = [k for k, v in _ohlcv_cache.items() if current_time - v['timestamp'] > _ohlcv_cache_ttl]
-            for k in expired_keys[:50]:  # 한 번에 최대 50개만 제거
-                del _ohlcv_cache[k]
-        
         return jsonify({
             'ok': True,
             'data': data,
@@ -1061,30 +1158,38 @@ def get_ohlcv():
             'ok': False
         }), 500
 
+def _nb_cache_stats():
+    """N/B 결과 캐시 통계 (캐시를 사용하지 않으면 None)"""
+    if nbverse_converter is None or not hasattr(nbverse_converter, 'cache_stats'):
+        return None
+    return nbverse_converter.cache_stats()
+
+
 # 캐시 통계 및 관리 API
 @app.route('/api/cache/stats', methods=['GET'])
 def get_cache_stats():
     """OHLCV 캐시 통계 조회"""
     try:
-        current_time = time.time()
         cache_items = []
         
-        for key, value in _ohlcv_cache.items():
-            age = current_time - value['timestamp']
-            is_expired = age > _ohlcv_cache_ttl
-            
+        for key, value, age, is_expired in _ohlcv_cache.snapshot():
             cache_items.append({
                 'key': key,
                 'age_seconds': round(age, 2),
-                'data_count': len(value['data']),
+                'data_count': len(value),
                 'expired': is_expired
             })
         
         return jsonify({
             'ok': True,
-            'total_cached_items': len(_ohlcv_cache),
+            'total_cached_items': len(cache_items),
             'cache_ttl_seconds': _ohlcv_cache_ttl,
-            'items': cache_items
+            'items': cache_items,
+            'ohlcv_cache': _ohlcv_cache.stats(),
+            'price_cache': _price_cache.stats(),
+            'price_feed': _price_feed.stats(),
+            'nb_cache': _nb_cache_stats(),
+            'market_data': get_market_data_service().stats()
         })
     except Exception as e:
         return jsonify({
@@ -1097,8 +1202,11 @@ def get_cache_stats():
 def clear_cache():
     """OHLCV 캐시 초기화"""
     try:
-        cache_size = len(_ohlcv_cache)
-        _ohlcv_cache.clear()
+        cache_size = _ohlcv_cache.clear()
+        cache_size += _price_cache.clear()
+        cache_size += get_market_data_service().clear()
+        if nbverse_converter is not None and getattr(nbverse_converter, 'cache', None) is not None:
+            nbverse_converter.cache.clear()
         print(f"🧹 캐시 초기화 완료: {cache_size}개 항목 삭제")
         
         return jsonify({
@@ -1166,6 +1274,78 @@ def calculate_nb():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+# N/B 값 배치 계산 API
+@app.route('/api/nb/calculate/batch', methods=['POST'])
+def calculate_nb_batch():
+    """여러 가격 데이터의 N/B 값을 프로세스 풀에서 병렬 계산
+    
+    요청 형식:
+        {
+            "items": [{"prices": [...], "timeframe": "1m"}, ...],  # 또는 가격 배열 목록
+            "workers": 4  # 선택사항 (기본값: CPU 수, CPU 수를 넘으면 CPU 수로 제한)
+        }
+    """
+    try:
+        data = request.json or {}
+        items = data.get('items')
+        workers = data.get('workers')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items 목록이 필요합니다.'}), 400
+        if len(items) > _NB_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'한 번에 최대 {_NB_BATCH_MAX_ITEMS}개까지 계산할 수 있습니다.'}), 400
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            return jsonify({'error': 'workers는 1 이상의 정수여야 합니다.'}), 400
+        if workers is not None:
+            workers = min(workers, os.cpu_count() or 1)
+        
+        if not nbverse_converter:
+            return jsonify({'error': 'NBVerse가 초기화되지 않았습니다.'}), 500
+        
+        # 입력 정규화 (단일 계산 API와 같은 문자열 형식: 최근 200개 가격)
+        timeframes = []
+        texts = []
+        for index, item in enumerate(items):
+            prices = item.get('prices') if isinstance(item, dict) else item
+            if not isinstance(prices, list) or len(prices) < 2:
+                return jsonify({'error': f'items[{index}]의 가격 데이터가 부족합니다.'}), 400
+            timeframes.append(item.get('timeframe') if isinstance(item, dict) else None)
+            texts.append(",".join([str(p) for p in prices[-200:]]))
+        
+        if not hasattr(nbverse_converter, 'text_to_nb_batch'):
+            # 배치 계산을 지원하지 않는 NBVerse 버전
+            nb_results = [nbverse_converter.text_to_nb(text) for text in texts]
+        else:
+            nb_results = nbverse_converter.text_to_nb_batch(texts, workers=workers)
+        
+        results = []
+        for timeframe, result in zip(timeframes, nb_results):
+            bit_max = result.get('bitMax', 5.5)
+            bit_min = result.get('bitMin', 5.5)
+            
+            # nb_max, nb_min 계산 (0~1 범위로 정규화)
+            nb_max = max(0.0, min(1.0, bit_max / 10.0))
+            nb_min = max(0.0, min(1.0, bit_min / 10.0))
+            
+            results.append({
+                'timeframe': timeframe,
+                'nb_value': (nb_max + nb_min) / 2.0,
+                'nb_max': nb_max,
+                'nb_min': nb_min,
+                'bit_max': bit_max,
+                'bit_min': bit_min
+            })
+        
+        return jsonify({
+            'results': results,
+            'count': len(results),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
 # N/B 값 저장 API
 @app.route('/api/nb/save', methods=['POST'])
 def save_nb():
@@ -1238,13 +1418,20 @@ def get_nb(nb_value):
 # 활성 카드 목록 API (보유 중 탭용)
 @app.route('/api/cards/active', methods=['GET'])
 def get_active_cards():
-    """활성 카드 목록 조회 (ACTIVE, OVERLAP_ACTIVE 상태만)"""
+    """활성 카드 목록 조회 (ACTIVE, OVERLAP_ACTIVE 상태만)
+    
+    Query:
+        fields: 'summary'이면 history_list/chart_data/realtime_scores 없이 헤더 필드만 반환
+                (지연 로드 카드의 본문을 읽지 않음)
+    """
     try:
         if not production_card_manager:
             return jsonify({'error': '카드 관리자가 초기화되지 않았습니다.'}), 500
         
         from managers.production_card_manager import CardState
+        from managers.card_records import history_summary, LAZY_FIELDS
         
+        summary_only = request.args.get('fields') == 'summary'
         cards = production_card_manager.get_all_cards()
         
         # 활성 카드만 필터링 (ACTIVE, OVERLAP_ACTIVE)
@@ -1253,14 +1440,16 @@ def get_active_cards():
             card_state = card.get('card_state')
             if card_state in [CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value]:
                 # 검증 완료된 카드 제외 (SOLD 히스토리가 있는 카드)
-                history_list = card.get('history_list', [])
-                has_sold = any(hist.get('type') == 'SOLD' for hist in history_list)
+                _, has_sold = history_summary(card)
                 if not has_sold:
                     # N/B 값 검증
                     if not card.get('nb_value') and not card.get('nb_max') and not card.get('nb_min'):
                         card['nb_value'] = 0.5
                         card['nb_max'] = 5.5
                         card['nb_min'] = 5.5
+                    if summary_only:
+                        header = card.header() if hasattr(card, 'header') else card
+                        card = {field: value for field, value in header.items() if field not in LAZY_FIELDS}
                     active_cards.append(card)
         
         return jsonify({
@@ -1282,6 +1471,8 @@ def get_production_cards():
             print("❌ 카드 관리자가 초기화되지 않았습니다.")
             return jsonify({'error': '카드 관리자가 초기화되지 않았습니다.'}), 500
         
+        from managers.card_records import history_summary
+        
         cards = production_card_manager.get_all_cards()
         print(f"📋 전체 카드 수: {len(cards) if cards else 0}개")
         
@@ -1296,8 +1487,7 @@ def get_production_cards():
                 card['nb_min'] = 5.5
             
             # 검증 완료된 카드 (SOLD 히스토리가 있는 카드)는 생산 카드에서 제외
-            history_list = card.get('history_list', [])
-            has_sold = any(hist.get('type') == 'SOLD' for hist in history_list)
+            _, has_sold = history_summary(card)
             
             # SOLD 히스토리가 없는 카드만 포함
             if not has_sold:
@@ -1408,7 +1598,7 @@ def produce_card():
         if not chart_data:
             print("📊 차트 데이터 가져오기 중...")
             timeframe = '1m'
-            df = pyupbit.get_ohlcv("KRW-BTC", interval=timeframe, count=200)
+            df = get_market_data_service().get_ohlcv("KRW-BTC", _map_timeframe_to_interval(timeframe), 200)
             if df is None or df.empty:
                 print("❌ 차트 데이터를 가져올 수 없습니다.")
                 return jsonify({'error': '차트 데이터를 가져올 수 없습니다.'}), 500
@@ -1444,7 +1634,7 @@ def produce_card():
                     '240m': 'minute240', '1d': 'day', '1w': 'week', '1mo': 'month'
                 }
                 pyupbit_interval = interval_map.get(timeframe, 'minute1')
-                df = pyupbit.get_ohlcv("KRW-BTC", interval=pyupbit_interval, count=1)
+                df = get_market_data_service().get_ohlcv("KRW-BTC", pyupbit_interval, 1)
                 if df is not None and not df.empty:
                     last_candle = df.iloc[-1]
                     production_candle_data = {
@@ -2476,7 +2666,7 @@ def sell_card(card_id):
                     if updated_card:
                         # 전체 카드 정보를 JSON 문자열로 변환하여 NB DATABASE에 저장
                         import json
-                        card_json = json.dumps(updated_card, ensure_ascii=False, default=str)
+                        card_json = json.dumps(to_plain(updated_card), ensure_ascii=False, default=str)
                         
                         # NBverse Storage에 전체 카드 정보 저장
                         if nbverse_storage:
@@ -2552,8 +2742,8 @@ def get_verification_cards():
         if not production_card_manager:
             return jsonify({'error': '카드 관리자가 초기화되지 않았습니다.'}), 500
         
-        # 모든 카드 가져오기 (REMOVED 포함)
-        all_cards = production_card_manager.get_all_cards()
+        # 매수/SOLD 히스토리가 모두 있는 카드만 인덱스에서 가져오기 (REMOVED 제외)
+        all_cards = production_card_manager.get_verification_cards()
         
         # 폐기된 카드도 포함
         discarded_cards = []
@@ -2684,37 +2874,36 @@ def get_verification_cards():
                                 os.path.join(data_dir, "min")
                             ]
                             
-                            for base_dir in base_dirs:
-                                if not os.path.exists(base_dir):
+                            # 카드 ID 인덱스가 있으면 해당 파일만, 없으면 재귀적으로 모든 JSON 파일 검색
+                            if hasattr(nbverse_storage, 'find_card_paths'):
+                                candidate_paths = nbverse_storage.find_card_paths(card_id)
+                            else:
+                                candidate_paths = (
+                                    os.path.join(root, filename)
+                                    for base_dir in base_dirs if os.path.exists(base_dir)
+                                    for root, dirs, files in os.walk(base_dir)
+                                    for filename in files if filename.endswith('.json')
+                                )
+                            
+                            for file_path in candidate_paths:
+                                try:
+                                    data = nbverse_storage.load_from_path(file_path)
+                                    if data and data.get('metadata', {}).get('card_id') == card_id:
+                                        metadata = data.get('metadata', {})
+                                        if metadata.get('nb_value') is not None:
+                                            card['nb_value'] = float(metadata.get('nb_value', 0.5))
+                                            card['nb_max'] = float(metadata.get('nb_max', 5.5))
+                                            card['nb_min'] = float(metadata.get('nb_min', 5.5))
+                                            # bit_max, bit_min도 복원 (있는 경우)
+                                            if metadata.get('bit_max'):
+                                                card['bit_max'] = float(metadata.get('bit_max'))
+                                            if metadata.get('bit_min'):
+                                                card['bit_min'] = float(metadata.get('bit_min'))
+                                            nb_loaded = True
+                                            print(f"✅ N/B 값 복원 (card_id): {card_id}, nb_value={card['nb_value']}")
+                                            break
+                                except Exception as e:
                                     continue
-                                
-                                # 재귀적으로 모든 JSON 파일 검색
-                                for root, dirs, files in os.walk(base_dir):
-                                    for filename in files:
-                                        if filename.endswith('.json'):
-                                            file_path = os.path.join(root, filename)
-                                            try:
-                                                data = nbverse_storage.load_from_path(file_path)
-                                                if data and data.get('metadata', {}).get('card_id') == card_id:
-                                                    metadata = data.get('metadata', {})
-                                                    if metadata.get('nb_value') is not None:
-                                                        card['nb_value'] = float(metadata.get('nb_value', 0.5))
-                                                        card['nb_max'] = float(metadata.get('nb_max', 5.5))
-                                                        card['nb_min'] = float(metadata.get('nb_min', 5.5))
-                                                        # bit_max, bit_min도 복원 (있는 경우)
-                                                        if metadata.get('bit_max'):
-                                                            card['bit_max'] = float(metadata.get('bit_max'))
-                                                        if metadata.get('bit_min'):
-                                                            card['bit_min'] = float(metadata.get('bit_min'))
-                                                        nb_loaded = True
-                                                        print(f"✅ N/B 값 복원 (card_id): {card_id}, nb_value={card['nb_value']}")
-                                                        break
-                                            except Exception as e:
-                                                continue
-                                    if nb_loaded:
-                                        break
-                                if nb_loaded:
-                                    break
                         
                         # 방법 2: nb_id로 찾기 (방법 1이 실패한 경우)
                         if not nb_loaded and nb_id:
@@ -3319,10 +3508,8 @@ def save_chart_analysis_card():
         # production_card_manager 캐시에 카드 추가 (update API가 찾을 수 있도록)
         if production_card_manager:
             try:
-                # 카드를 캐시에 추가
-                production_card_manager.cards_cache.append(full_card_data)
-                # 인덱스 재구성
-                production_card_manager._rebuild_indexes()
+                # 카드를 캐시에 등록 (쓰기 잠금 안에서 인덱스/임시 저장 파일도 함께 갱신)
+                production_card_manager.register_saved_card(full_card_data)
                 print(f"✅ 카드가 production_card_manager 캐시에 추가됨: {card_id}")
             except Exception as cache_error:
                 print(f"⚠️ 캐시 추가 오류 (계속): {cache_error}")
@@ -3390,89 +3577,120 @@ def query_chart_analysis_cards():
         parent_dir = os.path.dirname(os.path.dirname(current_file_dir))  # v0.0.0.4
         data_dir = os.path.join(parent_dir, "data", "nbverse")
 
-        target_dirs = [
-            os.path.join(data_dir, "max"),
-            os.path.join(data_dir, "min"),
-            os.path.join(data_dir, "cards"),
-        ]
-
         results = []
         seen_ids = set()
         scanned_files = 0
-        max_scan = 5000  # 안전장치: 너무 큰 디렉토리 전체 스캔 방지
-
-        for base_dir in target_dirs:
-            if not os.path.exists(base_dir):
-                continue
-            for root, _, files in os.walk(base_dir):
-                for filename in files:
-                    if not filename.endswith('.json'):
+        max_scan = 5000  # 안전장치: 너무 큰 디렉토리 전체 스캔 방지 (폴더 스캔에만 적용)
+
+        def iter_candidates():
+            """조회 후보 (파일 경로, 데이터) 순회"""
+            if hasattr(nbverse_storage, 'iter_nb_range'):
+                # 정렬 인덱스: nb_min 조건은 nb_min 인덱스, nb_max 조건만 있으면 nb_max 인덱스에서 이진 탐색 후 연속 구간 읽기
+                field = 'nb_min' if nb_min is not None else 'nb_max'
+                low, high = (nb_min, float('inf')) if nb_min is not None else (float('-inf'), nb_max)
+
+                # 1) metadata 값 인덱스 (save_text로 저장한 카드는 저장 N/B 값이 metadata 값과 다름)
+                if hasattr(nbverse_storage, 'iter_metadata_range'):
+                    for record in nbverse_storage.iter_metadata_range(field, low, high):
+                        yield record['path'], record['data']
+
+                # 2) 저장 N/B 값 인덱스 (metadata에 값이 없는 레코드는 카드 본문 값으로 필터)
+                folder_type = "min" if field == 'nb_min' else "max"
+                for record in nbverse_storage.iter_nb_range(low, high, folder_type=folder_type):
+                    data = record['data']
+                    metadata = data.get('metadata') if isinstance(data, dict) else None
+                    if hasattr(nbverse_storage, 'iter_metadata_range') and isinstance(metadata, dict) \
+                            and to_float(metadata.get(field)) is not None:
                         continue
-                    file_path = os.path.join(root, filename)
-                    scanned_files += 1
-                    if scanned_files > max_scan:
-                        break
-                    try:
-                        data = nbverse_storage.load_from_path(file_path)
-                        metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
-                        card_payload = None
-                        if isinstance(data, dict):
-                            card_payload = data.get('data') or data.get('content')
-                            if not card_payload and isinstance(data.get('text'), str):
-                                card_payload = data.get('text')
-                            if isinstance(card_payload, str):
-                                try:
-                                    card_payload = json.loads(card_payload)
-                                except Exception:
-                                    pass
-
-                        stored_nb_min = to_float(metadata.get('nb_min'))
-                        stored_nb_max = to_float(metadata.get('nb_max'))
-
-                        # 메타데이터에 없으면 카드 본문에서 보충
-                        if stored_nb_min is None and isinstance(card_payload, dict):
-                            stored_nb_min = to_float(card_payload.get('nb_min') or card_payload.get('nbMin'))
-                        if stored_nb_max is None and isinstance(card_payload, dict):
-                            stored_nb_max = to_float(card_payload.get('nb_max') or card_payload.get('nbMax'))
-
-                        # 필터: nb_min → 저장된 nb_min >= 요청 nb_min, nb_max → 저장된 nb_max <= 요청 nb_max
-                        if nb_min is not None:
-                            if stored_nb_min is None or stored_nb_min < nb_min:
-                                continue
-                        if nb_max is not None:
-                            if stored_nb_max is None or stored_nb_max > nb_max:
-                                continue
-
-                        card_id = metadata.get('card_id') or (data.get('card_id') if isinstance(data, dict) else None)
-                        dedup_key = card_id or file_path
-                        if dedup_key in seen_ids:
+                    yield record['path'], data
+                walk_dirs = [os.path.join(data_dir, "cards")]
+            elif hasattr(nbverse_storage, 'iter_records'):
+                # 정렬 인덱스가 없으면 저장소 레코드 전체 순회 (폴더 구조가 없는 저장소도 포함)
+                for record in nbverse_storage.iter_records():
+                    yield record['path'], record['data']
+                walk_dirs = [os.path.join(data_dir, "cards")]
+            else:
+                walk_dirs = [
+                    os.path.join(data_dir, "max"),
+                    os.path.join(data_dir, "min"),
+                    os.path.join(data_dir, "cards"),
+                ]
+
+            walked_files = 0
+            for base_dir in walk_dirs:
+                if not os.path.exists(base_dir):
+                    continue
+                for root, _, files in os.walk(base_dir):
+                    for filename in files:
+                        if not filename.endswith('.json'):
                             continue
-                        seen_ids.add(dedup_key)
-
-                        results.append({
-                            'card_id': card_id,
-                            'card_key': metadata.get('card_key'),
-                            'card_type': metadata.get('card_type'),
-                            'chart_analysis_card_type': metadata.get('chart_analysis_card_type'),
-                            'timeframe': metadata.get('timeframe'),
-                            'nb_value': metadata.get('nb_value'),
-                            'nb_max': stored_nb_max,
-                            'nb_min': stored_nb_min,
-                            'is_overlap': metadata.get('is_overlap', False),
-                            'file_path': file_path,
-                            'metadata': metadata,
-                            'card_data': card_payload if isinstance(card_payload, dict) else None
-                        })
-
-                        if len(results) >= limit:
-                            break
-                    except Exception as load_err:
-                        print(f"⚠️ 카드 조회 중 로드 실패: {file_path} -> {load_err}")
+                        walked_files += 1
+                        if walked_files > max_scan:
+                            return
+                        file_path = os.path.join(root, filename)
+                        try:
+                            yield file_path, nbverse_storage.load_from_path(file_path)
+                        except Exception as load_err:
+                            print(f"⚠️ 카드 조회 중 로드 실패: {file_path} -> {load_err}")
+
+        for file_path, data in iter_candidates():
+            scanned_files += 1
+            try:
+                metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
+                card_payload = None
+                if isinstance(data, dict):
+                    card_payload = data.get('data') or data.get('content')
+                    if not card_payload and isinstance(data.get('text'), str):
+                        card_payload = data.get('text')
+                    if isinstance(card_payload, str):
+                        try:
+                            card_payload = json.loads(card_payload)
+                        except Exception:
+                            pass
+
+                stored_nb_min = to_float(metadata.get('nb_min'))
+                stored_nb_max = to_float(metadata.get('nb_max'))
+
+                # 메타데이터에 없으면 카드 본문에서 보충
+                if stored_nb_min is None and isinstance(card_payload, dict):
+                    stored_nb_min = to_float(card_payload.get('nb_min') or card_payload.get('nbMin'))
+                if stored_nb_max is None and isinstance(card_payload, dict):
+                    stored_nb_max = to_float(card_payload.get('nb_max') or card_payload.get('nbMax'))
+
+                # 필터: nb_min → 저장된 nb_min >= 요청 nb_min, nb_max → 저장된 nb_max <= 요청 nb_max
+                if nb_min is not None:
+                    if stored_nb_min is None or stored_nb_min < nb_min:
                         continue
-                if len(results) >= limit or scanned_files > max_scan:
+                if nb_max is not None:
+                    if stored_nb_max is None or stored_nb_max > nb_max:
+                        continue
+
+                card_id = metadata.get('card_id') or (data.get('card_id') if isinstance(data, dict) else None)
+                dedup_key = card_id or file_path
+                if dedup_key in seen_ids:
+                    continue
+                seen_ids.add(dedup_key)
+
+                results.append({
+                    'card_id': card_id,
+                    'card_key': metadata.get('card_key'),
+                    'card_type': metadata.get('card_type'),
+                    'chart_analysis_card_type': metadata.get('chart_analysis_card_type'),
+                    'timeframe': metadata.get('timeframe'),
+                    'nb_value': metadata.get('nb_value'),
+                    'nb_max': stored_nb_max,
+                    'nb_min': stored_nb_min,
+                    'is_overlap': metadata.get('is_overlap', False),
+                    'file_path': file_path,
+                    'metadata': metadata,
+                    'card_data': card_payload if isinstance(card_payload, dict) else None
+                })
+
+                if len(results) >= limit:
                     break
-            if len(results) >= limit or scanned_files > max_scan:
-                break
+            except Exception as load_err:
+                print(f"⚠️ 카드 조회 중 로드 실패: {file_path} -> {load_err}")
+                continue
 
         return jsonify({
             'success': True,
@@ -3675,7 +3893,7 @@ def api_ai_predict():
                 df_data = []
             else:
                 # API에서 직접 가져오기
-                df = pyupbit.get_ohlcv(market, interval=interval, count=count)
+                df = get_market_data_service().get_ohlcv(market, interval, count)
                 if df is None or df.empty:
                     return jsonify({'error': '차트 데이터를 가져올 수 없습니다.'}), 500
                 df_data = df.to_dict('records')
@@ -3717,7 +3935,8 @@ def api_ai_predict():
                     chart_data_for_nb,
                     nbverse_storage=nbverse_storage,
                     nbverse_converter=nbverse_converter,
-                    settings_manager=settings_manager
+                    settings_manager=settings_manager,
+                    record=False  # 예측 조회는 NBVerse에 기록하지 않음
                 )
             except Exception:
                 nb_value = None
@@ -3998,13 +4217,13 @@ if __name__ == '__main__':
     print(f"📍 서버 주소: http://localhost:5000")
     print(f"📍 API 엔드포인트: http://localhost:5000/api")
     print(f"📍 헬스 체크: http://localhost:5000/api/health")
-    print(f"⚡ 멀티스레딩: 4 threads")
+    print(f"⚡ 멀티스레딩: {_SERVER_THREADS} threads (가격 스트림 연결 최대 {_PRICE_STREAM_MAX_CLIENTS}개)")
     print("="*60 + "\n")
     
     # Waitress 프로덕션 서버 사용 (Windows 최적화, 개발 서버보다 10-20배 빠름)
     try:
         from waitress import serve
-        serve(app, host='0.0.0.0', port=5000, threads=4, channel_timeout=300)
+        serve(app, host='0.0.0.0', port=5000, threads=_SERVER_THREADS, channel_timeout=300)
     except ImportError:
         print("⚠️ Waitress가 설치되지 않았습니다. 개발 서버로 실행합니다.")
         print("   빠른 실행을 원하면: pip install waitress")
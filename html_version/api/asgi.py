@@ -0,0 +1,165 @@
+"""HTML API 백엔드 ASGI 실행 모드
+
+app.py(Flask)를 그대로 사용하면서 요청을 레인별 스레드 풀로 나눕니다 (asgi_bridge.ASGIBridge).
+- cpu 레인: 카드 생산, N/B 계산, sklearn 예측처럼 수 초 걸리는 계산
+- io 레인: 잔고/차트/주문처럼 거래소 API를 기다리는 요청
+- fast 레인: 그 밖의 요청 (카드 목록, 설정, 캐시 통계, 정적 파일)
+- /api/price, /api/price/stream, /api/server/lanes 는 이벤트 루프에서 직접 처리
+  (캐시 적중이면 스레드를 쓰지 않고, 캐시가 없을 때만 io 레인에서 조회를 기다림)
+
+카드 생산이 cpu 레인을 모두 차지해도 가격 조회는 다른 레인/이벤트 루프에서 처리됩니다.
+
+실행:
+    python html_version/api/asgi.py              (uvicorn, 없으면 hypercorn)
+    uvicorn asgi:application --app-dir html_version/api --port 5000
+"""
+import os
+import sys
+import json
+import asyncio
+from datetime import datetime
+
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+if current_file_dir not in sys.path:
+    sys.path.insert(0, current_file_dir)
+
+import app as api
+from asgi_bridge import ASGIBridge, LaneBusy, send_json, wait_disconnect
+
+try:
+    import uvicorn
+    _UVICORN_AVAILABLE = True
+except ImportError:
+    _UVICORN_AVAILABLE = False
+
+try:
+    import hypercorn.asyncio
+    import hypercorn.config
+    _HYPERCORN_AVAILABLE = True
+except ImportError:
+    _HYPERCORN_AVAILABLE = False
+
+# 레인 이름 -> (스레드 수, 대기 한도)
+LANES = {
+    'fast': (8, 64),
+    'io': (8, 32),
+    'cpu': (2, 8),
+}
+
+# 경로 접두어 -> 레인 (위에서부터 먼저 일치하는 것)
+_CPU_PREFIXES = ('/api/cards/produce', '/api/nb/calculate', '/api/ai/', '/api/card-ai/',
+                 '/api/cards/chart-analysis/')
+_IO_PREFIXES = ('/api/balance', '/api/chart', '/api/ohlcv', '/api/trade/')
+_IO_SUFFIXES = ('/buy', '/sell', '/sell/start', '/sell/metrics')
+
+
+def route_lane(method: str, path: str) -> str:
+    """요청 경로 -> 레인 이름"""
+    if path.startswith(_CPU_PREFIXES):
+        return 'cpu'
+    if path.startswith(_IO_PREFIXES) or (path.startswith('/api/cards/') and path.endswith(_IO_SUFFIXES)):
+        return 'io'
+    return 'fast'
+
+
+application = ASGIBridge(api.app, LANES, route_lane=route_lane, default_lane='fast', on_startup=api.init_app)
+
+
+@application.route('/api/price')
+async def get_price(scope, receive, send):
+    """BTC 현재 가격 조회 (캐시 적중이면 이벤트 루프에서 바로 응답)"""
+    try:
+        price = api._price_cache.get("KRW-BTC")
+        if price is None:
+            price = await application.run_in_lane('io', api._get_btc_price_cached)
+        await send_json(send, {'price': price, 'timestamp': datetime.now().isoformat()})
+    except LaneBusy:
+        await send_json(send, {'error': '서버가 바쁩니다. 잠시 후 다시 시도하세요.'}, status=503,
+                        headers=[(b'retry-after', b'1')])
+    except Exception as e:
+        await send_json(send, {'error': str(e)}, status=500)
+
+
+@application.route('/api/price/stream')
+async def stream_price(scope, receive, send):
+    """BTC 현재가 푸시 (Server-Sent Events) - 연결마다 스레드를 잡지 않고 가격 피드 리스너로 받음"""
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    latest = {'tick': api._price_feed.latest()}
+    
+    def on_tick(tick):
+        # 가격 피드 스레드에서 호출 -> 이벤트 루프로 전달
+        latest['tick'] = tick
+        loop.call_soon_threadsafe(ready.set)
+    
+    api._price_feed.interval_seconds = api._price_push_interval()
+    api._price_feed.add_listener(on_tick)
+    disconnected = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                        (b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')]
+        })
+        await send({'type': 'http.response.body', 'body': b"retry: 3000\n\n", 'more_body': True})
+        if latest['tick'] is not None:
+            ready.set()
+        
+        last_sequence = None
+        deadline = loop.time() + api._PRICE_STREAM_MAX_SECONDS
+        while loop.time() < deadline:
+            waiter = asyncio.ensure_future(ready.wait())
+            done, _ = await asyncio.wait({waiter, disconnected}, timeout=api._PRICE_STREAM_KEEPALIVE_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                waiter.cancel()
+                return
+            if waiter not in done:
+                waiter.cancel()
+                await send({'type': 'http.response.body', 'body': b": keepalive\n\n", 'more_body': True})
+                continue
+            ready.clear()
+            tick = latest['tick']
+            if tick is not None and tick['sequence'] != last_sequence:
+                last_sequence = tick['sequence']
+                message = f"id: {tick['sequence']}\ndata: {json.dumps(tick)}\n\n"
+                await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    except OSError:
+        pass  # 클라이언트 연결 끊김
+    finally:
+        api._price_feed.remove_listener(on_tick)
+        disconnected.cancel()
+
+
+@application.route('/api/server/lanes')
+async def get_lane_stats(scope, receive, send):
+    """레인별 요청 수/대기/거절/지연 통계"""
+    await send_json(send, {'ok': True, 'lanes': application.stats(), 'price_feed': api._price_feed.stats()})
+
+
+def main(host: str = '0.0.0.0', port: int = 5000):
+    print("\n" + "=" * 60)
+    print("🚀 Trading Bot API 서버 시작 (ASGI 모드)")
+    print("=" * 60)
+    print(f"📍 서버 주소: http://localhost:{port}")
+    print(f"📍 레인: " + ", ".join(f"{name} {workers} threads" for name, (workers, _) in LANES.items()))
+    print(f"📍 레인 통계: http://localhost:{port}/api/server/lanes")
+    print("=" * 60 + "\n")
+    
+    if _UVICORN_AVAILABLE:
+        uvicorn.run(application, host=host, port=port, lifespan='on', log_level='warning')
+    elif _HYPERCORN_AVAILABLE:
+        config = hypercorn.config.Config()
+        config.bind = [f"{host}:{port}"]
+        asyncio.run(hypercorn.asyncio.serve(application, config))
+    else:
+        print("⚠️ ASGI 서버가 설치되지 않았습니다.")
+        print("   설치: pip install uvicorn")
+        print("   (또는 기존 Waitress 모드: python html_version/api/app.py)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
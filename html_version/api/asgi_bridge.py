@@ -0,0 +1,290 @@
+"""ASGI 브리지 - 동기 WSGI 앱(Flask)을 레인(lane)별 스레드 풀로 나누어 ASGI 서버에서 실행
+
+waitress처럼 스레드 풀 하나를 모든 요청이 같이 쓰면 느린 요청(카드 생산, N/B 계산)이
+스레드를 모두 차지해 가격 조회 같은 빠른 요청까지 기다리게 됩니다.
+이 브리지는
+- 요청 경로별로 레인(스레드 풀)을 골라 WSGI 앱을 실행하고 (느린 레인이 가득 차도 다른 레인은 영향 없음)
+- 레인마다 대기 한도를 넘으면 바로 503을 돌려주며 (요청이 끝없이 쌓이지 않음)
+- 자주 호출되는 엔드포인트는 async 라우트(route 데코레이터)로 이벤트 루프에서 직접 처리합니다.
+
+Flask 등 외부 패키지에 의존하지 않습니다 (uvicorn/hypercorn 같은 ASGI 서버에서 실행).
+"""
+import io
+import sys
+import json
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+AsyncHandler = Callable[[dict, Callable, Callable], Awaitable[None]]
+
+
+class LaneBusy(Exception):
+    """레인 대기 한도 초과"""
+
+
+class Lane:
+    """스레드 풀 하나 + 동시 실행/대기 한도 (카운터는 이벤트 루프 스레드에서만 변경)"""
+    
+    def __init__(self, name: str, workers: int, max_queue: int = 64):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"asgi-{name}")
+        self.in_flight = 0
+        self._durations = deque(maxlen=1000)  # 최근 요청 처리 시간 (초, 대기 포함)
+        self._stats = {'requests': 0, 'rejected': 0, 'errors': 0, 'max_in_flight': 0}
+    
+    def acquire(self):
+        if self.in_flight >= self.workers + self.max_queue:
+            self._stats['rejected'] += 1
+            raise LaneBusy(self.name)
+        self.in_flight += 1
+        self._stats['requests'] += 1
+        self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self.in_flight)
+    
+    def release(self, started: float, failed: bool = False):
+        self.in_flight -= 1
+        self._durations.append(time.monotonic() - started)
+        if failed:
+            self._stats['errors'] += 1
+    
+    def stats(self) -> Dict:
+        durations = sorted(self._durations)
+        
+        def percentile(p):
+            if not durations:
+                return 0.0
+            return round(durations[min(len(durations) - 1, int(len(durations) * p))] * 1000, 1)
+        
+        return {**self._stats, 'workers': self.workers, 'max_queue': self.max_queue,
+                'in_flight': self.in_flight, 'p50_ms': percentile(0.50), 'p99_ms': percentile(0.99)}
+
+
+async def send_response(send: Callable, status: int, body: bytes,
+                        content_type: str = 'application/json', headers: Optional[List[Tuple[bytes, bytes]]] = None):
+    """본문 한 번에 보내는 응답"""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type.encode('latin-1')),
+                    (b'content-length', str(len(body)).encode('latin-1'))] + (headers or [])
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send: Callable, payload: Any, status: int = 200, headers: Optional[List[Tuple[bytes, bytes]]] = None):
+    await send_response(send, status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), headers=headers)
+
+
+async def wait_disconnect(receive: Callable):
+    """클라이언트 연결 종료까지 대기 (스트리밍 응답에서 사용)"""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+def build_environ(scope: dict, body: bytes) -> Dict[str, Any]:
+    """ASGI scope -> WSGI environ (PEP 3333)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]) if server[1] is not None else '80',
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_LENGTH':
+            continue  # 본문을 다 읽었으므로 실제 길이 사용
+        if name != 'CONTENT_TYPE':
+            name = f"HTTP_{name}"
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+class _WSGICall:
+    """WSGI 앱 호출 한 번 (레인 스레드에서 실행)"""
+    
+    def __init__(self, wsgi_app: Callable, environ: Dict):
+        self.wsgi_app = wsgi_app
+        self.environ = environ
+        self.status = None
+        self.headers = None
+        self.iterator = None
+        self.result = None
+    
+    def start_response(self, status: str, headers: List[Tuple[str, str]], exc_info=None):
+        if exc_info and self.status is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    
+    def begin(self) -> bytes:
+        """앱 호출 후 첫 번째 비어 있지 않은 청크 (start_response는 그 전까지 호출되어야 함)"""
+        self.result = self.wsgi_app(self.environ, self.start_response)
+        self.iterator = iter(self.result)
+        return self.next_chunk()
+    
+    def next_chunk(self) -> bytes:
+        """다음 청크 (끝이면 b'')"""
+        for chunk in self.iterator:
+            if chunk:
+                return chunk
+        return b''
+    
+    def close(self):
+        if hasattr(self.result, 'close'):
+            self.result.close()
+
+
+class ASGIBridge:
+    """WSGI 앱을 레인별 스레드 풀에서 실행하는 ASGI 앱"""
+    
+    def __init__(self, wsgi_app: Callable, lanes: Dict[str, Tuple[int, int]],
+                 route_lane: Optional[Callable[[str, str], str]] = None, default_lane: Optional[str] = None,
+                 on_startup: Optional[Callable[[], None]] = None, on_shutdown: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            wsgi_app: WSGI 앱 (Flask app)
+            lanes: 레인 이름 -> (스레드 수, 대기 한도)
+            route_lane: route_lane(method, path) -> 레인 이름 (None이면 모두 default_lane)
+            default_lane: 기본 레인 (None이면 lanes의 첫 번째)
+            on_startup / on_shutdown: ASGI lifespan 때 스레드에서 실행할 초기화/정리 함수
+        """
+        if not lanes:
+            raise ValueError("레인이 하나 이상 필요합니다")
+        self.wsgi_app = wsgi_app
+        self.lanes = {name: Lane(name, workers, max_queue) for name, (workers, max_queue) in lanes.items()}
+        self.default_lane = default_lane or next(iter(self.lanes))
+        self.route_lane = route_lane
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        self._routes: Dict[Tuple[str, str], AsyncHandler] = {}
+    
+    def route(self, path: str, methods: Tuple[str, ...] = ('GET',)):
+        """async 라우트 등록 (handler(scope, receive, send), 같은 경로의 WSGI 라우트보다 우선)"""
+        def decorator(handler: AsyncHandler) -> AsyncHandler:
+            for method in methods:
+                self._routes[(method.upper(), path)] = handler
+            return handler
+        return decorator
+    
+    def lane_for(self, method: str, path: str) -> Lane:
+        name = self.route_lane(method, path) if self.route_lane else None
+        return self.lanes.get(name or self.default_lane, self.lanes[self.default_lane])
+    
+    async def run_in_lane(self, lane_name: str, func: Callable, *args):
+        """블로킹 함수를 레인 스레드에서 실행하고 결과를 기다림 (대기 한도 초과면 LaneBusy)"""
+        lane = self.lanes[lane_name]
+        lane.acquire()
+        started = time.monotonic()
+        failed = False
+        try:
+            return await asyncio.get_running_loop().run_in_executor(lane.executor, func, *args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            lane.release(started, failed)
+    
+    def stats(self) -> Dict:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+    
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            handler = self._routes.get((scope['method'], scope['path']))
+            if handler is not None:
+                await handler(scope, receive, send)
+            else:
+                await self._call_wsgi(scope, receive, send)
+        else:
+            raise NotImplementedError(f"지원하지 않는 ASGI scope: {scope['type']}")
+    
+    async def _lifespan(self, receive: Callable, send: Callable):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    if self.on_startup:
+                        await loop.run_in_executor(None, self.on_startup)
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                try:
+                    if self.on_shutdown:
+                        await loop.run_in_executor(None, self.on_shutdown)
+                finally:
+                    for lane in self.lanes.values():
+                        lane.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def _call_wsgi(self, scope: dict, receive: Callable, send: Callable):
+        # 본문은 이벤트 루프에서 모두 받은 뒤 스레드로 넘김 (느린 업로드가 스레드를 잡지 않음)
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        
+        lane = self.lane_for(scope['method'], scope['path'])
+        try:
+            lane.acquire()
+        except LaneBusy:
+            await send_json(send, {'error': f'서버가 바쁩니다 ({lane.name}). 잠시 후 다시 시도하세요.'},
+                            status=503, headers=[(b'retry-after', b'1')])
+            return
+        
+        loop = asyncio.get_running_loop()
+        call = _WSGICall(self.wsgi_app, build_environ(scope, bytes(body)))
+        started = time.monotonic()
+        failed = False
+        response_started = False
+        try:
+            chunk = await loop.run_in_executor(lane.executor, call.begin)
+            if call.status is None:
+                raise RuntimeError("WSGI 앱이 start_response를 호출하지 않았습니다")
+            await send({'type': 'http.response.start', 'status': call.status, 'headers': call.headers})
+            response_started = True
+            # 스트리밍 응답은 청크마다 레인 스레드에서 다음 청크를 만듦
+            while True:
+                next_chunk = await loop.run_in_executor(lane.executor, call.next_chunk) if chunk else b''
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': bool(next_chunk)})
+                if not next_chunk:
+                    break
+                chunk = next_chunk
+        except Exception as e:
+            failed = True
+            print(f"⚠️ WSGI 요청 처리 오류 ({scope['method']} {scope['path']}): {e}")
+            if not response_started:
+                await send_json(send, {'error': str(e)}, status=500)
+        finally:
+            if call.result is not None:
+                await loop.run_in_executor(lane.executor, call.close)
+            lane.release(started, failed)
@@ -0,0 +1,167 @@
+"""가격 조회 지연 부하 테스트 - 카드 생산 중에도 /api/price가 빠른지 확인
+
+1단계(기준): 가격 클라이언트만 /api/price 반복 호출
+2단계(경합): 같은 부하 + 생산 클라이언트가 /api/cards/produce 를 계속 호출
+
+단계별 /api/price p50/p95/p99/최대 지연과 오류 수를 출력합니다.
+Waitress 모드(app.py)와 ASGI 모드(asgi.py)에 각각 실행해 비교하세요.
+ASGI 모드면 마지막에 /api/server/lanes 통계도 출력합니다.
+
+주의: /api/cards/produce 는 실제로 카드를 생산합니다 (생산 카드 제한 설정 적용). 테스트용 데이터 디렉토리에서 실행하세요.
+
+사용:
+    python html_version/api/load_test_price_latency.py --base-url http://localhost:5000 --duration 20
+"""
+import sys
+import io
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """nearest-rank 백분위수 (정렬된 목록)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def call(url: str, method: str = 'GET', payload: Dict = None, timeout: float = 30.0):
+    """요청 한 번 -> (상태 코드, 지연 초) / 연결 실패는 상태 코드 0"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, time.perf_counter() - started
+
+
+class Recorder:
+    """여러 스레드의 결과 수집"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.errors: Dict[int, int] = {}
+    
+    def add(self, status: int, elapsed: float):
+        with self.lock:
+            if status == 200:
+                self.latencies.append(elapsed)
+            else:
+                self.errors[status] = self.errors.get(status, 0) + 1
+    
+    def summary(self) -> Dict:
+        with self.lock:
+            values = sorted(self.latencies)
+            errors = dict(self.errors)
+        return {
+            'requests': len(values) + sum(errors.values()),
+            'errors': errors,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'max_ms': (values[-1] if values else 0.0) * 1000,
+            'avg_ms': (sum(values) / len(values) if values else 0.0) * 1000,
+        }
+
+
+def run_phase(base_url: str, duration: float, price_clients: int, price_interval: float,
+              produce_clients: int) -> Dict[str, Dict]:
+    """duration초 동안 가격/생산 클라이언트 실행"""
+    stop_at = time.time() + duration
+    price = Recorder()
+    produce = Recorder()
+    
+    def price_client():
+        while time.time() < stop_at:
+            price.add(*call(f"{base_url}/api/price", timeout=10))
+            time.sleep(price_interval)
+    
+    def produce_client():
+        while time.time() < stop_at:
+            status, elapsed = call(f"{base_url}/api/cards/produce", method='POST',
+                                   payload={'chart_data': None}, timeout=600)
+            produce.add(status, elapsed)
+            if status != 200:
+                time.sleep(0.5)  # 거절/오류면 잠시 쉬고 다시 시도
+    
+    threads = [threading.Thread(target=price_client, daemon=True) for _ in range(price_clients)]
+    threads += [threading.Thread(target=produce_client, daemon=True) for _ in range(produce_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'price': price.summary(), 'produce': produce.summary()}
+
+
+def print_row(label: str, summary: Dict):
+    errors = ", ".join(f"{code or '연결 실패'}: {count}" for code, count in sorted(summary['errors'].items())) or "-"
+    print(f"{label:<22} {summary['requests']:>6} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} "
+          f"{summary['p99_ms']:>9.1f} {summary['max_ms']:>9.1f}   {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카드 생산 중 /api/price 지연 측정")
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--duration', type=float, default=20.0, help="단계별 실행 시간 (초)")
+    parser.add_argument('--price-clients', type=int, default=8, help="/api/price 동시 클라이언트 수")
+    parser.add_argument('--price-interval', type=float, default=0.05, help="클라이언트별 호출 간격 (초)")
+    parser.add_argument('--produce-clients', type=int, default=4, help="/api/cards/produce 동시 클라이언트 수")
+    args = parser.parse_args()
+    base_url = args.base_url.rstrip('/')
+    
+    status, _ = call(f"{base_url}/api/health", timeout=5)
+    if status != 200:
+        print(f"❌ 서버에 연결할 수 없습니다: {base_url} (상태 {status})")
+        sys.exit(1)
+    
+    print("=" * 80)
+    print(f"/api/price 지연 부하 테스트 ({base_url})")
+    print(f"가격 클라이언트 {args.price_clients}개, 생산 클라이언트 {args.produce_clients}개, 단계별 {args.duration:.0f}초")
+    print("=" * 80)
+    
+    baseline = run_phase(base_url, args.duration, args.price_clients, args.price_interval, 0)
+    contended = run_phase(base_url, args.duration, args.price_clients, args.price_interval, args.produce_clients)
+    
+    print(f"{'':<22} {'요청':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}   오류")
+    print_row("price (기준)", baseline['price'])
+    print_row("price (생산 중)", contended['price'])
+    print_row("cards/produce", contended['produce'])
+    
+    base_p99 = baseline['price']['p99_ms']
+    if base_p99 > 0:
+        print(f"\nℹ️ 생산 중 /api/price p99: {contended['price']['p99_ms']:.1f}ms "
+              f"(기준 대비 {contended['price']['p99_ms'] / base_p99:.1f}배)")
+    
+    # ASGI 모드면 레인 통계 출력
+    try:
+        with urllib.request.urlopen(f"{base_url}/api/server/lanes", timeout=5) as response:
+            lanes = json.loads(response.read()).get('lanes') or {}
+    except Exception:
+        lanes = {}
+    if lanes:
+        print("\n레인 통계 (ASGI 모드)")
+        for name, stats in lanes.items():
+            print(f"  {name:<5} 요청 {stats['requests']:>6}  거절 {stats['rejected']:>4}  "
+                  f"최대 동시 {stats['max_in_flight']:>3}  p99 {stats['p99_ms']:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -146,11 +146,74 @@ const API = {
         return this.request(endpoint, { method: 'DELETE' });
     },
     
-    // 가격 정보
+    // 가격 정보 (가격 스트림이 살아 있으면 요청 없이 마지막 푸시 가격 사용)
     async getPrice() {
+        if (this.isPriceStreamLive()) {
+            return { ...this.latestPrice };
+        }
         return this.get('/price');
     },
     
+    // 가격 스트림 (Server-Sent Events) - 서버의 가격 피드 하나를 모든 화면/카드가 공유
+    latestPrice: null,
+    latestPriceAt: 0,
+    priceListeners: [],
+    priceSource: null,
+    
+    // 가격 푸시 구독 (구독 해제 함수 반환)
+    subscribePrice(callback) {
+        this.priceListeners.push(callback);
+        this.openPriceStream();
+        if (this.latestPrice) {
+            callback(this.latestPrice);
+        }
+        return () => {
+            this.priceListeners = this.priceListeners.filter(listener => listener !== callback);
+            if (this.priceListeners.length === 0 && this.priceSource) {
+                this.priceSource.close();
+                this.priceSource = null;
+            }
+        };
+    },
+    
+    openPriceStream() {
+        if (this.priceSource || typeof EventSource === 'undefined') {
+            return;
+        }
+        // 연결이 끊기면 EventSource가 자동 재연결 (서버가 retry: 3000 지정)
+        this.priceSource = new EventSource(`${this.baseURL}/price/stream`);
+        this.priceSource.onmessage = (event) => {
+            try {
+                const tick = JSON.parse(event.data);
+                if (!tick || !tick.price) {
+                    return;
+                }
+                this.latestPrice = tick;
+                this.latestPriceAt = Date.now();
+                this.priceListeners.forEach(listener => {
+                    try {
+                        listener(tick);
+                    } catch (error) {
+                        console.error('가격 리스너 실행 실패:', error);
+                    }
+                });
+            } catch (error) {
+                console.error('가격 스트림 데이터 파싱 실패:', error);
+            }
+        };
+        this.priceSource.onerror = () => {
+            // 503(연결 수 초과) 등으로 재연결하지 않고 닫힌 경우: 폴링으로 대체, 다음 구독 때 다시 연결
+            if (this.priceSource && this.priceSource.readyState === EventSource.CLOSED) {
+                this.priceSource = null;
+            }
+        };
+    },
+    
+    // 최근 maxAgeMs 안에 푸시 가격을 받았는지
+    isPriceStreamLive(maxAgeMs = 30000) {
+        return !!this.priceSource && !!this.latestPrice && (Date.now() - this.latestPriceAt) < maxAgeMs;
+    },
+    
     // 잔고 정보
     async getBalance() {
         return this.get('/balance');
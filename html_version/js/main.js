@@ -1,5 +1,6 @@
 // 메인 애플리케이션
 let updateIntervals = {};
+let unsubscribePrice = null;  // 가격 스트림 구독 해제 함수
 let currentTab = 0;
 let realTradingEnabled = false;
 
@@ -296,16 +297,20 @@ async function refreshSidebarAfterSettingsSave() {
     }
 }
 
+// 가격 표시
+function renderPrice(data) {
+    if (data && data.price) {
+        const priceEl = document.getElementById('btc-price');
+        if (priceEl) {
+            priceEl.textContent = parseFloat(data.price).toLocaleString() + ' KRW';
+        }
+    }
+}
+
 // 가격 업데이트
 async function updatePrice() {
     try {
-        const data = await API.getPrice();
-        if (data && data.price) {
-            const priceEl = document.getElementById('btc-price');
-            if (priceEl) {
-                priceEl.textContent = parseFloat(data.price).toLocaleString() + ' KRW';
-            }
-        }
+        renderPrice(await API.getPrice());
     } catch (error) {
         console.error('가격 업데이트 실패:', error);
         // 에러가 발생해도 UI는 유지
@@ -1904,8 +1909,16 @@ async function startAutoUpdates() {
     // 로컬 Config 업데이트
     Config.set('CHART_UPDATE_INTERVAL', chartUpdateInterval);
     
-    // 가격 업데이트
-    updateIntervals.price = setInterval(updatePrice, priceUpdateInterval);
+    // 가격 업데이트 (서버 푸시, 스트림이 끊겼을 때만 폴링)
+    if (unsubscribePrice) {
+        unsubscribePrice();
+    }
+    unsubscribePrice = API.subscribePrice(renderPrice);
+    updateIntervals.price = setInterval(() => {
+        if (!API.isPriceStreamLive()) {
+            updatePrice();
+        }
+    }, priceUpdateInterval);
     
     // 잔고 업데이트
     updateIntervals.balance = setInterval(updateBalance, balanceUpdateInterval);
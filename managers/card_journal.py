@@ -0,0 +1,445 @@
+"""생산 카드 임시 저장 저널 모듈
+
+production_cards_cache.json을 매번 전체 다시 쓰지 않고
+스냅샷(카드 헤더, 압축 JSON) + 본문 파일(히스토리/차트 데이터, offset 인덱스)
++ 변경 로그(추가만 하는 JSON Lines)로 저장합니다.
+변경된 카드의 바뀐 필드/새 히스토리만 로그에 한 줄씩 추가하므로
+거래 한 번의 쓰기 비용이 전체 카드 수가 아니라 변경 크기에 비례합니다.
+로드할 때는 헤더만 읽고 본문은 카드별로 처음 접근할 때 읽습니다 (ProductionCard 지연 로드).
+"""
+import os
+import glob
+import json
+import hashlib
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from managers.card_records import LAZY_FIELDS, ProductionCard, json_default
+
+# 빠른 JSON 처리를 위한 orjson 사용 (없으면 표준 json 사용)
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def _dumps(data) -> bytes:
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=json_default)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_json_default_or_str).encode('utf-8')
+
+
+def _json_default_or_str(value):
+    try:
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+
+def _loads(data: bytes):
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _digest(data: bytes) -> int:
+    """필드 값 해시 (스냅샷에 저장하므로 프로세스마다 같은 값)"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def _history_state(history_list) -> Tuple[Optional[str], int]:
+    """히스토리 비교용 (최신 history_id, 길이)"""
+    head = history_list[0].get('history_id') if history_list and isinstance(history_list[0], Mapping) else None
+    return head, len(history_list)
+
+
+def _materialize(card: Dict) -> Dict:
+    """본문까지 포함한 카드 필드 dict (ProductionCard는 본문을 읽음)"""
+    return dict(card.items()) if isinstance(card, ProductionCard) else card
+
+
+class CardCacheJournal:
+    """스냅샷 + 변경 로그 형식의 카드 임시 저장소
+    
+    - 스냅샷: {'cards': [헤더...], 'bodies': 본문 파일명, 'saved_at': ..., 'generation': N}
+      헤더의 '_body'에 본문 위치(offset, length)와 본문 요약(필드 해시, has_buy, has_sold) 저장
+      ('_body'가 없는 카드는 전체 필드가 들어 있는 기존 형식으로 읽음)
+    - 본문 파일: production_cards_cache.<N>.bodies (카드별 무거운 필드 JSON을 이어 붙인 파일)
+    - 로그: 첫 줄 {'op': 'generation', 'value': N} 다음에 변경 한 줄씩
+      put(카드 전체) / set(바뀐 필드) / history(새 히스토리, 최신순) / del(카드 삭제)
+    - 로그 세대가 스냅샷 세대와 다르면 (압축 도중 종료) 로그는 이미 스냅샷에 반영된 것으로 보고 무시
+    - 카드별로 마지막으로 기록한 필드 해시를 보관하여 바뀐 필드만 기록
+      (히스토리 항목은 앞에 추가만 된다고 보고 최신 history_id와 길이로 비교)
+    """
+    
+    def __init__(self, snapshot_path: str, max_history: int = 100, compact_bytes: int = 1024 * 1024):
+        """
+        초기화
+        
+        Args:
+            snapshot_path: 스냅샷 파일 경로 (production_cards_cache.json)
+            max_history: 카드당 최대 히스토리 수 (history 재생 시 잘라냄)
+            compact_bytes: 로그가 이 크기를 넘으면 압축 (기본값: 1MB)
+        """
+        self.snapshot_path = snapshot_path
+        self.log_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        self.max_history = max_history
+        self.compact_bytes = compact_bytes
+        
+        self._generation = 0
+        self._log_size = 0
+        self._fingerprints = {}  # card_id -> {필드: 해시}
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.appended_records = 0
+        self.appended_bytes = 0
+        self.compactions = 0
+    
+    @property
+    def log_size(self) -> int:
+        return self._log_size
+    
+    def has_snapshot(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+    
+    def needs_compaction(self) -> bool:
+        """스냅샷이 없거나 로그가 임계값을 넘었는지"""
+        return not self.has_snapshot() or self._log_size > self.compact_bytes
+    
+    def load(self) -> Optional[List[Dict]]:
+        """스냅샷을 읽고 로그를 재생하여 카드 목록 반환 (스냅샷이 없으면 None)"""
+        with self._lock:
+            if not os.path.exists(self.snapshot_path):
+                return None
+            
+            with open(self.snapshot_path, 'rb') as f:
+                content = f.read()
+            data = _loads(content) if content.strip() else {}
+            if not isinstance(data, dict) or not isinstance(data.get('cards'), list):
+                return None
+            
+            self._generation = data.get('generation', 0)
+            bodies_path = None
+            if data.get('bodies'):
+                bodies_path = os.path.join(os.path.dirname(self.snapshot_path), data['bodies'])
+            
+            cards = {}
+            for card in data['cards']:
+                if not isinstance(card, dict) or not card.get('card_id'):
+                    continue
+                body = card.pop('_body', None)
+                if body and bodies_path:
+                    # 헤더만 메모리에 두고 본문은 처음 접근할 때 읽음
+                    card = ProductionCard(card, bodies_path, body['offset'], body['length'], body)
+                else:
+                    card = ProductionCard(card)
+                cards[card['card_id']] = card
+            
+            replayed = self._replay_log(cards)
+            
+            self._fingerprints = {card_id: self._fingerprint(card) for card_id, card in cards.items()}
+            if replayed:
+                print(f"ℹ️ 카드 저널 재생: {replayed}개 변경 반영 (로그 {self._log_size:,} bytes)")
+            return list(cards.values())
+    
+    def _replay_log(self, cards: Dict[str, Dict]) -> int:
+        """현재 세대의 로그를 카드 dict에 반영 - 락 안에서 호출"""
+        self._log_size = 0
+        if not os.path.exists(self.log_path):
+            return 0
+        
+        with open(self.log_path, 'rb') as f:
+            content = f.read()
+        
+        # 쓰는 도중 종료된 마지막 줄은 잘라냄 (다음 기록이 이어 붙지 않도록)
+        end = content.rfind(b'\n') + 1
+        if end < len(content):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(end)
+            content = content[:end]
+        self._log_size = len(content)
+        
+        replayed = 0
+        for index, line in enumerate(content.splitlines()):
+            if not line.strip():
+                continue
+            try:
+                record = _loads(line)
+            except ValueError:
+                print(f"⚠️ 카드 저널 손상된 줄 무시: {index + 1}번째 줄")
+                continue
+            
+            if index == 0:
+                if record.get('op') != 'generation' or record.get('value') != self._generation:
+                    # 압축 도중 종료: 로그 내용은 이미 스냅샷에 반영되었으므로 삭제
+                    os.remove(self.log_path)
+                    self._log_size = 0
+                    return 0
+                continue
+            
+            self._apply(cards, record)
+            replayed += 1
+        return replayed
+    
+    def _apply(self, cards: Dict[str, Dict], record: Dict):
+        """로그 한 줄 반영 (같은 줄을 다시 반영해도 결과가 같음)"""
+        operation = record.get('op')
+        if operation == 'put':
+            card = record.get('card')
+            if isinstance(card, dict) and card.get('card_id'):
+                cards[card['card_id']] = ProductionCard(card)
+            return
+        
+        card_id = record.get('id')
+        if operation == 'del':
+            cards.pop(card_id, None)
+            return
+        
+        card = cards.get(card_id)
+        if card is None:
+            return
+        if operation == 'set':
+            card.update(record.get('fields', {}))
+        elif operation == 'history':
+            history_list = card.get('history_list') or []
+            known_ids = {item.get('history_id') for item in history_list if isinstance(item, Mapping)}
+            new_items = [item for item in record.get('items', []) if item.get('history_id') not in known_ids]
+            card['history_list'] = (new_items + history_list)[:self.max_history]
+    
+    def _fingerprint(self, card: Dict) -> Dict:
+        """필드별 해시 (history_list는 (최신 history_id, 길이))
+        
+        본문을 읽지 않은 카드는 본문 필드 해시를 스냅샷에 저장된 값으로 대신합니다.
+        """
+        fingerprint = {}
+        lazy = isinstance(card, ProductionCard)
+        for field, value in (card.header().items() if lazy else card.items()):
+            if field == 'history_list' and isinstance(value, list):
+                fingerprint[field] = _history_state(value)
+            else:
+                fingerprint[field] = _digest(_dumps(value))
+        if lazy and not card.hydrated:
+            for field, value in card.body_meta.get('fingerprint', {}).items():
+                fingerprint.setdefault(field, tuple(value) if field == 'history_list' else value)
+        return fingerprint
+    
+    def _diff(self, card: Dict) -> List[Dict]:
+        """마지막 기록 이후 바뀐 내용을 로그 레코드로 변환 - 락 안에서 호출"""
+        card_id = card['card_id']
+        new_fingerprint = self._fingerprint(card)
+        old_fingerprint = self._fingerprints.get(card_id)
+        self._fingerprints[card_id] = new_fingerprint
+        
+        if old_fingerprint is None:
+            return [{'op': 'put', 'card': _materialize(card)}]
+        
+        records = []
+        fields = {field: card[field] for field, value in new_fingerprint.items()
+                  if field != 'history_list' and old_fingerprint.get(field) != value}
+        removed_fields = [field for field in old_fingerprint if field not in new_fingerprint]
+        if removed_fields:
+            # 필드 삭제는 드문 경우이므로 카드 전체 기록
+            return [{'op': 'put', 'card': _materialize(card)}]
+        
+        if new_fingerprint.get('history_list') != old_fingerprint.get('history_list'):
+            new_items = self._new_history_items(card.get('history_list') or [], old_fingerprint.get('history_list'))
+            if new_items is None:
+                fields['history_list'] = card.get('history_list', [])
+            elif new_items:
+                records.append({'op': 'history', 'id': card_id, 'items': new_items})
+        
+        if fields:
+            records.insert(0, {'op': 'set', 'id': card_id, 'fields': fields})
+        return records
+    
+    def _new_history_items(self, history_list: List[Dict], old_state) -> Optional[List[Dict]]:
+        """앞쪽에 새로 추가된 히스토리 (앞에 추가된 것이 아니면 None → history_list 전체 기록)"""
+        if not old_state:
+            return None
+        old_head, old_length = old_state
+        if old_head is None:
+            return None if old_length else list(history_list)
+        for index, item in enumerate(history_list):
+            if isinstance(item, Mapping) and item.get('history_id') == old_head:
+                if len(history_list) != min(old_length + index, self.max_history):
+                    return None
+                return history_list[:index]
+        return None
+    
+    def record(self, cards: Dict[str, Optional[Dict]]) -> int:
+        """변경된 카드 기록 (값이 None이면 삭제)
+        
+        Returns:
+            추가한 로그 바이트 수
+        """
+        with self._lock:
+            lines = []
+            for card_id, card in cards.items():
+                if card is None:
+                    if self._fingerprints.pop(card_id, None) is not None:
+                        lines.append(_dumps({'op': 'del', 'id': card_id}))
+                    continue
+                lines.extend(_dumps(record) for record in self._diff(card))
+            return self._append(lines)
+    
+    def record_all(self, cards: Iterable[Dict]) -> int:
+        """전체 카드를 비교하여 변경된 카드와 사라진 카드 기록"""
+        current = {card['card_id']: card for card in cards if isinstance(card, Mapping) and card.get('card_id')}
+        with self._lock:
+            removed = [card_id for card_id in self._fingerprints if card_id not in current]
+        changes = dict(current)
+        changes.update({card_id: None for card_id in removed})
+        return self.record(changes)
+    
+    def _append(self, lines: List[bytes]) -> int:
+        """로그 파일에 줄 추가 - 락 안에서 호출"""
+        if not lines:
+            return 0
+        if self._log_size == 0:
+            lines.insert(0, _dumps({'op': 'generation', 'value': self._generation}))
+        payload = b'\n'.join(lines) + b'\n'
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_size += len(payload)
+        self.appended_records += len(lines)
+        self.appended_bytes += len(payload)
+        return len(payload)
+    
+    def _split_card(self, card: Dict) -> Tuple[Dict, bytes, Dict]:
+        """카드를 (헤더, 본문 바이트, 본문 요약)으로 분리
+        
+        본문을 읽지 않은 카드는 기존 본문 바이트를 파싱하지 않고 그대로 복사합니다.
+        """
+        if isinstance(card, ProductionCard):
+            body_bytes = card.read_body_bytes()
+            if body_bytes is not None:
+                return card.header(), body_bytes, dict(card.body_meta)
+        
+        header = {}
+        body = {}
+        for field, value in card.items():
+            if field in LAZY_FIELDS:
+                body[field] = value
+            else:
+                header[field] = value
+        
+        fingerprint = {}
+        for field, value in body.items():
+            if field == 'history_list' and isinstance(value, list):
+                fingerprint[field] = list(_history_state(value))
+            else:
+                fingerprint[field] = _digest(_dumps(value))
+        history_list = body.get('history_list') or []
+        meta = {
+            'fingerprint': fingerprint,
+            'has_buy': any(h.get('type') in ('NEW', 'BUY') for h in history_list if isinstance(h, Mapping)),
+            'has_sold': any(h.get('type') == 'SOLD' for h in history_list if isinstance(h, Mapping))
+        }
+        return header, _dumps(body), meta
+    
+    def compact(self, cards: Iterable[Dict]):
+        """현재 카드 전체를 새 스냅샷(헤더) + 본문 파일로 쓰고 로그를 비움"""
+        self.write_compaction(self.prepare_compaction(cards))
+    
+    def prepare_compaction(self, cards: Iterable[Dict]) -> List[Tuple]:
+        """압축할 카드별 (헤더, 본문 바이트, 본문 요약, 지문, 본문을 읽지 않은 카드) 목록 생성
+        
+        카드가 바뀌지 않도록 잠금 안에서 호출하고, 결과는 잠금 밖에서 write_compaction()으로 기록합니다.
+        (결과는 카드와 공유하지 않는 바이트/복사본이므로 그 사이 카드가 바뀌어도 스냅샷은 그대로)
+        """
+        prepared = []
+        for card in cards:
+            if not isinstance(card, Mapping) or not card.get('card_id'):
+                continue
+            header, body_bytes, meta = self._split_card(card)
+            
+            fingerprint = self._fingerprint(header)
+            for field, value in meta.get('fingerprint', {}).items():
+                fingerprint.setdefault(field, tuple(value) if field == 'history_list' else value)
+            
+            lazy_card = card if isinstance(card, ProductionCard) and not card.hydrated else None
+            prepared.append((header, body_bytes, meta, fingerprint, lazy_card))
+        return prepared
+    
+    def write_compaction(self, prepared: List[Tuple]):
+        """prepare_compaction() 결과를 새 스냅샷(헤더) + 본문 파일로 쓰고 로그를 비움
+        
+        스냅샷을 만든 뒤 바뀐 카드는 지문이 달라지므로 다음 기록 때 로그에 추가됩니다.
+        """
+        with self._lock:
+            generation = self._generation + 1
+            base_path = os.path.splitext(self.snapshot_path)[0]
+            bodies_path = f"{base_path}.{generation}.bodies"
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            
+            # 본문 파일: 카드별 무거운 필드를 이어 붙이고 헤더에 위치 기록
+            headers = []
+            fingerprints = {}
+            rebinds = []
+            with open(f"{bodies_path}.tmp", 'wb') as f:
+                for header, body_bytes, meta, fingerprint, lazy_card in prepared:
+                    offset = f.tell()
+                    f.write(body_bytes)
+                    fingerprints[header['card_id']] = fingerprint
+                    
+                    headers.append(dict(header, _body=dict(meta, offset=offset, length=len(body_bytes))))
+                    if lazy_card is not None:
+                        rebinds.append((lazy_card, offset, len(body_bytes)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{bodies_path}.tmp", bodies_path)
+            
+            data = {
+                'cards': headers,
+                'bodies': os.path.basename(bodies_path),
+                'saved_at': datetime.now().isoformat(),
+                'generation': generation
+            }
+            temp_path = f"{self.snapshot_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(_dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            
+            # 스냅샷 교체 후 로그 삭제 (그 사이 종료되면 세대가 달라 로그는 무시됨)
+            self._generation = generation
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            self._log_size = 0
+            self._fingerprints = fingerprints
+            self.compactions += 1
+            
+            # 아직 본문을 읽지 않은 카드는 새 본문 파일을 가리키도록 바꾸고 이전 본문 파일 삭제
+            # (그 사이 본문을 읽은 카드는 rebind가 무시)
+            for card, offset, length in rebinds:
+                card.rebind(bodies_path, offset, length)
+            for old_path in glob.glob(f"{glob.escape(base_path)}.*.bodies"):
+                if old_path != bodies_path:
+                    try:
+                        os.remove(old_path)
+                    except OSError as e:
+                        print(f"⚠️ 이전 카드 본문 파일 삭제 오류: {e}")
+    
+    def stats(self) -> Dict:
+        """저널 통계"""
+        with self._lock:
+            return {
+                'generation': self._generation,
+                'log_size': self._log_size,
+                'tracked_cards': len(self._fingerprints),
+                'appended_records': self.appended_records,
+                'appended_bytes': self.appended_bytes,
+                'compactions': self.compactions,
+                'compact_bytes': self.compact_bytes
+            }
@@ -0,0 +1,205 @@
+"""카드 저장 지연 쓰기(write-behind) 모듈
+
+카드 생성/갱신/삭제 요청을 dirty 목록에 모아 두었다가 하나의 백그라운드 스레드에서 처리합니다.
+같은 카드에 대한 여러 번의 갱신은 지연 시간(coalesce window) 안에서 마지막 상태 한 번으로 합쳐지고,
+임시 저장 파일(production_cards_cache.json) 기록도 변경된 card_id 목록과 함께 한 번으로 묶입니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+
+
+class CardPersistenceWorker:
+    """카드 저장 지연 쓰기 워커
+    
+    - mark_created(card_id, text, metadata): 새 카드 파일 생성 예약 (같은 카드의 갱신보다 먼저 처리)
+    - mark_card(card): 카드 파일 갱신 예약 (같은 card_id는 마지막 카드 객체만 유지)
+    - mark_removed(card_id): 카드 파일 삭제 예약 (대기 중인 갱신은 취소)
+    - mark_cache(card_id): 임시 저장 파일 기록 예약 (card_id가 없으면 전체 카드 비교)
+    - flush(): 대기 중인 작업을 호출한 스레드에서 즉시 처리 (종료 시 사용)
+    """
+    
+    def __init__(self,
+                 write_card: Callable[[Dict], None],
+                 remove_card: Callable[[str], None],
+                 write_cache: Callable[[Set[str], bool], None],
+                 delay: float = 0.5,
+                 create_card: Optional[Callable[[str, Dict], None]] = None):
+        """
+        초기화
+        
+        Args:
+            write_card: 카드 하나를 저장소에 쓰는 함수
+            remove_card: card_id의 카드 파일을 삭제하는 함수
+            write_cache: 임시 저장 파일 기록 함수 (변경된 card_id 집합, 전체 비교 여부)
+            delay: 첫 요청 후 처리까지 기다리는 시간 (초, 기본값: 0.5)
+            create_card: 새 카드 파일을 만드는 함수 (텍스트, 메타데이터)
+        """
+        self._write_card = write_card
+        self._remove_card = remove_card
+        self._write_cache = write_cache
+        self._create_card = create_card
+        self.delay = max(0.0, float(delay))
+        
+        self._creates = OrderedDict()  # card_id -> (text, metadata) 새 카드 파일
+        self._pending = OrderedDict()  # card_id -> card (삭제 예약은 None)
+        self._cache_ids = set()  # 임시 저장 파일에 기록할 card_id
+        self._cache_dirty = False  # 전체 카드 비교 필요
+        self._first_marked_at = None  # 처리 대기 시작 시각 (지연 시간 기준)
+        
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # 꺼내기 ~ 쓰기를 한 번에 하나만 실행 (flush 순서 보장)
+        self._thread = None
+        self._stopped = False
+        
+        # 통계
+        self.requested = 0
+        self.created = 0
+        self.written = 0
+        self.removed = 0
+        self.cache_writes = 0
+    
+    def mark_created(self, card_id: str, text: str, metadata: Dict):
+        """새 카드 파일 생성 예약 (같은 drain의 갱신/삭제보다 먼저 처리되어 파일이 없어 갱신이 누락되지 않음)"""
+        if not card_id:
+            return
+        with self._condition:
+            self._creates[card_id] = (text, metadata)
+            self._cache_ids.add(card_id)
+            self.requested += 1
+            self._notify()
+    
+    def mark_card(self, card: Dict):
+        """카드 파일 갱신 예약"""
+        card_id = card.get('card_id') if card else None
+        if not card_id:
+            return
+        with self._condition:
+            self._pending[card_id] = card
+            self._cache_ids.add(card_id)
+            self.requested += 1
+            self._notify()
+    
+    def mark_removed(self, card_id: str):
+        """카드 파일 삭제 예약 (대기 중인 갱신은 덮어씀)"""
+        if not card_id:
+            return
+        with self._condition:
+            # 아직 쓰지 않은 새 카드는 만들지 않음 (삭제된 활성 카드 파일이 남지 않도록)
+            self._creates.pop(card_id, None)
+            self._pending[card_id] = None
+            self._cache_ids.add(card_id)
+            self.requested += 1
+            self._notify()
+    
+    def mark_cache(self, card_id: Optional[str] = None):
+        """임시 저장 파일 기록 예약 (card_id가 없으면 어떤 카드가 바뀌었는지 모르므로 전체 비교)"""
+        with self._condition:
+            if card_id:
+                self._cache_ids.add(card_id)
+            else:
+                self._cache_dirty = True
+            self._notify()
+    
+    def _notify(self):
+        """대기 시작 시각 기록 및 워커 시작 - 락 안에서 호출"""
+        if self._first_marked_at is None:
+            self._first_marked_at = time.monotonic()
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="CardPersistenceWorker", daemon=True)
+            self._thread.start()
+        self._condition.notify()
+    
+    def _has_pending(self) -> bool:
+        return bool(self._creates) or bool(self._pending) or bool(self._cache_ids) or self._cache_dirty
+    
+    def _run(self):
+        """지연 시간이 지나면 대기 중인 작업을 한 번에 처리"""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._has_pending():
+                        remaining = self._first_marked_at + self.delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+            self._drain()
+    
+    def _drain(self):
+        """대기 중인 작업을 꺼내서 처리 (새 카드 파일 → 카드 갱신/삭제 → 임시 저장 파일 순서)"""
+        with self._write_lock:
+            with self._condition:
+                creates = self._creates
+                pending = self._pending
+                self._creates = OrderedDict()
+                cache_ids = self._cache_ids
+                cache_dirty = self._cache_dirty
+                self._pending = OrderedDict()
+                self._cache_ids = set()
+                self._cache_dirty = False
+                self._first_marked_at = None
+            
+            for card_id, (text, metadata) in creates.items():
+                try:
+                    self._create_card(text, metadata)
+                    self.created += 1
+                except Exception as e:
+                    print(f"❌ 생산 카드 저장 오류 ({card_id}): {e}")
+            
+            for card_id, card in pending.items():
+                try:
+                    if card is None:
+                        self._remove_card(card_id)
+                        self.removed += 1
+                    else:
+                        self._write_card(card)
+                        self.written += 1
+                except Exception as e:
+                    print(f"⚠️ 카드 저장 오류 ({card_id}): {e}")
+            
+            if cache_ids or cache_dirty:
+                try:
+                    self._write_cache(cache_ids, cache_dirty)
+                    self.cache_writes += 1
+                except Exception as e:
+                    print(f"⚠️ 임시 저장 파일 저장 오류: {e}")
+    
+    def flush(self):
+        """대기 중인 작업을 즉시 처리 (워커가 처리 중이면 끝날 때까지 기다린 뒤 남은 작업 처리)"""
+        self._drain()
+    
+    def stop(self, flush: bool = True):
+        """워커 종료
+        
+        Args:
+            flush: True이면 종료 전에 대기 중인 작업을 처리 (기본값: True)
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        if flush:
+            self.flush()
+    
+    def stats(self) -> Dict:
+        """처리 통계"""
+        with self._condition:
+            return {
+                'pending_creates': len(self._creates),
+                'pending_cards': len(self._pending),
+                'pending_cache_cards': len(self._cache_ids),
+                'cache_dirty': self._cache_dirty,
+                'requested': self.requested,
+                'created': self.created,
+                'written': self.written,
+                'removed': self.removed,
+                'cache_writes': self.cache_writes,
+                'delay': self.delay
+            }
@@ -0,0 +1,356 @@
+"""NBverse 폴더에서 생산 카드 재구성 모듈 (임시 저장 파일이 없을 때의 콜드 스타트)
+
+파일 경로 목록을 한꺼번에 만들지 않고 흘려 보내며 처리합니다.
+- os.scandir 기반 폴더 순회 (이름순 깊이 우선 - 순서가 고정되어 중단 지점부터 이어갈 수 있음)
+- 파일 묶음 단위로 디코드, 파일이 많으면 프로세스 풀 사용 (orjson, 없으면 표준 json)
+- 'production_card' 바이트가 없는 파일은 파싱하지 않음 (바이트 사전 필터)
+- 처리 중인 묶음 수를 제한하여 파일 수와 무관하게 메모리 사용량 유지
+- 결과를 spool 파일에 추가하고 주기적으로 체크포인트 기록 → 중단 후 다시 시작하면 이어서 진행
+"""
+import os
+import sys
+import json
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+# 빠른 JSON 처리를 위한 orjson 사용 (없으면 표준 json 사용)
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# 생산 카드 파일에만 있는 값 (이 바이트가 없으면 파싱하지 않음)
+_PRODUCTION_CARD_MARKER = b'"production_card"'
+
+# NBverse .col 파일 참조의 dtype -> array 타입 코드 (NBverse/columns.py 형식, 리틀 엔디언)
+_COLUMN_TYPECODES = {'<f8': 'd', '<i8': 'q', '<i4': 'i'}
+
+
+def _loads(data: bytes):
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_line(record: Dict) -> bytes:
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _read_column(path: str, ref: Dict) -> list:
+    """JSON 옆 .col 파일에서 참조한 배열을 list로 읽음 (읽지 못하면 빈 list)"""
+    typecode = _COLUMN_TYPECODES.get(ref.get('dtype'))
+    if typecode is None:
+        return []
+    values = array(typecode)
+    column_path = os.path.join(os.path.dirname(path), os.path.basename(str(ref.get('$column'))))
+    try:
+        with open(column_path, 'rb') as f:
+            f.seek(ref.get('offset', 0))
+            values.frombytes(f.read(ref.get('count', 0) * values.itemsize))
+    except (OSError, ValueError):
+        return []
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
+
+
+def decode_batch(paths: Sequence[str]) -> Dict:
+    """파일 묶음에서 생산 카드 레코드 추출 (프로세스 풀 작업자에서 실행)
+    
+    Returns:
+        {'records': [{'path', 'metadata', 'nb'}], 'errors': 읽지 못한 파일 수}
+        (원본 텍스트/유니코드 배열은 카드 변환에 쓰지 않으므로 돌려보내지 않음)
+    """
+    records = []
+    errors = 0
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            errors += 1
+            continue
+        if _PRODUCTION_CARD_MARKER not in raw:
+            continue
+        try:
+            data = _loads(raw)
+        except ValueError:
+            errors += 1
+            continue
+        metadata = data.get('metadata') if isinstance(data, dict) else None
+        if not isinstance(metadata, dict) or metadata.get('card_type') != 'production_card':
+            continue
+        chart_data = metadata.get('chart_data')
+        if isinstance(chart_data, dict) and isinstance(chart_data.get('prices'), dict) and '$column' in chart_data['prices']:
+            metadata['chart_data'] = dict(chart_data, prices=_read_column(path, chart_data['prices']))
+        nb = data.get('nb') or {}
+        records.append({
+            'path': path,
+            'metadata': metadata,
+            'nb': {'max': nb.get('max'), 'min': nb.get('min')}
+        })
+    return {'records': records, 'errors': errors}
+
+
+def iter_json_files(base_dir: str, after: Optional[List[str]] = None) -> Iterator[str]:
+    """폴더 아래 .json 파일을 이름순 깊이 우선으로 순회 (os.scandir, 전체 경로 목록을 만들지 않음)
+    
+    Args:
+        base_dir: 순회할 폴더
+        after: 이 상대 경로(경로 구성 요소 목록)까지는 건너뜀 (이어서 재구성할 때)
+    """
+    def children(directory: str, prefix: List[str]):
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return iter(())
+        return ((entry, prefix + [entry.name]) for entry in entries)
+    
+    stack = [children(base_dir, [])]
+    while stack:
+        for entry, key in stack[-1]:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                # 체크포인트보다 앞선 폴더는 통째로 건너뜀
+                if after is not None and key < after[:len(key)]:
+                    continue
+                stack.append(children(entry.path, key))
+                break
+            if entry.name.endswith('.json') and (after is None or key > after):
+                yield entry.path
+        else:
+            stack.pop()
+
+
+class CardRebuilder:
+    """NBverse 폴더에서 생산 카드 레코드를 흘려 보내며 읽는 재구성 작업
+    
+    records()는 {'path', 'metadata', 'nb'} 레코드를 순서대로 돌려주며,
+    끝까지 읽으면 체크포인트와 spool 파일을 삭제합니다.
+    중간에 중단되면 다음 records() 호출 시 spool의 레코드를 먼저 돌려주고 체크포인트 이후 파일부터 이어갑니다.
+    """
+    
+    def __init__(self, search_dirs: Sequence[str], state_path: str, workers: int = 0,
+                 batch_size: int = 256, process_threshold: int = 2048,
+                 checkpoint_interval: float = 1.0, progress_interval: float = 2.0,
+                 on_progress: Optional[Callable[[Dict], None]] = None):
+        """
+        초기화
+        
+        Args:
+            search_dirs: 순회할 폴더 목록 (max, min 폴더)
+            state_path: 체크포인트/spool 파일 경로 앞부분 (<state_path>.checkpoint, <state_path>.spool)
+            workers: 디코드 작업자 수 (0이면 CPU 수, 최대 8 / 1이면 현재 프로세스에서만 디코드)
+            batch_size: 작업자가 한 번에 읽을 파일 수
+            process_threshold: 확인한 파일이 이 수를 넘으면 프로세스 풀 사용 (적을 때는 시작 비용이 더 큼)
+            checkpoint_interval: 체크포인트 기록 간격 (초)
+            progress_interval: 진행 상황 출력 간격 (초)
+            on_progress: 진행 상황 콜백 (stats 딕셔너리)
+        """
+        self.search_dirs = [os.path.abspath(d) for d in search_dirs]
+        self.checkpoint_path = f"{state_path}.checkpoint"
+        self.spool_path = f"{state_path}.spool"
+        self.workers = workers if workers > 0 else max(1, min(8, os.cpu_count() or 1))
+        self.batch_size = max(1, batch_size)
+        self.process_threshold = process_threshold
+        self.max_pending = self.workers * 2  # 처리 중인 묶음 수 상한 (메모리 상한)
+        self.checkpoint_interval = checkpoint_interval
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+        
+        self.stats = {'files': 0, 'records': 0, 'errors': 0, 'resumed': 0}
+        self._executor = None
+        self._spool = None
+        self._last_done = None  # 마지막으로 끝난 묶음 위치 (폴더 번호, 상대 경로)
+        self._last_checkpoint = 0.0
+        self._last_progress = 0.0
+    
+    def records(self) -> Iterator[Dict]:
+        """생산 카드 레코드 순회 (끝까지 읽으면 체크포인트 삭제)"""
+        start = time.perf_counter()
+        checkpoint = self._load_checkpoint()
+        try:
+            if checkpoint:
+                self.stats['files'] = checkpoint.get('files', 0)
+                self.stats['records'] = checkpoint.get('records', 0)
+                print(f"ℹ️ 생산 카드 재구성 이어서 진행: 파일 {self.stats['files']:,}개 처리됨")
+                for record in self._read_spool():
+                    self.stats['resumed'] += 1
+                    yield record
+            else:
+                self._clear_state()
+            
+            self._open_spool()
+            for dir_index, base_dir in enumerate(self.search_dirs):
+                after = None
+                if checkpoint:
+                    if dir_index < checkpoint['dir_index']:
+                        continue
+                    if dir_index == checkpoint['dir_index']:
+                        after = checkpoint.get('after')
+                yield from self._process_dir(dir_index, base_dir, after)
+        finally:
+            self._close()
+        
+        self._clear_state()
+        elapsed = time.perf_counter() - start
+        print(f"✅ 생산 카드 재구성 완료: 파일 {self.stats['files']:,}개 확인, "
+              f"카드 파일 {self.stats['records']:,}개 ({elapsed:.1f}초)")
+        if self.stats['errors']:
+            print(f"⚠️ 읽지 못한 파일 {self.stats['errors']:,}개 (비어있거나 손상됨)")
+    
+    def _process_dir(self, dir_index: int, base_dir: str, after: Optional[List[str]]) -> Iterator[Dict]:
+        """폴더 하나를 묶음 단위로 디코드 (처리 중인 묶음은 max_pending개까지, 결과는 순회 순서대로)"""
+        pending = deque()  # (파일 묶음, future 또는 None)
+        batch = []
+        scheduled = self.stats['files']
+        
+        for path in iter_json_files(base_dir, after):
+            batch.append(path)
+            if len(batch) < self.batch_size:
+                continue
+            scheduled += len(batch)
+            pending.append(self._submit(batch, scheduled))
+            batch = []
+            while len(pending) > self.max_pending or (pending and pending[0][1] is None):
+                yield from self._complete(dir_index, base_dir, pending.popleft())
+        
+        if batch:
+            pending.append(self._submit(batch, scheduled + len(batch)))
+        while pending:
+            yield from self._complete(dir_index, base_dir, pending.popleft())
+    
+    def _submit(self, paths: List[str], scheduled: int):
+        """파일 묶음 예약 (파일이 적으면 현재 프로세스에서 디코드)"""
+        if self._executor is None and self.workers > 1 and scheduled > self.process_threshold:
+            self._executor = self._start_pool()
+        if self._executor is None:
+            return paths, None
+        return paths, self._executor.submit(decode_batch, paths)
+    
+    def _start_pool(self):
+        try:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        except (OSError, NotImplementedError, ImportError) as e:
+            print(f"⚠️ 프로세스 풀을 사용할 수 없어 스레드로 디코드합니다: {e}")
+            return ThreadPoolExecutor(max_workers=self.workers)
+    
+    def _complete(self, dir_index: int, base_dir: str, item) -> Iterator[Dict]:
+        """묶음 결과 반영 (spool 추가, 체크포인트, 진행 상황) 후 레코드 반환"""
+        paths, future = item
+        result = None
+        if future is not None:
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # 남은 묶음은 현재 프로세스에서 디코드하고 이후 묶음은 스레드로 처리
+                if isinstance(self._executor, ProcessPoolExecutor):
+                    print(f"⚠️ 디코드 프로세스가 중단되어 스레드로 전환합니다: {e}")
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        if result is None:
+            result = decode_batch(paths)
+        
+        records = result['records']
+        self.stats['files'] += len(paths)
+        self.stats['records'] += len(records)
+        self.stats['errors'] += result['errors']
+        
+        if records:
+            self._spool.write(b''.join(_dumps_line(record) for record in records))
+        
+        self._last_done = (dir_index, os.path.relpath(paths[-1], base_dir).split(os.sep))
+        now = time.monotonic()
+        if now - self._last_checkpoint >= self.checkpoint_interval:
+            self._save_checkpoint(*self._last_done)
+            self._last_checkpoint = now
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            print(f"ℹ️ 생산 카드 재구성 중: 파일 {self.stats['files']:,}개 확인, 카드 파일 {self.stats['records']:,}개")
+            if self.on_progress:
+                self.on_progress(dict(self.stats))
+        
+        yield from records
+    
+    def _load_checkpoint(self) -> Optional[Dict]:
+        try:
+            with open(self.checkpoint_path, 'rb') as f:
+                checkpoint = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        # 다른 폴더를 대상으로 만든 체크포인트는 무시
+        if checkpoint.get('search_dirs') != self.search_dirs or not os.path.exists(self.spool_path):
+            return None
+        return checkpoint
+    
+    def _save_checkpoint(self, dir_index: int, after: List[str]):
+        """spool을 디스크에 내린 뒤 체크포인트 교체 (체크포인트 이전 파일의 레코드는 항상 spool에 있음)"""
+        try:
+            self._spool.flush()
+            os.fsync(self._spool.fileno())
+            checkpoint = {
+                'search_dirs': self.search_dirs,
+                'dir_index': dir_index,
+                'after': after,
+                'files': self.stats['files'],
+                'records': self.stats['records']
+            }
+            temp_path = f"{self.checkpoint_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(_dumps_line(checkpoint))
+            os.replace(temp_path, self.checkpoint_path)
+        except OSError as e:
+            print(f"⚠️ 재구성 체크포인트 저장 오류: {e}")
+    
+    def _read_spool(self) -> Iterator[Dict]:
+        """이전 실행에서 읽은 레코드 (쓰는 도중 중단된 줄은 건너뜀)"""
+        try:
+            with open(self.spool_path, 'rb') as f:
+                for line in f:
+                    try:
+                        yield _loads(line)
+                    except ValueError:
+                        continue
+        except OSError as e:
+            print(f"⚠️ 재구성 spool 읽기 오류: {e}")
+    
+    def _open_spool(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        self._spool = open(self.spool_path, 'ab')
+        # 쓰는 도중 중단된 마지막 줄 뒤에 새 레코드가 이어 붙지 않도록 줄바꿈 추가
+        if self._spool.tell() > 0:
+            with open(self.spool_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._spool.write(b'\n')
+    
+    def _close(self):
+        """작업자 종료, 중간에 멈췄으면 마지막으로 끝난 묶음까지 체크포인트 기록"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._spool is not None:
+            if self._last_done is not None:
+                self._save_checkpoint(*self._last_done)
+            self._spool.close()
+            self._spool = None
+    
+    def _clear_state(self):
+        for path in (self.checkpoint_path, self.spool_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ 재구성 상태 파일 삭제 오류: {e}")
@@ -0,0 +1,349 @@
+"""생산 카드 / 히스토리 레코드 모듈
+
+카드와 히스토리 항목을 __slots__ 레코드로 보관합니다.
+- 필드 이름을 카드마다 dict 키로 중복 저장하지 않음 (알 수 없는 필드만 _extra dict에 보관)
+- chart_data['prices'], realtime_scores는 array('d') (float 객체 대신 8바이트 double 연속 저장)
+- dict와 같은 방식으로 사용 (card['score'], card.get('history_list'), 'rank' in card, card.items(), dict(card))
+- 카드 헤더만 로드하고 history_list / chart_data / realtime_scores는 처음 접근할 때
+  본문 파일(offset 인덱스)에서 읽을 수 있음 (지연 로드)
+
+JSON 저장/응답 시에는 to_plain() 또는 json_default를 사용합니다.
+"""
+import json
+import threading
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Optional, Tuple
+
+# 빠른 JSON 처리를 위한 orjson 사용 (없으면 표준 json 사용)
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# 히스토리 항목 필드
+HISTORY_FIELDS = (
+    'history_id', 'card_key', 'generation', 'type', 'nb_id', 'timestamp',
+    'entry_price', 'exit_price', 'qty', 'pnl_percent', 'pnl_amount', 'fee_amount',
+    'memo', 'is_simulation'
+)
+
+# 카드 헤더 필드
+CARD_FIELDS = (
+    'card_id', 'card_key', 'timeframe', 'nb_value', 'nb_max', 'nb_min', 'nb_id',
+    'card_type', 'card_state', 'status', 'removal_pending', 'production_time',
+    'production_number', 'score', 'rank', 'buy_entry_price'
+)
+
+# 본문 파일로 분리하는 무거운 필드
+LAZY_FIELDS = ('history_list', 'chart_data', 'realtime_scores')
+_LAZY_FIELD_SET = frozenset(LAZY_FIELDS)
+
+# 실시간 점수 히스토리 최대 개수 (UI 점수 차트와 동일)
+MAX_REALTIME_SCORES = 100
+
+# 본문 읽기와 본문 위치 변경(압축)을 직렬화
+_body_lock = threading.RLock()
+
+
+def _loads(data: bytes):
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _float_array(values) -> Optional[array]:
+    """숫자 시퀀스를 array('d')로 변환 (숫자가 아닌 값이 있으면 None)"""
+    if hasattr(values, 'to_array'):  # NBverse ColumnArray (.col 파일 바이트에서 바로 변환)
+        values = values.to_array()
+    if isinstance(values, array):
+        return values
+    try:
+        return array('d', values)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_plain(value):
+    """레코드/array를 일반 dict/list로 변환 (JSON 저장, 외부 전달용)"""
+    if isinstance(value, _SlotRecord):
+        return value.to_dict()
+    if isinstance(value, array) or hasattr(value, 'to_array'):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """json/orjson/Flask의 default 인자용 (레코드와 array만 변환)"""
+    if isinstance(value, _SlotRecord):
+        return dict(value.items())
+    if isinstance(value, array) or hasattr(value, 'to_array'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _SlotRecord(MutableMapping):
+    """__slots__ 필드를 dict처럼 다루는 레코드 기본 클래스
+    
+    설정하지 않은 필드는 dict에 키가 없는 것과 같게 취급합니다.
+    """
+    
+    __slots__ = ('_extra',)
+    _FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET = frozenset()
+    
+    def __init__(self, data=None, **kwargs):
+        self._extra = None
+        if data:
+            self.update(data)
+        if kwargs:
+            self.update(kwargs)
+    
+    def _convert(self, key, value):
+        """필드 저장 형식 변환 (하위 클래스에서 재정의)"""
+        return value
+    
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+    
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+    
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+    
+    def __setitem__(self, key, value):
+        if key in self._FIELD_SET:
+            setattr(self, key, self._convert(key, value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+    
+    def __iter__(self):
+        for field in self._FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from list(self._extra)
+    
+    def __len__(self):
+        count = sum(1 for field in self._FIELDS if hasattr(self, field))
+        return count + (len(self._extra) if self._extra else 0)
+    
+    def copy(self) -> Dict:
+        """얕은 복사 (일반 dict)"""
+        return dict(self.items())
+    
+    def to_dict(self) -> Dict:
+        """일반 dict로 변환 (하위 레코드/array까지 변환)"""
+        return {key: to_plain(value) for key, value in self.items()}
+    
+    def __reduce_ex__(self, protocol):
+        # pickle/deepcopy는 일반 dict로 변환한 뒤 같은 레코드 타입으로 복원
+        return (type(self), (self.to_dict(),))
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class HistoryEntry(_SlotRecord):
+    """히스토리 항목 (NEW / BUY / SOLD)"""
+    
+    __slots__ = HISTORY_FIELDS
+    _FIELDS = HISTORY_FIELDS
+    _FIELD_SET = frozenset(HISTORY_FIELDS)
+
+
+class ProductionCard(_SlotRecord):
+    """생산 카드 레코드
+    
+    - history_list 항목은 HistoryEntry, chart_data['prices']와 realtime_scores는 array('d')로 저장
+      (realtime_scores는 최근 MAX_REALTIME_SCORES개만 유지)
+    - body_path를 주면 헤더만 가진 상태로 만들고, 무거운 필드(history_list / chart_data /
+      realtime_scores)에 처음 접근할 때 본문을 읽음
+      (keys()/items()/values()/순회/copy()/dict(card)도 본문을 먼저 읽음)
+    - len(card), bool(card), 헤더 필드 조회는 본문을 읽지 않음
+    - 본문을 읽기 전에 무거운 필드를 직접 설정하면 설정한 값이 유지됨
+    """
+    
+    __slots__ = CARD_FIELDS + LAZY_FIELDS + ('_body_path', '_body_offset', '_body_length', 'body_meta')
+    _FIELDS = CARD_FIELDS + LAZY_FIELDS
+    _FIELD_SET = frozenset(CARD_FIELDS + LAZY_FIELDS)
+    
+    def __init__(self, data=None, body_path: Optional[str] = None, offset: int = 0, length: int = 0,
+                 body_meta: Optional[Dict] = None):
+        """
+        초기화
+        
+        Args:
+            data: 카드 필드 (지연 로드 시 헤더 필드만)
+            body_path: 본문 파일 경로 (없으면 data가 전체 카드)
+            offset: 본문 파일에서 이 카드 본문의 시작 위치
+            length: 본문 길이 (바이트)
+            body_meta: 본문 요약 (fingerprint, has_buy, has_sold - 본문을 읽지 않고 조회용)
+        """
+        self._body_path = None
+        self._body_offset = offset
+        self._body_length = length
+        self.body_meta = body_meta or {}
+        super().__init__(data)
+        self._body_path = body_path
+    
+    @classmethod
+    def from_dict(cls, card) -> 'ProductionCard':
+        """dict 카드를 레코드로 변환 (이미 레코드면 그대로 반환)"""
+        if isinstance(card, cls):
+            return card
+        return cls(card)
+    
+    def _convert(self, key, value):
+        if key == 'history_list' and isinstance(value, list):
+            return [HistoryEntry(item) if isinstance(item, Mapping) and not isinstance(item, HistoryEntry) else item
+                    for item in value]
+        if key == 'chart_data' and isinstance(value, dict) and (
+                isinstance(value.get('prices'), list) or hasattr(value.get('prices'), 'to_array')):
+            # 실수만 있는 목록만 array('d')로 (정수가 있으면 100 -> 100.0으로 바뀌어 N/B 텍스트가 달라지므로 그대로 둠)
+            if isinstance(value['prices'], list) and not all(type(v) is float for v in value['prices']):
+                return value
+            prices = _float_array(value['prices'])
+            if prices is not None:
+                return dict(value, prices=prices)
+        elif key == 'realtime_scores' and isinstance(value, (list, tuple, array)):
+            scores = _float_array(value[-MAX_REALTIME_SCORES:])
+            if scores is not None:
+                return scores
+        return value
+    
+    @property
+    def hydrated(self) -> bool:
+        """본문을 이미 읽었는지 (지연 로드가 아니면 항상 True)"""
+        return self._body_path is None
+    
+    def hydrate(self) -> 'ProductionCard':
+        """본문을 읽어 무거운 필드 채우기 (이미 읽었으면 아무것도 하지 않음)"""
+        if self._body_path is None:
+            return self
+        with _body_lock:
+            if self._body_path is None:
+                return self
+            try:
+                with open(self._body_path, 'rb') as f:
+                    f.seek(self._body_offset)
+                    body = _loads(f.read(self._body_length))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 카드 본문 로드 오류 ({self.get('card_id', 'unknown')}): {e}")
+                body = {}
+            for field, value in body.items():
+                if not _SlotRecord.__contains__(self, field):
+                    _SlotRecord.__setitem__(self, field, value)
+            self._body_path = None
+        return self
+    
+    def read_body_bytes(self) -> Optional[bytes]:
+        """아직 읽지 않은 본문의 원본 바이트 (이미 읽었으면 None) - 압축 시 파싱 없이 복사용"""
+        with _body_lock:
+            if self._body_path is None:
+                return None
+            with open(self._body_path, 'rb') as f:
+                f.seek(self._body_offset)
+                return f.read(self._body_length)
+    
+    def snapshot(self) -> 'ProductionCard':
+        """분리된 복사본 (원본이 바뀌어도 영향 없음) - 본문을 읽지 않은 카드는 본문 위치만 복사"""
+        with _body_lock:
+            if self._body_path is not None:
+                return ProductionCard(to_plain(self.header()), self._body_path, self._body_offset,
+                                      self._body_length, dict(self.body_meta))
+        return ProductionCard(self.to_dict())
+    
+    def rebind(self, body_path: str, offset: int, length: int):
+        """본문 위치 변경 (압축으로 본문 파일이 바뀐 경우, 이미 읽었으면 무시)"""
+        with _body_lock:
+            if self._body_path is not None:
+                self._body_path = body_path
+                self._body_offset = offset
+                self._body_length = length
+    
+    def header(self) -> Dict:
+        """본문을 읽지 않고 현재 메모리에 있는 필드만 반환"""
+        return {field: _SlotRecord.__getitem__(self, field) for field in _SlotRecord.__iter__(self)}
+    
+    def _ensure(self, key):
+        if self._body_path is not None and key in _LAZY_FIELD_SET:
+            self.hydrate()
+    
+    def __getitem__(self, key):
+        self._ensure(key)
+        return _SlotRecord.__getitem__(self, key)
+    
+    def get(self, key, default=None):
+        self._ensure(key)
+        return _SlotRecord.get(self, key, default)
+    
+    def __contains__(self, key):
+        self._ensure(key)
+        return _SlotRecord.__contains__(self, key)
+    
+    def __delitem__(self, key):
+        self._ensure(key)
+        _SlotRecord.__delitem__(self, key)
+    
+    def __iter__(self):
+        return _SlotRecord.__iter__(self.hydrate())
+    
+    def __eq__(self, other):
+        # 리스트 검색/삭제(in, remove)에서 본문을 읽지 않도록 헤더를 먼저 비교
+        if other is self:
+            return True
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if self.get('card_id') != other.get('card_id'):
+            return False
+        return dict(self.items()) == dict(other.items())
+
+
+def snapshot_card(card: Dict) -> Dict:
+    """저장용 카드 복사본 (잠금 안에서 복사하고 직렬화는 잠금 밖에서 하기 위함)"""
+    if isinstance(card, ProductionCard):
+        return card.snapshot()
+    return to_plain(card)
+
+
+def history_summary(card: Dict) -> Tuple[bool, bool]:
+    """카드의 (매수 히스토리 존재, SOLD 히스토리 존재) - 본문을 읽지 않은 카드는 본문 요약 사용"""
+    if isinstance(card, ProductionCard) and not card.hydrated and 'has_sold' in card.body_meta:
+        return card.body_meta.get('has_buy', False), card.body_meta['has_sold']
+    history_list = card.get('history_list') or []
+    has_buy = any(h.get('type') in ('NEW', 'BUY') for h in history_list)
+    has_sold = any(h.get('type') == 'SOLD' for h in history_list)
+    return has_buy, has_sold
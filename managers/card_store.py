@@ -0,0 +1,215 @@
+"""생산 카드 저장소 / 읽기-쓰기 잠금 모듈
+
+- CardStore: card_id -> 카드 저장소 (추가/교체/제거 O(1), 보조 인덱스 자동 갱신)
+  순회/인덱싱은 변경 시에만 다시 만드는 읽기 전용 스냅샷(copy-on-write)을 사용하므로
+  다른 스레드가 카드를 추가/제거하는 중에도 잠금 없이 안전하게 순회할 수 있습니다.
+- ReadWriteLock: 조회는 동시에, 변경은 하나씩 (쓰기 우선, 같은 스레드 재진입 가능)
+"""
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class ReadWriteLock:
+    """읽기 여러 개 / 쓰기 하나 잠금
+    
+    - 쓰기 대기 중에는 새 읽기를 받지 않음 (쓰기 기아 방지)
+    - 쓰기 잠금을 가진 스레드는 쓰기/읽기 잠금을 다시 얻을 수 있음
+    - 읽기 잠금을 가진 스레드는 읽기 잠금을 다시 얻을 수 있지만 쓰기 잠금으로 올릴 수는 없음 (RuntimeError)
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # 쓰기 잠금을 가진 스레드
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+    
+    def acquire_read(self):
+        depth = getattr(self._local, 'read_depth', 0)
+        with self._cond:
+            # 이미 읽기/쓰기 잠금을 가진 스레드는 대기하지 않음 (재진입)
+            if not depth and self._writer != threading.get_ident():
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+            self._readers += 1
+        self._local.read_depth = depth + 1
+    
+    def release_read(self):
+        self._local.read_depth -= 1
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'read_depth', 0):
+                raise RuntimeError("읽기 잠금을 가진 상태에서 쓰기 잠금을 요청할 수 없습니다")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self):
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+    
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def reads(method):
+    """self._lock 읽기 잠금 안에서 메서드 실행"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def writes(method):
+    """self._lock 쓰기 잠금 안에서 메서드 실행"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write_locked():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _production_time(card: Dict) -> str:
+    return card.get('production_time') or ''
+
+
+class CardStore:
+    """card_id -> 카드 저장소
+    
+    - append(card) / remove(card) / discard(card)는 card_id 기준 O(1)이며 보조 인덱스(views)도 함께 갱신
+    - 순회, len, 정수/슬라이스 인덱싱은 생산 시간 최신순 스냅샷(튜플)을 사용
+      (스냅샷은 변경 후 처음 읽을 때 한 번만 다시 만듦)
+    - `card_id in store`, `store[card_id]`로 card_id 조회도 가능 (카드 객체로 in 검사도 가능)
+    """
+    
+    def __init__(self, views=None):
+        """
+        초기화
+        
+        Args:
+            views: 카드 추가/제거 시 함께 갱신할 보조 인덱스 (CardViewIndex, 선택사항)
+        """
+        self._views = views
+        self._cards = {}  # card_id -> 카드
+        self._snapshot = ()
+        self._stale = False
+        self._lock = threading.Lock()
+    
+    def snapshot(self) -> Tuple[Dict, ...]:
+        """현재 카드 목록 (생산 시간 최신순, 읽기 전용)"""
+        if not self._stale:
+            return self._snapshot
+        with self._lock:
+            if self._stale:
+                self._snapshot = tuple(sorted(self._cards.values(), key=_production_time, reverse=True))
+                self._stale = False
+            return self._snapshot
+    
+    def get(self, card_id: str) -> Optional[Dict]:
+        return self._cards.get(card_id)
+    
+    def append(self, card: Dict):
+        """카드 추가 (같은 card_id가 있으면 교체)"""
+        card_id = card.get('card_id')
+        if not card_id:
+            return
+        with self._lock:
+            self._cards[card_id] = card
+            self._stale = True
+            if self._views is not None:
+                self._views.add(card)
+    
+    def discard(self, card: Dict) -> bool:
+        """카드 제거 (저장된 카드가 이 카드와 같을 때만, 제거했으면 True)"""
+        card_id = card.get('card_id') if card else None
+        with self._lock:
+            stored = self._cards.get(card_id) if card_id else None
+            if stored is None or (stored is not card and stored != card):
+                return False
+            del self._cards[card_id]
+            self._stale = True
+            if self._views is not None:
+                self._views.remove(stored)
+            return True
+    
+    def remove(self, card: Dict):
+        """카드 제거 (없으면 ValueError - list.remove와 동일)"""
+        if not self.discard(card):
+            raise ValueError("card not in store")
+    
+    def replace_all(self, cards: Iterable[Dict]):
+        """저장소 내용을 통째로 교체 (로드 시)"""
+        with self._lock:
+            self._cards = {}
+            for card in cards:
+                card_id = card.get('card_id')
+                if card_id:
+                    self._cards[card_id] = card
+            self._stale = True
+            if self._views is not None:
+                self._views.rebuild(self._cards.values())
+    
+    def clear(self):
+        self.replace_all(())
+    
+    def reindex(self):
+        """보조 인덱스 전체 다시 만들기"""
+        with self._lock:
+            if self._views is not None:
+                self._views.rebuild(self._cards.values())
+    
+    def __len__(self) -> int:
+        return len(self._cards)
+    
+    def __bool__(self) -> bool:
+        return bool(self._cards)
+    
+    def __iter__(self):
+        return iter(self.snapshot())
+    
+    def __contains__(self, item) -> bool:
+        if isinstance(item, str):
+            return item in self._cards
+        stored = self._cards.get(item.get('card_id')) if item else None
+        return stored is not None and (stored is item or stored == item)
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._cards[key]
+        if isinstance(key, slice):
+            return list(self.snapshot()[key])
+        return self.snapshot()[key]
@@ -0,0 +1,246 @@
+"""생산 카드 보조 인덱스 모듈
+
+카드가 추가/변경/제거될 때 그 카드만 다시 색인하여
+활성 카드 / 전체 카드 / 검증 카드 목록을 전체 카드를 다시 훑지 않고 결과 크기만큼만 읽도록 합니다.
+
+- card_id -> 카드, card_key -> 카드 목록 (생산 시간 최신순)
+- 상태별 card_id, SOLD 히스토리가 있는 card_id
+- card_key별 최신 카드를 production_time 순으로 정렬해 둔 목록 (활성 화면 / 전체 화면)
+"""
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from managers.card_records import history_summary
+
+
+class _LatestView:
+    """그룹별 최신 카드 한 장씩을 production_time 순으로 유지"""
+    
+    def __init__(self):
+        self.latest = {}  # 그룹 -> (production_time, card_id)
+        self.order = []  # [(production_time, card_id)] 오름차순
+    
+    def set(self, group: str, item: Optional[Tuple[str, str]]):
+        """그룹의 최신 카드 변경 (None이면 그룹 제거)"""
+        old = self.latest.get(group)
+        if old == item:
+            return
+        if old is not None:
+            index = bisect.bisect_left(self.order, old)
+            if index < len(self.order) and self.order[index] == old:
+                del self.order[index]
+            del self.latest[group]
+        if item is not None:
+            bisect.insort(self.order, item)
+            self.latest[group] = item
+    
+    def card_ids(self) -> List[str]:
+        """최신순 card_id 목록"""
+        return [card_id for _, card_id in reversed(self.order)]
+
+
+class CardViewIndex:
+    """상태 전이 시 갱신하는 생산 카드 보조 인덱스
+    
+    - 활성 화면: card_key가 있고 활성 상태이며 SOLD 히스토리가 없는 카드 중 card_key별 최신
+    - 전체 화면: 제거 상태가 아닌 카드 중 card_key별 최신 (card_key가 없으면 card_id별)
+    - 카드 필드를 직접 바꾼 뒤에는 update(card)로 그 카드만 다시 색인
+    """
+    
+    def __init__(self, active_states: Iterable[str], removed_state: str):
+        """
+        초기화
+        
+        Args:
+            active_states: 활성 상태 값 (ACTIVE, OVERLAP_ACTIVE)
+            removed_state: 제거 상태 값 (REMOVED)
+        """
+        self.active_states = frozenset(active_states)
+        self.removed_state = removed_state
+        self._lock = threading.RLock()
+        self._reset()
+    
+    def _reset(self):
+        self._cards = {}  # card_id -> 카드
+        self._entries = {}  # card_id -> (card_key, card_state, has_buy, has_sold, production_time)
+        self._by_key = {}  # card_key -> [card_id] (생산 시간 최신순)
+        self._by_state = {}  # card_state -> {card_id}
+        self._sold_ids = set()
+        self._active = _LatestView()
+        self._visible = _LatestView()
+    
+    def __len__(self) -> int:
+        return len(self._cards)
+    
+    def _entry(self, card: Dict) -> Tuple:
+        has_buy, has_sold = history_summary(card)
+        return (card.get('card_key') or '', card.get('card_state'), has_buy, has_sold,
+                card.get('production_time') or '')
+    
+    def rebuild(self, cards: Iterable[Dict]):
+        """전체 다시 색인 (로드 직후 등 카드 목록이 통째로 바뀐 경우)"""
+        with self._lock:
+            self._reset()
+            for card in cards:
+                card_id = card.get('card_id')
+                if not card_id:
+                    continue
+                if card_id in self._cards:
+                    self._remove_entry(card_id)
+                self._add_entry(card_id, card)
+            for card_key in self._by_key:
+                self._refresh_group(card_key)
+            for card_id, entry in self._entries.items():
+                if not entry[0]:
+                    self._refresh_group('', card_id)
+    
+    def add(self, card: Dict):
+        """카드 색인 (같은 card_id가 있으면 교체)"""
+        card_id = card.get('card_id')
+        if not card_id:
+            return
+        with self._lock:
+            old_key = None
+            if card_id in self._cards:
+                old_key = self._entries[card_id][0]
+                self._remove_entry(card_id)
+            self._add_entry(card_id, card)
+            self._refresh_card(card_id, old_key)
+    
+    def update(self, card: Dict):
+        """색인된 카드의 상태/키/히스토리/생산 시간이 바뀌었으면 다시 색인 (색인되지 않은 카드는 무시)"""
+        card_id = card.get('card_id') if card else None
+        with self._lock:
+            if not card_id or self._cards.get(card_id) is not card:
+                return
+            entry = self._entry(card)
+            if entry == self._entries[card_id]:
+                return
+            old_key = self._entries[card_id][0]
+            self._remove_entry(card_id)
+            self._add_entry(card_id, card, entry)
+            self._refresh_card(card_id, old_key)
+    
+    def remove(self, card: Dict):
+        """카드 색인 제거"""
+        card_id = card.get('card_id') if card else None
+        with self._lock:
+            if not card_id or self._cards.get(card_id) is not card:
+                return
+            card_key = self._entries[card_id][0]
+            self._remove_entry(card_id)
+            self._refresh_card(card_id, card_key)
+    
+    def _add_entry(self, card_id: str, card: Dict, entry: Optional[Tuple] = None):
+        entry = entry or self._entry(card)
+        card_key, card_state, _, has_sold, _ = entry
+        self._cards[card_id] = card
+        self._entries[card_id] = entry
+        self._by_state.setdefault(card_state, set()).add(card_id)
+        if has_sold:
+            self._sold_ids.add(card_id)
+        if card_key:
+            members = self._by_key.setdefault(card_key, [])
+            members.append(card_id)
+            members.sort(key=lambda member: self._entries[member][4], reverse=True)
+    
+    def _remove_entry(self, card_id: str):
+        card_key, card_state, _, _, _ = self._entries.pop(card_id)
+        del self._cards[card_id]
+        state_ids = self._by_state.get(card_state)
+        if state_ids is not None:
+            state_ids.discard(card_id)
+            if not state_ids:
+                del self._by_state[card_state]
+        self._sold_ids.discard(card_id)
+        if card_key:
+            members = self._by_key[card_key]
+            members.remove(card_id)
+            if not members:
+                del self._by_key[card_key]
+    
+    def _refresh_card(self, card_id: str, old_key: Optional[str]):
+        """카드가 속했던 그룹과 현재 그룹의 최신 카드 다시 계산"""
+        entry = self._entries.get(card_id)
+        new_key = entry[0] if entry else None
+        if old_key is not None and old_key != new_key:
+            self._refresh_group(old_key, card_id)
+        if new_key is not None:
+            self._refresh_group(new_key, card_id)
+    
+    def _refresh_group(self, card_key: str, card_id: Optional[str] = None):
+        """그룹의 활성/전체 화면 최신 카드 다시 계산 (card_key가 없는 카드는 card_id가 그룹)"""
+        if not card_key:
+            entry = self._entries.get(card_id)
+            visible = entry is not None and not entry[0] and entry[1] != self.removed_state
+            self._visible.set(card_id, (entry[4], card_id) if visible else None)
+            return
+        
+        active = None
+        visible = None
+        for member in self._by_key.get(card_key, ()):
+            _, card_state, _, has_sold, production_time = self._entries[member]
+            if card_state == self.removed_state:
+                continue
+            # 생산 시간이 같으면 먼저 색인된 카드 유지 (기존 목록 순회 결과와 동일)
+            if visible is None or not visible[0] or production_time > visible[0]:
+                visible = (production_time, member)
+            if card_state in self.active_states and not has_sold:
+                if active is None or not active[0] or production_time > active[0]:
+                    active = (production_time, member)
+        self._active.set(card_key, active)
+        self._visible.set(card_key, visible)
+    
+    def get(self, card_id: str) -> Optional[Dict]:
+        """card_id로 카드 조회"""
+        return self._cards.get(card_id)
+    
+    def by_key(self, card_key: str) -> List[Dict]:
+        """card_key가 같은 카드 목록 (생산 시간 최신순, 제거 상태 포함)"""
+        with self._lock:
+            return [self._cards[card_id] for card_id in self._by_key.get(card_key, ())]
+    
+    def by_state(self, *states: str) -> List[Dict]:
+        """상태별 카드 목록"""
+        with self._lock:
+            return [self._cards[card_id] for state in states for card_id in self._by_state.get(state, ())]
+    
+    def has_sold(self, card_id: str) -> bool:
+        """SOLD 히스토리가 있는 카드인지"""
+        return card_id in self._sold_ids
+    
+    def latest_by_key(self, card_key: str) -> Optional[Dict]:
+        """card_key의 최신 카드 (제거 상태 제외)"""
+        with self._lock:
+            item = self._visible.latest.get(card_key)
+            return self._cards[item[1]] if item else None
+    
+    def active_cards(self) -> List[Dict]:
+        """활성 화면 카드 (card_key별 최신, 생산 시간 최신순)"""
+        with self._lock:
+            return [self._cards[card_id] for card_id in self._active.card_ids()]
+    
+    def visible_cards(self) -> List[Dict]:
+        """전체 화면 카드 (제거 상태 제외, card_key별 최신, 생산 시간 최신순)"""
+        with self._lock:
+            return [self._cards[card_id] for card_id in self._visible.card_ids()]
+    
+    def sold_cards(self, include_removed: bool = False) -> List[Dict]:
+        """매수/SOLD 히스토리가 모두 있는 카드 (검증 카드)
+        
+        Args:
+            include_removed: False이면 전체 화면 카드 중에서만, True이면 제거 상태 포함 모든 카드에서
+        """
+        with self._lock:
+            result = []
+            for card_id in self._sold_ids:
+                card_key, _, has_buy, _, _ = self._entries[card_id]
+                if not has_buy:
+                    continue
+                if not include_removed:
+                    item = self._visible.latest.get(card_key or card_id)
+                    if item is None or item[1] != card_id:
+                        continue
+                result.append(self._cards[card_id])
+            return result
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from enum import Enum
 
+from managers.card_records import json_default
+
 
 class DiscardReason(str, Enum):
     """폐기 사유"""
@@ -126,7 +128,7 @@ class DiscardedCardManager:
                     # 카드 파일 저장
                     card_file = os.path.join(self.data_dir, f"{card_id}.json")
                     with open(card_file, 'w', encoding='utf-8') as f:
-                        json.dump(discarded_card, f, indent=2, ensure_ascii=False)
+                        json.dump(discarded_card, f, indent=2, ensure_ascii=False, default=json_default)
                     
                     # 메타데이터 저장
                     self._save_metadata(background=False)  # 동기 실행 (이미 백그라운드 내부)
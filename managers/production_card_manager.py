@@ -8,6 +8,12 @@ from datetime import datetime
 from typing import List, Dict, Optional
 from enum import Enum
 from functools import lru_cache
+from managers.card_persistence import CardPersistenceWorker
+from managers.card_journal import CardCacheJournal
+from managers.card_rebuild import CardRebuilder
+from managers.card_records import HistoryEntry, ProductionCard, history_summary, json_default, snapshot_card, to_plain
+from managers.card_store import CardStore, ReadWriteLock, reads, writes
+from managers.card_view_index import CardViewIndex
 
 # 빠른 JSON 처리를 위한 orjson 사용 (없으면 표준 json 사용)
 _USE_ORJSON = False
@@ -79,12 +85,12 @@ def _json_dumps(data: dict, indent: int = 2) -> bytes:
     try:
         if _USE_ORJSON and _ORJSON_AVAILABLE:
             if indent == 2:
-                return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=json_default)
             else:
-                return orjson.dumps(data)
+                return orjson.dumps(data, default=json_default)
         else:
             # 표준 json 사용
-            result = json.dumps(data, ensure_ascii=False, indent=indent)
+            result = json.dumps(data, ensure_ascii=False, indent=indent, default=json_default)
             if isinstance(result, str):
                 return result.encode('utf-8')
             return result
@@ -92,7 +98,7 @@ def _json_dumps(data: dict, indent: int = 2) -> bytes:
         # orjson 실패 시 표준 json으로 fallback
         if _USE_ORJSON:
             try:
-                result = json.dumps(data, ensure_ascii=False, indent=indent)
+                result = json.dumps(data, ensure_ascii=False, indent=indent, default=json_default)
                 if isinstance(result, str):
                     return result.encode('utf-8')
                 return result
@@ -140,7 +146,6 @@ class ProductionCardManager:
         """
         self.nbverse_storage = nbverse_storage
         self.discarded_card_manager = discarded_card_manager
-        self.cards_cache = []  # 메모리 캐시
         self.MAX_CARDS = 4  # 기본값: 최대 4개 제한 (설정에서 동적으로 읽어옴)
         self.MAX_HISTORY_PER_CARD = 100  # 카드당 최대 히스토리 100개
         self._cache_dirty = True  # 캐시 무효화 플래그
@@ -150,14 +155,40 @@ class ProductionCardManager:
         # 설정에서 MAX_CARDS 값 읽어오기
         self._update_max_cards_from_settings()
         
-        # 메모리 캐싱 최적화: 빠른 조회를 위한 인덱스
-        self._card_id_index = {}  # card_id -> card 매핑 (O(1) 조회)
-        self._card_key_index = {}  # card_key -> [cards] 매핑 (O(1) 조회)
-        self._index_lock = threading.Lock()  # 인덱스 스레드 안전성
+        # 메모리 캐싱 최적화: 빠른 조회를 위한 인덱스 (카드 추가/변경/제거 시 해당 카드만 다시 색인)
+        # card_id, card_key, 상태, SOLD 여부, card_key별 최신 카드(생산 시간 순)
+        self._views = CardViewIndex(
+            active_states=(CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value),
+            removed_state=CardState.REMOVED.value
+        )
+        
+        # 메모리 캐시 (card_id -> 카드, 추가/제거 시 인덱스도 함께 갱신, 순회는 읽기 전용 스냅샷)
+        self.cards_cache = CardStore(self._views)
+        
+        # 동시성 제어: 조회 메서드는 읽기 잠금, 카드를 바꾸는 메서드는 쓰기 잠금
+        # (Flask 요청 스레드, 백그라운드 로드/정리 스레드, Qt 워커가 동시에 호출)
+        self._lock = ReadWriteLock()
+        self._load_state_lock = threading.Lock()  # _loading 확인/설정용
         
         # 임시 저장 파일 경로
         self._cache_file_path = os.path.join("data", "production_cards_cache.json")
         
+        # 임시 저장 파일 저널 (스냅샷 + 변경 로그, 로그가 커지면 저장 워커에서 압축)
+        self._journal = CardCacheJournal(
+            self._cache_file_path,
+            max_history=self.MAX_HISTORY_PER_CARD,
+            compact_bytes=self._get_journal_compact_bytes_from_settings()
+        )
+        
+        # 카드 저장 워커 (같은 카드의 연속 갱신과 임시 저장 파일 기록을 묶어서 처리)
+        self._persistence = CardPersistenceWorker(
+            write_card=self._write_card_to_nbverse,
+            remove_card=self._remove_card_files,
+            write_cache=self._write_cards_cache,
+            delay=self._get_persist_delay_from_settings(),
+            create_card=self._create_card_in_nbverse
+        )
+        
         # 프로그램 시작 시 임시 저장 파일에서 로드 (백그라운드로 실행)
         self.load(background=True)
     
@@ -179,6 +210,36 @@ class ProductionCardManager:
             print(f"⚠️ 설정에서 MAX_CARDS 읽기 실패, 기본값 사용: {e}")
             self.MAX_CARDS = 4  # 기본값 유지
     
+    def _get_persist_delay_from_settings(self) -> float:
+        """설정에서 카드 저장 지연 시간(초)을 읽어옴 (card_persist_delay_ms)"""
+        try:
+            from managers.settings_manager import SettingsManager
+            settings_manager = SettingsManager()
+            return max(0, int(settings_manager.get('card_persist_delay_ms', 500))) / 1000.0
+        except Exception as e:
+            print(f"⚠️ 설정에서 카드 저장 지연 시간 읽기 실패, 기본값 사용: {e}")
+            return 0.5
+    
+    def _get_journal_compact_bytes_from_settings(self) -> int:
+        """설정에서 임시 저장 저널 압축 기준 크기(바이트)를 읽어옴 (card_journal_compact_kb)"""
+        try:
+            from managers.settings_manager import SettingsManager
+            settings_manager = SettingsManager()
+            return max(1, int(settings_manager.get('card_journal_compact_kb', 1024))) * 1024
+        except Exception as e:
+            print(f"⚠️ 설정에서 저널 압축 기준 읽기 실패, 기본값 사용: {e}")
+            return 1024 * 1024
+    
+    def _get_rebuild_workers_from_settings(self) -> int:
+        """설정에서 콜드 스타트 재구성 디코드 작업자 수를 읽어옴 (card_rebuild_workers, 0이면 CPU 수)"""
+        try:
+            from managers.settings_manager import SettingsManager
+            settings_manager = SettingsManager()
+            return max(0, int(settings_manager.get('card_rebuild_workers', 0)))
+        except Exception as e:
+            print(f"⚠️ 설정에서 재구성 작업자 수 읽기 실패, 기본값 사용: {e}")
+            return 0
+    
     def _get_max_cards(self):
         """현재 MAX_CARDS 값을 반환 (설정에서 동적으로 읽어옴)"""
         self._update_max_cards_from_settings()
@@ -280,18 +341,17 @@ class ProductionCardManager:
         Args:
             background: True이면 백그라운드 스레드에서 실행 (기본값: False)
         """
-        # 중복 호출 방지
-        if self._loading:
-            print("ℹ️ 생산 카드 로드가 이미 진행 중입니다. 중복 호출을 건너뜁니다.")
-            return
+        # 중복 호출 방지 (확인과 설정을 한 번에 해서 두 스레드가 동시에 로드하지 않도록)
+        with self._load_state_lock:
+            if self._loading:
+                print("ℹ️ 생산 카드 로드가 이미 진행 중입니다. 중복 호출을 건너뜁니다.")
+                return
+            self._loading = True
         
         if background:
             # 백그라운드 스레드에서 실행
-            import threading
-            
             def load_in_background():
                 try:
-                    self._loading = True
                     self._load_cards()
                 finally:
                     self._loading = False
@@ -301,7 +361,6 @@ class ProductionCardManager:
         else:
             # 동기 실행
             try:
-                self._loading = True
                 self._load_cards()
             finally:
                 self._loading = False
@@ -326,69 +385,35 @@ class ProductionCardManager:
                 if hasattr(self.nbverse_storage, 'min_dir') and os.path.exists(self.nbverse_storage.min_dir):
                     search_dirs.append(self.nbverse_storage.min_dir)
             
-            if not search_dirs:
+            if search_dirs:
+                # 폴더를 흘려 보내며 생산 카드 파일만 디코드 (파일 목록을 만들지 않음, 많으면 프로세스 풀 사용)
+                # 중간에 종료되면 다음 로드 때 체크포인트 이후 파일부터 이어서 진행
+                rebuilder = CardRebuilder(
+                    search_dirs,
+                    state_path=os.path.join("data", "production_cards_rebuild"),
+                    workers=self._get_rebuild_workers_from_settings()
+                )
+                records = rebuilder.records()
+            elif self.nbverse_storage and hasattr(self.nbverse_storage, 'iter_records'):
+                # 폴더 구조가 없는 저장소 (인덱스 저장소): 레코드 순회 API로 읽음
+                records = self._iter_storage_card_records()
+            else:
                 print("⚠️ NBverse 저장소가 초기화되지 않았습니다.")
-                self.cards_cache = []
+                with self._lock.write_locked():
+                    self.cards_cache.clear()
                 self._cache_dirty = False
                 return
             
-            # UI 반응성을 위해 배치 처리
-            # 최적화: 리스트 컴프리헨션 사용 + os.path.join 최적화
-            all_files = []
-            for base_dir in search_dirs:
-                # os.walk 최적화: 제너레이터 사용
-                for root, dirs, files in os.walk(base_dir):
-                    # 최적화: 리스트 컴프리헨션으로 파일 경로 생성
-                    json_files = [
-                        os.path.join(root, filename)
-                        for filename in files
-                        if filename.endswith('.json')
-                    ]
-                    all_files.extend(json_files)
-            
-            # 파일을 병렬로 처리 (속도 개선: ThreadPoolExecutor 사용)
             cards_dict = {}  # card_id -> card 매핑
-            cards_dict_lock = threading.Lock()  # 스레드 안전성을 위한 락
-            
-            def process_file(file_path: str):
-                """단일 파일 처리 함수"""
-                try:
-                    data = self.nbverse_storage.load_from_path(file_path)
-                    if data and data.get('metadata'):
-                        metadata = data.get('metadata', {})
-                        # production_card 타입만 필터링
-                        if metadata.get('card_type') == 'production_card':
-                            card = self._data_to_card(data, metadata)
-                            if card:
-                                card_id = card.get('card_id')
-                                if card_id:
-                                    with cards_dict_lock:
-                                        # 중복 제거 (card_id 기준)
-                                        if card_id not in cards_dict:
-                                            cards_dict[card_id] = card
-                                        else:
-                                            # 생산 시간 비교하여 더 최신 것만 유지
-                                            existing_time = cards_dict[card_id].get('production_time', '')
-                                            new_time = card.get('production_time', '')
-                                            if new_time > existing_time:
-                                                cards_dict[card_id] = card
-                except Exception as e:
-                    # 개별 파일 오류는 무시하고 계속 진행
-                    pass
-            
-            # 병렬 처리 (ThreadPoolExecutor 사용)
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-            max_workers = min(8, len(all_files))  # 최대 8개 스레드 또는 파일 수만큼
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 모든 파일을 병렬로 처리
-                futures = [executor.submit(process_file, file_path) for file_path in all_files]
-                # 완료 대기 (진행 상황 표시용)
-                for future in as_completed(futures):
-                    try:
-                        future.result()  # 예외 확인
-                    except Exception:
-                        pass  # 개별 파일 오류는 무시
+            for record in records:
+                card = self._data_to_card(record, record['metadata'])
+                card_id = card.get('card_id') if card else None
+                if not card_id:
+                    continue
+                # 중복 제거 (card_id 기준, max/min 폴더에 같은 카드가 있으면 더 최신 것만 유지)
+                existing = cards_dict.get(card_id)
+                if existing is None or card.get('production_time', '') > existing.get('production_time', ''):
+                    cards_dict[card_id] = card
             
             # dict에서 리스트로 변환
             cards = list(cards_dict.values())
@@ -396,131 +421,129 @@ class ProductionCardManager:
             # production_time 기준으로 정렬 (최신순)
             cards.sort(key=lambda x: x.get('production_time', ''), reverse=True)
             
-            # 기존 캐시의 카드와 병합 (중복 제거 - card_id 및 card_key 기준)
-            # 새로 추가된 카드가 사라지지 않도록 보존
-            # 속도 개선: dict 사용하여 중복 제거 + 리스트 컴프리헨션 최적화
-            existing_card_ids = {c.get('card_id') for c in self.cards_cache if c.get('card_id')}
-            # card_key -> 최신 card 매핑 (최적화: 딕셔너리 컴프리헨션 사용)
-            existing_card_keys = {}
-            for c in self.cards_cache:
-                card_key = c.get('card_key')
-                if card_key:
-                    existing_time = existing_card_keys.get(card_key, {}).get('production_time', '')
-                    new_time = c.get('production_time', '')
-                    if not existing_time or new_time > existing_time:
-                        existing_card_keys[card_key] = c
-            
-            # card_key 기준으로도 중복 제거 (같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 유지)
-            new_card_dict = {}  # card_id -> card 매핑
-            new_card_key_dict = {}  # card_key -> 최신 card 매핑
-            
-            for card in cards:
-                card_id = card.get('card_id')
-                card_key = card.get('card_key', '')
-                if not card_id:
-                    continue
-                
-                # 기존 캐시에 없고, new_card_dict에도 없는 경우만 추가
-                if card_id not in existing_card_ids:
-                    # card_key 기준 중복 체크
+            # 병합/중복 정리/개수 제한은 쓰기 잠금 안에서 (파일 읽기는 잠금 밖에서 끝냄)
+            with self._lock.write_locked():
+                # 기존 캐시의 카드와 병합 (중복 제거 - card_id 및 card_key 기준)
+                # 새로 추가된 카드가 사라지지 않도록 보존
+                # 속도 개선: dict 사용하여 중복 제거 + 리스트 컴프리헨션 최적화
+                existing_card_ids = {c.get('card_id') for c in self.cards_cache if c.get('card_id')}
+                # card_key -> 최신 card 매핑 (최적화: 딕셔너리 컴프리헨션 사용)
+                existing_card_keys = {}
+                for c in self.cards_cache:
+                    card_key = c.get('card_key')
                     if card_key:
-                        if card_key not in new_card_key_dict:
-                            # 새로운 card_key
-                            new_card_key_dict[card_key] = card
-                            new_card_dict[card_id] = card
-                        else:
-                            # 같은 card_key가 이미 있으면 생산 시간 비교
-                            existing_time = new_card_key_dict[card_key].get('production_time', '')
-                            new_time = card.get('production_time', '')
-                            if new_time > existing_time:
-                                # 더 최신 카드로 교체
-                                old_card_id = new_card_key_dict[card_key].get('card_id')
-                                if old_card_id in new_card_dict:
-                                    del new_card_dict[old_card_id]
-                                new_card_key_dict[card_key] = card
-                                new_card_dict[card_id] = card
-                    else:
-                        # card_key가 없으면 card_id만으로 추가
-                        if card_id not in new_card_dict:
-                            new_card_dict[card_id] = card
-            
-            # 캐시 업데이트 (기존 캐시 유지 + 새 카드 추가)
-            for card in new_card_dict.values():
-                if card.get('card_id') not in existing_card_ids:
-                    self.cards_cache.append(card)
-                    existing_card_ids.add(card.get('card_id'))
-            
-            # 최신순으로 정렬
-            self.cards_cache.sort(key=lambda x: x.get('production_time', ''), reverse=True)
-            
-            # 인덱스 재구성 (캐시 업데이트 후)
-            self._rebuild_indexes()
-            
-            # card_key 기준 중복 제거 (동기적으로 실행하여 즉시 정리)
-            # 활성 카드 중에서 같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 남기고 나머지 제거
-            # 최적화: 리스트 컴프리헨션 + 딕셔너리 사용
-            active_states = {CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value}
-            active_cards_by_key = {}
-            for card in self.cards_cache:
-                if card.get('card_state', CardState.ACTIVE.value) in active_states:
+                        existing_time = existing_card_keys.get(card_key, {}).get('production_time', '')
+                        new_time = c.get('production_time', '')
+                        if not existing_time or new_time > existing_time:
+                            existing_card_keys[card_key] = c
+                
+                # card_key 기준으로도 중복 제거 (같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 유지)
+                new_card_dict = {}  # card_id -> card 매핑
+                new_card_key_dict = {}  # card_key -> 최신 card 매핑
+                
+                for card in cards:
+                    card_id = card.get('card_id')
                     card_key = card.get('card_key', '')
-                    if card_key:
-                        if card_key not in active_cards_by_key:
-                            active_cards_by_key[card_key] = []
-                        active_cards_by_key[card_key].append(card)
-            
-            # 중복 제거: 같은 card_key를 가진 활성 카드가 여러 개 있으면 최신 것만 남기고 나머지 REMOVED 처리
-            for card_key, duplicate_cards in active_cards_by_key.items():
-                if len(duplicate_cards) > 1:
-                    # 생산 시간 기준으로 정렬 (최신 것부터)
-                    duplicate_cards.sort(key=lambda x: x.get('production_time', ''), reverse=True)
+                    if not card_id:
+                        continue
                     
-                    # 가장 최신 카드는 유지하고 나머지 제거
-                    for card_to_remove in duplicate_cards[1:]:
-                        card_id = card_to_remove.get('card_id', 'unknown')
-                        print(f"🗑️ [로드 시 중복 제거] 카드 {card_id}: 같은 card_key({card_key})를 가진 활성 카드가 {len(duplicate_cards)}개 있어 제거")
-                        
-                        # 카드 상태를 REMOVED로 변경
-                        card_to_remove['card_state'] = CardState.REMOVED.value
-                        card_to_remove['status'] = CardState.REMOVED.value
+                    # 기존 캐시에 없고, new_card_dict에도 없는 경우만 추가
+                    if card_id not in existing_card_ids:
+                        # card_key 기준 중복 체크
+                        if card_key:
+                            if card_key not in new_card_key_dict:
+                                # 새로운 card_key
+                                new_card_key_dict[card_key] = card
+                                new_card_dict[card_id] = card
+                            else:
+                                # 같은 card_key가 이미 있으면 생산 시간 비교
+                                existing_time = new_card_key_dict[card_key].get('production_time', '')
+                                new_time = card.get('production_time', '')
+                                if new_time > existing_time:
+                                    # 더 최신 카드로 교체
+                                    old_card_id = new_card_key_dict[card_key].get('card_id')
+                                    if old_card_id in new_card_dict:
+                                        del new_card_dict[old_card_id]
+                                    new_card_key_dict[card_key] = card
+                                    new_card_dict[card_id] = card
+                        else:
+                            # card_key가 없으면 card_id만으로 추가
+                            if card_id not in new_card_dict:
+                                new_card_dict[card_id] = card
+                
+                # 캐시 업데이트 (기존 캐시 유지 + 새 카드 추가, 인덱스도 추가된 카드만 갱신)
+                for card in new_card_dict.values():
+                    if card.get('card_id') not in existing_card_ids:
+                        self.cards_cache.append(card)
+                        existing_card_ids.add(card.get('card_id'))
+                
+                # card_key 기준 중복 제거 (동기적으로 실행하여 즉시 정리)
+                # 활성 카드 중에서 같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 남기고 나머지 제거
+                # 최적화: 리스트 컴프리헨션 + 딕셔너리 사용
+                active_states = {CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value}
+                active_cards_by_key = {}
+                for card in self.cards_cache:
+                    if card.get('card_state', CardState.ACTIVE.value) in active_states:
+                        card_key = card.get('card_key', '')
+                        if card_key:
+                            if card_key not in active_cards_by_key:
+                                active_cards_by_key[card_key] = []
+                            active_cards_by_key[card_key].append(card)
+                
+                # 중복 제거: 같은 card_key를 가진 활성 카드가 여러 개 있으면 최신 것만 남기고 나머지 REMOVED 처리
+                for card_key, duplicate_cards in active_cards_by_key.items():
+                    if len(duplicate_cards) > 1:
+                        # 생산 시간 기준으로 정렬 (최신 것부터)
+                        duplicate_cards.sort(key=lambda x: x.get('production_time', ''), reverse=True)
                         
-                        # NBverse에 업데이트 (백그라운드)
-                        self._update_card_in_nbverse(card_to_remove)
-            
-            # 중복 카드 정리 (로드 후 실행, 재귀 호출 방지를 위해 _cache_dirty를 False로 설정 후 실행)
-            # 이미 위에서 card_key 기준 중복 제거를 했으므로 추가 정리는 백그라운드로만 실행
-            self._cache_dirty = False  # 재귀 호출 방지
-            try:
-                # 추가 중복 카드 정리를 백그라운드로 실행 (UI 블로킹 방지)
-                import threading
-                def cleanup_in_background():
-                    try:
-                        self.cleanup_duplicate_cards(force_use_cache=True)  # 캐시 강제 사용
-                    except Exception as e:
-                        print(f"⚠️ 중복 카드 정리 오류: {e}")
+                        # 가장 최신 카드는 유지하고 나머지 제거
+                        for card_to_remove in duplicate_cards[1:]:
+                            card_id = card_to_remove.get('card_id', 'unknown')
+                            print(f"🗑️ [로드 시 중복 제거] 카드 {card_id}: 같은 card_key({card_key})를 가진 활성 카드가 {len(duplicate_cards)}개 있어 제거")
+                            
+                            # 카드 상태를 REMOVED로 변경
+                            card_to_remove['card_state'] = CardState.REMOVED.value
+                            card_to_remove['status'] = CardState.REMOVED.value
+                            
+                            # NBverse에 업데이트 (백그라운드)
+                            self._update_card_in_nbverse(card_to_remove)
+                
+                # 중복 카드 정리 (로드 후 실행, 재귀 호출 방지를 위해 _cache_dirty를 False로 설정 후 실행)
+                # 이미 위에서 card_key 기준 중복 제거를 했으므로 추가 정리는 백그라운드로만 실행
+                self._cache_dirty = False  # 재귀 호출 방지
+                try:
+                    # 추가 중복 카드 정리를 백그라운드로 실행 (UI 블로킹 방지)
+                    def cleanup_in_background():
+                        try:
+                            self.cleanup_duplicate_cards(force_use_cache=True)  # 캐시 강제 사용
+                        except Exception as e:
+                            print(f"⚠️ 중복 카드 정리 오류: {e}")
+                    
+                    thread = threading.Thread(target=cleanup_in_background, daemon=True)
+                    thread.start()
+                except Exception as e:
+                    print(f"⚠️ 중복 카드 정리 시작 오류: {e}")
                 
-                thread = threading.Thread(target=cleanup_in_background, daemon=True)
-                thread.start()
-            except Exception as e:
-                print(f"⚠️ 중복 카드 정리 시작 오류: {e}")
-            
-            # 최대 개수 제한 (REMOVED 상태는 제외)
-            self._update_max_cards_from_settings()  # 설정에서 최신 값 읽어오기
-            active_cards = [c for c in self.cards_cache if c.get('card_state') != CardState.REMOVED.value]
-            if len(active_cards) > self.MAX_CARDS:
-                # 오래된 카드 제거
-                cards_to_remove = active_cards[self.MAX_CARDS:]
-                for card in cards_to_remove:
-                    self._remove_card_from_nbverse(card.get('card_id'))
-                self.cards_cache = [c for c in self.cards_cache if c not in cards_to_remove]
+                # 최대 개수 제한 (REMOVED 상태는 제외)
+                self._update_max_cards_from_settings()  # 설정에서 최신 값 읽어오기
+                active_cards = [c for c in self.cards_cache if c.get('card_state') != CardState.REMOVED.value]
+                if len(active_cards) > self.MAX_CARDS:
+                    # 오래된 카드 제거
+                    cards_to_remove = active_cards[self.MAX_CARDS:]
+                    for card in cards_to_remove:
+                        self._remove_card_from_nbverse(card.get('card_id'))
+                        self._remove_from_cache(card)
             
             self._cache_dirty = False
+            # 다음 시작 때는 폴더를 다시 훑지 않도록 임시 저장 파일 작성 (저장 워커에서 실행)
+            self._save_cards_to_cache()
             print(f"✅ 생산 카드 로드 완료 (NBverse): {len(cards)}개")
         except Exception as e:
             print(f"❌ 생산 카드 로드 오류: {e}")
             import traceback
             traceback.print_exc()
-            self.cards_cache = []
+            with self._lock.write_locked():
+                self.cards_cache.clear()
             self._cache_dirty = False
         finally:
             self._loading = False  # 로드 완료 플래그 해제
@@ -632,142 +655,184 @@ class ProductionCardManager:
             if len(card.get('history_list', [])) > self.MAX_HISTORY_PER_CARD:
                 card['history_list'] = card['history_list'][:self.MAX_HISTORY_PER_CARD]
             
-            return card
+            return ProductionCard(card)
         except Exception as e:
             print(f"⚠️ 카드 데이터 변환 오류: {e}")
             return None
     
+    def _load_nbverse_record(self, file_path: str) -> Optional[Dict]:
+        """NBverse 파일 로드 (.col 파일에 저장된 배열은 변환하지 않고 ColumnArray로 받음 - 다시 저장할 때 바이트 그대로 사용)"""
+        if getattr(self.nbverse_storage, 'columnar', False):
+            return self.nbverse_storage.load_from_path(file_path, lazy_columns=True)
+        return self.nbverse_storage.load_from_path(file_path)
+    
+    def _iter_storage_card_records(self):
+        """저장소 레코드 순회 API로 생산 카드 레코드 추출 (CardRebuilder.records()와 같은 형식)"""
+        for record in self.nbverse_storage.iter_records():
+            data = record['data']
+            metadata = data.get('metadata') if isinstance(data, dict) else None
+            if not isinstance(metadata, dict) or metadata.get('card_type') != 'production_card':
+                continue
+            nb = data.get('nb') or {}
+            yield {
+                'path': record['path'],
+                'metadata': metadata,
+                'nb': {'max': nb.get('max'), 'min': nb.get('min')}
+            }
+    
+    def _scan_card_files(self, card_id: str, first_only: bool = False) -> List[str]:
+        """max/min 폴더를 스캔하여 metadata.card_id가 같은 파일 찾기 (카드 ID 인덱스가 없는 저장소용)"""
+        found_files = []
+        if not hasattr(self.nbverse_storage, 'max_dir') and hasattr(self.nbverse_storage, 'iter_records'):
+            # 폴더 구조가 없는 저장소: 레코드 순회 API로 찾음
+            for record in self.nbverse_storage.iter_records():
+                data = record['data']
+                if data and data.get('metadata', {}).get('card_id') == card_id:
+                    found_files.append(record['path'])
+                    if first_only:
+                        break
+            return found_files
+        
+        base_dirs = [d for d in [getattr(self.nbverse_storage, 'max_dir', None),
+                                 getattr(self.nbverse_storage, 'min_dir', None)]
+                     if d and os.path.exists(d)]
+        
+        for base_dir in base_dirs:
+            for root, dirs, files in os.walk(base_dir):
+                for filename in files:
+                    if not filename.endswith('.json'):
+                        continue
+                    file_path = os.path.join(root, filename)
+                    try:
+                        data = self._load_nbverse_record(file_path)
+                        if data and data.get('metadata', {}).get('card_id') == card_id:
+                            found_files.append(file_path)
+                            if first_only:
+                                return found_files
+                    except Exception:
+                        pass
+        
+        return found_files
+    
     def _remove_card_from_nbverse(self, card_id: str):
-        """NBverse에서 카드 제거 - 백그라운드 실행"""
+        """NBverse에서 카드 제거 - 저장 워커에 예약 (대기 중인 갱신은 취소)"""
         if not self.nbverse_storage:
             return
         
-        # 백그라운드 스레드에서 실행 (렉 방지)
-        import threading
-        
-        def remove_in_background():
-            try:
-                # max/min 폴더에서 해당 card_id를 가진 파일 찾아서 삭제
-                # 최적화: 리스트 컴프리헨션 + 조기 종료
-                base_dirs = [d for d in [self.nbverse_storage.max_dir, self.nbverse_storage.min_dir] 
-                            if d and os.path.exists(d)]
-                
-                for base_dir in base_dirs:
-                    for root, dirs, files in os.walk(base_dir):
-                        # 최적화: 리스트 컴프리헨션으로 파일 경로 수집
-                        json_files = [
-                            os.path.join(root, filename)
-                            for filename in files
-                            if filename.endswith('.json')
-                        ]
-                        for file_path in json_files:
-                            try:
-                                data = self.nbverse_storage.load_from_path(file_path)
-                                if data and data.get('metadata', {}).get('card_id') == card_id:
-                                    os.remove(file_path)
-                                    print(f"🗑️ 카드 제거: {card_id}")
-                                    return  # 찾았으면 즉시 종료
-                            except:
-                                pass
-            except Exception as e:
-                print(f"⚠️ 카드 제거 오류: {e}")
-        
-        # 백그라운드 스레드에서 실행
-        thread = threading.Thread(target=remove_in_background, daemon=True)
-        thread.start()
+        self._persistence.mark_removed(card_id)
+    
+    def _remove_card_files(self, card_id: str):
+        """NBverse에서 카드 파일 삭제 (저장 워커 스레드에서 실행)"""
+        try:
+            # 카드 ID 인덱스가 있으면 해당 파일만 삭제 (max/min 양쪽)
+            if hasattr(self.nbverse_storage, 'remove_card'):
+                if self.nbverse_storage.remove_card(card_id):
+                    print(f"🗑️ 카드 제거: {card_id}")
+                return
+            
+            # 인덱스를 지원하지 않는 저장소: max/min 폴더에서 해당 card_id를 가진 파일 찾아서 삭제
+            for file_path in self._scan_card_files(card_id, first_only=True):
+                os.remove(file_path)
+                print(f"🗑️ 카드 제거: {card_id}")
+        except Exception as e:
+            print(f"⚠️ 카드 제거 오류: {e}")
     
     def _update_card_in_nbverse(self, card: Dict):
-        """NBverse에서 카드 업데이트 (히스토리 포함) - 백그라운드 실행"""
+        """NBverse에서 카드 업데이트 (히스토리 포함) - 저장 워커에 예약
+        
+        지연 시간 안에 같은 카드가 여러 번 갱신되면 마지막 상태만 한 번 저장됩니다.
+        카드 필드를 바꾼 뒤 항상 호출되므로 여기서 보조 인덱스도 해당 카드만 갱신합니다.
+        """
+        self._views.update(card)
+        
         if not self.nbverse_storage:
             return False
         
-        # 백그라운드 스레드에서 실행 (렉 방지)
-        import threading
-        
-        def update_in_background():
-            try:
-                card_id = card.get('card_id')
-                if not card_id:
-                    return
-                
-                # 기존 파일 찾기 (최적화: 리스트 컴프리헨션 사용)
-                found_files = []
-                base_dirs = [d for d in [self.nbverse_storage.max_dir, self.nbverse_storage.min_dir] 
-                            if d and os.path.exists(d)]
-                
-                for base_dir in base_dirs:
-                    # 최적화: 리스트 컴프리헨션으로 파일 경로 수집
-                    for root, dirs, files in os.walk(base_dir):
-                        json_files = [
-                            os.path.join(root, filename)
-                            for filename in files
-                            if filename.endswith('.json')
-                        ]
-                        # 최적화: 배치로 로드하여 I/O 최소화
-                        for file_path in json_files:
-                            try:
-                                data = self.nbverse_storage.load_from_path(file_path)
-                                if data and data.get('metadata', {}).get('card_id') == card_id:
-                                    found_files.append(file_path)
-                                    # 첫 번째 파일만 찾으면 중단 (같은 card_id는 하나만 있어야 함)
-                                    break
-                            except:
-                                pass
-                        if found_files:
-                            break  # 찾았으면 중단
-                    if found_files:
-                        break  # 찾았으면 중단
-                
-                # 모든 파일 업데이트 (최적화: found_files가 비어있으면 스킵)
-                if not found_files:
-                    return
-                
-                for file_path in found_files:
-                    try:
-                        data = self.nbverse_storage.load_from_path(file_path)
-                        if data and data.get('metadata'):
-                            # metadata 업데이트
-                            metadata = data['metadata']
-                            metadata.update({
-                                'card_id': card.get('card_id'),
-                                'card_key': card.get('card_key'),
-                                'timeframe': card.get('timeframe'),
-                                'nb_value': card.get('nb_value'),
-                                'nb_id': card.get('nb_id'),
-                                'card_type_detail': card.get('card_type', 'normal'),
-                                'card_state': card.get('card_state', CardState.ACTIVE.value),
-                                'status': card.get('card_state', CardState.ACTIVE.value),  # 호환성
-                                'removal_pending': card.get('removal_pending', False),
-                                'production_time': card.get('production_time'),
-                                'chart_data': card.get('chart_data', {}),
-                                'history_list': card.get('history_list', []),  # 히스토리 포함
-                                'bit_max': (card.get('nb_max', 0.5) * 10.0) if card.get('nb_max') is not None else (card.get('bit_max', 5.5)),  # nb_max * 10으로 bit_max 계산 (호환성)
-                                'bit_min': (card.get('nb_min', 0.5) * 10.0) if card.get('nb_min') is not None else (card.get('bit_min', 5.5)),  # nb_min * 10으로 bit_min 계산 (호환성)
-                                'nb_max': card.get('nb_max'),  # nb_max 직접 저장 (0~1 범위)
-                                'nb_min': card.get('nb_min'),  # nb_min 직접 저장 (0~1 범위)
-                                'score': card.get('score', 100.0),  # 점수 (기본값 100점)
-                                'rank': card.get('rank', 'C'),  # 등급 (기본값 C)
-                                'realtime_scores': card.get('realtime_scores', []),  # 실시간 점수 히스토리
-                                'buy_entry_price': card.get('buy_entry_price', 0.0)  # 매수 진입 가격
-                            })
-                            
-                            # 파일 저장 (빠른 JSON 사용)
-                            with open(file_path, 'wb') as f:
-                                f.write(_json_dumps(data, indent=2))
-                                f.flush()
-                                os.fsync(f.fileno())
-                    except Exception as e:
-                        print(f"⚠️ 카드 업데이트 오류: {e}")
-            except Exception as e:
-                print(f"⚠️ 카드 업데이트 오류: {e}")
-        
-        # 백그라운드 스레드에서 실행
-        thread = threading.Thread(target=update_in_background, daemon=True)
-        thread.start()
+        self._persistence.mark_card(card)
         
         # 즉시 반환 (비동기)
         return True
     
+    def _create_card_in_nbverse(self, text: str, metadata: Dict):
+        """새 카드 파일 생성 (저장 워커 스레드에서 실행)"""
+        if not self.nbverse_storage:
+            return
+        self.nbverse_storage.save_text(text, metadata=metadata)
+        print(f"💾 생산 카드 저장 완료 (NBverse): {metadata.get('card_id')}")
+    
+    def _write_card_to_nbverse(self, card: Dict):
+        """NBverse 카드 파일에 현재 카드 상태 쓰기 (저장 워커 스레드에서 실행)
+        
+        변경 중인 카드를 직렬화하지 않도록 읽기 잠금 안에서 복사본을 만들고, 파일 쓰기는 잠금 밖에서 합니다.
+        """
+        if not self.nbverse_storage:
+            return
+        try:
+            with self._lock.read_locked():
+                card = snapshot_card(card)
+            card_id = card.get('card_id')
+            if not card_id:
+                return
+            
+            # 기존 파일 찾기 (카드 ID 인덱스가 있으면 O(1) 조회, 없으면 폴더 스캔)
+            if hasattr(self.nbverse_storage, 'find_card_paths'):
+                found_files = self.nbverse_storage.find_card_paths(card_id)
+            else:
+                found_files = self._scan_card_files(card_id, first_only=True)
+            
+            # 모든 파일 업데이트 (최적화: found_files가 비어있으면 스킵)
+            if not found_files:
+                return
+            
+            for file_path in found_files:
+                try:
+                    data = self._load_nbverse_record(file_path)
+                    if data and data.get('metadata'):
+                        # metadata 업데이트
+                        metadata = data['metadata']
+                        metadata.update({
+                            'card_id': card.get('card_id'),
+                            'card_key': card.get('card_key'),
+                            'timeframe': card.get('timeframe'),
+                            'nb_value': card.get('nb_value'),
+                            'nb_id': card.get('nb_id'),
+                            'card_type_detail': card.get('card_type', 'normal'),
+                            'card_state': card.get('card_state', CardState.ACTIVE.value),
+                            'status': card.get('card_state', CardState.ACTIVE.value),  # 호환성
+                            'removal_pending': card.get('removal_pending', False),
+                            'production_time': card.get('production_time'),
+                            'chart_data': to_plain(card.get('chart_data', {})),
+                            'history_list': to_plain(card.get('history_list', [])),  # 히스토리 포함
+                            'bit_max': (card.get('nb_max', 0.5) * 10.0) if card.get('nb_max') is not None else (card.get('bit_max', 5.5)),  # nb_max * 10으로 bit_max 계산 (호환성)
+                            'bit_min': (card.get('nb_min', 0.5) * 10.0) if card.get('nb_min') is not None else (card.get('bit_min', 5.5)),  # nb_min * 10으로 bit_min 계산 (호환성)
+                            'nb_max': card.get('nb_max'),  # nb_max 직접 저장 (0~1 범위)
+                            'nb_min': card.get('nb_min'),  # nb_min 직접 저장 (0~1 범위)
+                            'score': card.get('score', 100.0),  # 점수 (기본값 100점)
+                            'rank': card.get('rank', 'C'),  # 등급 (기본값 C)
+                            'realtime_scores': to_plain(card.get('realtime_scores', [])),  # 실시간 점수 히스토리
+                            'buy_entry_price': card.get('buy_entry_price', 0.0)  # 매수 진입 가격
+                        })
+                        
+                        # 저장소가 지원하면 저장소를 통해 갱신 (인덱스 저장소 경로 포함)
+                        if hasattr(self.nbverse_storage, 'save_to_path'):
+                            self.nbverse_storage.save_to_path(file_path, data)
+                            continue
+                        
+                        # 파일 저장 (빠른 JSON 사용)
+                        with open(file_path, 'wb') as f:
+                            f.write(_json_dumps(data, indent=2))
+                            f.flush()
+                            os.fsync(f.fileno())
+                except Exception as e:
+                    print(f"⚠️ 카드 업데이트 오류: {e}")
+        except Exception as e:
+            print(f"⚠️ 카드 업데이트 오류: {e}")
+    
+    def flush(self):
+        """대기 중인 카드 저장/임시 저장 파일 쓰기를 즉시 완료 (프로그램 종료 시 호출)"""
+        self._persistence.flush()
+    
+    @reads
     def get_card_by_key(self, card_key: str) -> Optional[Dict]:
         """
         card_key로 카드 찾기 (중첩 카드 조회용) - 인덱스 사용으로 O(1) 조회 (메모리 캐싱 최적화)
@@ -783,17 +848,11 @@ class ProductionCardManager:
         if not self.cards_cache and not self._loading:
             self.load(background=True)  # 백그라운드로만 시작, 대기 안 함
         
-        # 인덱스가 비어있으면 재구성
-        if not self._card_key_index and self.cards_cache:
-            self._rebuild_indexes()
-        
-        # 인덱스를 사용한 O(1) 조회 (같은 card_key가 여러 개 있으면 첫 번째 반환)
-        with self._index_lock:
-            cards = self._card_key_index.get(card_key, [])
-            if cards:
-                return cards[0]  # 첫 번째 카드 반환
-        return None
+        # 인덱스를 사용한 O(1) 조회 (같은 card_key가 여러 개 있으면 가장 최신 카드 반환)
+        cards = self._views.by_key(card_key)
+        return cards[0] if cards else None
     
+    @reads
     def get_active_cards_by_key(self, card_key: str) -> List[Dict]:
         """
         card_key로 활성 카드 찾기 (중복 체크용) - 인덱스 사용으로 최적화
@@ -809,16 +868,11 @@ class ProductionCardManager:
         if not self.cards_cache and not self._loading:
             self.load(background=True)  # 백그라운드로만 시작, 대기 안 함
         
-        # 인덱스가 비어있으면 재구성
-        if not self._card_key_index and self.cards_cache:
-            self._rebuild_indexes()
-        
         # 인덱스를 사용한 O(1) 조회 + 필터링 (최적화: 리스트 컴프리헨션)
         active_states = {CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value}
-        with self._index_lock:
-            cards = self._card_key_index.get(card_key, [])
-            return [card for card in cards if card.get('card_state') in active_states]
+        return [card for card in self._views.by_key(card_key) if card.get('card_state') in active_states]
     
+    @writes
     def cleanup_duplicate_cards(self, force_use_cache: bool = False) -> int:
         """
         중복 카드 정리 (같은 card_key를 가진 활성 카드가 여러 개 있으면 가장 오래된 것만 남기고 나머지 제거)
@@ -870,8 +924,7 @@ class ProductionCardManager:
                     self._update_card_in_nbverse(card_to_remove)
                     
                     # 캐시에서 제거
-                    if card_to_remove in self.cards_cache:
-                        self.cards_cache.remove(card_to_remove)
+                    self._remove_from_cache(card_to_remove)
                     
                     removed_count += 1
         
@@ -897,6 +950,7 @@ class ProductionCardManager:
         # SOLD 여부와 무관하게 기존 데이터가 있으면 중첩을 허용
         return True
     
+    @writes
     def activate_overlap_card(self, card_key: str) -> Optional[Dict]:
         """
         중첩 카드 재활성
@@ -939,6 +993,7 @@ class ProductionCardManager:
         print(f"🔄 중첩 카드 재활성: {card_key} (generation: {max_generation + 1})")
         return card
     
+    @writes
     def cleanup_old_cards(self, hours_threshold: float = 20.0) -> int:
         """
         오래된 카드 정리 (20시간 이상 된 카드)
@@ -958,10 +1013,8 @@ class ProductionCardManager:
             all_cards = self.get_all_cards()
             
             for card in all_cards:
-                # 보유 중인 포지션이 있으면 건너뜀
-                history_list = card.get('history_list', [])
-                has_buy = any(h.get('type') in ['NEW', 'BUY'] for h in history_list)
-                has_sold = any(h.get('type') == 'SOLD' for h in history_list)
+                # 보유 중인 포지션이 있으면 건너뜀 (지연 로드 카드는 히스토리를 읽지 않고 본문 요약 사용)
+                has_buy, has_sold = history_summary(card)
                 
                 # 매수했지만 아직 매도하지 않은 카드는 보호
                 if has_buy and not has_sold:
@@ -996,8 +1049,7 @@ class ProductionCardManager:
                         self._update_card_in_nbverse(card)
                         
                         # 캐시에서 제거
-                        if card in self.cards_cache:
-                            self.cards_cache.remove(card)
+                        self._remove_from_cache(card)
                         
                         cleaned_count += 1
                 except Exception as e:
@@ -1015,6 +1067,7 @@ class ProductionCardManager:
             traceback.print_exc()
             return 0
     
+    @writes
     def cleanup_gray_cards(self):
         """
         GRAY 카드 정리 (다음 생산 시점에 호출)
@@ -1038,7 +1091,7 @@ class ProductionCardManager:
                 self._update_card_in_nbverse(card)
                 
                 # 캐시에서 제거 (Active 목록에서 제거)
-                self.cards_cache.remove(card)
+                self._remove_from_cache(card)
                 removed_count += 1
                 print(f"🗑️ GRAY 카드 제거: {card.get('card_key', 'unknown')}")
         
@@ -1047,6 +1100,7 @@ class ProductionCardManager:
         
         return removed_count
     
+    @writes
     def add_card(self, timeframe: str, nb_value: float = 0.0, nb_max: Optional[float] = None, 
                  nb_min: Optional[float] = None, card_type: str = 'normal', 
                  chart_data: dict = None, nb_id: Optional[str] = None, generation: int = 1,
@@ -1098,9 +1152,7 @@ class ProductionCardManager:
                 print(f"⚠️ REMOVED 상태의 카드가 이미 존재합니다: {card_key} (카드 ID: {existing_card.get('card_id', 'unknown')})")
                 print(f"  → REMOVED 상태의 카드를 완전히 삭제하고 새 카드를 생성합니다.")
                 self._remove_card_from_nbverse(existing_card.get('card_id'))
-                if existing_card in self.cards_cache:
-                    self.cards_cache.remove(existing_card)
-                    self._rebuild_indexes()
+                self._remove_from_cache(existing_card)
                 existing_card = None
             else:
                 # 활성/GRAY/OVERLAP 모두 중첩 재활성
@@ -1127,14 +1179,14 @@ class ProductionCardManager:
             # 가장 오래된 카드 제거
             removed_card = active_cards[0]
             self._remove_card_from_nbverse(removed_card.get('card_id'))
-            if removed_card in self.cards_cache:
-                self.cards_cache.remove(removed_card)
-                # 인덱스 재구성 (카드 제거 후)
-                self._rebuild_indexes()
+            self._remove_from_cache(removed_card)
             print(f"⚠️ 생산 카드가 {self.MAX_CARDS}개에 도달하여 가장 오래된 카드를 제거했습니다: {removed_card.get('card_id', 'unknown')}")
         
         # 카드 ID 생성
         card_id = f"prod_card_{timeframe}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
+        while card_id in self.cards_cache:
+            # 같은 초에 생산된 카드와 ID가 겹치면 다시 생성 (캐시는 card_id 기준 저장)
+            card_id = f"prod_card_{timeframe}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
         
         # 생산 순서 번호 부여 (모든 카드 중 가장 큰 번호 + 1)
         try:
@@ -1155,7 +1207,7 @@ class ProductionCardManager:
         history_list = []
         
         # 히스토리 추가 (NEW 타입 - 처음 생산)
-        history_item = {
+        history_item = HistoryEntry({
             'history_id': str(uuid.uuid4()),
             'card_key': card_key,
             'generation': generation,
@@ -1168,7 +1220,7 @@ class ProductionCardManager:
             'pnl_percent': 0.0,
             'pnl_amount': 0.0,
             'fee_amount': 0.0
-        }
+        })
         history_list.insert(0, history_item)
         
         # 카드 상태 결정
@@ -1187,7 +1239,7 @@ class ProductionCardManager:
             initial_rank = existing_card.get('rank', 'C')
         
         # 카드 객체 생성
-        card = {
+        card = ProductionCard({
             'card_id': card_id,
             'card_key': card_key,
             'timeframe': timeframe,
@@ -1205,7 +1257,7 @@ class ProductionCardManager:
             'history_list': history_list,
             'score': initial_score,  # 기본 점수 100점
             'rank': initial_rank  # 기본 등급 C
-        }
+        })
         
         # 기존 카드가 있으면 히스토리 병합 (중첩 카드 재활성 시)
         if existing_card:
@@ -1240,7 +1292,7 @@ class ProductionCardManager:
             'production_time': datetime.now().isoformat(),
             'production_number': production_number,  # 생산 순서 번호
             'chart_data': chart_data or {},
-            'history_list': card.get('history_list', []),  # 히스토리 리스트 포함
+            'history_list': to_plain(card.get('history_list', [])),  # 히스토리 리스트 포함
             'bit_max': nb_max,  # nb_max를 bit_max로도 저장 (호환성)
             'bit_min': nb_min,  # nb_min을 bit_min으로도 저장 (호환성)
             'nb_max': nb_max,  # nb_max 직접 저장
@@ -1249,23 +1301,12 @@ class ProductionCardManager:
             'rank': card.get('rank', 'C')  # 등급 (기본값 C)
         }
         
-        # NBverse에 저장 (백그라운드 실행)
+        # NBverse에 저장 (저장 워커에서 실행 - 같은 카드의 이후 갱신/삭제와 순서 보장, flush로 완료)
         try:
             if not existing_card:
-                # 새 카드만 저장 (백그라운드 실행)
-                import threading
-                
-                def save_in_background():
-                    try:
-                        self.nbverse_storage.save_text(prices_str, metadata=metadata)
-                        print(f"💾 생산 카드 저장 완료 (NBverse): {card_id}")
-                    except Exception as e:
-                        print(f"❌ 생산 카드 저장 오류: {e}")
-                        import traceback
-                        traceback.print_exc()
-                
-                thread = threading.Thread(target=save_in_background, daemon=True)
-                thread.start()
+                # 새 카드만 저장
+                if self.nbverse_storage:
+                    self._persistence.mark_created(card_id, prices_str, metadata)
             else:
                 # 기존 카드 업데이트 (이미 백그라운드로 실행됨)
                 self._update_card_in_nbverse(card)
@@ -1276,20 +1317,8 @@ class ProductionCardManager:
             traceback.print_exc()
             # 백그라운드 실행이므로 예외를 다시 발생시키지 않음
         
-        # 캐시에 추가 (기존 카드가 아니면)
-        if not existing_card:
-            self.cards_cache.append(card)
-            # 최신순으로 정렬
-            self.cards_cache.sort(key=lambda x: x.get('production_time', ''), reverse=True)
-        else:
-            # 기존 카드 업데이트 (캐시에서 찾아서 업데이트)
-            for i, cached_card in enumerate(self.cards_cache):
-                if cached_card.get('card_id') == card.get('card_id'):
-                    self.cards_cache[i] = card
-                    break
-        
-        # 인덱스 재구성 (캐시 업데이트 후)
-        self._rebuild_indexes()
+        # 캐시에 추가 (기존 카드면 같은 card_id의 카드를 교체, 인덱스도 이 카드만 갱신)
+        self.cards_cache.append(card)
         
         # 캐시가 최신 상태이므로 dirty 플래그를 False로 설정
         # (load()를 호출해도 새로 추가된 카드가 사라지지 않도록)
@@ -1297,12 +1326,42 @@ class ProductionCardManager:
         
         # 카드 추가/업데이트 시 임시 저장 파일에도 저장 (백그라운드)
         try:
-            self._save_cards_to_cache()
+            self._save_cards_to_cache(card.get('card_id'))
         except Exception as e:
             print(f"⚠️ 카드 추가 후 임시 저장 오류: {e}")
         
         return card
     
+    @writes
+    def register_saved_card(self, card_data: Dict) -> Optional[Dict]:
+        """
+        호출한 쪽에서 NBverse에 이미 저장한 카드(차트 분석 카드 등)를 캐시에 등록
+        (update_card로 찾을 수 있도록, NBverse에는 다시 저장하지 않음)
+        
+        Args:
+            card_data: 카드 데이터 (card_id 필수)
+        
+        Returns:
+            등록된 카드 (card_id가 없으면 None)
+        """
+        card_id = card_data.get('card_id') if isinstance(card_data, dict) else None
+        if not card_id:
+            return None
+        
+        # 캐시에 추가 (같은 card_id의 카드는 교체, 인덱스도 이 카드만 갱신)
+        card = ProductionCard(card_data)
+        self.cards_cache.append(card)
+        self._cache_dirty = False
+        
+        # 임시 저장 파일에도 기록 (저장 워커)
+        try:
+            self._save_cards_to_cache(card_id)
+        except Exception as e:
+            print(f"⚠️ 카드 등록 후 임시 저장 오류: {e}")
+        
+        return card
+    
+    @writes
     def add_history(self, 
                    card_id: str,
                    history_type: str,  # NEW, BUY, SOLD
@@ -1374,7 +1433,7 @@ class ProductionCardManager:
                 generation = 1
         
         # 히스토리 항목 생성
-        history_item = {
+        history_item = HistoryEntry({
             'history_id': str(uuid.uuid4()),
             'card_key': card_key,
             'generation': generation,
@@ -1389,7 +1448,7 @@ class ProductionCardManager:
             'fee_amount': fee_amount,
             'memo': memo,
             'is_simulation': is_simulation  # 모의 거래 여부
-        }
+        })
         
         # 맨 앞에 삽입 (최신 우선)
         card['history_list'].insert(0, history_item)
@@ -1403,12 +1462,13 @@ class ProductionCardManager:
         
         # 임시 저장 파일에도 저장 (백그라운드)
         try:
-            self._save_cards_to_cache()
+            self._save_cards_to_cache(card_id)
         except Exception as e:
             print(f"⚠️ 히스토리 추가 후 임시 저장 오류: {e}")
         
         return history_item
     
+    @writes
     def add_buy_history(self, 
                        card_id: str,
                        qty: float,
@@ -1458,6 +1518,7 @@ class ProductionCardManager:
             memo=memo
         )
     
+    @writes
     def add_sold_history(self,
                         card_id: str,
                         exit_price: float,
@@ -1550,23 +1611,23 @@ class ProductionCardManager:
         return history_item
     
     def _rebuild_indexes(self):
-        """인덱스 재구성 (캐시 업데이트 시 호출) - 최적화: 딕셔너리 조회 최소화"""
-        with self._index_lock:
-            self._card_id_index.clear()
-            self._card_key_index.clear()
-            
-            # 최적화: 한 번의 순회로 모든 인덱스 구성
-            for card in self.cards_cache:
-                card_id = card.get('card_id')
-                card_key = card.get('card_key', '')
-                
-                if card_id:
-                    self._card_id_index[card_id] = card
-                
-                if card_key:
-                    # 최적화: setdefault 사용으로 조회 최소화
-                    self._card_key_index.setdefault(card_key, []).append(card)
+        """인덱스 전체 재구성
+        
+        카드 추가/제거는 cards_cache(CardStore)가, 필드 변경은 _update_card_in_nbverse가
+        해당 카드만 다시 색인하므로 평소에는 호출할 필요가 없습니다.
+        """
+        self.cards_cache.reindex()
+    
+    def _remove_from_cache(self, card: Dict):
+        """메모리 캐시와 인덱스에서 카드 제거 (card_id 기준 O(1))"""
+        self.cards_cache.discard(card)
+    
+    @writes
+    def refresh_card_views(self, card: Dict):
+        """카드 상태/키/히스토리를 직접 변경한 뒤 인덱스에 반영 (저장은 하지 않음)"""
+        self._views.update(card)
     
+    @reads
     def get_card_by_id(self, card_id: str) -> Optional[Dict]:
         """카드 ID로 카드 찾기 - 인덱스 사용으로 O(1) 조회 (메모리 캐싱 최적화)"""
         # UI 반응성을 위해 load() 호출 제거, 캐시만 사용
@@ -1574,14 +1635,10 @@ class ProductionCardManager:
         if not self.cards_cache and not self._loading:
             self.load(background=True)  # 백그라운드로만 시작, 대기 안 함
         
-        # 인덱스가 비어있으면 재구성
-        if not self._card_id_index and self.cards_cache:
-            self._rebuild_indexes()
-        
         # 인덱스를 사용한 O(1) 조회
-        with self._index_lock:
-            return self._card_id_index.get(card_id)
+        return self._views.get(card_id)
     
+    @writes
     def update_card(self, card_id: str, updates: Dict) -> bool:
         """
         카드 업데이트 (예측 정보 등)
@@ -1603,12 +1660,9 @@ class ProductionCardManager:
             # 기존 카드에 업데이트 필드 병합
             card.update(updates)
             
-            # NBverse에서 카드 업데이트 (백그라운드)
+            # NBverse에서 카드 업데이트 (백그라운드, 인덱스는 해당 카드만 갱신)
             self._update_card_in_nbverse(card)
             
-            # 인덱스 재구성 (업데이트된 카드 반영)
-            self._rebuild_indexes()
-            
             return True
         except Exception as e:
             print(f"⚠️ 카드 업데이트 오류: {e}")
@@ -1616,6 +1670,7 @@ class ProductionCardManager:
             traceback.print_exc()
             return False
     
+    @writes
     def remove_card(self, card_id: str) -> bool:
         """
         카드 제거 (즉시 실행)
@@ -1637,12 +1692,10 @@ class ProductionCardManager:
             self._remove_card_from_nbverse(card_id)
             
             # 캐시에서 제거
-            if card in self.cards_cache:
-                self.cards_cache.remove(card)
-                self._rebuild_indexes()
+            self._remove_from_cache(card)
             
             # 저장
-            self._save_cards_to_cache()
+            self._save_cards_to_cache(card_id)
             
             print(f"✅ 카드 제거 완료: {card_id}")
             return True
@@ -1668,6 +1721,7 @@ class ProductionCardManager:
         
         return card.get('history_list', [])
     
+    @reads
     def get_active_cards(self):
         """
         활성 생산 카드만 반환 (ACTIVE, OVERLAP_ACTIVE만) - UI 반응성을 위해 캐시만 사용
@@ -1679,35 +1733,10 @@ class ProductionCardManager:
         if not self.cards_cache and not self._loading:
             self.load(background=True)  # 백그라운드로만 시작, 대기 안 함
         
-        # 활성 카드 필터링 (최적화: set 사용으로 O(1) 조회)
-        active_states = {CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value}
-        active_cards = [card for card in self.cards_cache 
-                       if card.get('card_state') in active_states]
-        
-        # 검증 완료된 카드 제외 (SOLD 히스토리가 있는 카드는 제외)
-        filtered_cards = []
-        for card in active_cards:
-            history_list = card.get('history_list', [])
-            has_sold = any(hist.get('type') == 'SOLD' for hist in history_list)
-            if not has_sold:
-                filtered_cards.append(card)
-        
-        # card_key 기준 중복 제거 (같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 유지)
-        # 최적화: 딕셔너리 컴프리헨션 스타일로 개선
-        cards_by_key = {}
-        for card in filtered_cards:
-            card_key = card.get('card_key', '')
-            if card_key:
-                existing_time = cards_by_key.get(card_key, {}).get('production_time', '')
-                new_time = card.get('production_time', '')
-                if not existing_time or new_time > existing_time:
-                    cards_by_key[card_key] = card
-        
-        # 중복 제거된 카드 리스트 반환 (최신순 정렬)
-        result = list(cards_by_key.values())
-        result.sort(key=lambda x: x.get('production_time', ''), reverse=True)
-        return result
+        # 상태 전이 시 갱신되는 인덱스에서 card_key별 최신 활성 카드를 최신순으로 읽음 (O(결과 수))
+        return self._views.active_cards()
     
+    @reads
     def get_all_cards(self):
         """
         모든 생산 카드 반환 (REMOVED 제외) - UI 반응성을 위해 캐시만 사용
@@ -1718,30 +1747,23 @@ class ProductionCardManager:
         if not self.cards_cache and not self._loading:
             self.load(background=True)  # 백그라운드로만 시작, 대기 안 함
         
-        # 캐시에서 REMOVED 상태가 아닌 카드만 필터링
-        cards = [card for card in self.cards_cache 
-                if card.get('card_state') != CardState.REMOVED.value]
+        # card_key별 최신 카드 (card_key가 없으면 card_id별)를 최신순으로 읽음 (O(결과 수))
+        return self._views.visible_cards()
+    
+    @reads
+    def get_verification_cards(self, include_removed: bool = False) -> List[Dict]:
+        """
+        검증 카드 반환 (매수와 SOLD 히스토리가 모두 있는 카드)
+        SOLD 히스토리가 있는 카드 인덱스만 확인하므로 전체 카드 히스토리를 훑지 않음
         
-        # card_key 기준 중복 제거 (같은 card_key를 가진 카드가 여러 개 있으면 최신 것만 유지)
-        # 최적화: 딕셔너리 조회 최소화
-        cards_by_key = {}
-        for card in cards:
-            card_key = card.get('card_key', '')
-            if card_key:
-                existing_time = cards_by_key.get(card_key, {}).get('production_time', '')
-                new_time = card.get('production_time', '')
-                if not existing_time or new_time > existing_time:
-                    cards_by_key[card_key] = card
-            else:
-                # card_key가 없으면 card_id로 구분
-                card_id = card.get('card_id', '')
-                if card_id and card_id not in cards_by_key:
-                    cards_by_key[card_id] = card
-        
-        # 중복 제거된 카드 리스트 반환 (최신순 정렬)
-        result = list(cards_by_key.values())
-        result.sort(key=lambda x: x.get('production_time', ''), reverse=True)
-        return result
+        Args:
+            include_removed: False이면 get_all_cards() 중에서만, True이면 REMOVED 포함 캐시 전체에서
+        """
+        return self._views.sold_cards(include_removed=include_removed)
+    
+    def has_sold_history(self, card_id: str) -> bool:
+        """SOLD 히스토리가 있는 카드인지 (인덱스 조회, 히스토리를 읽지 않음)"""
+        return self._views.has_sold(card_id)
     
     def _should_auto_discard(self, card: Dict, current_pnl_percent: float) -> bool:
         """
@@ -1836,8 +1858,7 @@ class ProductionCardManager:
                 self._remove_card_from_nbverse(card_id)
             
             # 캐시에서 제거
-            if card in self.cards_cache:
-                self.cards_cache.remove(card)
+            self._remove_from_cache(card)
             
             print(f"🗑️ 자동 폐기: {card.get('card_key', 'unknown')} (손익: {pnl_percent:.2f}%)")
             
@@ -1849,28 +1870,21 @@ class ProductionCardManager:
     def _load_cards_from_cache(self) -> bool:
         """
         임시 저장 파일에서 카드 로드
+        (헤더만 로드하고 history_list/chart_data/realtime_scores는 카드별로 처음 접근할 때 읽음)
         
         Returns:
             True: 로드 성공, False: 파일이 없거나 오류 발생
         """
         try:
-            if not os.path.exists(self._cache_file_path):
-                return False
-            
-            with open(self._cache_file_path, 'rb') as f:
-                data = _json_loads(f.read())
-            
-            if not isinstance(data, dict) or 'cards' not in data:
-                return False
-            
-            cards = data.get('cards', [])
-            if not isinstance(cards, list):
+            # 스냅샷 + 변경 로그 재생 (기존 전체 저장 형식도 스냅샷으로 그대로 읽음)
+            cards = self._journal.load()
+            if cards is None:
                 return False
             
             # 카드 데이터 검증 및 로드 (card_key 기준 중복 제거)
             cards_dict = {}  # card_key -> 최신 card 매핑
             for card in cards:
-                if isinstance(card, dict) and card.get('card_id'):
+                if isinstance(card, ProductionCard) and card.get('card_id'):
                     card_key = card.get('card_key', '')
                     if card_key:
                         if card_key not in cards_dict:
@@ -1887,37 +1901,62 @@ class ProductionCardManager:
                         if card_id:
                             cards_dict[card_id] = card
             
-            # 중복 제거된 카드 리스트로 변환
-            self.cards_cache = list(cards_dict.values())
-            
-            # 최신순으로 정렬
-            self.cards_cache.sort(key=lambda x: x.get('production_time', ''), reverse=True)
-            
-            # 인덱스 재구성 (캐시 업데이트 후)
-            self._rebuild_indexes()
+            # 중복 제거된 카드로 캐시 교체 (인덱스도 함께 재구성, 순회 시 최신순)
+            with self._lock.write_locked():
+                self.cards_cache.replace_all(cards_dict.values())
             
             return len(self.cards_cache) > 0
         except Exception as e:
             print(f"⚠️ 임시 저장 파일 로드 오류: {e}")
             return False
     
-    def _save_cards_to_cache(self):
-        """임시 저장 파일에 카드 저장 (백그라운드 실행 권장)"""
+    def _save_cards_to_cache(self, card_id: Optional[str] = None):
+        """임시 저장 파일에 카드 저장 - 저장 워커에 예약 (지연 시간 안의 여러 요청은 한 번으로 묶음)
+        
+        Args:
+            card_id: 변경된 카드 ID (없으면 전체 카드를 비교하여 바뀐 카드만 기록)
+        """
+        self._persistence.mark_cache(card_id)
+    
+    def _compact_cards_cache(self):
+        """저널 압축 (로그가 커졌을 때만 실행되는 드문 작업)
+        
+        카드별 헤더/본문 바이트는 읽기 잠금 안에서 만들고, 파일 쓰기/fsync는 잠금 밖에서 실행
+        (본문을 읽지 않은 카드의 본문 위치를 새 본문 파일로 옮겨야 하므로 복사본이 아닌 실제 카드 사용)
+        """
+        with self._lock.read_locked():
+            prepared = self._journal.prepare_compaction(self.cards_cache.snapshot())
+        self._journal.write_compaction(prepared)
+    
+    def _write_cards_cache(self, card_ids=None, full: bool = True):
+        """임시 저장 저널에 변경된 카드 기록 (저장 워커 스레드에서 실행)
+        
+        Args:
+            card_ids: 변경된 카드 ID 집합 (캐시에 없는 카드는 삭제로 기록)
+            full: True이면 전체 카드를 비교하여 바뀐 카드와 사라진 카드 기록
+        """
         try:
-            # data 디렉토리 생성
-            cache_dir = os.path.dirname(self._cache_file_path)
-            if cache_dir and not os.path.exists(cache_dir):
-                os.makedirs(cache_dir, exist_ok=True)
-            
-            # 카드 데이터 저장
-            data = {
-                'cards': self.cards_cache,
-                'saved_at': datetime.now().isoformat()
-            }
+            # 스냅샷이 없거나 로그가 커졌으면 현재 카드 전체로 새 스냅샷 작성
+            if self._journal.needs_compaction():
+                self._compact_cards_cache()
+                return
             
-            with open(self._cache_file_path, 'wb') as f:
-                f.write(_json_dumps(data, indent=2))
-                f.flush()
-                os.fsync(f.fileno())
+            # 변경 중인 카드를 직렬화하지 않도록 읽기 잠금 안에서 복사하고, 기록은 잠금 밖에서
+            with self._lock.read_locked():
+                if full:
+                    cards = [snapshot_card(card) for card in self.cards_cache.snapshot()]
+                elif card_ids:
+                    changes = {}
+                    for card_id in card_ids:
+                        card = self.cards_cache.get(card_id)
+                        changes[card_id] = snapshot_card(card) if card is not None else None
+            
+            if full:
+                self._journal.record_all(cards)
+            elif card_ids:
+                self._journal.record(changes)
+            
+            if self._journal.needs_compaction():
+                self._compact_cards_cache()
         except Exception as e:
             print(f"⚠️ 임시 저장 파일 저장 오류: {e}")
\ No newline at end of file
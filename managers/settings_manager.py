@@ -13,7 +13,14 @@ class SettingsManager:
             "update_cycle_seconds": 25,  # 전체 프로세스 업데이트 주기 (초)
             "production_timeframes": ["1m", "3m", "5m", "15m", "30m", "60m", "1d"],  # 생산 가능한 타임프레임 목록
             "nb_decimal_places": 10,  # N/B 값 소수점 자리수
+            "nb_chart_record_interval_seconds": 60,  # 차트 N/B 계산 결과 NBVerse 저장 간격 (초, 타임프레임별 / 0이면 매번, 음수이면 저장 안 함 / 같은 차트는 한 번만 저장)
+            "nbverse_storage_backend": "directory",  # NBVerse 저장소 방식 ("directory": 폴더 구조, "indexed": 단일 인덱스 파일)
+            "nbverse_compaction_interval_hours": 24,  # NBVerse 저장소 압축 주기 (시간, 0이면 사용 안 함 - 중복 텍스트/카드 이전 버전/빈 폴더 정리)
+            "nbverse_retention_days": 0,  # 카드가 아닌 NBVerse 파일 보존 기간 (일, 0이면 기간으로 삭제하지 않음)
             "production_card_limit": 0,  # 생산 카드 제한 (0이면 제한 없음)
+            "card_persist_delay_ms": 500,  # 카드 저장 지연 시간 (밀리초, 이 시간 안의 같은 카드 갱신은 한 번으로 묶어서 저장)
+            "card_journal_compact_kb": 1024,  # 카드 임시 저장 로그 압축 기준 (KB, 넘으면 스냅샷으로 다시 씀)
+            "card_rebuild_workers": 0,  # 임시 저장 파일이 없을 때 NBverse 폴더 재구성 디코드 작업자 수 (0이면 CPU 수, 1이면 프로세스 풀 사용 안 함)
             "chart_animation_interval_ms": 1000  # 차트 애니메이션 순회 주기 (밀리초, 기본값 1초)
         }
         self.load()
@@ -2,8 +2,10 @@
 import os
 import sys
 import re
+import time
+import threading
 from datetime import datetime
-from decimal import Decimal, getcontext
+from decimal import getcontext
 import math
 
 # Windows 콘솔 인코딩 문제 해결을 위한 안전한 출력 함수
@@ -185,6 +187,15 @@ except Exception as e:
     TextToNBConverter = None
 
 
+# N/B 결과 캐시 설정 (같은 가격 문자열의 text_to_nb 재계산 방지)
+NB_CACHE_MAX_ITEMS = 256
+NB_CACHE_FILE_NAME = "nb_cache.sqlite3"
+
+# NBVerse 저장소 방식 ("directory": max/min 숫자 폴더 구조, "indexed": 단일 인덱스 파일)
+STORAGE_BACKEND_DIRECTORY = "directory"
+STORAGE_BACKEND_INDEXED = "indexed"
+
+
 class SimpleNBCalculator:
     """간단한 N/B 계산기 (NBVerse가 없을 때 사용)"""
     def __init__(self, decimal_places=10):
@@ -196,7 +207,8 @@ class SimpleNBCalculator:
         """N/B 값을 소수점 자리수로 포맷팅"""
         if not math.isfinite(value) or math.isnan(value):
             return 0.0
-        return round(float(Decimal(str(value))), self.NB_DECIMAL_PLACES)
+        # float(Decimal(str(value)))는 value와 같은 float이므로 바로 반올림 (결과 동일)
+        return round(value, self.NB_DECIMAL_PLACES)
     
     def calculate_simple_nb(self, prices: list) -> float:
         """간단한 N/B 값 계산 (가격 변화율 기반)"""
@@ -222,9 +234,56 @@ class SimpleNBCalculator:
         return self.format_nb_value(normalized)
 
 
+# 차트 N/B 계산 결과 저장 간격 기본값 (초, 타임프레임별)
+NB_CHART_RECORD_INTERVAL_SECONDS = 60
+
+# 타임프레임별 마지막 차트 N/B 저장 시각 (time.monotonic)
+_chart_record_times = {}
+_chart_record_lock = threading.Lock()
+
+
+def _should_record_chart(timeframe, settings_manager=None):
+    """차트 N/B 결과를 저장할 차례인지 (타임프레임별로 저장 간격 안에는 한 번만, 간격이 음수이면 저장 안 함)"""
+    interval = NB_CHART_RECORD_INTERVAL_SECONDS
+    if settings_manager:
+        try:
+            interval = float(settings_manager.get("nb_chart_record_interval_seconds", interval))
+        except (TypeError, ValueError):
+            pass
+    if interval < 0:
+        return False
+    with _chart_record_lock:
+        last = _chart_record_times.get(timeframe)
+        return last is None or time.monotonic() - last >= interval
+
+
+def _record_chart_nb(nbverse_storage, prices_str, bit_max, bit_min, metadata):
+    """차트 N/B 결과 저장 (이미 계산한 값 재사용, 같은 가격 문자열이 이미 저장되어 있으면 건너뜀)
+    
+    Returns:
+        새로 저장했으면 True
+    """
+    if hasattr(nbverse_storage, 'save_precomputed'):
+        result = nbverse_storage.save_precomputed(prices_str, bit_max, bit_min,
+                                                  metadata=metadata, skip_duplicate=True)
+        if result.get('duplicate'):
+            return False
+    else:
+        # save_precomputed를 지원하지 않는 NBVerse 버전
+        nbverse_storage.save_text(prices_str, metadata=metadata)
+    with _chart_record_lock:
+        _chart_record_times[metadata.get('timeframe', 'unknown')] = time.monotonic()
+    return True
+
+
 def calculate_nb_value_from_chart(chart_data, nbverse_storage=None, nbverse_converter=None, 
-                                  settings_manager=None, nb_decimal_places=10):
-    """차트 데이터로부터 N/B 값 계산"""
+                                  settings_manager=None, nb_decimal_places=10, record=True):
+    """차트 데이터로부터 N/B 값 계산
+    
+    Args:
+        record: False이면 NBVerse에 저장하지 않음 (True여도 nb_chart_record_interval_seconds 간격으로만,
+                같은 가격 문자열은 한 번만 저장)
+    """
     try:
         if not chart_data or 'prices' not in chart_data:
             return 0.5
@@ -251,20 +310,20 @@ def calculate_nb_value_from_chart(chart_data, nbverse_storage=None, nbverse_conv
             if nbverse_storage and hasattr(nbverse_storage, 'decimal_places'):
                 decimal_places = nbverse_storage.decimal_places
             
-            # NBVerse에 저장
+            # NBVerse에 저장 (계산 결과 재사용, 간격/중복 확인 후)
+            timeframe = chart_data.get('timeframe', 'unknown')
             try:
-                nbverse_storage.save_text(
-                    prices_str,
-                    metadata={
-                        'timeframe': chart_data.get('timeframe', 'unknown'),
+                if record and _should_record_chart(timeframe, settings_manager):
+                    metadata = {
+                        'timeframe': timeframe,
                         'current_price': chart_data.get('current_price', 0),
                         'bit_max': bit_max,
                         'bit_min': bit_min,
                         'nb_value': nb_value,
                         'timestamp': datetime.now().isoformat()
                     }
-                )
-                safe_print(f"💾 NBVerse에 저장 완료: {chart_data.get('timeframe', 'unknown')} (bitMax: {bit_max:.{decimal_places}f}, bitMin: {bit_min:.{decimal_places}f})")
+                    if _record_chart_nb(nbverse_storage, prices_str, bit_max, bit_min, metadata):
+                        safe_print(f"💾 NBVerse에 저장 완료: {timeframe} (bitMax: {bit_max:.{decimal_places}f}, bitMin: {bit_min:.{decimal_places}f})")
             except Exception as e:
                 safe_print(f"⚠️ NBVerse 저장 오류: {e}")
                 import traceback
@@ -289,16 +348,89 @@ def calculate_nb_value_from_chart(chart_data, nbverse_storage=None, nbverse_conv
         return 0.5
 
 
-def init_nbverse_storage(data_dir, decimal_places=10):
-    """NBVerse 저장소 초기화"""
+def _nb_cache_kwargs(data_dir):
+    """N/B 결과 캐시 설정 (NBResultCache를 지원하지 않는 NBVerse 버전이면 빈 설정)"""
+    try:
+        from NBverse import NBResultCache
+    except ImportError:
+        return {}
+    
+    return {
+        'cache': NBResultCache(
+            max_items=NB_CACHE_MAX_ITEMS,
+            disk_path=os.path.join(data_dir, NB_CACHE_FILE_NAME)
+        )
+    }
+
+
+def start_nbverse_compaction(nbverse_storage, interval_hours=24, retention_days=0):
+    """NBVerse 저장소 주기 압축 시작 (중복 텍스트 / 카드 이전 버전 / 보존 기간이 지난 파일 / 빈 폴더 정리)
+    
+    Args:
+        nbverse_storage: 정리할 저장소 (compact()를 지원하는 폴더 구조 저장소만 대상)
+        interval_hours: 실행 주기 (시간, 0 이하이면 시작하지 않음)
+        retention_days: 카드가 아닌 파일의 보존 기간 (일, 0이면 기간으로 삭제하지 않음)
+    
+    Returns:
+        시작된 스케줄러 (시작하지 않았으면 None)
+    """
+    if not nbverse_storage or interval_hours <= 0 or not hasattr(nbverse_storage, 'compact'):
+        return None
+    try:
+        from NBverse import NBverseCompactionScheduler
+    except ImportError:
+        safe_print("⚠️ 이 NBVerse 버전은 저장소 압축을 지원하지 않습니다.")
+        return None
+    
+    scheduler = NBverseCompactionScheduler(
+        nbverse_storage,
+        interval_seconds=interval_hours * 3600,
+        retention_days=retention_days
+    )
+    scheduler.start()
+    retention = f"{retention_days}일" if retention_days else "제한 없음"
+    safe_print(f"✅ NBVerse 저장소 압축 예약 (주기: {interval_hours}시간, 보존 기간: {retention})")
+    return scheduler
+
+
+def _create_storage(data_dir, decimal_places, converter, storage_backend):
+    """저장소 방식에 맞는 NBVerse 저장소 생성 (인덱스 저장소를 지원하지 않으면 폴더 구조 저장소)"""
+    if storage_backend == STORAGE_BACKEND_INDEXED:
+        try:
+            from NBverse import NBverseIndexedStorage
+        except ImportError:
+            safe_print("⚠️ 이 NBVerse 버전은 인덱스 저장소를 지원하지 않습니다. 폴더 구조 저장소를 사용합니다.")
+        else:
+            storage = NBverseIndexedStorage(data_dir=data_dir, decimal_places=decimal_places, converter=converter)
+            # 처음 전환할 때 (저장소가 비어 있으면) 기존 폴더 구조 데이터를 가져옴
+            if storage.count() == 0:
+                imported = storage.import_from_directory()
+                if imported:
+                    safe_print(f"✅ 기존 폴더 구조 데이터를 인덱스 저장소로 가져왔습니다: {imported}개")
+            return storage
+    elif storage_backend != STORAGE_BACKEND_DIRECTORY:
+        safe_print(f"⚠️ 알 수 없는 저장소 방식: {storage_backend}, 폴더 구조 저장소를 사용합니다.")
+    
+    return NBverseStorage(data_dir=data_dir, decimal_places=decimal_places)
+
+
+def init_nbverse_storage(data_dir, decimal_places=10, storage_backend=STORAGE_BACKEND_DIRECTORY):
+    """NBVerse 저장소 초기화
+    
+    Args:
+        data_dir: 데이터 디렉토리 경로
+        decimal_places: 소수점 자리수 (기본값: 10)
+        storage_backend: 저장소 방식 ("directory" 또는 "indexed", 기본값: "directory")
+    """
     if not NBVERSE_AVAILABLE or NBverseStorage is None:
         return None, None
     
     try:
         os.makedirs(data_dir, exist_ok=True)
-        storage = NBverseStorage(data_dir=data_dir, decimal_places=decimal_places)
-        converter = TextToNBConverter(bit=5.5, decimal_places=decimal_places)
-        safe_print(f"✅ NBVerse 초기화 완료 (소수점 자리수: {decimal_places}, 데이터 디렉토리: {data_dir})")
+        converter = TextToNBConverter(bit=5.5, decimal_places=decimal_places,
+                                      **_nb_cache_kwargs(data_dir))
+        storage = _create_storage(data_dir, decimal_places, converter, storage_backend)
+        safe_print(f"✅ NBVerse 초기화 완료 (소수점 자리수: {decimal_places}, 데이터 디렉토리: {data_dir}, 저장소: {type(storage).__name__})")
         return storage, converter
     except Exception as e:
         safe_print(f"⚠️ NBVerse 초기화 오류: {e}")
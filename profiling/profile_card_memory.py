@@ -0,0 +1,119 @@
+"""생산 카드 메모리 사용량 비교 스크립트
+
+5,000장 카드 픽스처를 일반 dict 카드와 ProductionCard 레코드(__slots__ + array('d'))로
+각각 메모리에 올렸을 때의 카드당 사용량을 tracemalloc으로 측정합니다.
+"""
+import sys
+import os
+import io
+import json
+import uuid
+import random
+import tracemalloc
+
+# 현재 스크립트의 디렉토리
+script_dir = os.path.dirname(os.path.abspath(__file__))
+# 프로젝트 루트 경로 (profiling의 상위 디렉토리)
+project_root = os.path.dirname(script_dir)
+
+# 프로젝트 루트 경로 추가
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_records import ProductionCard
+
+CARD_COUNT = 5000
+PRICE_COUNT = 200
+HISTORY_COUNT = 10
+SCORE_COUNT = 100
+
+
+def create_fixture_json(count: int = CARD_COUNT) -> str:
+    """임시 저장 파일과 같은 형태의 카드 목록 JSON 생성"""
+    rng = random.Random(42)
+    cards = []
+    for index in range(count):
+        base_price = rng.uniform(90_000_000, 100_000_000)
+        prices = [round(base_price * (1 + rng.uniform(-0.01, 0.01)), 1) for _ in range(PRICE_COUNT)]
+        nb_id = f"nb_1m_{rng.random():.10f}"
+        history_list = []
+        for generation in range(HISTORY_COUNT):
+            history_list.append({
+                'history_id': str(uuid.UUID(int=rng.getrandbits(128))),
+                'card_key': f"1m_{nb_id}",
+                'generation': generation + 1,
+                'type': 'NEW' if generation == 0 else rng.choice(['BUY', 'SOLD']),
+                'nb_id': nb_id,
+                'timestamp': f"2026-01-01T00:{generation:02d}:00",
+                'entry_price': prices[0],
+                'exit_price': prices[-1],
+                'qty': 0.0001,
+                'pnl_percent': 0.0,
+                'pnl_amount': 0.0,
+                'fee_amount': 0.0,
+                'memo': '',
+                'is_simulation': False
+            })
+        cards.append({
+            'card_id': f"prod_card_1m_20260101_{index:06d}",
+            'card_key': f"1m_{nb_id}",
+            'timeframe': '1m',
+            'nb_value': rng.random(),
+            'nb_max': rng.random(),
+            'nb_min': rng.random(),
+            'nb_id': nb_id,
+            'card_type': 'normal',
+            'card_state': 'ACTIVE',
+            'status': 'ACTIVE',
+            'removal_pending': False,
+            'production_time': f"2026-01-01T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}",
+            'production_number': index + 1,
+            'chart_data': {'prices': prices, 'timeframe': '1m', 'current_price': prices[-1]},
+            'history_list': history_list,
+            'score': 100.0,
+            'rank': 'C',
+            'realtime_scores': [round(rng.uniform(50, 150), 2) for _ in range(SCORE_COUNT)]
+        })
+    return json.dumps(cards)
+
+
+def measure(build) -> int:
+    """build()가 만든 객체가 유지하는 메모리 (바이트)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def build_dict_cards(data: str):
+    return json.loads(data)
+
+
+def build_record_cards(data: str):
+    return [ProductionCard(card) for card in json.loads(data)]
+
+
+def main():
+    print("=" * 60)
+    print(f"생산 카드 메모리 비교 ({CARD_COUNT:,}장, 가격 {PRICE_COUNT}개, 히스토리 {HISTORY_COUNT}개, 점수 {SCORE_COUNT}개)")
+    print("=" * 60)
+    data = create_fixture_json()
+    
+    dict_bytes = measure(lambda: build_dict_cards(data))
+    record_bytes = measure(lambda: build_record_cards(data))
+    
+    print(f"일반 dict 카드:       {dict_bytes / 1024 / 1024:8.1f} MB  (카드당 {dict_bytes / CARD_COUNT / 1024:6.1f} KB)")
+    print(f"ProductionCard 레코드: {record_bytes / 1024 / 1024:8.1f} MB  (카드당 {record_bytes / CARD_COUNT / 1024:6.1f} KB)")
+    print(f"절감: {(1 - record_bytes / dict_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
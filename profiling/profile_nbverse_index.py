@@ -0,0 +1,122 @@
+"""NBverse N/B 값 인덱스 읽기 방식 비교 스크립트
+
+100,000개 항목의 인덱스 로그를 만들어
+- 기존 방식: 로그 파일 전체를 open().read() 후 파싱하여 프로세스 메모리의 정렬 배열로 보관
+- 세그먼트 방식: 정렬 세그먼트 파일을 mmap으로 열어 값 배열에서 바로 이진 탐색
+의 첫 검색(콜드 로드) 시간, 범위 검색 시간, 인스턴스가 유지하는 메모리를 비교합니다.
+(find_similar_by_nb_range / 차트 분석 조회가 사용하는 iter_nb_range 경로)
+"""
+import sys
+import os
+import io
+import time
+import random
+import shutil
+import tempfile
+import tracemalloc
+
+# 현재 스크립트의 디렉토리
+script_dir = os.path.dirname(os.path.abspath(__file__))
+# 프로젝트 루트 경로 (profiling의 상위 디렉토리)
+project_root = os.path.dirname(script_dir)
+
+# NBverse 패키지 경로 추가
+nbverse_root = os.path.join(project_root, 'NBVerseV01-main')
+if nbverse_root not in sys.path:
+    sys.path.insert(0, nbverse_root)
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from NBverse.value_index import NBValueIndex
+
+RECORD_COUNT = 100_000
+QUERY_COUNT = 1_000
+QUERY_LIMIT = 50  # find_similar_by_nb_range 기본 limit
+
+
+def create_index_log(index_path: str, count: int = RECORD_COUNT):
+    """저장할 때마다 한 줄씩 추가된 것과 같은 (정렬되지 않은) 인덱스 로그 생성"""
+    rng = random.Random(42)
+    lines = []
+    for index in range(count):
+        value = round(rng.uniform(0.0, 10.0), 10)
+        digits = "/".join(f"{int(value * 1_000_000):07d}")
+        lines.append(f"{value!r}\t{digits}/{value:.10f}_20260101_000000_{index:06d}.json\n")
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def measure(build):
+    """build()의 실행 시간(초)과 결과 객체가 유지하는 메모리(바이트)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, after - before
+
+
+def cold_load(index_path: str, base_dir: str, use_segment: bool) -> NBValueIndex:
+    """새 프로세스가 처음 검색하는 것과 같은 상태 (인스턴스 생성 + 첫 검색)"""
+    index = NBValueIndex(index_path, base_dir, use_segment=use_segment)
+    index.find_range(5.0, 5.0001)
+    return index
+
+
+def run_queries(index: NBValueIndex, ranges) -> int:
+    found = 0
+    for low, high in ranges:
+        found += len(index.find_range(low, high, QUERY_LIMIT))
+    return found
+
+
+def main():
+    print("=" * 60)
+    print(f"N/B 값 인덱스 읽기 비교 ({RECORD_COUNT:,}개 항목, 범위 검색 {QUERY_COUNT:,}회, limit {QUERY_LIMIT})")
+    print("=" * 60)
+    work_dir = tempfile.mkdtemp(prefix="nbverse_index_profile_")
+    try:
+        base_dir = os.path.join(work_dir, "max")
+        index_path = os.path.join(work_dir, "index", "max.idx")
+        create_index_log(index_path)
+        
+        # 세그먼트 파일 생성 (기존 로그만 있을 때 처음 한 번)
+        _, build_seconds, _ = measure(lambda: cold_load(index_path, base_dir, use_segment=True))
+        print(f"세그먼트 생성 (한 번): {build_seconds * 1000:8.1f} ms, "
+              f"{os.path.getsize(index_path[:-len('.idx')] + '.seg') / 1024 / 1024:.1f} MB")
+        
+        rng = random.Random(7)
+        ranges = []
+        for _ in range(QUERY_COUNT):
+            center = rng.uniform(0.0, 10.0)
+            width = rng.choice([0.0001, 0.01, 0.5])
+            ranges.append((center - width, center + width))
+        
+        results = {}
+        for label, use_segment in (("기존 (read + 파싱)", False), ("세그먼트 (mmap)", True)):
+            index, load_seconds, held_bytes = measure(lambda: cold_load(index_path, base_dir, use_segment))
+            start = time.perf_counter()
+            found = run_queries(index, ranges)
+            query_seconds = time.perf_counter() - start
+            results[label] = (load_seconds, query_seconds, held_bytes, found)
+            print(f"{label:18s} 콜드 로드 {load_seconds * 1000:8.1f} ms | "
+                  f"범위 검색 {query_seconds / QUERY_COUNT * 1_000_000:7.1f} us/회 | "
+                  f"프로세스 메모리 {held_bytes / 1024 / 1024:6.1f} MB")
+        
+        (legacy_load, legacy_query, legacy_bytes, legacy_found), (mmap_load, mmap_query, mmap_bytes, mmap_found) = results.values()
+        assert legacy_found == mmap_found, (legacy_found, mmap_found)
+        print(f"콜드 로드 {legacy_load / mmap_load:.0f}배 빠름, 범위 검색 {legacy_query / mmap_query:.2f}배, "
+              f"프로세스당 메모리 {(1 - mmap_bytes / legacy_bytes) * 100:.1f}% 절감 "
+              f"(세그먼트 페이지는 OS 페이지 캐시에서 프로세스 간 공유)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
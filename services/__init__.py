@@ -1,5 +1,14 @@
 """서비스 모듈"""
-from .price_cache_service import PriceCacheService, get_price_cache_service
+from .market_data_service import MarketDataService, get_market_data_service
+from .candle_store import CandleStore, CandleArrays, get_candle_store
+from .price_feed import PriceFeed, PriceSubscription
 
-__all__ = ['PriceCacheService', 'get_price_cache_service']
+__all__ = ['MarketDataService', 'get_market_data_service', 'CandleStore', 'CandleArrays', 'get_candle_store',
+           'PriceFeed', 'PriceSubscription']
 
+# 가격 캐시 서비스는 PyQt6가 필요 (웹 서버에서는 시장 데이터 서비스만 사용)
+try:
+    from .price_cache_service import PriceCacheService, get_price_cache_service
+    __all__ += ['PriceCacheService', 'get_price_cache_service']
+except ImportError:
+    pass
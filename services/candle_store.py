@@ -0,0 +1,456 @@
+"""봉(OHLCV) 저장소 모듈 - (market, interval)별 링 버퍼를 디스크에 보관하고 새 봉만 조회
+
+매번 200개 봉을 다시 받는 대신
+- 마지막으로 저장한 봉 이후의 봉만 조회 (아직 진행 중인 마지막 봉은 다시 받아 값 보정)
+- 봉은 고정 크기 바이너리 파일('<market>_<interval>.candles')의 링 버퍼에 저장하고 바뀐 칸만 씀
+- 재시작 후에는 디스크에서 바로 읽어 네트워크 없이 차트를 그릴 수 있음
+- 차트 / N/B / ML 코드에는 NumPy 배열 뷰(복사 없음)를 넘겨 줌
+- GUI와 API 서버가 같은 파일을 쓰므로 조회/병합은 파일 잠금('<파일>.lock') 안에서 하고,
+  다른 프로세스가 파일을 바꿨으면 다시 읽은 뒤 병합
+- capacity보다 많은 봉을 요청하면 링 버퍼를 거치지 않고 바로 조회
+
+파일 형식 (리틀 엔디언):
+    헤더 32바이트: magic(8) capacity(uint32) fields(uint32) count(uint64) head(uint64)
+    본문: capacity개의 칸 x [time, open, high, low, close, volume, value] float64
+    time은 봉 시작 시각 (UTC epoch 초), head는 다음에 쓸 칸 번호
+"""
+import os
+import time
+import struct
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+    _FCNTL_AVAILABLE = True
+except ImportError:
+    _FCNTL_AVAILABLE = False
+
+try:
+    import msvcrt
+    _MSVCRT_AVAILABLE = True
+except ImportError:
+    _MSVCRT_AVAILABLE = False
+
+try:
+    import pandas as pd
+    _PANDAS_AVAILABLE = True
+except ImportError:
+    _PANDAS_AVAILABLE = False
+
+from .market_data_service import INTERVAL_SECONDS, fetch_upbit_ohlcv
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume', 'value')
+_MAGIC = b'NBCNDL01'
+_HEADER = struct.Struct('<8sIIQQ')
+_ROW_SIZE = len(FIELDS) * 8
+
+# pyupbit DataFrame 인덱스는 한국 시간(KST, UTC+9)
+_KST_OFFSET = 9 * 3600
+_KST = timezone(timedelta(hours=9))
+
+
+class CandleArrays(NamedTuple):
+    """봉 열별 NumPy 배열 (읽기 전용 뷰, 오래된 봉 -> 최신 봉 순)
+    
+    다음 갱신 때 마지막(진행 중) 봉 값이 보정되고, 링 버퍼가 한 바퀴 돌면 오래된 칸은 덮어쓰므로
+    오래 보관하려면 .copy()를 사용하세요.
+    """
+    time: np.ndarray  # 봉 시작 시각 (UTC epoch 초)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    value: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.time)
+    
+    def timestamps(self, fmt: str = '%Y-%m-%d %H:%M:%S') -> List[str]:
+        """봉 시작 시각 문자열 (한국 시간, pyupbit 인덱스와 같은 기준)"""
+        return [datetime.fromtimestamp(t, tz=_KST).strftime(fmt) for t in self.time.tolist()]
+    
+    def to_frame(self):
+        """pyupbit.get_ohlcv와 같은 형식의 DataFrame (복사본)"""
+        if not _PANDAS_AVAILABLE:
+            raise ImportError("pandas가 설치되어 있지 않습니다")
+        index = pd.to_datetime((self.time + _KST_OFFSET).astype(np.int64), unit='s')
+        columns = {name: getattr(self, name) for name in FIELDS[1:]}
+        return pd.DataFrame(columns, index=index, copy=True)
+
+
+def candles_since(interval: str, last_time: float, now: float) -> Optional[int]:
+    """last_time 봉 이후 새로 시작된 봉 수 (알 수 없는 interval이면 None)"""
+    if now <= last_time:
+        return 0
+    if interval == 'month':
+        last = datetime.fromtimestamp(last_time, tz=timezone.utc)
+        current = datetime.fromtimestamp(now, tz=timezone.utc)
+        return (current.year - last.year) * 12 + current.month - last.month
+    period = INTERVAL_SECONDS.get(interval)
+    if period is None:
+        return None
+    return int((now - last_time) // period)
+
+
+class _FileLock:
+    """프로세스 간 배타 잠금 (fcntl.flock / msvcrt.locking, 둘 다 없으면 잠그지 않음)
+    
+    같은 프로세스 안에서는 _Series.lock으로 먼저 직렬화하므로 스레드 간 재진입은 없습니다.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+    
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        try:
+            if _FCNTL_AVAILABLE:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            elif _MSVCRT_AVAILABLE:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK은 10초 동안 못 잡으면 오류 -> 계속 기다림
+        except BaseException:
+            self._file.close()
+            raise
+        return self
+    
+    def __exit__(self, *exc):
+        try:
+            if _FCNTL_AVAILABLE:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif _MSVCRT_AVAILABLE:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _to_rows(frame) -> np.ndarray:
+    """fetcher 결과를 (n, 7) float64 배열로 변환 (시간 오름차순)
+    
+    pyupbit DataFrame(KST 인덱스) 또는 [time(UTC 초), open, high, low, close, volume, value] 행 배열을 받습니다.
+    """
+    if frame is None or len(frame) == 0:
+        return np.empty((0, len(FIELDS)))
+    if hasattr(frame, 'columns') and hasattr(frame, 'index'):
+        rows = np.empty((len(frame), len(FIELDS)))
+        rows[:, 0] = frame.index.values.astype('datetime64[s]').astype(np.int64) - _KST_OFFSET
+        for column, name in enumerate(FIELDS[1:6], start=1):
+            rows[:, column] = frame[name].to_numpy(dtype=np.float64)
+        if 'value' in frame:
+            rows[:, 6] = frame['value'].to_numpy(dtype=np.float64)
+        else:
+            rows[:, 6] = rows[:, 4] * rows[:, 5]
+    else:
+        rows = np.array(frame, dtype=np.float64).reshape(-1, len(FIELDS))
+    return rows[np.argsort(rows[:, 0], kind='stable')]
+
+
+class _Series:
+    """(market, interval) 하나의 링 버퍼
+    
+    메모리에는 2 x capacity 칸을 두고 같은 봉을 i, i + capacity 두 칸에 써서
+    최근 n개 봉이 항상 연속된 구간(복사 없는 뷰)이 되도록 합니다.
+    """
+    
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = capacity
+        self.data = np.zeros((len(FIELDS), capacity * 2))
+        self.count = 0
+        self.head = 0  # 다음에 쓸 칸
+        self.refreshed_at = 0.0
+        # 전체 조회에서 요청보다 적게 받았으면 거래소에 있는 봉을 모두 가진 것 (상장 직후 등)
+        # 보관한 봉이 요청 수보다 적어도 전체 조회를 반복하지 않고 새 봉만 조회
+        self.exhausted = False
+        self.lock = threading.Lock()
+        self.file_lock = _FileLock(f"{path}.lock")
+        with self.lock, self.file_lock:
+            self._load()
+    
+    @property
+    def last_time(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return float(self.data[0, self.head + self.capacity - 1])
+    
+    def view(self, count: int) -> CandleArrays:
+        count = min(count, self.count)
+        end = self.head + self.capacity
+        window = self.data[:, end - count:end]
+        window.flags.writeable = False
+        return CandleArrays(*window)
+    
+    def _put(self, slot: int, row: np.ndarray):
+        self.data[:, slot] = row
+        self.data[:, slot + self.capacity] = row
+    
+    def reset(self, rows: np.ndarray):
+        """rows(시간 오름차순)로 전체 교체하고 파일을 새로 씀"""
+        rows = rows[-self.capacity:]
+        self.count = len(rows)
+        self.head = self.count % self.capacity
+        for slot, row in enumerate(rows):
+            self._put(slot, row)
+        self._write_all()
+    
+    def merge(self, rows: np.ndarray) -> int:
+        """마지막 봉과 같은 시각이면 보정, 이후 봉이면 추가 (이전 봉은 무시), 바뀐 봉 수 반환"""
+        changed = []
+        last_time = self.last_time
+        for row in rows:
+            if last_time is not None and row[0] < last_time:
+                continue
+            if last_time is not None and row[0] == last_time:
+                slot = (self.head - 1) % self.capacity
+                if np.array_equal(self.data[:, slot], row):
+                    continue
+            else:
+                slot = self.head
+                self.head = (self.head + 1) % self.capacity
+                self.count = min(self.count + 1, self.capacity)
+                last_time = row[0]
+            self._put(slot, row)
+            changed.append(slot)
+        if changed:
+            self._write_slots(changed)
+        return len(changed)
+    
+    def _header(self) -> bytes:
+        return _HEADER.pack(_MAGIC, self.capacity, len(FIELDS), self.count, self.head)
+    
+    def _write_all(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self._header())
+            f.write(np.ascontiguousarray(self.data[:, :self.capacity].T, dtype='<f8').tobytes())
+        os.replace(temp_path, self.path)
+    
+    def _write_slots(self, slots: List[int]):
+        """바뀐 칸만 쓰고 헤더 갱신 (칸을 먼저 써서 헤더가 쓰지 않은 칸을 가리키지 않도록)"""
+        if not os.path.exists(self.path):
+            self._write_all()
+            return
+        with open(self.path, 'r+b') as f:
+            for slot in slots:
+                f.seek(_HEADER.size + slot * _ROW_SIZE)
+                f.write(self.data[:, slot].astype('<f8').tobytes())
+            f.seek(0)
+            f.write(self._header())
+    
+    def sync(self):
+        """다른 프로세스가 파일을 바꿨으면 다시 읽음 (self.lock + file_lock 안에서 호출)
+        
+        다른 프로세스의 병합은 헤더(count/head)나 마지막 칸을 바꾸고 전체 교체는 파일 자체를 바꾸므로
+        헤더와 마지막 칸만 비교합니다.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                _, capacity, _, count, head = _HEADER.unpack(f.read(_HEADER.size))
+                if os.fstat(f.fileno()).st_size < _HEADER.size + capacity * _ROW_SIZE:
+                    return  # 잘린 파일 (다음에 쓸 때 새로 씀)
+                if (capacity, count, head) == (self.capacity, self.count, self.head):
+                    if not count:
+                        return
+                    slot = (head - 1) % capacity
+                    f.seek(_HEADER.size + slot * _ROW_SIZE)
+                    last = np.frombuffer(f.read(_ROW_SIZE), dtype='<f8')
+                    if np.array_equal(last, self.data[:, slot]):
+                        return
+        except (OSError, struct.error):
+            return
+        self._load()
+    
+    def _load(self):
+        """디스크의 링 버퍼 읽기 (capacity가 바뀌었으면 최근 봉부터 다시 배치)"""
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            magic, capacity, fields, count, head = _HEADER.unpack_from(raw)
+        except (OSError, struct.error):
+            return
+        if magic != _MAGIC or fields != len(FIELDS) or count > capacity or head >= max(capacity, 1):
+            print(f"⚠️ 봉 저장 파일 형식이 올바르지 않아 무시합니다: {self.path}")
+            return
+        if len(raw) < _HEADER.size + capacity * _ROW_SIZE:
+            print(f"⚠️ 봉 저장 파일이 잘려 있어 무시합니다: {self.path}")
+            return
+        body = np.frombuffer(raw, dtype='<f8', count=capacity * len(FIELDS), offset=_HEADER.size)
+        ring = body.reshape(capacity, len(FIELDS))
+        order = np.arange(head - count, head) % capacity
+        rows = ring[order]
+        if capacity == self.capacity:
+            self.count = count
+            self.head = head
+            self.data[:, :capacity] = ring.T
+            self.data[:, capacity:] = ring.T
+        else:
+            self.reset(rows)
+
+
+class CandleStore:
+    """(market, interval)별 봉 링 버퍼 저장소 (스레드 안전)"""
+    
+    def __init__(self, data_dir: str = 'data/candles', fetcher: Optional[Callable] = None,
+                 capacity: int = 1000, min_refresh_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            data_dir: 봉 파일 저장 폴더
+            fetcher: fetcher(market, interval, count) -> pyupbit DataFrame 또는 (n, 7) 행 배열
+            capacity: (market, interval)별로 보관할 최대 봉 수
+            min_refresh_seconds: 이 시간 안에 다시 요청하면 조회하지 않고 보관 중인 봉 반환
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.data_dir = data_dir
+        self._fetcher = fetcher or fetch_upbit_ohlcv
+        self.capacity = capacity
+        self.min_refresh_seconds = min_refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._stats = {'requests': 0, 'memory_hits': 0, 'fetches': 0, 'full_fetches': 0,
+                       'direct_fetches': 0, 'candles_fetched': 0, 'fetch_errors': 0}
+    
+    def _get_series(self, market: str, interval: str) -> _Series:
+        key = (market, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                name = f"{market}_{interval}.candles".replace(os.sep, '_')
+                series = _Series(os.path.join(self.data_dir, name), self.capacity)
+                self._series[key] = series
+            return series
+    
+    def get_candles(self, market: str = 'KRW-BTC', interval: str = 'minute1', count: int = 200,
+                    refresh: bool = True) -> CandleArrays:
+        """
+        최근 count개 봉 (NumPy 뷰)
+        
+        Args:
+            refresh: False이면 조회하지 않고 디스크/메모리에 있는 봉만 반환 (시작 직후 화면 표시용)
+        
+        Returns:
+            CandleArrays (보관 중인 봉이 count보다 적으면 있는 만큼)
+            count가 capacity보다 크면 링 버퍼를 거치지 않고 바로 조회한 봉 (조회 실패 시 보관 중인 봉)
+        """
+        count = max(1, int(count))
+        series = self._get_series(market, interval)
+        with series.lock:
+            with self._lock:
+                self._stats['requests'] += 1
+            if refresh and count > self.capacity:
+                candles = self._fetch_direct(series, market, interval, count)
+                if candles is not None:
+                    return candles
+                count = self.capacity
+            now = self._clock()
+            if refresh and (series.count >= count or series.exhausted) and \
+                    now - series.refreshed_at < self.min_refresh_seconds:
+                with self._lock:
+                    self._stats['memory_hits'] += 1
+                return series.view(count)
+            with series.file_lock:
+                series.sync()
+                if refresh:
+                    self._refresh(series, market, interval, count, now)
+            return series.view(count)
+    
+    def get_frame(self, market: str, interval: str, count: int):
+        """pyupbit.get_ohlcv 형식 DataFrame (MarketDataService fetcher로 사용)"""
+        candles = self.get_candles(market, interval, count)
+        if not len(candles):
+            return None
+        return candles.to_frame()
+    
+    def _fetch_direct(self, series: _Series, market: str, interval: str, count: int) -> Optional[CandleArrays]:
+        """capacity보다 많은 봉을 바로 조회 (최근 capacity개는 링 버퍼에도 반영, series.lock 안에서 호출)
+        
+        Returns:
+            CandleArrays (읽기 전용 복사본), 조회 실패 시 보관 중인 봉이 있으면 None
+        """
+        now = self._clock()
+        try:
+            rows = _to_rows(self._fetcher(market, interval, count))
+        except Exception as e:
+            with self._lock:
+                self._stats['fetch_errors'] += 1
+            if not series.count:
+                raise
+            print(f"⚠️ 봉 조회 실패, 저장된 봉 사용: {market} {interval} ({e})")
+            return None
+        
+        with self._lock:
+            self._stats['direct_fetches'] += 1
+            self._stats['candles_fetched'] += len(rows)
+        if len(rows):
+            with series.file_lock:
+                series.reset(rows)
+            series.refreshed_at = now
+            series.exhausted = len(rows) < self.capacity
+        columns = np.ascontiguousarray(rows.T)
+        columns.flags.writeable = False
+        return CandleArrays(*columns)
+    
+    def _refresh(self, series: _Series, market: str, interval: str, count: int, now: float):
+        """새 봉만 조회하여 병합 (series.lock + series.file_lock 안에서 호출)"""
+        missing = candles_since(interval, series.last_time, now) if series.count >= count or series.exhausted else None
+        full = missing is None or missing + 1 > self.capacity
+        fetch_count = max(count, series.count) if full else missing + 1  # 진행 중인 마지막 봉 포함
+        try:
+            rows = _to_rows(self._fetcher(market, interval, min(fetch_count, self.capacity)))
+        except Exception as e:
+            with self._lock:
+                self._stats['fetch_errors'] += 1
+            if not series.count:
+                raise
+            print(f"⚠️ 봉 조회 실패, 저장된 봉 사용: {market} {interval} ({e})")
+            series.refreshed_at = now
+            return
+        
+        with self._lock:
+            self._stats['fetches'] += 1
+            self._stats['full_fetches'] += int(full)
+            self._stats['candles_fetched'] += len(rows)
+        if len(rows):
+            if full:
+                series.reset(rows)
+            else:
+                series.merge(rows)
+        if full and len(rows):
+            series.exhausted = len(rows) < min(fetch_count, self.capacity)
+        series.refreshed_at = now
+    
+    def stats(self) -> Dict:
+        """조회 통계"""
+        with self._lock:
+            series = {f"{market}_{interval}": item.count for (market, interval), item in self._series.items()}
+            return {**self._stats, 'series': series}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candle_store() -> CandleStore:
+    """프로세스 공유 CandleStore (data/candles, 기본 fetcher 사용)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CandleStore()
+    return _store
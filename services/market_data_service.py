@@ -0,0 +1,287 @@
+"""시장 데이터 서비스 모듈 - 업비트 OHLCV 조회를 한 곳에서 캐시/공유
+
+(market, interval, count) 단위로 조회 결과를 보관하고
+- 같은 조회가 동시에 들어오면 진행 중인 요청 하나를 함께 기다림 (single-flight)
+- 더 큰 count로 조회한 결과가 있으면 뒤쪽(최신) count개만 잘라서 반환
+- 캐시 유효 시간은 봉 마감 시각까지 (다음 봉이 시작되면 새로 조회)
+합니다. fetcher(market, interval, count)를 바꿔 끼울 수 있어 테스트에서는 가짜 조회 함수를 사용합니다.
+"""
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import pyupbit
+    _PYUPBIT_AVAILABLE = True
+except ImportError:
+    _PYUPBIT_AVAILABLE = False
+
+# interval별 봉 길이 (초). 업비트 봉은 UTC 0시(한국 시간 9시) 기준으로 나뉨
+INTERVAL_SECONDS = {
+    'minute1': 60,
+    'minute3': 180,
+    'minute5': 300,
+    'minute10': 600,
+    'minute15': 900,
+    'minute30': 1800,
+    'minute60': 3600,
+    'minute240': 14400,
+    'day': 86400,
+    'week': 7 * 86400,
+}
+
+# 주봉은 월요일 시작 (1970-01-01은 목요일이므로 4일 이동)
+_WEEK_OFFSET = 4 * 86400
+
+# 카드/차트 타임프레임 -> pyupbit interval
+TIMEFRAME_INTERVALS = {
+    '1m': 'minute1',
+    '3m': 'minute3',
+    '5m': 'minute5',
+    '10m': 'minute10',
+    '15m': 'minute15',
+    '30m': 'minute30',
+    '60m': 'minute60',
+    '1h': 'minute60',
+    '240m': 'minute240',
+    '4h': 'minute240',
+    '1d': 'day',
+    '1day': 'day',
+    '1w': 'week',
+    '1week': 'week',
+    '1mo': 'month',
+}
+
+
+def timeframe_to_interval(timeframe: str, default: Optional[str] = 'minute1') -> Optional[str]:
+    """카드 타임프레임('1m' 등)을 pyupbit interval로 변환 (이미 interval이면 그대로)"""
+    tf = (timeframe or '').lower()
+    if tf in INTERVAL_SECONDS or tf == 'month':
+        return tf
+    return TIMEFRAME_INTERVALS.get(tf, default)
+
+
+def next_candle_close(interval: str, now: float) -> Optional[float]:
+    """now가 속한 봉의 마감 시각 (epoch 초, 알 수 없는 interval이면 None)"""
+    if interval == 'month':
+        current = datetime.fromtimestamp(now, tz=timezone.utc)
+        year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+        return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+    period = INTERVAL_SECONDS.get(interval)
+    if period is None:
+        return None
+    offset = _WEEK_OFFSET if interval == 'week' else 0
+    return ((now - offset) // period + 1) * period + offset
+
+
+def fetch_upbit_ohlcv(market: str, interval: str, count: int):
+    """기본 fetcher - pyupbit.get_ohlcv"""
+    if not _PYUPBIT_AVAILABLE:
+        raise ImportError("pyupbit가 설치되어 있지 않습니다")
+    return pyupbit.get_ohlcv(market, interval=interval, count=count)
+
+
+def _is_empty(frame) -> bool:
+    if frame is None:
+        return True
+    empty = getattr(frame, 'empty', None)
+    return empty if isinstance(empty, bool) else len(frame) == 0
+
+
+def _tail(frame, count: int):
+    """마지막 count개 (DataFrame이면 iloc 사용)"""
+    if len(frame) <= count:
+        return frame
+    if hasattr(frame, 'iloc'):
+        return frame.iloc[-count:]
+    return frame[-count:]
+
+
+class _Entry:
+    __slots__ = ('frame', 'fetched_at', 'expires_at')
+    
+    def __init__(self, frame, fetched_at: float, expires_at: float):
+        self.frame = frame
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """진행 중인 조회 하나 (기다리는 호출자들이 결과/예외를 함께 받음)"""
+    __slots__ = ('count', 'event', 'frame', 'error')
+    
+    def __init__(self, count: int):
+        self.count = count
+        self.event = threading.Event()
+        self.frame = None
+        self.error = None
+
+
+class MarketDataService:
+    """OHLCV 조회 공유 캐시 (스레드 안전)"""
+    
+    def __init__(self, fetcher: Optional[Callable] = None, max_entries: int = 64,
+                 max_age_seconds: float = 180.0, close_delay_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            fetcher: fetcher(market, interval, count) -> DataFrame (기본: pyupbit.get_ohlcv)
+            max_entries: 보관할 최대 조회 결과 수 (오래 안 쓴 것부터 제거)
+            max_age_seconds: 봉 마감과 무관하게 결과를 보관하는 최대 시간 (일봉/주봉도 진행 중인 봉은 갱신)
+            close_delay_seconds: 봉 마감 후 거래소에 새 봉이 반영될 때까지 기다리는 시간
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self._fetcher = fetcher or fetch_upbit_ohlcv
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.close_delay_seconds = close_delay_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, int], _Entry]" = OrderedDict()
+        self._flights: Dict[Tuple[str, str, int], _Flight] = {}
+        self._stats = {'hits': 0, 'sliced_hits': 0, 'misses': 0, 'coalesced': 0,
+                       'fetches': 0, 'errors': 0}
+    
+    def get_ohlcv(self, market: str = 'KRW-BTC', interval: str = 'minute1', count: int = 200,
+                  max_age: Optional[float] = None):
+        """
+        OHLCV 조회 (캐시 -> 진행 중인 조회 -> 새 조회 순)
+        
+        Args:
+            market: 마켓 코드
+            interval: pyupbit interval ('minute1', 'day' 등)
+            count: 봉 개수
+            max_age: 이보다 오래된 결과는 사용하지 않음 (초, 현재가 확인처럼 최신 값이 필요할 때)
+        
+        Returns:
+            fetcher 결과 (조회 실패/빈 결과는 캐시하지 않고 그대로 반환, 예외는 모든 대기자에게 전달)
+        """
+        count = int(count)
+        with self._lock:
+            now = self._clock()
+            frame = self._lookup(market, interval, count, now, max_age)
+            if frame is not None:
+                return frame
+            
+            flight = self._find_flight(market, interval, count)
+            if flight is not None:
+                self._stats['coalesced'] += 1
+                owner = False
+            else:
+                self._stats['misses'] += 1
+                flight = _Flight(count)
+                self._flights[(market, interval, count)] = flight
+                owner = True
+        
+        if owner:
+            self._run_flight(market, interval, flight)
+        else:
+            flight.event.wait()
+        
+        if flight.error is not None:
+            raise flight.error
+        if _is_empty(flight.frame):
+            return flight.frame
+        return _tail(flight.frame, count)
+    
+    def _lookup(self, market: str, interval: str, count: int, now: float, max_age: Optional[float]):
+        """count 이상인 유효한 결과 중 가장 작은 것 (잠금 안에서 호출)"""
+        best_key = None
+        expired = []
+        for key, entry in self._entries.items():
+            if key[0] != market or key[1] != interval or key[2] < count:
+                continue
+            if entry.expires_at <= now:
+                expired.append(key)
+                continue
+            if max_age is not None and now - entry.fetched_at > max_age:
+                continue
+            if best_key is None or key[2] < best_key[2]:
+                best_key = key
+        for key in expired:
+            del self._entries[key]
+        if best_key is None:
+            return None
+        
+        self._entries.move_to_end(best_key)
+        if best_key[2] == count:
+            self._stats['hits'] += 1
+            return self._entries[best_key].frame
+        self._stats['sliced_hits'] += 1
+        return _tail(self._entries[best_key].frame, count)
+    
+    def _find_flight(self, market: str, interval: str, count: int) -> Optional[_Flight]:
+        """count 이상을 조회 중인 요청 (잠금 안에서 호출)"""
+        for (flight_market, flight_interval, _), flight in self._flights.items():
+            if flight_market == market and flight_interval == interval and flight.count >= count:
+                return flight
+        return None
+    
+    def _run_flight(self, market: str, interval: str, flight: _Flight):
+        """잠금 밖에서 조회하고 결과를 저장한 뒤 대기자를 깨움"""
+        try:
+            flight.frame = self._fetcher(market, interval, flight.count)
+        except Exception as e:
+            flight.error = e
+        
+        with self._lock:
+            self._stats['fetches'] += 1
+            if flight.error is not None:
+                self._stats['errors'] += 1
+            elif not _is_empty(flight.frame):
+                self._store(market, interval, flight.count, flight.frame)
+            del self._flights[(market, interval, flight.count)]
+        flight.event.set()
+    
+    def _store(self, market: str, interval: str, count: int, frame):
+        """결과 저장 (잠금 안에서 호출). 같은 시리즈의 더 작은 결과는 새 결과로 대신함"""
+        now = self._clock()
+        expires_at = now + self.max_age_seconds
+        close = next_candle_close(interval, now)
+        if close is not None:
+            expires_at = min(expires_at, close + self.close_delay_seconds)
+        
+        for key in [key for key in self._entries
+                    if key[0] == market and key[1] == interval and key[2] <= count]:
+            del self._entries[key]
+        self._entries[(market, interval, count)] = _Entry(frame, now, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> int:
+        """캐시 비우기 (진행 중인 조회는 그대로 완료), 삭제한 항목 수 반환"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+    
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            now = self._clock()
+            items = [{
+                'market': market,
+                'interval': interval,
+                'count': count,
+                'age_seconds': round(now - entry.fetched_at, 2),
+                'expires_in_seconds': round(entry.expires_at - now, 2),
+            } for (market, interval, count), entry in self._entries.items()]
+            return {**self._stats, 'entries': len(self._entries),
+                    'in_flight': len(self._flights), 'items': items}
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_market_data_service() -> MarketDataService:
+    """프로세스 공유 MarketDataService (봉 저장소를 거쳐 새 봉만 조회)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from .candle_store import get_candle_store
+                _service = MarketDataService(fetcher=get_candle_store().get_frame)
+    return _service
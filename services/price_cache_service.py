@@ -1,7 +1,12 @@
-"""가격 캐시 서비스 모듈 - 모든 카드가 공유하는 중앙 가격 캐시"""
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
-from typing import List, Callable
-import pyupbit
+"""가격 캐시 서비스 모듈 - 모든 카드가 공유하는 중앙 가격 캐시
+
+거래소 조회는 가격 피드(PriceFeed)의 백그라운드 스레드에서 하고,
+틱은 price_updated 시그널로 GUI 스레드에 넘겨 콜백을 호출합니다 (이벤트 루프를 막지 않음).
+"""
+from PyQt6.QtCore import QObject, pyqtSignal
+from typing import Dict, List, Callable
+
+from .price_feed import PriceFeed
 
 
 class PriceCacheService(QObject):
@@ -23,28 +28,29 @@ class PriceCacheService(QObject):
         
         self._cached_price = 0.0
         self._price_callbacks: List[Callable[[float], None]] = []
-        self._update_timer = QTimer()
-        self._update_timer.timeout.connect(self._update_price)
-        self._is_updating = False
         
         # 가격 업데이트 주기 (15초 - 성능 최적화, API 호출 감소)
         self._update_interval = 15000
+        self._feed = PriceFeed(market="KRW-BTC", interval_seconds=self._update_interval / 1000)
         
-        # 시그널 연결
+        # 시그널 연결 (피드 스레드에서 emit -> GUI 스레드에서 콜백 실행)
         self.price_updated.connect(self._notify_callbacks)
     
+    @property
+    def feed(self) -> PriceFeed:
+        """가격 피드 (같은 틱을 받을 다른 리스너 등록용)"""
+        return self._feed
+    
     def start(self, interval_ms: int = 15000):
-        """가격 업데이트 시작"""
+        """가격 업데이트 시작 (백그라운드 스레드, 즉시 한 번 조회)"""
         self._update_interval = interval_ms
-        if not self._update_timer.isActive():
-            self._update_timer.start(interval_ms)
-            # 즉시 한 번 업데이트
-            self._update_price()
+        self._feed.interval_seconds = interval_ms / 1000
+        self._feed.add_listener(self._on_tick)
     
     def stop(self):
         """가격 업데이트 중지"""
-        if self._update_timer.isActive():
-            self._update_timer.stop()
+        self._feed.remove_listener(self._on_tick)
+        self._feed.stop()
     
     def get_price(self) -> float:
         """현재 캐시된 가격 반환"""
@@ -66,24 +72,13 @@ class PriceCacheService(QObject):
         if callback in self._price_callbacks:
             self._price_callbacks.remove(callback)
     
-    def _update_price(self):
-        """가격 업데이트 (API 호출)"""
-        if self._is_updating:
-            return  # 이미 업데이트 중이면 스킵
-        
-        try:
-            self._is_updating = True
-            price = pyupbit.get_current_price("KRW-BTC")
-            if price is not None:
-                new_price = float(price)
-                if new_price > 0 and new_price != self._cached_price:
-                    self._cached_price = new_price
-                    # 시그널로 모든 콜백에 알림
-                    self.price_updated.emit(new_price)
-        except Exception as e:
-            print(f"가격 업데이트 오류: {e}")
-        finally:
-            self._is_updating = False
+    def _on_tick(self, tick: Dict):
+        """가격 피드 틱 (피드 스레드에서 호출) - 가격이 바뀌었을 때만 GUI 스레드로 전달"""
+        new_price = tick['price']
+        if new_price > 0 and new_price != self._cached_price:
+            self._cached_price = new_price
+            # 시그널로 모든 콜백에 알림 (큐 연결로 GUI 스레드에서 실행)
+            self.price_updated.emit(new_price)
     
     def _notify_callbacks(self, price: float):
         """모든 등록된 콜백에 가격 전달 (성능 최적화)"""
@@ -0,0 +1,207 @@
+"""가격 피드 모듈 - 가격 생산자 하나가 조회한 현재가를 모든 구독자에게 전달 (팬아웃)
+
+화면/카드마다 가격을 따로 조회(폴링)하는 대신
+- 백그라운드 스레드 하나가 interval_seconds마다 한 번만 거래소에 요청하고
+- 구독(subscribe, 웹 서버의 SSE 연결)과 리스너(add_listener, Qt 가격 캐시 서비스)에 같은 틱을 전달합니다.
+
+구독자는 최신 틱만 받습니다 (느린 구독자 때문에 틱이 쌓이지 않음).
+구독자/리스너가 모두 없어진 뒤 idle_stop_seconds가 지나면 생산 스레드가 멈추고, 다음 구독 때 다시 시작합니다.
+"""
+import time
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import pyupbit
+    _PYUPBIT_AVAILABLE = True
+except ImportError:
+    _PYUPBIT_AVAILABLE = False
+
+
+def fetch_current_price(market: str) -> Optional[float]:
+    """기본 fetcher - pyupbit.get_current_price"""
+    if not _PYUPBIT_AVAILABLE:
+        raise ImportError("pyupbit가 설치되어 있지 않습니다")
+    price = pyupbit.get_current_price(market)
+    return float(price) if price is not None else None
+
+
+class PriceSubscription:
+    """구독 하나 (최신 틱 한 칸)"""
+    
+    def __init__(self, feed: "PriceFeed"):
+        self._feed = feed
+        self._event = threading.Event()
+        self._tick = None
+        self.closed = False
+    
+    def _push(self, tick: Dict):
+        self._tick = tick
+        self._event.set()
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """다음 틱 (timeout 안에 없으면 None, 그 사이 여러 틱이 왔으면 가장 최신 것)"""
+        if not self._event.wait(timeout):
+            return None
+        self._event.clear()
+        return self._tick
+    
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._feed._unsubscribe(self)
+
+
+class PriceFeed:
+    """가격 생산자 + 팬아웃 (스레드 안전)"""
+    
+    def __init__(self, fetcher: Optional[Callable[[str], Optional[float]]] = None, market: str = 'KRW-BTC',
+                 interval_seconds: float = 2.0, idle_stop_seconds: float = 30.0):
+        """
+        Args:
+            fetcher: fetcher(market) -> 현재가 (None이면 이번 틱 건너뜀)
+            market: 마켓 코드
+            interval_seconds: 거래소 조회 주기 (초)
+            idle_stop_seconds: 구독자/리스너가 없을 때 생산 스레드를 멈추기까지 기다리는 시간
+        """
+        self._fetcher = fetcher or fetch_current_price
+        self.market = market
+        self.interval_seconds = interval_seconds
+        self.idle_stop_seconds = idle_stop_seconds
+        self._lock = threading.Lock()
+        self._subscriptions: List[PriceSubscription] = []
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._latest: Optional[Dict] = None
+        self._sequence = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = {'fetches': 0, 'ticks': 0, 'errors': 0}
+    
+    # ---- 구독 ----
+    
+    def subscribe(self) -> PriceSubscription:
+        """구독 시작 (생산 스레드가 멈춰 있으면 시작, 최신 틱이 있으면 바로 받을 수 있음)"""
+        subscription = PriceSubscription(self)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if self._latest is not None:
+                subscription._push(self._latest)
+        self.start()
+        return subscription
+    
+    def _unsubscribe(self, subscription: PriceSubscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+    
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """틱마다 callback(tick) 호출 (생산 스레드에서 호출되므로 GUI는 시그널로 넘길 것)"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+        self.start()
+    
+    def remove_listener(self, callback: Callable[[Dict], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def latest(self) -> Optional[Dict]:
+        """마지막 틱 ({'market', 'price', 'timestamp', 'sequence'})"""
+        with self._lock:
+            return self._latest
+    
+    # ---- 생산 ----
+    
+    def start(self):
+        """생산 스레드 시작 (이미 실행 중이면 무시)
+        
+        중지 요청을 받았지만 아직 조회 중인 스레드는 실행 중으로 보지 않고 새 스레드를 시작합니다.
+        """
+        with self._lock:
+            if self._running_locked():
+                return
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop_event,),
+                                            daemon=True, name=f"PriceFeed-{self.market}")
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """생산 스레드 중지"""
+        with self._lock:
+            thread = self._thread
+            self._stop_event.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+    
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._running_locked()
+    
+    def _running_locked(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set()
+    
+    def publish(self, price: float) -> Dict:
+        """틱 하나를 모든 구독자/리스너에 전달"""
+        with self._lock:
+            self._sequence += 1
+            tick = {
+                'market': self.market,
+                'price': float(price),
+                'timestamp': datetime.now().isoformat(),
+                'sequence': self._sequence
+            }
+            self._latest = tick
+            self._stats['ticks'] += 1
+            for subscription in self._subscriptions:
+                subscription._push(tick)
+            listeners = self._listeners[:]
+        for callback in listeners:
+            try:
+                callback(tick)
+            except Exception as e:
+                print(f"⚠️ 가격 리스너 실행 오류: {e}")
+        return tick
+    
+    def _run(self, stop_event: threading.Event):
+        idle_since = None
+        failing = False
+        while not stop_event.is_set():
+            with self._lock:
+                if self._subscriptions or self._listeners:
+                    idle_since = None
+                else:
+                    idle_since = idle_since or time.monotonic()
+                    if time.monotonic() - idle_since >= self.idle_stop_seconds:
+                        # 잠금 안에서 비워야 이 사이에 들어온 subscribe()가 새 스레드를 시작함
+                        if self._thread is threading.current_thread():
+                            self._thread = None
+                        return
+            
+            started = time.monotonic()
+            try:
+                price = self._fetcher(self.market)
+                with self._lock:
+                    self._stats['fetches'] += 1
+                # 조회 중에 중지 요청을 받았으면 (새 스레드가 이어서 생산할 수 있으므로) 발행하지 않음
+                if price is not None and price > 0 and not stop_event.is_set():
+                    self.publish(price)
+                failing = False
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                if not failing:  # 연속 실패는 한 번만 출력
+                    print(f"⚠️ 가격 피드 조회 실패: {e}")
+                failing = True
+            stop_event.wait(max(0.0, self.interval_seconds - (time.monotonic() - started)))
+        
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, 'subscribers': len(self._subscriptions),
+                    'listeners': len(self._listeners), 'running': self._thread is not None,
+                    'interval_seconds': self.interval_seconds}
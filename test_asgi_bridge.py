@@ -0,0 +1,179 @@
+"""ASGI 브리지(ASGIBridge) 테스트 스크립트
+
+가짜 WSGI 앱으로 느린 레인이 가득 차도 빠른 레인 응답이 늦어지지 않는지,
+대기 한도를 넘으면 503을 돌려주는지, 요청/스트리밍 응답이 그대로 전달되는지 확인합니다.
+"""
+import sys
+import io
+import os
+import json
+import time
+import asyncio
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+api_dir = os.path.join(project_root, 'html_version', 'api')
+if api_dir not in sys.path:
+    sys.path.insert(0, api_dir)
+
+from asgi_bridge import ASGIBridge, send_json
+
+SLOW_SECONDS = 0.5
+
+
+def wsgi_app(environ, start_response):
+    """가짜 WSGI 앱: /slow (블로킹), /stream (청크 여러 개), /echo, /empty"""
+    path = environ['PATH_INFO']
+    if path == '/slow':
+        time.sleep(SLOW_SECONDS)
+    if path == '/stream':
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return (f"chunk{i};".encode() for i in range(3))
+    if path == '/empty':
+        start_response('204 No Content', [])
+        return []
+    if path == '/error':
+        raise RuntimeError("boom")
+    body = environ['wsgi.input'].read(int(environ['CONTENT_LENGTH'] or 0))
+    payload = {
+        'path': path,
+        'method': environ['REQUEST_METHOD'],
+        'query': environ['QUERY_STRING'],
+        'content_type': environ.get('CONTENT_TYPE'),
+        'token': environ.get('HTTP_X_TOKEN'),
+        'body': body.decode('utf-8'),
+    }
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [json.dumps(payload).encode('utf-8')]
+
+
+def make_bridge(**kwargs):
+    return ASGIBridge(wsgi_app, {'fast': (4, 16), 'cpu': (1, 1)},
+                      route_lane=lambda method, path: 'cpu' if path == '/slow' else 'fast', **kwargs)
+
+
+async def request(bridge, path, method='GET', body=b'', headers=None, query=b''):
+    """ASGI 요청 한 번 -> (status, headers, 본문 청크 목록)"""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+             'headers': headers or [], 'http_version': '1.1', 'scheme': 'http',
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 5555)}
+    messages = [{'type': 'http.request', 'body': body[:3], 'more_body': len(body) > 3},
+                {'type': 'http.request', 'body': body[3:], 'more_body': False}]
+    sent = []
+    
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+    
+    async def send(message):
+        sent.append(message)
+    
+    await bridge(scope, receive, send)
+    start = sent[0]
+    chunks = [message['body'] for message in sent[1:]]
+    assert sent[-1].get('more_body', False) is False
+    return start['status'], dict(start['headers']), chunks
+
+
+async def timed(bridge, path):
+    started = time.monotonic()
+    status, _, _ = await request(bridge, path)
+    return status, time.monotonic() - started
+
+
+def test_lane_isolation():
+    """느린 레인이 가득 차도 빠른 레인은 바로 응답, 대기 한도를 넘으면 503"""
+    async def scenario():
+        bridge = make_bridge()
+        slow = [asyncio.ensure_future(timed(bridge, '/slow')) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        fast = await asyncio.gather(*(timed(bridge, '/fast') for _ in range(20)))
+        slow = await asyncio.gather(*slow)
+        return bridge, fast, slow
+    
+    bridge, fast, slow = asyncio.run(scenario())
+    statuses = sorted(status for status, _ in slow)
+    assert statuses == [200, 200, 503], statuses  # 스레드 1 + 대기 1, 세 번째는 거절
+    assert max(elapsed for _, elapsed in fast) < 0.2, fast
+    assert all(status == 200 for status, _ in fast)
+    stats = bridge.stats()
+    assert stats['cpu']['rejected'] == 1 and stats['cpu']['requests'] == 2 and stats['cpu']['in_flight'] == 0
+    assert stats['fast']['requests'] == 20 and stats['fast']['in_flight'] == 0
+    worst = max(elapsed for _, elapsed in fast) * 1000
+    print(f"✅ 레인 분리: 느린 요청 처리 중 빠른 요청 최대 {worst:.1f}ms, 대기 한도 초과 503")
+
+
+def test_wsgi_passthrough():
+    """요청 본문/헤더/쿼리 전달, 스트리밍/빈 응답, 앱 예외"""
+    async def scenario():
+        bridge = make_bridge()
+        echo = await request(bridge, '/echo', method='POST', body='{"chart_data": "가격"}'.encode('utf-8'),
+                             headers=[(b'content-type', b'application/json'), (b'x-token', b'abc'),
+                                      (b'content-length', b'999')], query=b'count=200')
+        stream = await request(bridge, '/stream')
+        empty = await request(bridge, '/empty')
+        error = await request(bridge, '/error')
+        return bridge, echo, stream, empty, error
+    
+    bridge, echo, stream, empty, error = asyncio.run(scenario())
+    status, headers, chunks = echo
+    payload = json.loads(b''.join(chunks))
+    assert status == 200 and headers[b'content-type'] == b'application/json'
+    assert payload == {'path': '/echo', 'method': 'POST', 'query': 'count=200', 'content_type': 'application/json',
+                       'token': 'abc', 'body': '{"chart_data": "가격"}'}, payload
+    assert stream[0] == 200 and stream[2] == [b'chunk0;', b'chunk1;', b'chunk2;']
+    assert empty[0] == 204 and b''.join(empty[2]) == b''
+    assert error[0] == 500 and json.loads(b''.join(error[2]))['error'] == 'boom'
+    assert bridge.stats()['fast']['errors'] == 1
+    print("✅ WSGI 요청/응답 전달 (스트리밍, 빈 응답, 예외)")
+
+
+def test_async_routes_and_lifespan():
+    """async 라우트가 WSGI 라우트보다 우선, run_in_lane, lifespan 초기화/정리"""
+    calls = []
+    
+    async def scenario():
+        bridge = make_bridge(on_startup=lambda: calls.append('startup'),
+                             on_shutdown=lambda: calls.append('shutdown'))
+        
+        @bridge.route('/echo')
+        async def echo(scope, receive, send):
+            value = await bridge.run_in_lane('cpu', lambda: sum(range(10)))
+            await send_json(send, {'value': value})
+        
+        lifespan = asyncio.Queue()
+        lifespan.put_nowait({'type': 'lifespan.startup'})
+        sent = []
+        
+        async def send(message):
+            sent.append(message['type'])
+        
+        lifespan_task = asyncio.ensure_future(bridge({'type': 'lifespan'}, lifespan.get, send))
+        while 'lifespan.startup.complete' not in sent:
+            await asyncio.sleep(0.01)
+        result = await request(bridge, '/echo')
+        post = await request(bridge, '/echo', method='POST')
+        lifespan.put_nowait({'type': 'lifespan.shutdown'})
+        await lifespan_task
+        return sent, result, post
+    
+    sent, result, post = asyncio.run(scenario())
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete'] and calls == ['startup', 'shutdown']
+    assert result[0] == 200 and json.loads(b''.join(result[2])) == {'value': 45}
+    assert json.loads(b''.join(post[2]))['method'] == 'POST'  # POST는 등록하지 않았으므로 WSGI 앱
+    print("✅ async 라우트 / lifespan")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("ASGI 브리지 테스트")
+    print("=" * 50)
+    test_lane_isolation()
+    test_wsgi_passthrough()
+    test_async_routes_and_lifespan()
+    print("✅ 모든 테스트 통과")
@@ -0,0 +1,234 @@
+"""봉 저장소(CandleStore) 테스트 스크립트
+
+가짜 거래소로 새 봉만 조회하는지, 진행 중인 봉을 보정하는지,
+디스크 링 버퍼에서 다시 읽는지, NumPy 뷰를 돌려주는지 확인합니다.
+"""
+import sys
+import io
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.candle_store import CandleStore, candles_since, _PANDAS_AVAILABLE
+from services.market_data_service import MarketDataService
+
+# 2026-01-05 00:00:00 UTC
+START = 1767571200.0
+
+
+class FakeExchange:
+    """1분봉 거래소 흉내 (진행 중인 봉의 종가는 현재 시각에 따라 바뀜)"""
+    
+    def __init__(self, now: float):
+        self.now = now
+        self.calls = []
+        self.fail = False
+        self.listed_at = None  # 상장 시각 (이전 봉은 없음)
+    
+    def candle(self, start: float):
+        elapsed = min(self.now - start, 59.0)
+        base = 1000.0 + (start - START) / 60
+        close = base + elapsed / 100
+        return [start, base, close + 1, base - 1, close, 2.0, close * 2.0]
+    
+    def __call__(self, market, interval, count):
+        self.calls.append(count)
+        if self.fail:
+            raise ConnectionError("offline")
+        last = (self.now // 60) * 60
+        if self.listed_at is not None:
+            count = min(count, int((last - self.listed_at) // 60) + 1)
+        return np.array([self.candle(last - 60 * i) for i in reversed(range(count))])
+    
+    def clock(self) -> float:
+        return self.now
+
+
+def test_incremental():
+    """처음에는 count개, 이후에는 새 봉 + 진행 중인 봉만 조회"""
+    data_dir = tempfile.mkdtemp(prefix="candle_store_")
+    try:
+        exchange = FakeExchange(START + 200 * 60 + 10)
+        store = CandleStore(data_dir, fetcher=exchange, capacity=300, clock=exchange.clock)
+        
+        candles = store.get_candles('KRW-BTC', 'minute1', 200)
+        assert exchange.calls == [200] and len(candles) == 200
+        assert candles.time[-1] == START + 200 * 60 and np.all(np.diff(candles.time) == 60)
+        assert candles.close.flags.c_contiguous and not candles.close.flags.writeable
+        
+        # 같은 봉 안에서 바로 다시 요청하면 조회하지 않음
+        assert len(store.get_candles('KRW-BTC', 'minute1', 100)) == 100 and exchange.calls == [200]
+        
+        # 30초 뒤: 진행 중인 봉 1개만 조회하여 보정
+        exchange.now += 30
+        candles = store.get_candles('KRW-BTC', 'minute1', 200)
+        assert exchange.calls == [200, 1]
+        assert candles.close[-1] == exchange.candle(START + 200 * 60)[4]
+        
+        # 3분 뒤: 새 봉 3개 + 마감된 이전 봉 보정 = 4개 조회
+        exchange.now += 180
+        candles = store.get_candles('KRW-BTC', 'minute1', 200)
+        assert exchange.calls[-1] == 4 and candles.time[-1] == START + 203 * 60
+        assert candles.close[-4] == exchange.candle(START + 200 * 60)[4]  # 마감 종가로 보정
+        
+        # 보관한 봉보다 많이 요청하면 전체 조회
+        assert len(store.get_candles('KRW-BTC', 'minute1', 250)) == 250 and exchange.calls[-1] == 250
+        
+        # 링 버퍼를 한 바퀴 돌아도 최근 봉이 연속된 뷰
+        exchange.now += 100 * 60
+        store.get_candles('KRW-BTC', 'minute1', 250)
+        candles = store.get_candles('KRW-BTC', 'minute1', 300)
+        assert exchange.calls[-1] == 101 and len(candles) == 300
+        assert np.all(np.diff(candles.time) == 60) and candles.time[-1] == START + 303 * 60
+        print(f"✅ 새 봉만 조회: 조회 count {exchange.calls} ({sum(exchange.calls)}개 봉)")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def test_exhausted_series():
+    """거래소에 요청보다 적은 봉만 있으면 (상장 직후) 매번 전체 조회하지 않음"""
+    data_dir = tempfile.mkdtemp(prefix="candle_store_new_")
+    try:
+        exchange = FakeExchange(START + 50 * 60 + 10)
+        exchange.listed_at = START
+        store = CandleStore(data_dir, fetcher=exchange, capacity=300, clock=exchange.clock)
+        
+        assert len(store.get_candles('KRW-BTC', 'minute1', 200)) == 51 and exchange.calls == [200]
+        # 같은 봉 안에서 다시 요청하면 조회하지 않음
+        assert len(store.get_candles('KRW-BTC', 'minute1', 200)) == 51 and exchange.calls == [200]
+        
+        # 2분 뒤: 새 봉 2개 + 마감된 이전 봉 보정만 조회
+        exchange.now += 120
+        candles = store.get_candles('KRW-BTC', 'minute1', 200)
+        assert exchange.calls == [200, 3] and len(candles) == 53
+        assert candles.time[0] == START and candles.time[-1] == START + 52 * 60
+        print(f"✅ 봉이 부족한 시리즈: 조회 count {exchange.calls}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def test_persistence():
+    """재시작 후 디스크에서 바로 읽고, 조회 실패 시 저장된 봉 사용"""
+    data_dir = tempfile.mkdtemp(prefix="candle_store_disk_")
+    try:
+        exchange = FakeExchange(START + 500 * 60 + 5)
+        store = CandleStore(data_dir, fetcher=exchange, capacity=100, clock=exchange.clock)
+        store.get_candles('KRW-BTC', 'minute1', 100)
+        exchange.now += 125
+        expected = store.get_candles('KRW-BTC', 'minute1', 100)
+        assert os.path.getsize(os.path.join(data_dir, 'KRW-BTC_minute1.candles')) == 32 + 100 * 56
+        
+        # 새 인스턴스(재시작): 조회 없이 디스크의 봉 반환
+        exchange.fail = True
+        restarted = CandleStore(data_dir, fetcher=exchange, capacity=100, clock=exchange.clock)
+        calls = len(exchange.calls)
+        candles = restarted.get_candles('KRW-BTC', 'minute1', 100, refresh=False)
+        assert len(exchange.calls) == calls
+        for name in candles._fields:
+            assert np.array_equal(getattr(candles, name), getattr(expected, name)), name
+        
+        # 조회 실패: 저장된 봉 그대로 반환
+        exchange.now += 60
+        assert len(restarted.get_candles('KRW-BTC', 'minute1', 100)) == 100
+        assert restarted.stats()['fetch_errors'] == 1
+        
+        # 저장된 봉이 없으면 오류 전달
+        try:
+            restarted.get_candles('KRW-ETH', 'minute1', 10)
+            raise AssertionError("조회 실패가 전달되지 않음")
+        except ConnectionError:
+            pass
+        
+        # capacity가 바뀌어도 최근 봉부터 다시 배치
+        smaller = CandleStore(data_dir, fetcher=exchange, capacity=40, clock=exchange.clock)
+        candles = smaller.get_candles('KRW-BTC', 'minute1', 40, refresh=False)
+        assert np.array_equal(candles.close, expected.close[-40:])
+        assert candles.timestamps()[-1] == '2026-01-05 17:22:00'  # 한국 시간
+        
+        # 잘린 파일은 무시
+        path = os.path.join(data_dir, 'KRW-BTC_minute1.candles')
+        with open(path, 'r+b') as f:
+            f.truncate(100)
+        assert len(CandleStore(data_dir, fetcher=exchange, capacity=40).get_candles(
+            'KRW-BTC', 'minute1', 40, refresh=False)) == 0
+        print("✅ 디스크 링 버퍼 다시 읽기 / 조회 실패 시 저장된 봉 사용")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def test_shared_file():
+    """두 인스턴스(GUI / API 서버 프로세스)가 같은 파일을 써도 링 버퍼가 어긋나지 않음"""
+    data_dir = tempfile.mkdtemp(prefix="candle_store_shared_")
+    try:
+        exchange = FakeExchange(START + 300 * 60 + 5)
+        gui = CandleStore(data_dir, fetcher=exchange, capacity=100, clock=exchange.clock)
+        api = CandleStore(data_dir, fetcher=exchange, capacity=100, clock=exchange.clock)
+        gui.get_candles('KRW-BTC', 'minute1', 50)
+        api.get_candles('KRW-BTC', 'minute1', 100)  # 전체 조회로 파일 교체
+        
+        # gui는 병합 전에 api가 바꾼 파일을 다시 읽음 (이전 head 기준으로 칸을 쓰지 않음)
+        exchange.now += 180
+        candles = gui.get_candles('KRW-BTC', 'minute1', 100)
+        assert exchange.calls[-1] == 4 and candles.time[-1] == START + 303 * 60
+        stored = CandleStore(data_dir, fetcher=exchange, capacity=100).get_candles(
+            'KRW-BTC', 'minute1', 100, refresh=False)
+        assert len(stored) == 100 and np.all(np.diff(stored.time) == 60), np.diff(stored.time)
+        assert np.array_equal(stored.close, candles.close)
+        
+        # capacity보다 많이 요청하면 바로 조회 (최근 capacity개는 링 버퍼에 보관)
+        exchange.now += 60
+        candles = api.get_candles('KRW-BTC', 'minute1', 250)
+        assert len(candles) == 250 and exchange.calls[-1] == 250 and np.all(np.diff(candles.time) == 60)
+        assert not candles.close.flags.writeable and api.stats()['direct_fetches'] == 1
+        assert np.array_equal(gui.get_candles('KRW-BTC', 'minute1', 100, refresh=False).time, candles.time[-100:])
+        print("✅ 같은 파일을 쓰는 인스턴스 간 동기화 / capacity 초과 요청은 바로 조회")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def test_market_data_fetcher():
+    """MarketDataService fetcher로 사용 (pandas가 있으면 DataFrame 왕복 확인)"""
+    assert candles_since('minute5', START, START + 899) == 2
+    assert candles_since('day', START, START + 86400) == 1
+    assert candles_since('month', START, START + 40 * 86400) == 1
+    if not _PANDAS_AVAILABLE:
+        print("ℹ️ pandas가 없어 DataFrame 변환 테스트를 건너뜁니다")
+        return
+    data_dir = tempfile.mkdtemp(prefix="candle_store_frame_")
+    try:
+        exchange = FakeExchange(START + 50 * 60)
+        store = CandleStore(data_dir, fetcher=exchange, clock=exchange.clock)
+        service = MarketDataService(fetcher=store.get_frame, clock=exchange.clock)
+        frame = service.get_ohlcv('KRW-BTC', 'minute1', 20)
+        assert list(frame.columns) == ['open', 'high', 'low', 'close', 'volume', 'value']
+        assert str(frame.index[-1]) == '2026-01-05 09:50:00'
+        # DataFrame을 받는 fetcher 결과도 그대로 병합
+        frame_store = CandleStore(os.path.join(data_dir, 'frame'), fetcher=lambda m, i, c: frame.iloc[-c:],
+                                  clock=exchange.clock)
+        assert np.array_equal(frame_store.get_candles('KRW-BTC', 'minute1', 20).close, frame['close'].to_numpy())
+        print("✅ DataFrame 변환")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("봉 저장소 테스트")
+    print("=" * 50)
+    test_incremental()
+    test_exhausted_series()
+    test_persistence()
+    test_shared_file()
+    test_market_data_fetcher()
+    print("✅ 모든 테스트 통과")
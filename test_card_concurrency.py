@@ -0,0 +1,227 @@
+"""생산 카드 관리자 동시성 스트레스 테스트 스크립트
+
+여러 스레드가 add_card / update_card / add_history / remove_card / get_active_cards를
+동시에 호출한 뒤 캐시와 인덱스가 일관된지 확인합니다.
+"""
+import sys
+import io
+import os
+import time
+import random
+import shutil
+import tempfile
+import threading
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+for path in (project_root, os.path.join(project_root, 'NBVerseV01-main')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from managers.card_store import CardStore, ReadWriteLock
+from test_card_view_index import ids, scan_active, scan_all
+
+THREADS = 8
+DURATION = 3.0
+MAX_ADDS = 60
+
+
+def test_read_write_lock():
+    """읽기는 동시에, 쓰기는 단독으로, 읽기 -> 쓰기 승격은 오류"""
+    lock = ReadWriteLock()
+    state = {'readers': 0, 'max_readers': 0, 'writers': 0, 'violations': 0}
+    state_lock = threading.Lock()
+    
+    def reader():
+        for _ in range(200):
+            with lock.read_locked():
+                with state_lock:
+                    state['readers'] += 1
+                    state['max_readers'] = max(state['max_readers'], state['readers'])
+                    if state['writers']:
+                        state['violations'] += 1
+                with lock.read_locked():  # 재진입
+                    time.sleep(0.0001)
+                with state_lock:
+                    state['readers'] -= 1
+    
+    def writer():
+        for _ in range(100):
+            with lock.write_locked():
+                with lock.write_locked(), lock.read_locked():  # 재진입
+                    with state_lock:
+                        state['writers'] += 1
+                        if state['writers'] > 1 or state['readers']:
+                            state['violations'] += 1
+                    time.sleep(0.0001)
+                    with state_lock:
+                        state['writers'] -= 1
+    
+    threads = [threading.Thread(target=reader) for _ in range(4)] + [threading.Thread(target=writer) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+        assert not thread.is_alive(), "잠금 교착"
+    assert state['violations'] == 0, state
+    assert state['max_readers'] > 1, state
+    
+    with lock.read_locked():
+        try:
+            lock.acquire_write()
+            raise AssertionError("읽기 -> 쓰기 승격 허용")
+        except RuntimeError:
+            pass
+    print(f"✅ 읽기/쓰기 잠금 (동시 읽기 최대 {state['max_readers']}개)")
+
+
+def test_card_store():
+    """card_id 기준 추가/교체/제거와 스냅샷 순회"""
+    store = CardStore()
+    cards = [{'card_id': f'c{i}', 'production_time': f'2026-01-01T00:00:{i:02d}'} for i in range(5)]
+    for card in cards:
+        store.append(card)
+    snapshot = store.snapshot()
+    assert ids(store) == ['c4', 'c3', 'c2', 'c1', 'c0'] and store[0] is cards[4]
+    
+    replaced = dict(cards[2], score=1.0)
+    store.append(replaced)
+    store.remove(cards[0])
+    assert len(store) == 4 and store['c2'] is replaced and 'c0' not in store
+    assert replaced in store and cards[0] not in store
+    assert not store.discard({'card_id': 'missing'})
+    assert ids(snapshot) == ['c4', 'c3', 'c2', 'c1', 'c0']  # 이전 스냅샷은 그대로
+    try:
+        store.remove(cards[0])
+        raise AssertionError("없는 카드 제거")
+    except ValueError:
+        pass
+    print("✅ 카드 저장소 추가/교체/제거")
+
+
+def check_views(manager):
+    """인덱스 조회 결과가 캐시 전체 순회 결과와 같음"""
+    from managers.production_card_manager import CardState
+    with manager._lock.read_locked():
+        cards = list(manager.cards_cache)
+        active = manager.get_active_cards()
+        visible = manager.get_all_cards()
+        assert ids(active) == ids(scan_active(cards)), (ids(active), ids(scan_active(cards)))
+        assert ids(visible) == ids(scan_all(cards))
+        assert len({card['card_id'] for card in cards}) == len(cards)
+        for card in active:
+            assert card['card_state'] in (CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value)
+            assert manager.get_card_by_id(card['card_id']) is card
+    return len(cards)
+
+
+def test_manager_stress(base_dir):
+    """여러 스레드에서 추가/변경/히스토리/제거/조회를 동시에 실행"""
+    from managers.production_card_manager import ProductionCardManager, CardState
+    from nbverse_helper import init_nbverse_storage
+    
+    storage = init_nbverse_storage(os.path.join(base_dir, 'data', 'nbverse'))[0]
+    assert storage is not None, "NBverse 저장소 초기화 실패"
+    manager = ProductionCardManager(nbverse_storage=storage)
+    manager.load()
+    
+    errors = []
+    counts = {'add': 0, 'update': 0, 'history': 0, 'remove': 0, 'read': 0}
+    counts_lock = threading.Lock()
+    stop_at = time.time() + DURATION
+    prices = [100.0 + i for i in range(20)]
+    
+    def count(name):
+        with counts_lock:
+            counts[name] += 1
+    
+    def pick(rng):
+        cards = manager.cards_cache.snapshot()
+        return rng.choice(cards) if cards else None
+    
+    def worker(seed):
+        rng = random.Random(seed)
+        try:
+            while time.time() < stop_at:
+                action = rng.random()
+                if action < 0.15 and counts['add'] < MAX_ADDS:
+                    manager.add_card('1m', rng.random(), rng.random(), rng.random(),
+                                     chart_data={'prices': prices, 'current_price': prices[-1]})
+                    count('add')
+                elif action < 0.35:
+                    card = pick(rng)
+                    if card:
+                        state = rng.choice([CardState.ACTIVE.value, CardState.OVERLAP_ACTIVE.value, CardState.GRAY.value])
+                        manager.update_card(card['card_id'], {'card_state': state, 'score': rng.uniform(0, 200)})
+                        count('update')
+                elif action < 0.5:
+                    card = pick(rng)
+                    if card:
+                        manager.add_history(card['card_id'], rng.choice(['BUY', 'SOLD']), qty=1.0, entry_price=100.0)
+                        count('history')
+                elif action < 0.55:
+                    card = pick(rng)
+                    if card:
+                        manager.remove_card(card['card_id'])
+                        count('remove')
+                else:
+                    active = manager.get_active_cards()
+                    keys = [card.get('card_key') for card in active]
+                    assert len(keys) == len(set(keys)), "활성 카드 card_key 중복"
+                    times = [card.get('production_time', '') for card in active]
+                    assert times == sorted(times, reverse=True), "활성 카드 정렬 오류"
+                    for card in manager.get_all_cards():
+                        assert card.get('card_state') != CardState.REMOVED.value
+                    if rng.random() < 0.05:
+                        check_views(manager)
+                    count('read')
+        except Exception as e:
+            import traceback
+            errors.append(traceback.format_exc())
+    
+    threads = [threading.Thread(target=worker, args=(seed,), daemon=True) for seed in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=DURATION + 120)
+        assert not thread.is_alive(), "스레드 교착"
+    assert not errors, errors[0]
+    
+    total = check_views(manager)
+    # 임시 폴더를 지우기 전에 백그라운드 로드/저장 워커의 파일 쓰기를 모두 끝냄
+    deadline = time.time() + 30
+    while manager._loading and time.time() < deadline:
+        time.sleep(0.05)
+    manager.flush()
+    assert manager._persistence.stats()['pending_creates'] == 0
+    print(f"✅ 스트레스: {THREADS}개 스레드, 카드 {total}개, 작업 {counts}")
+    
+    # 호출한 쪽에서 저장한 카드 등록: 인덱스와 임시 저장 파일에 반영되고 update_card로 찾을 수 있음
+    registered = manager.register_saved_card({'card_id': 'chart_card_1', 'card_key': 'chart_key_1', 'timeframe': '1m',
+                                              'card_state': CardState.ACTIVE.value, 'production_time': '2099-01-01T00:00:00'})
+    assert registered is not None and manager.update_card('chart_card_1', {'score': 50.0})
+    assert check_views(manager) == total + 1
+    manager.flush()
+    assert 'chart_card_1' in {card['card_id'] for card in manager._journal.load()}
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("생산 카드 동시성 테스트")
+    print("=" * 50)
+    test_read_write_lock()
+    test_card_store()
+    base_dir = tempfile.mkdtemp(prefix="card_concurrency_")
+    cwd = os.getcwd()
+    try:
+        # 관리자는 data/ 아래 상대 경로를 사용하므로 임시 폴더에서 실행
+        os.chdir(base_dir)
+        test_manager_stress(base_dir)
+        print("✅ 모든 테스트 통과")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(base_dir, ignore_errors=True)
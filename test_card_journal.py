@@ -0,0 +1,222 @@
+"""카드 임시 저장 저널(CardCacheJournal) 테스트 스크립트"""
+import sys
+import io
+import os
+import copy
+import uuid
+import shutil
+import tempfile
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_journal import CardCacheJournal
+from managers.card_records import to_plain
+
+
+def make_card(index):
+    return {
+        'card_id': f'prod_card_1m_{index}',
+        'card_key': f'1m_nb_1m_{index}',
+        'card_state': 'ACTIVE',
+        'score': 100.0,
+        'rank': 'C',
+        'production_time': f'2026-01-01T00:{index:02d}:00',
+        'chart_data': {'prices': [100.0 + i for i in range(200)]},
+        'history_list': [make_history('NEW')],
+        'realtime_scores': [100.0] * 50
+    }
+
+
+def make_history(history_type):
+    return {'history_id': str(uuid.uuid4()), 'type': history_type, 'qty': 1.0, 'entry_price': 100.0}
+
+
+def add_history(card, history_type, max_history=100):
+    card['history_list'].insert(0, make_history(history_type))
+    card['history_list'] = card['history_list'][:max_history]
+
+
+def by_id(cards):
+    # ProductionCard는 본문까지 읽은 일반 dict로 비교 (array('d')는 list로)
+    return {card['card_id']: to_plain(dict(card.items())) for card in cards}
+
+
+def test_replay(base_dir):
+    """스냅샷 + 로그 재생 결과가 메모리 카드와 같음"""
+    path = os.path.join(base_dir, 'production_cards_cache.json')
+    journal = CardCacheJournal(path, compact_bytes=10 * 1024 * 1024)
+    cards = [make_card(i) for i in range(50)]
+    journal.compact(cards)
+    snapshot_size = os.path.getsize(path)
+    
+    # 거래 한 번 (히스토리 추가 + 상태 변경)의 기록 크기는 전체 카드 수와 무관
+    add_history(cards[3], 'BUY')
+    cards[3]['score'] = 120.0
+    written = journal.record({cards[3]['card_id']: cards[3]})
+    assert written < snapshot_size / 20, (written, snapshot_size)
+    
+    # 전체 비교: 바뀐 카드와 사라진 카드만 기록
+    cards[7]['card_state'] = 'GRAY'
+    removed = cards.pop(10)
+    journal.record_all(cards)
+    
+    # 히스토리 100개 초과 (앞에 추가 + 뒤에서 잘라냄)
+    for _ in range(120):
+        add_history(cards[5], 'BUY')
+        journal.record({cards[5]['card_id']: cards[5]})
+    
+    # 새 카드
+    cards.append(make_card(99))
+    journal.record({cards[-1]['card_id']: cards[-1]})
+    
+    loaded = CardCacheJournal(path).load()
+    assert by_id(loaded) == by_id(cards)
+    assert removed['card_id'] not in by_id(loaded)
+    print(f"✅ 재생 일치: 카드 {len(loaded)}개, 스냅샷 {snapshot_size:,} bytes, 거래 1회 기록 {written:,} bytes")
+    return path
+
+
+def test_torn_write_and_compaction(path):
+    """쓰는 도중 종료된 마지막 줄은 무시, 압축 후에는 로그 없이 스냅샷만으로 복원"""
+    journal = CardCacheJournal(path)
+    cards = journal.load()
+    expected = copy.deepcopy(by_id(cards))
+    
+    with open(journal.log_path, 'ab') as f:
+        f.write(b'{"op":"set","id":"prod_card_1m_0","fields":{"sco')
+    journal = CardCacheJournal(path)
+    assert by_id(journal.load()) == expected
+    assert open(journal.log_path, 'rb').read().endswith(b'\n')
+    
+    journal = CardCacheJournal(path, compact_bytes=1)
+    cards = journal.load()
+    assert journal.needs_compaction()
+    journal.compact(cards)
+    assert not os.path.exists(journal.log_path)
+    assert by_id(CardCacheJournal(path).load()) == expected
+    print("✅ 잘린 마지막 줄 무시, 압축 후 복원 일치")
+
+
+def test_stale_log_after_compaction(path):
+    """스냅샷 교체 후 로그 삭제 전에 종료되면 이전 세대 로그는 재생하지 않음"""
+    journal = CardCacheJournal(path)
+    cards = journal.load()
+    cards[0]['score'] = 1.0
+    journal.record({cards[0]['card_id']: cards[0]})
+    stale_log = open(journal.log_path, 'rb').read()
+    
+    cards[0]['score'] = 2.0
+    journal.compact(cards)
+    with open(journal.log_path, 'wb') as f:
+        f.write(stale_log)
+    
+    loaded = by_id(CardCacheJournal(path).load())
+    assert loaded[cards[0]['card_id']]['score'] == 2.0
+    assert not os.path.exists(journal.log_path)
+    print("✅ 이전 세대 로그 무시")
+
+
+def test_lazy_loading(base_dir):
+    """헤더만 로드하고 본문은 처음 접근할 때 읽음, 압축 후에도 읽지 않은 본문 유지"""
+    import glob
+    import json
+    import time
+    from managers.card_records import ProductionCard, history_summary, json_default
+    
+    path = os.path.join(base_dir, 'lazy_cache.json')
+    cards = [make_card(i) for i in range(2000)]
+    add_history(cards[1], 'SOLD')
+    CardCacheJournal(path).compact(cards)
+    expected = by_id(copy.deepcopy(cards))
+    
+    start = time.perf_counter()
+    journal = CardCacheJournal(path)
+    loaded = journal.load()
+    load_ms = (time.perf_counter() - start) * 1000
+    assert all(isinstance(card, ProductionCard) and not card.hydrated for card in loaded)
+    
+    # 헤더 필드 조회, 정렬, SOLD 여부 확인은 본문을 읽지 않음
+    loaded.sort(key=lambda card: card.get('production_time', ''), reverse=True)
+    sold = [card['card_id'] for card in loaded if history_summary(card)[1]]
+    assert sold == [cards[1]['card_id']], sold
+    assert not any(card.hydrated for card in loaded)
+    
+    # 무거운 필드에 접근한 카드만 본문을 읽음
+    first = by_id_raw(loaded)[cards[0]['card_id']]
+    assert len(first['history_list']) == 1 and first.hydrated
+    assert sum(card.hydrated for card in loaded) == 1
+    
+    # 본문을 읽지 않은 카드의 헤더 변경은 헤더 필드만 기록
+    second = by_id_raw(loaded)[cards[2]['card_id']]
+    second['score'] = 130.0
+    written = journal.record({second['card_id']: second})
+    assert not second.hydrated and written < 200, written
+    expected[second['card_id']]['score'] = 130.0
+    
+    # 압축: 읽지 않은 본문은 파싱 없이 새 본문 파일로 복사되고 이전 본문 파일은 삭제
+    journal.compact(loaded)
+    assert sum(card.hydrated for card in loaded) == 1
+    assert len(glob.glob(os.path.join(base_dir, 'lazy_cache.*.bodies'))) == 1
+    assert json.loads(json.dumps(by_id_raw(loaded)[cards[3]['card_id']], default=json_default))['history_list']
+    assert by_id(CardCacheJournal(path).load()) == expected
+    assert by_id(loaded) == expected
+    print(f"✅ 지연 로드: 카드 {len(loaded)}개 헤더 로드 {load_ms:.1f}ms, 압축 후 본문 유지")
+
+
+def by_id_raw(cards):
+    return {card['card_id']: card for card in cards}
+
+
+def test_legacy_snapshot(base_dir):
+    """기존 전체 저장 형식(들여쓰기 JSON, generation 없음)도 그대로 읽음"""
+    import json
+    path = os.path.join(base_dir, 'legacy_cache.json')
+    cards = [make_card(i) for i in range(3)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'cards': cards, 'saved_at': '2026-01-01T00:00:00'}, f, ensure_ascii=False, indent=2)
+    
+    journal = CardCacheJournal(path)
+    loaded = journal.load()
+    assert by_id(loaded) == by_id(cards)
+    
+    loaded[0]['card_state'] = 'GRAY'
+    journal.record_all(loaded)
+    assert by_id(CardCacheJournal(path).load()) == by_id(loaded)
+    print("✅ 기존 형식 스냅샷 로드 + 로그 재생")
+
+
+def test_change_during_compaction(base_dir):
+    """스냅샷 준비 후 파일 쓰기 전에 바뀐 카드는 다음 기록에서 로그에 남음"""
+    path = os.path.join(base_dir, 'split_cache.json')
+    cards = [make_card(i) for i in range(3)]
+    journal = CardCacheJournal(path)
+    journal.compact(cards)
+
+    prepared = journal.prepare_compaction(cards)
+    cards[1]['score'] = 77.0
+    journal.write_compaction(prepared)
+    assert by_id(CardCacheJournal(path).load())[cards[1]['card_id']]['score'] != 77.0
+
+    assert journal.record_all(cards) > 0
+    assert by_id(CardCacheJournal(path).load()) == by_id(cards)
+    print("✅ 압축 준비 후 변경된 카드는 다음 기록에 반영")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("카드 임시 저장 저널 테스트")
+    print("=" * 50)
+    base_dir = tempfile.mkdtemp(prefix="card_journal_")
+    try:
+        path = test_replay(base_dir)
+        test_torn_write_and_compaction(path)
+        test_stale_log_after_compaction(path)
+        test_lazy_loading(base_dir)
+        test_legacy_snapshot(base_dir)
+        test_change_during_compaction(base_dir)
+        print("✅ 모든 테스트 통과")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
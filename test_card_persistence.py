@@ -0,0 +1,142 @@
+"""카드 저장 지연 쓰기 워커(CardPersistenceWorker) 테스트 스크립트"""
+import sys
+import io
+import time
+import threading
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_persistence import CardPersistenceWorker
+
+
+class RecordingStore:
+    """저장 호출 기록용"""
+    
+    def __init__(self, write_delay: float = 0.0):
+        self.write_delay = write_delay
+        self.writes = []
+        self.creates = []
+        self.removes = []
+        self.cache_writes = 0
+        self.cache_ids = set()
+        self.threads = set()
+        self.lock = threading.Lock()
+    
+    def write_card(self, card):
+        time.sleep(self.write_delay)
+        with self.lock:
+            self.writes.append((card['card_id'], card['value']))
+            self.threads.add(threading.current_thread().name)
+    
+    def create_card(self, text, metadata):
+        with self.lock:
+            self.creates.append(metadata['card_id'])
+            self.writes.append((metadata['card_id'], 'created'))
+    
+    def remove_card(self, card_id):
+        with self.lock:
+            self.removes.append(card_id)
+    
+    def write_cache(self, card_ids, full):
+        with self.lock:
+            self.cache_writes += 1
+            self.cache_ids |= card_ids
+
+
+def make_worker(store, delay):
+    return CardPersistenceWorker(store.write_card, store.remove_card, store.write_cache, delay=delay,
+                                 create_card=store.create_card)
+
+
+def test_coalesce():
+    """지연 시간 안의 같은 카드 갱신은 마지막 상태 한 번만 저장"""
+    store = RecordingStore()
+    worker = make_worker(store, delay=0.2)
+    
+    card = {'card_id': 'card_a', 'value': 0}
+    for i in range(50):
+        card['value'] = i
+        worker.mark_card(card)
+        worker.mark_cache('card_a')
+    worker.mark_card({'card_id': 'card_b', 'value': 1})
+    
+    time.sleep(0.5)
+    assert store.writes == [('card_a', 49), ('card_b', 1)], store.writes
+    assert store.cache_writes == 1, store.cache_writes
+    assert store.cache_ids == {'card_a', 'card_b'}, store.cache_ids
+    assert store.threads == {'CardPersistenceWorker'}, store.threads
+    print(f"✅ 갱신 묶음: 요청 {worker.stats()['requested']}회 → 카드 쓰기 {len(store.writes)}회, 임시 저장 {store.cache_writes}회")
+
+
+def test_remove_overrides_update():
+    """삭제 예약은 대기 중인 갱신을 취소"""
+    store = RecordingStore()
+    worker = make_worker(store, delay=10.0)
+    
+    worker.mark_card({'card_id': 'card_a', 'value': 1})
+    worker.mark_removed('card_a')
+    worker.flush()
+    
+    assert store.writes == [], store.writes
+    assert store.removes == ['card_a'], store.removes
+    print("✅ 삭제 예약이 대기 중인 갱신을 대체")
+
+
+def test_create_ordering():
+    """새 카드 생성은 같은 카드의 갱신보다 먼저, 생성 전에 삭제되면 만들지 않음"""
+    store = RecordingStore()
+    worker = make_worker(store, delay=10.0)
+    
+    worker.mark_card({'card_id': 'card_a', 'value': 1})
+    worker.mark_created('card_a', '100,101', {'card_id': 'card_a'})
+    worker.mark_created('card_b', '100,101', {'card_id': 'card_b'})
+    worker.mark_removed('card_b')
+    assert worker.stats()['pending_creates'] == 1
+    worker.flush()
+    
+    assert store.writes == [('card_a', 'created'), ('card_a', 1)], store.writes
+    assert store.creates == ['card_a'] and store.removes == ['card_b']
+    assert worker.stats()['created'] == 1 and store.cache_ids == {'card_a', 'card_b'}
+    print("✅ 새 카드 생성 → 갱신 순서, 생성 전 삭제 시 생성 취소")
+
+
+def test_flush():
+    """flush는 지연 시간을 기다리지 않고, 워커가 쓰는 중이면 끝날 때까지 기다림"""
+    store = RecordingStore(write_delay=0.05)
+    worker = make_worker(store, delay=10.0)
+    
+    for i in range(5):
+        worker.mark_card({'card_id': f'card_{i}', 'value': i})
+    worker.mark_cache()
+    
+    start = time.perf_counter()
+    worker.flush()
+    elapsed = time.perf_counter() - start
+    assert len(store.writes) == 5 and store.cache_writes == 1
+    assert elapsed < 5.0, elapsed
+    
+    # 워커가 쓰는 중에 flush 호출
+    worker.delay = 0.0
+    for i in range(5):
+        worker.mark_card({'card_id': f'card_{i}', 'value': i + 10})
+    time.sleep(0.02)
+    worker.flush()
+    assert len(store.writes) == 10, store.writes
+    assert worker.stats()['pending_cards'] == 0
+    
+    worker.stop()
+    print(f"✅ flush 완료: {elapsed * 1000:.1f}ms (지연 시간 10초)")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("카드 저장 지연 쓰기 워커 테스트")
+    print("=" * 50)
+    test_coalesce()
+    test_remove_overrides_update()
+    test_create_ordering()
+    test_flush()
+    print("✅ 모든 테스트 통과")
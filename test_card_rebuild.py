@@ -0,0 +1,204 @@
+"""NBverse 폴더 재구성(CardRebuilder) 테스트 스크립트
+
+생산 카드 / 다른 종류의 파일이 섞인 폴더를 만들어
+순서 고정 순회, 바이트 사전 필터, 중단 후 이어서 진행, 프로세스 풀 디코드를 확인합니다.
+"""
+import sys
+import io
+import os
+import json
+import shutil
+import tempfile
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_rebuild import CardRebuilder, decode_batch, iter_json_files
+
+CARDS_PER_DIR = 300
+OTHERS_PER_DIR = 200
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def make_tree(base_dir):
+    """max/min 폴더에 숫자 경로로 카드 파일과 다른 파일을 만듦 (NBverse 저장 구조와 비슷하게)"""
+    expected = set()
+    search_dirs = []
+    for name in ('max', 'min'):
+        root = os.path.join(base_dir, name)
+        search_dirs.append(root)
+        for i in range(CARDS_PER_DIR):
+            card_id = f'prod_card_1m_{i:05d}'
+            expected.add(card_id)
+            digits = f'{i:05d}'
+            path = os.path.join(root, *digits[:3], f'{card_id}.json')
+            write_json(path, {
+                'nb': {'max': 0.5 + i, 'min': 0.25 + i},
+                'text': 'x' * 64,
+                'metadata': {'card_type': 'production_card', 'card_id': card_id,
+                             'timeframe': '1m', 'production_time': f'2026-01-01T00:{i // 60:02d}:{i % 60:02d}'}
+            })
+        for i in range(OTHERS_PER_DIR):
+            digits = f'{i:05d}'
+            write_json(os.path.join(root, *digits[:3], f'text_{i}.json'),
+                       {'nb': {'max': 1.0, 'min': 1.0}, 'metadata': {'card_type': 'chart'}})
+        # 손상된 카드 파일 / json이 아닌 파일
+        with open(os.path.join(root, 'broken.json'), 'wb') as f:
+            f.write(b'{"metadata": {"card_type": "production_card"')
+        with open(os.path.join(root, 'notes.txt'), 'w') as f:
+            f.write('production_card')
+    return search_dirs, expected
+
+
+def test_iter_order_and_after(search_dirs):
+    """순회 순서가 고정이고 after 이후 파일만 돌려줌"""
+    root = search_dirs[0]
+    paths = list(iter_json_files(root))
+    keys = [os.path.relpath(path, root).split(os.sep) for path in paths]
+    assert keys == sorted(keys), "이름순 깊이 우선 순서가 아님"
+    assert len(paths) == CARDS_PER_DIR + OTHERS_PER_DIR + 1
+    middle = keys[len(keys) // 2]
+    rest = list(iter_json_files(root, after=middle))
+    assert rest == paths[len(keys) // 2 + 1:]
+    print(f"✅ 순회 순서 고정 / 체크포인트 이후부터 순회 ({len(paths)}개)")
+
+
+def test_prefilter(search_dirs):
+    """생산 카드가 아닌 파일은 레코드로 나오지 않고, 손상된 카드 파일은 오류로 셈"""
+    root = search_dirs[0]
+    result = decode_batch(list(iter_json_files(root)))
+    assert len(result['records']) == CARDS_PER_DIR
+    assert result['errors'] == 1
+    record = result['records'][0]
+    assert set(record) == {'path', 'metadata', 'nb'} and 'text' not in record
+    assert record['metadata']['card_type'] == 'production_card'
+    print("✅ 바이트 사전 필터 / 손상 파일 처리")
+
+
+def test_column_prices(base_dir):
+    """NBverse .col 파일에 저장된 chart_data.prices를 list로 읽음"""
+    from array import array
+    folder = os.path.join(base_dir, 'columns')
+    path = os.path.join(folder, 'card.json')
+    prices = [100.0 + i for i in range(20)]
+    write_json(path, {
+        'nb': {'max': 1.0, 'min': 0.5, 'unicodeArray': {'$column': 'card.abcd.col', 'offset': 0, 'dtype': '<i4', 'count': 4}},
+        'metadata': {'card_type': 'production_card', 'card_id': 'col_card',
+                     'chart_data': {'prices': {'$column': 'card.abcd.col', 'offset': 16, 'dtype': '<f8', 'count': 20}}}
+    })
+    payload = array('i', [1, 2, 3, 4]).tobytes() + array('d', prices).tobytes()
+    with open(os.path.join(folder, 'card.abcd.col'), 'wb') as f:
+        f.write(payload)
+    record = decode_batch([path])['records'][0]
+    assert record['metadata']['chart_data']['prices'] == prices
+    print("✅ .col 파일 가격 배열 읽기")
+
+
+def test_full_rebuild(search_dirs, expected, state_path, **kwargs):
+    rebuilder = CardRebuilder(search_dirs, state_path, **kwargs)
+    records = list(rebuilder.records())
+    assert len(records) == len(expected) * 2  # max/min 폴더에 같은 카드
+    assert {r['metadata']['card_id'] for r in records} == expected
+    assert rebuilder.stats['errors'] == 2
+    assert not os.path.exists(rebuilder.checkpoint_path) and not os.path.exists(rebuilder.spool_path)
+    return rebuilder
+
+
+def test_resume(search_dirs, expected, state_path):
+    """중간에 멈춘 뒤 다시 시작하면 spool 레코드 + 남은 파일로 모든 카드를 찾음"""
+    first = CardRebuilder(search_dirs, state_path, workers=1, batch_size=32, checkpoint_interval=0)
+    for count, _ in enumerate(first.records()):
+        if count >= CARDS_PER_DIR + 10:  # 두 번째 폴더 처리 중에 중단
+            break
+    assert os.path.exists(first.checkpoint_path) and os.path.exists(first.spool_path)
+    files_before = first.stats['files']
+    
+    # 쓰는 도중 중단된 spool 줄 흉내
+    with open(first.spool_path, 'ab') as f:
+        f.write(b'{"path": "torn')
+    
+    second = CardRebuilder(search_dirs, state_path, workers=1, batch_size=32)
+    records = list(second.records())
+    assert {r['metadata']['card_id'] for r in records} == expected
+    assert second.stats['resumed'] >= CARDS_PER_DIR
+    # 이미 확인한 파일은 다시 읽지 않음
+    total_files = 2 * (CARDS_PER_DIR + OTHERS_PER_DIR + 1)
+    assert second.stats['files'] == total_files, (second.stats, files_before)
+    assert not os.path.exists(second.checkpoint_path)
+    print(f"✅ 중단 후 이어서 진행 (이전 실행에서 {files_before}개 확인, spool에서 {second.stats['resumed']}개)")
+    
+    # 다른 폴더 대상의 체크포인트는 무시
+    third = CardRebuilder(search_dirs[:1], state_path, workers=1)
+    for _ in third.records():
+        break
+    fourth = CardRebuilder(search_dirs, state_path, workers=1)
+    assert fourth._load_checkpoint() is None
+    fourth._clear_state()
+
+
+def test_indexed_storage_rebuild(base_dir):
+    """폴더 구조가 없는 인덱스 저장소로 전환해도 임시 저장 파일 없이 카드를 다시 만듦 (처음 전환할 때 기존 데이터 가져옴)"""
+    import time
+    from managers.production_card_manager import ProductionCardManager
+    from nbverse_helper import init_nbverse_storage, STORAGE_BACKEND_INDEXED
+    
+    def loaded(manager):
+        deadline = time.time() + 30
+        while manager._loading and time.time() < deadline:
+            time.sleep(0.05)
+        return manager
+    
+    cwd = os.getcwd()
+    # 관리자는 data/ 아래 상대 경로를 사용하므로 임시 폴더에서 실행
+    os.makedirs(base_dir, exist_ok=True)
+    os.chdir(base_dir)
+    try:
+        data_dir = os.path.join(base_dir, 'data', 'nbverse')
+        legacy = init_nbverse_storage(data_dir)[0]
+        manager = loaded(ProductionCardManager(nbverse_storage=legacy))
+        card = manager.add_card('1m', 0.3, 0.6, 0.2, chart_data={'prices': [1.0, 2.0], 'current_price': 2.0})
+        manager.flush()
+        
+        storage = init_nbverse_storage(data_dir, storage_backend=STORAGE_BACKEND_INDEXED)[0]
+        assert storage.count() == 1, "기존 폴더 구조 데이터 가져오기 실패"
+        for name in os.listdir('data'):
+            if name.startswith('production_cards_cache'):
+                os.remove(os.path.join('data', name))
+        
+        manager = loaded(ProductionCardManager(nbverse_storage=storage))
+        assert [c['card_id'] for c in manager.get_all_cards()] == [card['card_id']]
+        assert manager._scan_card_files(card['card_id']) == storage.find_card_paths(card['card_id'])
+        manager.flush()
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("생산 카드 재구성 테스트")
+    print("=" * 50)
+    base_dir = tempfile.mkdtemp(prefix="card_rebuild_")
+    try:
+        search_dirs, expected = make_tree(os.path.join(base_dir, 'nbverse'))
+        state_path = os.path.join(base_dir, 'state', 'rebuild')
+        test_iter_order_and_after(search_dirs)
+        test_prefilter(search_dirs)
+        if sys.byteorder == 'little':
+            test_column_prices(base_dir)
+        test_full_rebuild(search_dirs, expected, state_path, workers=1, batch_size=50)
+        print("✅ 현재 프로세스 디코드")
+        rebuilder = test_full_rebuild(search_dirs, expected, state_path, workers=2, batch_size=20, process_threshold=100)
+        print(f"✅ 프로세스 풀 디코드 ({rebuilder.stats['files']}개 확인)")
+        test_resume(search_dirs, expected, state_path)
+        test_indexed_storage_rebuild(os.path.join(base_dir, 'indexed'))
+        print("✅ 인덱스 저장소 재구성")
+        print("✅ 모든 테스트 통과")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
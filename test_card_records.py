@@ -0,0 +1,134 @@
+"""카드 레코드(ProductionCard / HistoryEntry) 테스트 스크립트"""
+import sys
+import io
+import copy
+import json
+import pickle
+from array import array
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_records import (
+    HistoryEntry, ProductionCard, MAX_REALTIME_SCORES, history_summary, json_default, snapshot_card, to_plain
+)
+
+
+def make_card():
+    return {
+        'card_id': 'prod_card_1m_1',
+        'card_key': '1m_nb_1m_0.5',
+        'card_state': 'ACTIVE',
+        'score': 100.0,
+        'rank': 'C',
+        'production_time': '2026-01-01T00:00:00',
+        'chart_data': {'prices': [100.0 + i for i in range(200)], 'current_price': 299.0, 'timeframe': '1m'},
+        'history_list': [{'history_id': 'h1', 'type': 'NEW', 'qty': 1.0, 'entry_price': 100.0}],
+        'realtime_scores': [100.0] * 10,
+        'custom_field': {'note': 'extra'}
+    }
+
+
+def test_dict_compat():
+    """dict와 같은 방식으로 조회/변경/삭제"""
+    original = make_card()
+    card = ProductionCard(original)
+    
+    assert card['score'] == 100.0 and card.get('rank') == 'C'
+    assert card.get('nb_value') is None and card.get('nb_value', 0.5) == 0.5
+    assert 'custom_field' in card and 'nb_value' not in card
+    assert len(card) == len(original) and set(card) == set(original)
+    
+    card['score'] = 120.0
+    card.update({'rank': 'B', 'memo': 'x'})
+    assert card.setdefault('nb_value', 0.5) == 0.5
+    assert card.pop('memo') == 'x'
+    del card['nb_value']
+    try:
+        card['nb_value']
+        raise AssertionError("삭제한 필드 조회")
+    except KeyError:
+        pass
+    
+    expected = dict(original, score=120.0, rank='B')
+    assert to_plain(dict(card)) == expected
+    assert to_plain({**card}) == expected
+    assert card.to_dict() == expected
+    print("✅ dict 호환 조회/변경/삭제")
+
+
+def test_series_storage():
+    """가격/점수 시리즈는 array('d'), 히스토리 항목은 HistoryEntry로 저장"""
+    card = ProductionCard(make_card())
+    assert isinstance(card['chart_data']['prices'], array)
+    assert isinstance(card['realtime_scores'], array)
+    assert all(isinstance(item, HistoryEntry) for item in card['history_list'])
+    assert card['chart_data']['prices'][-1] == 299.0 and card['chart_data']['prices'][-20:][0] == 280.0
+    
+    # 실시간 점수는 최근 MAX_REALTIME_SCORES개만 유지
+    card['realtime_scores'] = [float(i) for i in range(MAX_REALTIME_SCORES + 50)]
+    assert len(card['realtime_scores']) == MAX_REALTIME_SCORES
+    assert card['realtime_scores'][-1] == MAX_REALTIME_SCORES + 49
+    
+    # 숫자가 아닌 가격이 있으면 list 그대로 유지
+    card['chart_data'] = {'prices': [100.0, None]}
+    assert card['chart_data']['prices'] == [100.0, None]
+    # 정수가 있는 가격도 list 그대로 유지 (100 -> 100.0으로 바뀌지 않음)
+    card['chart_data'] = {'prices': [100, 101.5]}
+    assert [type(v) for v in to_plain(card)['chart_data']['prices']] == [int, float]
+    
+    card['history_list'].insert(0, {'history_id': 'h2', 'type': 'SOLD'})
+    assert history_summary(card) == (True, True)
+    print("✅ array('d') 가격/점수 시리즈, HistoryEntry 히스토리")
+
+
+def test_serialization():
+    """JSON/pickle/deepcopy 결과가 일반 dict 카드와 같음"""
+    original = make_card()
+    card = ProductionCard(original)
+    
+    assert json.loads(json.dumps(card, default=json_default)) == original
+    try:
+        import orjson
+        assert orjson.loads(orjson.dumps(card, default=json_default)) == original
+    except ImportError:
+        pass
+    
+    for restored in (pickle.loads(pickle.dumps(card)), copy.deepcopy(card)):
+        assert isinstance(restored, ProductionCard) and restored is not card
+        assert restored == card and restored.to_dict() == original
+        assert isinstance(restored['history_list'][0], HistoryEntry)
+    
+    other = ProductionCard(dict(original, card_id='prod_card_1m_2'))
+    cards = [other, card]
+    cards.remove(card)
+    assert cards == [other]
+    print("✅ JSON / pickle / deepcopy 변환")
+
+
+def test_snapshot():
+    """저장용 복사본은 원본 변경(히스토리 추가, 점수/차트 변경)의 영향을 받지 않음"""
+    original = make_card()
+    card = ProductionCard(original)
+    snapshot = snapshot_card(card)
+    
+    card['history_list'].insert(0, HistoryEntry({'history_id': 'h2', 'type': 'BUY'}))
+    card['realtime_scores'].append(150.0)
+    card['chart_data']['prices'][0] = 1.0
+    card['score'] = 150.0
+    assert isinstance(snapshot, ProductionCard) and snapshot.to_dict() == original
+    assert snapshot_card(dict(original)) == original
+    print("✅ 저장용 카드 복사본")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("카드 레코드 테스트")
+    print("=" * 50)
+    test_dict_compat()
+    test_series_storage()
+    test_serialization()
+    test_snapshot()
+    print("✅ 모든 테스트 통과")
@@ -0,0 +1,161 @@
+"""생산 카드 보조 인덱스(CardViewIndex) 테스트 스크립트"""
+import sys
+import io
+import random
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from managers.card_records import ProductionCard
+from managers.card_view_index import CardViewIndex
+
+ACTIVE_STATES = ('ACTIVE', 'OVERLAP_ACTIVE')
+STATES = ('ACTIVE', 'OVERLAP_ACTIVE', 'GRAY', 'REMOVED')
+
+
+def scan_active(cards):
+    """기존 get_active_cards() 전체 순회 방식"""
+    cards_by_key = {}
+    for card in cards:
+        if card.get('card_state') not in ACTIVE_STATES:
+            continue
+        if any(h.get('type') == 'SOLD' for h in card.get('history_list', [])):
+            continue
+        card_key = card.get('card_key', '')
+        if card_key:
+            existing_time = cards_by_key.get(card_key, {}).get('production_time', '')
+            new_time = card.get('production_time', '')
+            if not existing_time or new_time > existing_time:
+                cards_by_key[card_key] = card
+    result = list(cards_by_key.values())
+    result.sort(key=lambda x: x.get('production_time', ''), reverse=True)
+    return result
+
+
+def scan_all(cards):
+    """기존 get_all_cards() 전체 순회 방식"""
+    cards_by_key = {}
+    for card in cards:
+        if card.get('card_state') == 'REMOVED':
+            continue
+        card_key = card.get('card_key', '')
+        if card_key:
+            existing_time = cards_by_key.get(card_key, {}).get('production_time', '')
+            new_time = card.get('production_time', '')
+            if not existing_time or new_time > existing_time:
+                cards_by_key[card_key] = card
+        else:
+            card_id = card.get('card_id', '')
+            if card_id and card_id not in cards_by_key:
+                cards_by_key[card_id] = card
+    result = list(cards_by_key.values())
+    result.sort(key=lambda x: x.get('production_time', ''), reverse=True)
+    return result
+
+
+def ids(cards):
+    return [card['card_id'] for card in cards]
+
+
+def make_card(index, rng):
+    return ProductionCard({
+        'card_id': f'prod_card_1m_{index}',
+        'card_key': rng.choice(['', '1m_a', '1m_b', '1m_c', '1m_d']),
+        'card_state': rng.choice(STATES),
+        'production_time': f'2026-01-01T00:00:{index:06d}',
+        'history_list': [{'history_id': f'h{index}', 'type': 'NEW'}]
+    })
+
+
+def check(index, cards):
+    assert ids(index.active_cards()) == ids(scan_active(cards))
+    assert ids(index.visible_cards()) == ids(scan_all(cards))
+    for card_key in ('1m_a', '1m_b', '1m_c', '1m_d'):
+        expected = sorted((c for c in cards if c.get('card_key') == card_key),
+                          key=lambda c: c['production_time'], reverse=True)
+        assert ids(index.by_key(card_key)) == ids(expected)
+    for state in STATES:
+        assert set(ids(index.by_state(state))) == {c['card_id'] for c in cards if c['card_state'] == state}
+    visible = scan_all(cards)
+    expected_sold = {c['card_id'] for c in visible
+                     if any(h['type'] == 'SOLD' for h in c['history_list'])}
+    assert set(ids(index.sold_cards())) == expected_sold
+
+
+def test_incremental_matches_scan():
+    """추가/상태 변경/히스토리 추가/제거를 반복해도 전체 순회 결과와 같음"""
+    rng = random.Random(7)
+    index = CardViewIndex(ACTIVE_STATES, 'REMOVED')
+    cards = []
+    next_id = 0
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.35 or not cards:
+            card = make_card(next_id, rng)
+            next_id += 1
+            cards.append(card)
+            index.add(card)
+        elif action < 0.6:
+            card = rng.choice(cards)
+            card['card_state'] = rng.choice(STATES)
+            index.update(card)
+        elif action < 0.75:
+            card = rng.choice(cards)
+            card['history_list'].insert(0, {'history_id': f's{step}', 'type': rng.choice(['BUY', 'SOLD'])})
+            index.update(card)
+        elif action < 0.85:
+            card = rng.choice(cards)
+            card['card_key'] = rng.choice(['', '1m_a', '1m_e'])
+            index.update(card)
+        else:
+            card = cards.pop(rng.randrange(len(cards)))
+            index.remove(card)
+        if step % 50 == 0:
+            check(index, cards)
+    check(index, cards)
+    
+    rebuilt = CardViewIndex(ACTIVE_STATES, 'REMOVED')
+    rebuilt.rebuild(cards)
+    assert ids(rebuilt.active_cards()) == ids(index.active_cards())
+    assert ids(rebuilt.visible_cards()) == ids(index.visible_cards())
+    print(f"✅ 증분 색인 = 전체 순회 결과 (카드 {len(cards)}개)")
+
+
+def test_state_transition_and_sold():
+    """활성 카드가 SOLD/REMOVED로 바뀌면 같은 card_key의 이전 카드가 다시 보임"""
+    index = CardViewIndex(ACTIVE_STATES, 'REMOVED')
+    old = ProductionCard({'card_id': 'c1', 'card_key': 'k', 'card_state': 'ACTIVE',
+                          'production_time': '2026-01-01T00:00:00', 'history_list': []})
+    new = ProductionCard({'card_id': 'c2', 'card_key': 'k', 'card_state': 'ACTIVE',
+                          'production_time': '2026-01-01T00:01:00', 'history_list': [{'type': 'NEW'}]})
+    index.rebuild([old, new])
+    assert ids(index.active_cards()) == ['c2'] and index.latest_by_key('k') is new
+    
+    new['history_list'].insert(0, {'type': 'SOLD'})
+    index.update(new)
+    assert index.has_sold('c2') and ids(index.active_cards()) == ['c1']
+    assert ids(index.visible_cards()) == ['c2'] and ids(index.sold_cards()) == ['c2']
+    
+    new['card_state'] = 'REMOVED'
+    index.update(new)
+    assert ids(index.visible_cards()) == ['c1'] and index.sold_cards() == []
+    assert ids(index.sold_cards(include_removed=True)) == ['c2']
+    
+    # 색인된 객체가 아닌 같은 id의 다른 카드는 무시
+    index.update(ProductionCard({'card_id': 'c1', 'card_key': 'k', 'card_state': 'GRAY'}))
+    assert ids(index.active_cards()) == ['c1']
+    
+    index.remove(old)
+    assert index.active_cards() == [] and index.get('c1') is None and len(index) == 1
+    print("✅ 상태 전이 / SOLD 히스토리 반영")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("생산 카드 보조 인덱스 테스트")
+    print("=" * 50)
+    test_incremental_matches_scan()
+    test_state_transition_and_sold()
+    print("✅ 모든 테스트 통과")
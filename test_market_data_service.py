@@ -0,0 +1,204 @@
+"""시장 데이터 서비스(MarketDataService) 테스트 스크립트
+
+가짜 fetcher로 single-flight(동시 조회 합치기), 큰 count 결과 잘라 쓰기,
+봉 마감 기준 캐시 만료, 오류/빈 결과 처리를 확인합니다.
+"""
+import sys
+import io
+import os
+import time
+import threading
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.market_data_service import MarketDataService, next_candle_close, timeframe_to_interval
+
+# 2026-01-05 00:00:00 UTC (월요일, 한국 시간 09:00)
+MONDAY = 1767571200.0
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeFetcher:
+    """호출 기록을 남기고 [(호출 번호, i), ...] 목록을 돌려주는 가짜 조회 함수"""
+    
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.fail = None
+        self.empty = False
+        self._lock = threading.Lock()
+    
+    def __call__(self, market, interval, count):
+        with self._lock:
+            self.calls.append((market, interval, count))
+            number = len(self.calls)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        if self.empty:
+            return []
+        return [(number, i) for i in range(count)]
+
+
+def test_candle_close():
+    """봉 마감 시각은 업비트 기준(UTC 0시)으로 정렬"""
+    assert next_candle_close('minute1', MONDAY + 5) == MONDAY + 60
+    assert next_candle_close('minute10', MONDAY + 601) == MONDAY + 1200
+    assert next_candle_close('minute240', MONDAY + 3600) == MONDAY + 14400
+    assert next_candle_close('day', MONDAY + 3600) == MONDAY + 86400
+    assert next_candle_close('week', MONDAY + 86400 * 3) == MONDAY + 86400 * 7
+    assert next_candle_close('month', MONDAY) == 1769904000.0  # 2026-02-01 UTC
+    assert next_candle_close('unknown', MONDAY) is None
+    assert timeframe_to_interval('1m') == 'minute1' and timeframe_to_interval('minute5') == 'minute5'
+    assert timeframe_to_interval('1d') == 'day' and timeframe_to_interval('zz') == 'minute1'
+    print("✅ 봉 마감 시각 계산")
+
+
+def test_single_flight():
+    """같은 조회가 동시에 들어오면 fetcher는 한 번만 호출"""
+    fetcher = FakeFetcher(delay=0.2)
+    service = MarketDataService(fetcher=fetcher)
+    barrier = threading.Barrier(7)
+    results = []
+    errors = []
+    
+    def worker(count, wait=True):
+        try:
+            if wait:
+                barrier.wait()
+            results.append(service.get_ohlcv('KRW-BTC', 'minute1', count))
+        except Exception as e:
+            errors.append(e)
+    
+    # 먼저 200개 조회가 시작되면 나머지(200개 이하)는 그 결과를 함께 기다림
+    first = threading.Thread(target=worker, args=(200, False))
+    first.start()
+    while not service.stats()['in_flight']:
+        time.sleep(0.001)
+    threads = [threading.Thread(target=worker, args=(count,)) for count in (200, 200, 100, 50, 1, 200, 150)]
+    for thread in threads:
+        thread.start()
+    for thread in [first] + threads:
+        thread.join()
+    
+    assert not errors, errors
+    assert fetcher.calls == [('KRW-BTC', 'minute1', 200)], fetcher.calls
+    assert sorted(len(result) for result in results) == [1, 50, 100, 150, 200, 200, 200, 200]
+    for result in results:
+        assert result[-1] == (1, 199)  # 같은 조회 결과의 최신 부분
+    stats = service.stats()
+    assert stats['fetches'] == 1 and stats['coalesced'] + stats['hits'] + stats['sliced_hits'] == 7, stats
+    
+    # 다른 market / interval은 따로 조회
+    service.get_ohlcv('KRW-ETH', 'minute1', 200)
+    service.get_ohlcv('KRW-BTC', 'minute5', 200)
+    assert len(fetcher.calls) == 3
+    print(f"✅ single-flight: 동시 호출 8개 -> 조회 {stats['fetches']}회 (대기 합류 {stats['coalesced']}회)")
+
+
+def test_slicing_and_ttl():
+    """큰 count 결과를 잘라 쓰고, 봉 마감 + 지연 시간이 지나면 다시 조회"""
+    clock = FakeClock(MONDAY + 10)
+    fetcher = FakeFetcher()
+    service = MarketDataService(fetcher=fetcher, clock=clock, close_delay_seconds=1.0)
+    
+    assert len(service.get_ohlcv('KRW-BTC', 'minute1', 20)) == 20
+    big = service.get_ohlcv('KRW-BTC', 'minute1', 200)
+    assert len(fetcher.calls) == 2 and len(big) == 200
+    assert service.stats()['entries'] == 1  # 200개 결과가 20개 결과를 대신함
+    
+    small = service.get_ohlcv('KRW-BTC', 'minute1', 20)
+    assert small == big[-20:] and len(fetcher.calls) == 2
+    assert service.get_ohlcv('KRW-BTC', 'minute1', 200) is big
+    assert service.get_ohlcv('KRW-BTC', 'minute1', 300)[-1] == (3, 299)  # 더 큰 count는 새로 조회
+    
+    # 1분봉: 다음 봉 마감(60초) + 1초 전까지 유지
+    clock.now = MONDAY + 60.5
+    assert len(service.get_ohlcv('KRW-BTC', 'minute1', 200)) == 200 and len(fetcher.calls) == 3
+    clock.now = MONDAY + 61
+    service.get_ohlcv('KRW-BTC', 'minute1', 200)
+    assert len(fetcher.calls) == 4
+    
+    # max_age: 더 최신 값이 필요한 호출은 봉 마감 전이라도 다시 조회
+    clock.now = MONDAY + 80
+    service.get_ohlcv('KRW-BTC', 'minute1', 1)
+    assert len(fetcher.calls) == 4
+    service.get_ohlcv('KRW-BTC', 'minute1', 1, max_age=5)
+    assert len(fetcher.calls) == 5
+    
+    # 일봉은 봉 마감 전이라도 max_age_seconds가 지나면 다시 조회
+    service.get_ohlcv('KRW-BTC', 'day', 30)
+    clock.now += service.max_age_seconds - 1
+    service.get_ohlcv('KRW-BTC', 'day', 30)
+    assert len(fetcher.calls) == 6
+    clock.now += 2
+    service.get_ohlcv('KRW-BTC', 'day', 30)
+    assert len(fetcher.calls) == 7
+    print("✅ 큰 count 결과 잘라 쓰기 / 봉 마감 기준 만료")
+
+
+def test_errors_and_bounds():
+    """오류는 모든 대기자에게 전달하고 캐시하지 않음, 항목 수 제한"""
+    fetcher = FakeFetcher(delay=0.1)
+    fetcher.fail = RuntimeError("network down")
+    service = MarketDataService(fetcher=fetcher)
+    errors = []
+    
+    def worker():
+        try:
+            service.get_ohlcv('KRW-BTC', 'minute1', 10)
+        except RuntimeError as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4 and len(fetcher.calls) == 1
+    assert service.stats()['errors'] == 1 and service.stats()['entries'] == 0
+    
+    # 빈 결과도 캐시하지 않음
+    fetcher.fail = None
+    fetcher.delay = 0.0
+    fetcher.empty = True
+    assert service.get_ohlcv('KRW-BTC', 'minute1', 10) == []
+    fetcher.empty = False
+    assert len(service.get_ohlcv('KRW-BTC', 'minute1', 10)) == 10
+    assert len(fetcher.calls) == 3
+    
+    # 최근에 쓰지 않은 항목부터 제거
+    bounded = MarketDataService(fetcher=FakeFetcher(), max_entries=3)
+    for market in ('A', 'B', 'C'):
+        bounded.get_ohlcv(market, 'minute1', 5)
+    bounded.get_ohlcv('A', 'minute1', 5)
+    bounded.get_ohlcv('D', 'minute1', 5)
+    assert [item['market'] for item in bounded.stats()['items']] == ['C', 'A', 'D']
+    assert bounded.clear() == 3 and bounded.stats()['entries'] == 0
+    print("✅ 오류 전달 / 빈 결과 / 항목 수 제한")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("시장 데이터 서비스 테스트")
+    print("=" * 50)
+    test_candle_close()
+    test_single_flight()
+    test_slicing_and_ttl()
+    test_errors_and_bounds()
+    print("✅ 모든 테스트 통과")
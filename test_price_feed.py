@@ -0,0 +1,188 @@
+"""가격 피드(PriceFeed) 테스트 스크립트
+
+가짜 fetcher로 구독자가 여러 명이어도 틱마다 조회가 한 번인지,
+느린 구독자는 최신 틱만 받는지, 구독자가 없으면 멈췄다가 다시 시작하는지 확인합니다.
+"""
+import sys
+import io
+import os
+import time
+import threading
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.price_feed import PriceFeed
+
+SUBSCRIBERS = 8
+
+
+class FakeFetcher:
+    """조회할 때마다 가격 1씩 증가"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.lock = threading.Lock()
+    
+    def __call__(self, market):
+        with self.lock:
+            self.calls += 1
+            if self.fail:
+                raise ConnectionError("offline")
+            return 100000000.0 + self.calls
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_fan_out():
+    """구독자 여러 명이 같은 틱을 받고 거래소 조회는 틱당 한 번"""
+    fetcher = FakeFetcher()
+    feed = PriceFeed(fetcher=fetcher, interval_seconds=0.05)
+    received = [[] for _ in range(SUBSCRIBERS)]
+    subscriptions = [feed.subscribe() for _ in range(SUBSCRIBERS)]
+    
+    def reader(index):
+        while len(received[index]) < 5:
+            tick = subscriptions[index].get(timeout=2)
+            assert tick is not None, "틱을 받지 못함"
+            if not received[index] or received[index][-1]['sequence'] != tick['sequence']:
+                received[index].append(tick)
+    
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(SUBSCRIBERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for subscription in subscriptions:
+        subscription.close()
+    feed.stop()
+    
+    stats = feed.stats()
+    assert stats['fetches'] == fetcher.calls == stats['ticks'], (stats, fetcher.calls)
+    assert stats['subscribers'] == 0 and not feed.is_running()
+    # 같은 sequence면 같은 가격 (모두 같은 조회 결과를 공유)
+    by_sequence = {}
+    for ticks in received:
+        for tick in ticks:
+            assert by_sequence.setdefault(tick['sequence'], tick['price']) == tick['price']
+    assert fetcher.calls < SUBSCRIBERS * 5
+    print(f"✅ 팬아웃: 구독자 {SUBSCRIBERS}명, 거래소 조회 {fetcher.calls}회")
+
+
+def test_slow_subscriber():
+    """느린 구독자는 밀린 틱 대신 최신 틱 하나만 받음"""
+    feed = PriceFeed(fetcher=lambda market: None, interval_seconds=60)
+    subscription = feed.subscribe()
+    feed.stop()
+    for price in (1.0, 2.0, 3.0):
+        feed.publish(price)
+    tick = subscription.get(timeout=0.1)
+    assert tick['price'] == 3.0 and tick['sequence'] == 3
+    assert subscription.get(timeout=0.05) is None
+    
+    # 새 구독자는 마지막 틱을 바로 받음
+    late = feed.subscribe()
+    feed.stop()
+    assert late.get(timeout=0.1)['sequence'] == 3
+    subscription.close()
+    late.close()
+    print("✅ 느린 구독자: 최신 틱만 전달")
+
+
+def test_idle_stop_and_restart():
+    """구독자가 없으면 멈추고, 다시 구독하면 재시작"""
+    fetcher = FakeFetcher()
+    feed = PriceFeed(fetcher=fetcher, interval_seconds=0.02, idle_stop_seconds=0.1)
+    subscription = feed.subscribe()
+    assert subscription.get(timeout=1) is not None
+    subscription.close()
+    assert wait_until(lambda: not feed.is_running()), "구독자가 없는데 계속 실행 중"
+    calls = fetcher.calls
+    time.sleep(0.1)
+    assert fetcher.calls == calls
+    
+    subscription = feed.subscribe()
+    assert feed.is_running() and wait_until(lambda: fetcher.calls > calls)
+    subscription.close()
+    feed.stop()
+    print("✅ 구독자 없으면 중지 / 다시 구독하면 재시작")
+
+
+def test_restart_while_stopping():
+    """중지 요청 후 아직 조회 중인 스레드가 있어도 start()가 새 스레드를 시작"""
+    release = threading.Event()
+    fetcher = FakeFetcher()
+    
+    def slow_fetcher(market):
+        release.wait(5)
+        return fetcher(market)
+    
+    feed = PriceFeed(fetcher=slow_fetcher, interval_seconds=0.02)
+    feed.start()
+    old_thread = feed._thread
+    assert wait_until(lambda: old_thread.is_alive())
+    feed.stop(timeout=0)
+    assert old_thread.is_alive() and not feed.is_running()
+    
+    ticks = []
+    feed.add_listener(ticks.append)
+    assert feed.is_running() and feed._thread is not old_thread
+    release.set()
+    assert wait_until(lambda: len(ticks) >= 2)
+    old_thread.join(1)
+    assert not old_thread.is_alive() and feed.is_running()
+    feed.remove_listener(ticks.append)
+    feed.stop()
+    print("✅ 중지 중인 스레드가 있어도 재시작")
+
+
+def test_errors():
+    """리스너 예외와 조회 실패가 피드를 멈추지 않음"""
+    fetcher = FakeFetcher()
+    feed = PriceFeed(fetcher=fetcher, interval_seconds=0.02)
+    ticks = []
+    
+    def broken(tick):
+        raise RuntimeError("listener bug")
+    
+    feed.add_listener(broken)
+    feed.add_listener(ticks.append)
+    assert wait_until(lambda: len(ticks) >= 2)
+    
+    fetcher.fail = True
+    assert wait_until(lambda: feed.stats()['errors'] >= 3)
+    fetcher.fail = False
+    count = len(ticks)
+    assert wait_until(lambda: len(ticks) > count), "조회 실패 후 복구되지 않음"
+    
+    feed.remove_listener(broken)
+    feed.remove_listener(ticks.append)
+    feed.stop()
+    assert feed.stats()['listeners'] == 0 and not feed.is_running()
+    print(f"✅ 리스너 예외 / 조회 실패 후 복구 (오류 {feed.stats()['errors']}회)")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("가격 피드 테스트")
+    print("=" * 50)
+    test_fan_out()
+    test_slow_subscriber()
+    test_idle_stop_and_restart()
+    test_restart_while_stopping()
+    test_errors()
+    print("✅ 모든 테스트 통과")
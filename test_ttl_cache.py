@@ -0,0 +1,174 @@
+"""TTL 캐시(TTLCache) / 레이트 리미터 동시성 테스트 스크립트
+
+여러 스레드가 같은/다른 키를 동시에 읽고 쓰는 동안
+크기 제한, 키별 단일 생성(get_or_set), 만료, 통계가 일관된지 확인합니다.
+"""
+import sys
+import io
+import os
+import time
+import random
+import threading
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.ttl_cache import TTLCache, RateLimiter
+
+THREADS = 16
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_and_lru():
+    """만료 시각과 LRU 제거 순서"""
+    clock = FakeClock()
+    cache = TTLCache(max_size=3, ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=30)
+    cache.set('c', 3)
+    assert cache.get('a') == 1  # a 사용 -> b가 가장 오래 사용하지 않은 항목
+    cache.set('d', 4)
+    assert 'b' not in cache and [key for key, *_ in cache.snapshot()] == ['c', 'a', 'd']
+    
+    clock.now += 10
+    assert cache.get('a') is None and cache.get('a', 'x') == 'x'
+    assert cache.peek('a') == 1  # 만료된 값도 peek으로는 확인 가능
+    assert cache.purge_expired() == 3 and len(cache) == 0
+    
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['hits'] == 1 and stats['misses'] == 2, stats
+    assert stats['size'] == 0 and stats['max_size'] == 3
+    assert cache.delete('a') is False
+    print("✅ 만료 / LRU 제거")
+
+
+def test_concurrent_churn():
+    """키가 계속 바뀌어도(count 파라미터처럼) 크기는 max_size를 넘지 않음"""
+    cache = TTLCache(max_size=50, ttl=0.05)
+    errors = []
+    max_seen = [0]
+    stop = time.time() + 1.0
+    
+    def worker(seed):
+        rng = random.Random(seed)
+        try:
+            while time.time() < stop:
+                key = f"KRW-BTC_minute1_{rng.randint(1, 1000)}"
+                value = cache.get(key)
+                if value is not None and value != key.upper():
+                    errors.append((key, value))
+                cache.set(key, key.upper())
+                if rng.random() < 0.01:
+                    cache.purge_expired()
+                size = len(cache)
+                if size > max_seen[0]:
+                    max_seen[0] = size
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    stats = cache.stats()
+    assert not errors, errors[:3]
+    assert max_seen[0] <= 50 and stats['size'] <= 50, (max_seen, stats)
+    assert stats['evictions'] > 0
+    print(f"✅ 동시 읽기/쓰기 {THREADS}개 스레드: 최대 크기 {max_seen[0]}/50, 제거 {stats['evictions']}회")
+
+
+def test_get_or_set_single_load():
+    """같은 키는 한 스레드만 factory 실행, 다른 키는 서로 기다리지 않음"""
+    cache = TTLCache(max_size=10, ttl=60)
+    calls = {}
+    calls_lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+    results = []
+    
+    def factory(key):
+        with calls_lock:
+            calls[key] = calls.get(key, 0) + 1
+        time.sleep(0.2)
+        return f"value-{key}"
+    
+    def worker(index):
+        key = 'a' if index % 2 else 'b'
+        barrier.wait()
+        results.append((key, cache.get_or_set(key, lambda: factory(key))))
+    
+    start = time.time()
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    
+    assert calls == {'a': 1, 'b': 1}, calls
+    assert all(value == f"value-{key}" for key, value in results) and len(results) == THREADS
+    assert elapsed < 0.35, elapsed  # 'a'와 'b'는 동시에 생성
+    stats = cache.stats()
+    assert stats['loads'] == 2 and stats['coalesced'] == THREADS - 2, stats
+    assert not cache._key_locks  # 사용이 끝난 키 잠금은 제거
+    
+    # factory 예외는 저장하지 않고 전달
+    def failing():
+        raise RuntimeError("No data")
+    try:
+        cache.get_or_set('c', failing)
+        raise AssertionError("예외가 전달되지 않음")
+    except RuntimeError:
+        pass
+    assert 'c' not in cache and cache.get_or_set('c', lambda: 3) == 3
+    print(f"✅ get_or_set: {THREADS}개 스레드, 키 2개 -> factory 2회 ({elapsed:.2f}초)")
+
+
+def test_rate_limiter():
+    """동시에 호출해도 기간 안의 허용 횟수를 넘지 않음"""
+    clock = FakeClock()
+    limiter = RateLimiter(period=60, clock=clock)
+    granted = []
+    
+    def worker():
+        for _ in range(10):
+            if limiter.try_acquire(10):
+                granted.append(1)
+    
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(granted) == 10 and limiter.count() == 10
+    
+    clock.now += 59
+    assert not limiter.try_acquire(10)
+    clock.now += 1
+    assert limiter.try_acquire(10) and limiter.count() == 1
+    print("✅ 레이트 리미터")
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("TTL 캐시 동시성 테스트")
+    print("=" * 50)
+    test_ttl_and_lru()
+    test_concurrent_churn()
+    test_get_or_set_single_load()
+    test_rate_limiter()
+    print("✅ 모든 테스트 통과")
@@ -2171,7 +2171,7 @@ class TradingBotGUI(QMainWindow):
                     # 하지만 명시적으로 제거하여 즉시 반영
                     if hasattr(self.production_card_manager, 'cards_cache'):
                         if card in self.production_card_manager.cards_cache:
-                            self.production_card_manager.cards_cache.remove(card)
+                            self.production_card_manager._remove_from_cache(card)
                             print(f"  ✓ 캐시에서 카드 제거 완료: {card_id}")
                     
                     # 캐시 무효화 (다음 로드 시 REMOVED 상태로 로드됨)
@@ -2197,6 +2197,7 @@ class TradingBotGUI(QMainWindow):
                     card['card_state'] = CardState.GRAY.value
                     card['status'] = CardState.GRAY.value
                     card['removal_pending'] = True
+                    self.production_card_manager.refresh_card_views(card)
                     
                     # NBverse에 저장
                     if self.nbverse_storage:
@@ -2431,6 +2432,12 @@ class TradingBotGUI(QMainWindow):
                 except Exception as e:
                     # 저장 오류는 무시하고 계속 진행
                     pass
+                
+                # 저장 워커에 대기 중인 카드/임시 저장 파일을 종료 전에 모두 기록
+                try:
+                    self.production_card_manager.flush()
+                except Exception as e:
+                    print(f"⚠️ 카드 저장 완료 대기 오류: {e}")
             
             # 모든 QThread가 완료될 때까지 최종 대기
             from PyQt6.QtCore import QThread
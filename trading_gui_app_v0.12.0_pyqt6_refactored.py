@@ -488,8 +488,7 @@ class TradingBotGUI(QMainWindow):
                     worker.wait(2000)
                 
                 # 캐시에서 제거
-                if card in self.production_card_manager.cards_cache:
-                    self.production_card_manager.cards_cache.remove(card)
+                self.production_card_manager._remove_from_cache(card)
                 
                 self.production_card_manager._cache_dirty = True
                 print(f"✅ 강화학습 AI: 카드 {card_id} 폐기 완료")
@@ -536,6 +535,12 @@ class TradingBotGUI(QMainWindow):
                             print(f"✓ {saved_count}개 카드 상태 저장 완료")
                 except Exception as e:
                     pass
+                
+                # 저장 워커에 대기 중인 카드/임시 저장 파일을 종료 전에 모두 기록
+                try:
+                    self.production_card_manager.flush()
+                except Exception as e:
+                    print(f"⚠️ 카드 저장 완료 대기 오류: {e}")
             
             print("✓ 프로그램 종료 준비 완료")
             event.accept()
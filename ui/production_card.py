@@ -3063,20 +3063,18 @@ class ProductionCard(QFrame):
             self.card['score'] = new_score
             self.card['realtime_scores'] = self.realtime_scores.copy()  # 점수 히스토리 저장
             
-            # 생산 카드 관리자에 점수 업데이트 반영 (저장을 위해) - 캐싱 최적화
-            # 카드 데이터를 직접 수정하면 생산 카드 관리자가 자동으로 저장함
+            # 생산 카드 관리자에 점수 업데이트 반영 (저장을 위해)
+            # update_card로 넘겨야 관리자 잠금/뷰 인덱스/저장 워커를 거침 (카드 저장소를 직접 수정하지 않음)
             parent = self._get_parent_with_attr('production_card_manager')
             
             if parent and hasattr(parent, 'production_card_manager') and parent.production_card_manager:
+                manager = parent.production_card_manager
                 card_id = self.card.get('card_id', '')
-                if card_id:
-                    # 카드 캐시에서 찾아서 업데이트
-                    if hasattr(parent.production_card_manager, 'cards_cache'):
-                        if card_id in parent.production_card_manager.cards_cache:
-                            parent.production_card_manager.cards_cache[card_id]['score'] = new_score
-                            parent.production_card_manager.cards_cache[card_id]['realtime_scores'] = self.realtime_scores.copy()
-                            # 캐시 dirty 플래그 설정 (저장 필요)
-                            parent.production_card_manager._cache_dirty = True
+                if card_id and manager.get_card_by_id(card_id) is not None:
+                    manager.update_card(card_id, {
+                        'score': new_score,
+                        'realtime_scores': self.realtime_scores.copy()
+                    })
             
         except Exception as e:
             print(f"⚠️ 실시간 점수 업데이트 오류: {e}")
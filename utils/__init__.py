@@ -2,10 +2,12 @@
 from .config import Config, load_config
 from .helpers import safe_float, parse_iso_datetime, get_btc_price, get_all_balances
 from .gpu_setup import GPU_AVAILABLE, USE_GPU, CUDF_AVAILABLE, np_gpu
+from .ttl_cache import TTLCache, RateLimiter
 
 __all__ = [
     'Config', 'load_config',
     'safe_float', 'parse_iso_datetime', 'get_btc_price', 'get_all_balances',
-    'GPU_AVAILABLE', 'USE_GPU', 'CUDF_AVAILABLE', 'np_gpu'
+    'GPU_AVAILABLE', 'USE_GPU', 'CUDF_AVAILABLE', 'np_gpu',
+    'TTLCache', 'RateLimiter'
 ]
 
@@ -0,0 +1,182 @@
+"""TTL 캐시 모듈 - 여러 요청 스레드가 함께 쓰는 크기 제한 캐시
+
+- 항목마다 만료 시각 (기본 ttl, set 할 때 ttl 지정 가능)
+- max_size를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 키별 잠금: get_or_set / lock_for로 같은 키의 값은 한 스레드만 만들고 나머지는 그 결과 사용
+- hits / misses / coalesced / evictions / expirations(만료된 항목 조회) 통계
+"""
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """스레드 안전 TTL + LRU 캐시"""
+    
+    def __init__(self, max_size: int = 256, ttl: float = 60.0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_size: 최대 항목 수 (넘으면 LRU 제거)
+            ttl: 기본 유효 시간 (초)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        if max_size <= 0:
+            raise ValueError("max_size는 1 이상이어야 합니다")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()  # key -> (값, 저장 시각, 만료 시각)
+        self._key_locks: Dict[Hashable, list] = {}  # key -> [Lock, 사용 중인 스레드 수]
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'loads': 0,
+                       'evictions': 0, 'expirations': 0}
+    
+    def _lookup(self, key: Hashable, now: float):
+        """유효한 값 또는 _MISSING (잠금 안에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[2] <= now:
+            # 만료된 항목은 peek()용으로 남겨 두고 덮어쓰기/LRU/purge_expired 때 제거
+            self._stats['expirations'] += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+    
+    def get(self, key: Hashable, default=None):
+        """유효한 값 (없거나 만료되었으면 default)"""
+        with self._lock:
+            value = self._lookup(key, self._clock())
+            if value is _MISSING:
+                self._stats['misses'] += 1
+                return default
+            self._stats['hits'] += 1
+            return value
+    
+    def set(self, key: Hashable, value, ttl: Optional[float] = None):
+        """값 저장 (ttl 초 후 만료, 기본값은 self.ttl)"""
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (value, now, now + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def peek(self, key: Hashable, default=None):
+        """만료 여부와 관계없이 마지막으로 저장한 값 (통계/LRU 순서는 바꾸지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+    
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+    
+    @contextmanager
+    def lock_for(self, key: Hashable):
+        """키별 잠금 (같은 키를 만드는 스레드끼리만 기다림, 다른 키/읽기는 막지 않음)"""
+        with self._lock:
+            item = self._key_locks.get(key)
+            if item is None:
+                item = self._key_locks[key] = [threading.Lock(), 0]
+            item[1] += 1
+        try:
+            with item[0]:
+                yield
+        finally:
+            with self._lock:
+                item[1] -= 1
+                if not item[1]:
+                    del self._key_locks[key]
+    
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: Optional[float] = None):
+        """
+        유효한 값이 없으면 factory()로 만들어 저장 (키별로 한 스레드만 factory 실행)
+        
+        factory가 예외를 던지면 저장하지 않고 그대로 전달합니다.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self.lock_for(key):
+            # 기다리는 동안 다른 스레드가 만들었으면 그 값 사용
+            with self._lock:
+                value = self._lookup(key, self._clock())
+                if value is not _MISSING:
+                    self._stats['coalesced'] += 1
+                    return value
+                self._stats['loads'] += 1
+            value = factory()
+            self.set(key, value, ttl)
+            return value
+    
+    def purge_expired(self) -> int:
+        """만료된 항목 제거, 제거한 수 반환"""
+        with self._lock:
+            now = self._clock()
+            expired = [key for key, entry in self._entries.items() if entry[2] <= now]
+            for key in expired:
+                del self._entries[key]
+            return len(expired)
+    
+    def clear(self) -> int:
+        """전체 삭제, 삭제한 항목 수 반환"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+    
+    def snapshot(self) -> List[Tuple[Hashable, Any, float, bool]]:
+        """(key, 값, 경과 초, 만료 여부) 목록 (오래 사용하지 않은 순, 사용 기록은 바꾸지 않음)"""
+        with self._lock:
+            now = self._clock()
+            return [(key, value, now - stored_at, expires_at <= now)
+                    for key, (value, stored_at, expires_at) in self._entries.items()]
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {**self._stats, 'size': len(self._entries), 'max_size': self.max_size,
+                    'ttl_seconds': self.ttl,
+                    'hit_rate': round(self._stats['hits'] / lookups, 4) if lookups else 0.0}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[2] > self._clock()
+
+
+class RateLimiter:
+    """최근 period초 동안의 호출 수 제한 (스레드 안전)"""
+    
+    def __init__(self, period: float = 60.0, clock: Callable[[], float] = time.time):
+        self.period = period
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = deque()
+    
+    def try_acquire(self, limit: int) -> bool:
+        """limit 안이면 호출 1회를 기록하고 True, 넘으면 False"""
+        with self._lock:
+            now = self._clock()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+            if len(self._calls) >= limit:
+                return False
+            self._calls.append(now)
+            return True
+    
+    def count(self) -> int:
+        """최근 period초 동안의 호출 수"""
+        with self._lock:
+            now = self._clock()
+            return sum(1 for t in self._calls if now - t < self.period)
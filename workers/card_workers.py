@@ -54,11 +54,32 @@ class CardProductionWorker(QThread):
         self.chart_nb_value = chart_nb_value  # 좌측 차트에서 계산한 N/B 값
         self.chart_timeframe = chart_timeframe
     
+    def _duplicate_check_converter(self):
+        """기존 카드 MAX/MIN 재계산용 변환기
+        
+        결과 캐시가 없는 변환기면 SlidingNBCalculator를 사용합니다.
+        (카드마다 최근 가격 구간의 최솟값/최댓값/길이가 같으면 값별 기여도를 재사용)
+        결과 캐시가 있으면 캐시 적중이 더 빠르므로 공용 변환기를 그대로 사용합니다.
+        """
+        converter = self.nbverse_converter
+        if getattr(converter, 'cache', None) is not None or not hasattr(converter, 'calculator'):
+            return converter
+        try:
+            from NBverse import SlidingNBCalculator
+        except ImportError:
+            return converter
+        # 공용 변환기의 계산기를 사용하여 SUPER_BIT(범위 밖 결과 보정값) 상태 공유
+        return SlidingNBCalculator(
+            bit=getattr(converter, 'bit', 5.5),
+            decimal_places=getattr(converter, 'decimal_places', 10),
+            calculator=converter.calculator
+        )
+    
     def run(self):
         """백그라운드에서 실행"""
         try:
             import random
-            import pyupbit
+            from services.market_data_service import get_market_data_service
             from datetime import datetime
             from nbverse_helper import calculate_nb_value_from_chart
             
@@ -161,7 +182,7 @@ class CardProductionWorker(QThread):
             log_msg = f"📊 차트 데이터 조회 중... (타임프레임: {selected_timeframe}, interval: {pyupbit_interval}, 백그라운드 실행)"
             print(f"[카드 생산] {log_msg}")
             self.log_message.emit(log_msg)
-            df = pyupbit.get_ohlcv("KRW-BTC", interval=pyupbit_interval, count=200)
+            df = get_market_data_service().get_ohlcv("KRW-BTC", pyupbit_interval, 200)
             # 네트워크 요청은 백그라운드에서 실행되므로 msleep 불필요
             
             # 중단 요청 체크
@@ -287,6 +308,7 @@ class CardProductionWorker(QThread):
                 
                 checked_count = 0
                 batch_size = 10
+                dup_converter = self._duplicate_check_converter()
                 for idx, card in enumerate(existing_cards, 1):
                     # 중단 요청 체크
                     if self.isInterruptionRequested():
@@ -303,7 +325,7 @@ class CardProductionWorker(QThread):
                         
                         # 기존 카드의 전체 차트 데이터로 MAX, MIN 값 계산
                         existing_prices_str = ",".join([str(p) for p in card_chart_data['prices']])
-                        existing_result = self.nbverse_converter.text_to_nb(existing_prices_str)
+                        existing_result = dup_converter.text_to_nb(existing_prices_str)
                         existing_max = round(existing_result.get('bitMax', 5.5), decimal_places)
                         existing_min = round(existing_result.get('bitMin', 5.5), decimal_places)
                         
@@ -1,8 +1,9 @@
 """차트 관련 워커 클래스들"""
 from PyQt6.QtCore import QThread, pyqtSignal
 from datetime import datetime
-import pyupbit
 import numpy as np
+from services.market_data_service import get_market_data_service
+from services.candle_store import get_candle_store
 
 
 class ChartDataWorker(QThread):
@@ -35,24 +36,24 @@ class ChartDataWorker(QThread):
                 return
             
             # 가격 데이터 조회 (백그라운드에서 실행)
-            df = pyupbit.get_ohlcv("KRW-BTC", interval=pyupbit_interval, count=self.count)
+            candles = get_candle_store().get_candles("KRW-BTC", pyupbit_interval, self.count)
             
-            if df is None or df.empty:
+            if not len(candles):
                 self.error_occurred.emit("차트 데이터를 가져올 수 없습니다.")
                 return
             
-            # 차트 데이터 구성
+            # 차트 데이터 구성 (봉 저장소의 NumPy 뷰에서 바로 변환)
             chart_data = {
                 'timeframe': self.timeframe,
-                'prices': df['close'].tolist(),
-                'timestamps': df.index.strftime('%Y-%m-%d %H:%M:%S').tolist(),
-                'volumes': df['volume'].tolist(),
-                'highs': df['high'].tolist(),
-                'lows': df['low'].tolist(),
-                'opens': df['open'].tolist(),
-                'current_price': float(df['close'].iloc[-1]),
-                'min_price': float(df['low'].min()),
-                'max_price': float(df['high'].max()),
+                'prices': candles.close.tolist(),
+                'timestamps': candles.timestamps(),
+                'volumes': candles.volume.tolist(),
+                'highs': candles.high.tolist(),
+                'lows': candles.low.tolist(),
+                'opens': candles.open.tolist(),
+                'current_price': float(candles.close[-1]),
+                'min_price': float(candles.low.min()),
+                'max_price': float(candles.high.max()),
                 'generated_at': datetime.now().isoformat()
             }
             
@@ -115,7 +116,7 @@ class ChartAIAnalysisWorker(QThread):
                 return
             
             # pyupbit으로 최신 데이터 가져오기 (더 정확한 분석을 위해)
-            df = pyupbit.get_ohlcv("KRW-BTC", interval=pyupbit_interval, count=200)
+            df = get_market_data_service().get_ohlcv("KRW-BTC", pyupbit_interval, 200)
             if df is None or df.empty:
                 self.analysis_ready.emit({
                     'signal': 'HOLD',
@@ -281,6 +282,12 @@ class NBMaxMinWorker(QThread):
     max_min_ready = pyqtSignal(float, float)  # MAX, MIN 준비 완료 시그널
     
     def __init__(self, chart_data, nbverse_converter, settings_manager):
+        """
+        Args:
+            chart_data: 차트 데이터
+            nbverse_converter: text_to_nb()를 제공하는 변환기 (TextToNBConverter 또는 SlidingNBCalculator)
+            settings_manager: 설정 관리자
+        """
         super().__init__()
         self.chart_data = chart_data
         self.nbverse_converter = nbverse_converter
@@ -4,6 +4,8 @@ import os
 import json
 from typing import Dict, Optional, List
 
+from managers.card_records import json_default, to_plain
+
 
 class CardUpdateWorker(QThread):
     """카드 업데이트를 백그라운드에서 실행하는 워커 스레드"""
@@ -27,22 +29,25 @@ class CardUpdateWorker(QThread):
                 self.update_completed.emit(False)
                 return
             
-            # 기존 파일 찾기
+            # 기존 파일 찾기 (카드 ID 인덱스가 있는 저장소는 인덱스로 조회)
             found_files = []
-            for base_dir in [self.nbverse_storage.max_dir, self.nbverse_storage.min_dir]:
-                if not os.path.exists(base_dir):
-                    continue
-                
-                for root, dirs, files in os.walk(base_dir):
-                    for filename in files:
-                        if filename.endswith('.json'):
-                            file_path = os.path.join(root, filename)
-                            try:
-                                data = self.nbverse_storage.load_from_path(file_path)
-                                if data and data.get('metadata', {}).get('card_id') == card_id:
-                                    found_files.append(file_path)
-                            except:
-                                pass
+            if hasattr(self.nbverse_storage, 'find_card_paths'):
+                found_files = self.nbverse_storage.find_card_paths(card_id)
+            else:
+                for base_dir in [self.nbverse_storage.max_dir, self.nbverse_storage.min_dir]:
+                    if not os.path.exists(base_dir):
+                        continue
+                    
+                    for root, dirs, files in os.walk(base_dir):
+                        for filename in files:
+                            if filename.endswith('.json'):
+                                file_path = os.path.join(root, filename)
+                                try:
+                                    data = self.nbverse_storage.load_from_path(file_path)
+                                    if data and data.get('metadata', {}).get('card_id') == card_id:
+                                        found_files.append(file_path)
+                                except:
+                                    pass
             
             # 모든 파일 업데이트
             for file_path in found_files:
@@ -64,17 +69,22 @@ class CardUpdateWorker(QThread):
                             'status': self.card.get('card_state', CardState.ACTIVE.value),
                             'removal_pending': self.card.get('removal_pending', False),
                             'production_time': self.card.get('production_time'),
-                            'chart_data': self.card.get('chart_data', {}),
-                            'history_list': self.card.get('history_list', []),
+                            'chart_data': to_plain(self.card.get('chart_data', {})),
+                            'history_list': to_plain(self.card.get('history_list', [])),
                             'bit_max': self.card.get('nb_max'),
                             'bit_min': self.card.get('nb_min'),
                             'nb_max': self.card.get('nb_max'),
                             'nb_min': self.card.get('nb_min')
                         })
                         
+                        # 저장소가 지원하면 저장소를 통해 갱신 (.col 파일에 나눠 저장한 배열과 인덱스 저장소 경로 포함)
+                        if hasattr(self.nbverse_storage, 'save_to_path'):
+                            self.nbverse_storage.save_to_path(file_path, data)
+                            continue
+                        
                         # 파일 저장
                         with open(file_path, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, ensure_ascii=False, indent=2)
+                            json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
                             f.flush()
                             os.fsync(f.fileno())
                 except Exception as e:
@@ -103,6 +113,11 @@ class CardRemoveWorker(QThread):
                 self.remove_completed.emit(False)
                 return
             
+            # 카드 ID 인덱스가 있는 저장소는 해당 레코드만 삭제
+            if hasattr(self.nbverse_storage, 'remove_card'):
+                self.remove_completed.emit(self.nbverse_storage.remove_card(self.card_id) > 0)
+                return
+            
             removed_count = 0
             # max/min 폴더에서 해당 card_id를 가진 파일 찾아서 삭제
             for base_dir in [self.nbverse_storage.max_dir, self.nbverse_storage.min_dir]:
@@ -28,17 +28,8 @@ class VerificationCardLoadWorker(QThread):
                 self.cards_ready.emit([])
                 return
             
-            # 모든 카드 가져오기 (REMOVED 포함 - 검증 완료된 카드 포함)
-            # get_all_cards()는 REMOVED를 제외하므로, 캐시에서 직접 가져오기
-            from managers.production_card_manager import CardState
-            
-            # 캐시에서 모든 카드 가져오기 (REMOVED 포함)
-            all_cards = []
-            if hasattr(self.production_card_manager, 'cards_cache'):
-                all_cards = list(self.production_card_manager.cards_cache)
-            else:
-                # 캐시가 없으면 get_all_cards() 사용 (REMOVED 제외)
-                all_cards = self.production_card_manager.get_all_cards()
+            # 매수/SOLD 히스토리가 있는 카드만 인덱스에서 가져오기 (REMOVED 포함 - 검증 완료된 카드 포함)
+            all_cards = self.production_card_manager.get_verification_cards(include_removed=True)
             
             # 폐기된 카드도 가져오기 (REMOVED 상태인 카드 포함)
             discarded_cards = []